@@ -1,10 +1,22 @@
 """
 Rotas da API Flask.
 """
-from flask import Blueprint, jsonify, render_template, request
+import json
+import math
+from typing import Any, Dict, Optional
+
+from flask import Blueprint, Response, current_app, jsonify, render_template, request, stream_with_context
 
 from src.config.settings import active_config
-from src.services.agent_orchestrator import AgentOrchestrator
+from src.services.admission import PRIORITY_BATCH, PRIORITY_INTERACTIVE, AdmissionController, AdmissionRejected, parse_priority
+from src.services.agent_orchestrator import DEADLINE_EXCEEDED_ERROR, QUALITY_DEGRADED, AgentOrchestrator, ProductsResult
+from src.services.agents.langflow.extraction import extraction_stats
+from src.services.cache import FetchCache, MemoCache
+from src.services.deadline import Deadline, deadline_scope
+from src.services.http import CircuitBreakerRegistry, EndpointPoolRegistry, HedgingRegistry, HttpSessionPool, RateLimiter
+from src.services.http.retry import retry_budget_stats
+from src.services.jobs import JOB_DONE, JobError, JobManager, JobStore
+from src.services.pipeline import pipeline_stats
 from src.utils.statistics import prepare_chart_data
 from src.utils.logging import get_logger
 
@@ -13,6 +25,252 @@ logger = get_logger(__name__)
 # Cria um blueprint para as rotas
 api_bp = Blueprint('api', __name__)
 
+def _orchestrator() -> AgentOrchestrator:
+    """
+    Obtém o orquestrador compartilhado da aplicação, criado em create_app.
+
+    Returns:
+        AgentOrchestrator: Orquestrador de agentes
+    """
+    orchestrator = current_app.extensions.get('agent_orchestrator')
+    if orchestrator is None:
+        orchestrator = current_app.extensions.setdefault('agent_orchestrator', AgentOrchestrator())
+    return orchestrator
+
+def _request_deadline(value) -> Optional[Deadline]:
+    """
+    Cria o prazo da requisição a partir do parâmetro "deadline_ms" ou de REQUEST_DEADLINE_MS.
+
+    Args:
+        value: Valor do parâmetro "deadline_ms" (None se ausente)
+
+    Returns:
+        Optional[Deadline]: Prazo ou None se nenhum prazo se aplicar
+
+    Raises:
+        ValueError: Se o valor informado não for um número positivo
+    """
+    return Deadline.from_ms(value, current_app.config['REQUEST_DEADLINE_MS'])
+
+def _invalid_deadline(value):
+    """
+    Monta a resposta de erro para um "deadline_ms" inválido.
+
+    Args:
+        value: Valor recebido
+
+    Returns:
+        Tuple[Response, int]: Resposta JSON e status 400
+    """
+    return jsonify({
+        "success": False,
+        "error": f"deadline_ms inválido: {value}"
+    }), 400
+
+def _batch_limit(value) -> Optional[int]:
+    """
+    Interpreta um limite de concorrência do lote ("concurrency" ou "per_host_limit"),
+    limitado a BATCH_MAX_CONCURRENCY.
+
+    Args:
+        value: Valor informado (None se ausente)
+
+    Returns:
+        Optional[int]: Limite ou None para usar o padrão
+
+    Raises:
+        ValueError: Se o valor não for um inteiro positivo
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"Limite inválido: {value}")
+    limit = int(value)
+    if limit < 1:
+        raise ValueError(f"Limite inválido: {value}")
+    return min(limit, current_app.config['BATCH_MAX_CONCURRENCY'])
+
+def _admission() -> AdmissionController:
+    """
+    Obtém o controle de admissão da aplicação, criado em create_app.
+
+    Returns:
+        AdmissionController: Controle de admissão dos pipelines
+    """
+    controller = current_app.extensions.get('admission_controller')
+    if controller is None:
+        controller = current_app.extensions.setdefault('admission_controller',
+                                                       create_admission_controller(current_app.config))
+    return controller
+
+def create_admission_controller(config) -> AdmissionController:
+    """
+    Cria o controle de admissão que limita os pipelines simultâneos.
+
+    Args:
+        config: Configuração da aplicação (ADMISSION_*)
+
+    Returns:
+        AdmissionController: Controle de admissão
+    """
+    return AdmissionController(
+        max_concurrent=config['ADMISSION_MAX_CONCURRENT'],
+        max_queue=config['ADMISSION_MAX_QUEUE'],
+        max_wait=config['ADMISSION_MAX_WAIT'],
+        interactive_reserved=config['ADMISSION_INTERACTIVE_RESERVED'],
+        enabled=config['ADMISSION_ENABLED']
+    )
+
+def _overloaded(error: AdmissionRejected):
+    """
+    Monta a resposta para um pipeline recusado pelo controle de admissão.
+
+    Args:
+        error (AdmissionRejected): Recusa
+
+    Returns:
+        Response: Resposta JSON com status 429 ou 503 e o cabeçalho Retry-After
+    """
+    response = jsonify({
+        "success": False,
+        "error": str(error),
+        "reason": error.reason,
+        "retry_after": error.retry_after
+    })
+    response.status_code = error.status_code
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def _invalid_priority(value):
+    """
+    Monta a resposta de erro para uma prioridade inválida.
+
+    Args:
+        value: Valor recebido
+
+    Returns:
+        Tuple[Response, int]: Resposta JSON e status 400
+    """
+    return jsonify({
+        "success": False,
+        "error": f"Prioridade inválida: {value} (use interactive, batch ou prefetch)"
+    }), 400
+
+def _job_manager() -> JobManager:
+    """
+    Obtém a fila de jobs da aplicação, criada em create_app.
+
+    Returns:
+        JobManager: Fila de jobs
+    """
+    return current_app.extensions['job_manager']
+
+def create_job_manager(orchestrator: AgentOrchestrator, config,
+                       admission: Optional[AdmissionController] = None) -> JobManager:
+    """
+    Cria a fila de jobs que executa buscas de produtos em segundo plano.
+
+    Args:
+        orchestrator (AgentOrchestrator): Orquestrador que executa os pipelines
+        config: Configuração da aplicação (JOB_STORE_PATH, JOB_LEASE_TTL, JOB_WORKERS, JOB_RESULT_TTL
+            e REQUEST_DEADLINE_MS)
+        admission (Optional[AdmissionController]): Controle de admissão; os jobs aguardam
+            uma vaga sem limite próprio de espera, apenas o seu prazo
+
+    Returns:
+        JobManager: Fila de jobs
+    """
+    def run(params):
+        # O prazo começa a contar quando o job sai da fila
+        deadline = Deadline.from_ms(params.get("deadline_ms"), config['REQUEST_DEADLINE_MS'])
+        priority = params.get("priority") or PRIORITY_BATCH
+        try:
+            with deadline_scope(deadline):
+                resultado = orchestrator.fetch_products(
+                    source=params["source"],
+                    fetcher_type=params.get("fetcher"),
+                    processor_type=params.get("processor"),
+                    formatter_type=params.get("formatter"),
+                    use_cache=not params.get("bypass_cache", False),
+                    pipeline_id=params.get("pipeline"),
+                    deadline=deadline,
+                    admit=(lambda: admission.admit(priority, max_wait=math.inf)) if admission else None
+                )
+        except AdmissionRejected as e:
+            raise JobError(str(e))
+        if not resultado.products and deadline is not None and deadline.expired:
+            raise JobError(DEADLINE_EXCEEDED_ERROR)
+        if not resultado.products:
+            raise JobError("Erro ao obter ou processar dados")
+        return {
+            "produtos": _serialize_products(resultado.products),
+            "dados_grafico": prepare_chart_data(resultado.products),
+            **_quality_fields(resultado)
+        }
+
+    def key(params):
+        return json.dumps(orchestrator.request_key(
+            params["source"], params.get("fetcher"), params.get("processor"),
+            params.get("formatter"), params.get("pipeline"),
+            use_cache=not params.get("bypass_cache", False)
+        ))
+
+    return JobManager(
+        runner=run,
+        key_func=key,
+        store=JobStore(config['JOB_STORE_PATH'], lease_ttl=config['JOB_LEASE_TTL']),
+        workers=config['JOB_WORKERS'],
+        result_ttl=config['JOB_RESULT_TTL']
+    )
+
+def _quality_fields(resultado: ProductsResult) -> Dict[str, Any]:
+    """
+    Monta os campos de qualidade da resposta.
+
+    Args:
+        resultado (ProductsResult): Resultado da busca
+
+    Returns:
+        Dict[str, Any]: "quality" e "stage_reached" e, para entregas degradadas, "degraded_reason"
+    """
+    campos = {"quality": resultado.quality, "stage_reached": resultado.stage_reached}
+    if resultado.quality == QUALITY_DEGRADED:
+        campos["degraded_reason"] = resultado.reason
+    return campos
+
+def _serialize_products(produtos):
+    """
+    Converte os produtos para dicionários serializáveis em JSON.
+
+    Args:
+        produtos: Lista de produtos (List[Product] ou lista de dicionários)
+
+    Returns:
+        List[Dict[str, Any]]: Produtos como dicionários
+    """
+    # Verifica se os produtos já estão no formato do agente
+    if isinstance(produtos, list) and len(produtos) > 0 and isinstance(produtos[0], dict):
+        # Já está no formato de dicionário (provavelmente do agente)
+        logger.info("Produtos já estão no formato de dicionário")
+        return produtos
+
+    # Converte para dicionários para serialização JSON
+    logger.info("Convertendo produtos para o formato de dicionário")
+    produtos_dict = []
+    for produto in produtos:
+        # Garante que todos os campos necessários estão presentes
+        produto_dict = {
+            "name": produto.name,
+            "price": float(produto.price) if produto.price is not None else 0.0,
+            "rating": float(produto.rating) if produto.rating is not None else 0.0,
+            "image_url": produto.image_url or "",
+            "url": produto.url or "",
+            "description": produto.description or "",
+            "classificacao": produto.classificacao or "",
+        }
+        produtos_dict.append(produto_dict)
+    return produtos_dict
+
 @api_bp.route('/')
 def index():
     """
@@ -50,9 +308,15 @@ def fetch_data():
         processor_type = request.args.get('processor')
         formatter_type = request.args.get('formatter')
 
+        # Pipeline declarativo (ver /agents); substitui os agentes informados
+        pipeline_id = request.args.get('pipeline')
+
         # Obtém a URL de origem
         source = request.args.get('source')
 
+        # Permite ignorar explicitamente o cache da etapa de busca
+        bypass_cache = request.args.get('bypass_cache', 'false').lower() in ('1', 'true', 'yes')
+
         # Log para depuração
         logger.info(f"Parâmetros da requisição: {request.args}")
         logger.info(f"URL recebida na requisição: {source}")
@@ -70,16 +334,51 @@ def fetch_data():
                 "error": f"URL inválida: {source}"
             })
 
-        # Inicializa o orquestrador de agentes
-        orchestrator = AgentOrchestrator()
+        # Prazo de ponta a ponta: limita todas as etapas, timeouts e retentativas da requisição
+        try:
+            deadline = _request_deadline(request.args.get('deadline_ms'))
+        except ValueError:
+            return _invalid_deadline(request.args.get('deadline_ms'))
+
+        # Prioridade no controle de admissão (pré-carregamentos podem se identificar com "prefetch")
+        try:
+            priority = parse_priority(request.args.get('priority'), PRIORITY_INTERACTIVE)
+        except ValueError:
+            return _invalid_priority(request.args.get('priority'))
+
+        # Obtém o orquestrador de agentes compartilhado
+        orchestrator = _orchestrator()
+
+        if pipeline_id and pipeline_id not in orchestrator.pipelines:
+            logger.error(f"Pipeline inválido: {pipeline_id}")
+            return jsonify({
+                "success": False,
+                "error": f"Pipeline inválido: {pipeline_id}"
+            })
+
+        # Busca e processa os produtos assim que houver vaga (a espera conta no prazo); requisições
+        # idênticas a uma já em andamento aguardam o seu resultado sem ocupar outra vaga.
+        # Sem formatação a tempo, a resposta pode ser degradada
+        admission = _admission()
+        with deadline_scope(deadline):
+            resultado = orchestrator.fetch_products(
+                source=source,
+                fetcher_type=fetcher_type,
+                processor_type=processor_type,
+                formatter_type=formatter_type,
+                use_cache=not bypass_cache,
+                pipeline_id=pipeline_id,
+                deadline=deadline,
+                admit=lambda: admission.admit(priority)
+            )
+        produtos = resultado.products
 
-        # Busca e processa os produtos
-        produtos = orchestrator.fetch_and_process_products(
-            source=source,
-            fetcher_type=fetcher_type,
-            processor_type=processor_type,
-            formatter_type=formatter_type
-        )
+        if not produtos and deadline is not None and deadline.expired:
+            logger.error(DEADLINE_EXCEEDED_ERROR)
+            return jsonify({
+                "success": False,
+                "error": DEADLINE_EXCEEDED_ERROR
+            }), 504
 
         if not produtos:
             logger.error("Erro ao obter ou processar dados")
@@ -88,27 +387,7 @@ def fetch_data():
                 "error": "Erro ao obter ou processar dados"
             })
 
-        # Verifica se os produtos já estão no formato do agente
-        if isinstance(produtos, list) and len(produtos) > 0 and isinstance(produtos[0], dict):
-            # Já está no formato de dicionário (provavelmente do agente)
-            logger.info("Produtos já estão no formato de dicionário")
-            produtos_dict = produtos
-        else:
-            # Converte para dicionários para serialização JSON
-            logger.info("Convertendo produtos para o formato de dicionário")
-            produtos_dict = []
-            for produto in produtos:
-                # Garante que todos os campos necessários estão presentes
-                produto_dict = {
-                    "name": produto.name,
-                    "price": float(produto.price) if produto.price is not None else 0.0,
-                    "rating": float(produto.rating) if produto.rating is not None else 0.0,
-                    "image_url": produto.image_url or "",
-                    "url": produto.url or "",
-                    "description": produto.description or "",
-                    "classificacao": produto.classificacao or "",
-                }
-                produtos_dict.append(produto_dict)
+        produtos_dict = _serialize_products(produtos)
 
         # Prepara os dados para o gráfico
         dados_grafico = prepare_chart_data(produtos)
@@ -121,9 +400,13 @@ def fetch_data():
         return jsonify({
             "success": True,
             "produtos": produtos_dict,
-            "dados_grafico": dados_grafico
+            "dados_grafico": dados_grafico,
+            **_quality_fields(resultado)
         })
 
+    except AdmissionRejected as e:
+        return _overloaded(e)
+
     except Exception as e:
         logger.error(f"Erro no servidor: {str(e)}")
         return jsonify({
@@ -131,21 +414,370 @@ def fetch_data():
             "error": f"Erro no servidor: {str(e)}"
         })
 
+@api_bp.route('/fetch-data/stream')
+def fetch_data_stream():
+    """
+    Rota para buscar dados de produtos com entrega progressiva.
+
+    Aceita os mesmos parâmetros de /fetch-data (inclusive "pipeline"), além de "format" ("sse", padrão, ou
+    "ndjson"). Envia eventos "stage" a cada etapa do pipeline, eventos "products" com
+    os lotes de produtos assim que ficam prontos e, ao final, um evento "done" com o
+    total e os dados do gráfico (ou "error" em caso de falha).
+
+    Returns:
+        Response: Resposta text/event-stream ou application/x-ndjson transmitida
+    """
+    source = request.args.get('source') or active_config.DEFAULT_SCRAPE_URL
+    stream_format = request.args.get('format', 'sse').lower()
+    bypass_cache = request.args.get('bypass_cache', 'false').lower() in ('1', 'true', 'yes')
+
+    if not isinstance(source, str) or not source.startswith('http'):
+        logger.error(f"URL inválida: {source}")
+        return jsonify({
+            "success": False,
+            "error": f"URL inválida: {source}"
+        }), 400
+
+    if stream_format not in ('sse', 'ndjson'):
+        return jsonify({
+            "success": False,
+            "error": f"Formato de transmissão inválido: {stream_format}"
+        }), 400
+
+    try:
+        deadline = _request_deadline(request.args.get('deadline_ms'))
+    except ValueError:
+        return _invalid_deadline(request.args.get('deadline_ms'))
+
+    try:
+        priority = parse_priority(request.args.get('priority'), PRIORITY_INTERACTIVE)
+    except ValueError:
+        return _invalid_priority(request.args.get('priority'))
+
+    orchestrator = _orchestrator()
+    pipeline_id = request.args.get('pipeline')
+    if pipeline_id and pipeline_id not in orchestrator.pipelines:
+        return jsonify({
+            "success": False,
+            "error": f"Pipeline inválido: {pipeline_id}"
+        }), 400
+
+    # A vaga é obtida antes da transmissão, para que a sobrecarga seja respondida com 429/503,
+    # e fica ocupada até o fim da resposta
+    try:
+        with deadline_scope(deadline):
+            ticket = _admission().acquire(priority)
+    except AdmissionRejected as e:
+        return _overloaded(e)
+
+    events = orchestrator.stream_products(
+        source,
+        fetcher_type=request.args.get('fetcher'),
+        processor_type=request.args.get('processor'),
+        formatter_type=request.args.get('formatter'),
+        use_cache=not bypass_cache,
+        pipeline_id=pipeline_id,
+        deadline=deadline
+    )
+
+    def encode(name, body):
+        if stream_format == 'sse':
+            return f"event: {name}\ndata: {json.dumps(body, ensure_ascii=False)}\n\n"
+        return json.dumps({"event": name, **body}, ensure_ascii=False) + "\n"
+
+    def generate():
+        # Os produtos já enviados são mantidos apenas para os dados do gráfico do evento final
+        produtos = []
+        try:
+            # O formatador em streaming é lido durante a iteração, então o prazo vale aqui também
+            with deadline_scope(deadline):
+                for event in events:
+                    name = event["event"]
+                    if name == "stage":
+                        yield encode(name, {"stage": event["stage"]})
+                    elif name == "products":
+                        produtos.extend(event["products"])
+                        yield encode(name, {"produtos": _serialize_products(event["products"])})
+                    elif name == "done":
+                        yield encode(name, {
+                            "success": True,
+                            "total": event["total"],
+                            "dados_grafico": prepare_chart_data(produtos)
+                        })
+                    else:
+                        yield encode(name, {"success": False, "error": event["error"]})
+        except Exception as e:
+            logger.error(f"Erro na transmissão de produtos: {str(e)}")
+            yield encode("error", {"success": False, "error": f"Erro no servidor: {str(e)}"})
+        finally:
+            ticket.release()
+
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Libera a vaga mesmo se a transmissão nunca for iniciada
+    response.call_on_close(ticket.release)
+    return response
+
+@api_bp.route('/fetch-batch', methods=['POST'])
+def fetch_batch():
+    """
+    Rota para buscar dados de várias categorias em paralelo.
+
+    Recebe um JSON com "sources" (lista de URLs) e, opcionalmente, "concurrency",
+    "per_host_limit", "fetcher", "processor", "formatter", "pipeline", "bypass_cache",
+    "priority" (padrão: batch) e "deadline_ms" (prazo do lote inteiro). Cada fonte
+    ocupa uma vaga do controle de admissão; fontes recusadas são entregues com erro.
+    Os resultados são enviados em NDJSON, uma linha por categoria concluída,
+    seguidos de uma linha final de resumo.
+
+    Returns:
+        Response: Resposta NDJSON transmitida à medida que as categorias terminam
+    """
+    payload = request.get_json(silent=True) or {}
+    sources = payload.get('sources')
+
+    if not isinstance(sources, list) or not sources:
+        return jsonify({
+            "success": False,
+            "error": "Informe uma lista de URLs em 'sources'"
+        }), 400
+
+    invalid = [source for source in sources if not isinstance(source, str) or not source.startswith('http')]
+    if invalid:
+        logger.error(f"URLs inválidas no lote: {invalid}")
+        return jsonify({
+            "success": False,
+            "error": f"URLs inválidas: {invalid}"
+        }), 400
+
+    try:
+        deadline = _request_deadline(payload.get('deadline_ms'))
+    except (TypeError, ValueError):
+        return _invalid_deadline(payload.get('deadline_ms'))
+
+    try:
+        priority = parse_priority(payload.get('priority'), PRIORITY_BATCH)
+    except ValueError:
+        return _invalid_priority(payload.get('priority'))
+
+    limits = {}
+    for name in ('concurrency', 'per_host_limit'):
+        try:
+            limits[name] = _batch_limit(payload.get(name))
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error": f"{name} inválido: {payload.get(name)} (informe um inteiro positivo)"
+            }), 400
+
+    orchestrator = _orchestrator()
+    if payload.get('pipeline') and payload['pipeline'] not in orchestrator.pipelines:
+        return jsonify({
+            "success": False,
+            "error": f"Pipeline inválido: {payload['pipeline']}"
+        }), 400
+
+    # Com a fila já cheia, recusa o lote inteiro antes de iniciar a transmissão
+    admission = _admission()
+    rejection = admission.check(priority)
+    if rejection is not None:
+        return _overloaded(rejection)
+
+    results = orchestrator.fetch_and_process_many(
+        sources,
+        concurrency=limits['concurrency'],
+        per_host_limit=limits['per_host_limit'],
+        fetcher_type=payload.get('fetcher'),
+        processor_type=payload.get('processor'),
+        formatter_type=payload.get('formatter'),
+        use_cache=not payload.get('bypass_cache', False),
+        pipeline_id=payload.get('pipeline'),
+        deadline=deadline,
+        admit=lambda: admission.admit(priority)
+    )
+
+    def generate():
+        completed = failed = 0
+        for result in results:
+            completed += 1
+            if result["error"]:
+                failed += 1
+                line = {
+                    "source": result["source"],
+                    "success": False,
+                    "error": result["error"],
+                    "elapsed": result["elapsed"]
+                }
+            else:
+                line = {
+                    "source": result["source"],
+                    "success": True,
+                    "produtos": _serialize_products(result["products"]),
+                    "dados_grafico": prepare_chart_data(result["products"]),
+                    "elapsed": result["elapsed"]
+                }
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+        yield json.dumps({"done": True, "total": completed, "failed": failed}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@api_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Rota para enfileirar uma busca de produtos em segundo plano.
+
+    Recebe um JSON com "source" e, opcionalmente, "fetcher", "processor", "formatter",
+    "pipeline", "bypass_cache", "priority" (padrão: batch) e "deadline_ms" (contado a
+    partir do início da execução). Responde imediatamente com o identificador do job;
+    o resultado é obtido em /jobs/<id> ou acompanhado em /jobs/<id>/events.
+    Pedidos equivalentes a um job em andamento, ou a um resultado ainda retido,
+    recebem o mesmo job.
+
+    Returns:
+        Response: Resposta JSON com o identificador e o status do job (202)
+    """
+    payload = request.get_json(silent=True) or {}
+    source = payload.get('source') or active_config.DEFAULT_SCRAPE_URL
+
+    if not isinstance(source, str) or not source.startswith('http'):
+        logger.error(f"URL inválida: {source}")
+        return jsonify({
+            "success": False,
+            "error": f"URL inválida: {source}"
+        }), 400
+
+    pipeline_id = payload.get('pipeline')
+    if pipeline_id and pipeline_id not in _orchestrator().pipelines:
+        return jsonify({
+            "success": False,
+            "error": f"Pipeline inválido: {pipeline_id}"
+        }), 400
+
+    try:
+        _request_deadline(payload.get('deadline_ms'))
+    except (TypeError, ValueError):
+        return _invalid_deadline(payload.get('deadline_ms'))
+
+    try:
+        priority = parse_priority(payload.get('priority'), PRIORITY_BATCH)
+    except ValueError:
+        return _invalid_priority(payload.get('priority'))
+
+    params = {name: payload.get(name) for name in ('fetcher', 'processor', 'formatter', 'pipeline', 'deadline_ms')}
+    params.update(source=source, bypass_cache=bool(payload.get('bypass_cache', False)), priority=priority)
+    job, deduplicated = _job_manager().submit(params, reuse_results=not params['bypass_cache'])
+
+    response = jsonify({
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "deduplicated": deduplicated,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events"
+    })
+    response.status_code = 202
+    response.headers['Location'] = f"/jobs/{job.id}"
+    return response
+
+@api_bp.route('/jobs/<job_id>')
+def get_job(job_id):
+    """
+    Rota para consultar o status de um job e, quando concluído, o seu resultado.
+
+    Args:
+        job_id (str): Identificador do job
+
+    Returns:
+        Response: Resposta JSON com o job ("result" contém produtos e dados do gráfico)
+    """
+    job = _job_manager().get(job_id)
+    if job is None:
+        return jsonify({
+            "success": False,
+            "error": "Job não encontrado ou expirado"
+        }), 404
+
+    return jsonify({
+        "success": True,
+        "job": job.to_dict()
+    })
+
+@api_bp.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Rota para acompanhar um job por Server-Sent Events.
+
+    Envia um evento "status" a cada mudança de status e, ao final, um evento "done"
+    com os produtos e os dados do gráfico (ou "error"). Comentários de keep-alive
+    mantêm a conexão aberta enquanto o job está em andamento.
+
+    Args:
+        job_id (str): Identificador do job
+
+    Returns:
+        Response: Resposta text/event-stream transmitida
+    """
+    manager = _job_manager()
+    heartbeat = current_app.config['JOB_EVENTS_HEARTBEAT']
+    if manager.get(job_id) is None:
+        return jsonify({
+            "success": False,
+            "error": "Job não encontrado ou expirado"
+        }), 404
+
+    def encode(name, body):
+        return f"event: {name}\ndata: {json.dumps(body, ensure_ascii=False)}\n\n"
+
+    def generate():
+        status = None
+        version = manager.version
+        while True:
+            job = manager.get(job_id)
+            if job is None:
+                yield encode("error", {"success": False, "error": "Job não encontrado ou expirado"})
+                return
+            if job.status != status:
+                status = job.status
+                yield encode("status", {"status": status})
+            if job.finished:
+                if job.status == JOB_DONE:
+                    yield encode("done", {"success": True, **job.result})
+                else:
+                    yield encode("error", {"success": False, "error": job.error})
+                return
+
+            current = manager.wait_for_change(version, heartbeat)
+            if current == version:
+                yield ": keep-alive\n\n"
+            version = current
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @api_bp.route('/agents')
 def list_agents():
     """
     Rota para listar os agentes disponíveis.
 
     Returns:
-        Response: Resposta JSON com os agentes disponíveis
+        Response: Resposta JSON com os agentes e pipelines disponíveis e o estado dos disjuntores
     """
     try:
-        orchestrator = AgentOrchestrator()
+        orchestrator = _orchestrator()
         agents = orchestrator.list_available_agents()
 
         return jsonify({
             "success": True,
-            "agents": agents
+            "agents": agents,
+            "pipelines": orchestrator.list_available_pipelines(),
+            "circuit_breakers": CircuitBreakerRegistry().stats(),
+            "load_balancer": EndpointPoolRegistry().stats()
         })
 
     except Exception as e:
@@ -154,3 +786,40 @@ def list_agents():
             "success": False,
             "error": f"Erro ao listar agentes: {str(e)}"
         })
+
+@api_bp.route('/stats')
+def stats():
+    """
+    Rota para consultar as métricas internas da aplicação.
+
+    Returns:
+        Response: Resposta JSON com as métricas de cache, coalescência, pipelines, limitação de taxa e conexões
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "cache": {
+                "fetch": FetchCache().stats(),
+                "memo": MemoCache().stats()
+            },
+            "coalescing": AgentOrchestrator.coalescing_stats(),
+            "pipelines": pipeline_stats(),
+            "extraction": extraction_stats(),
+            "rate_limiter": RateLimiter().stats(),
+            "retry_budget": retry_budget_stats(),
+            "circuit_breakers": CircuitBreakerRegistry().stats(),
+            "hedging": HedgingRegistry().stats(),
+            "load_balancer": EndpointPoolRegistry().stats(),
+            "http_pool": HttpSessionPool().stats(),
+            "agent_pool": _orchestrator().agent_pool_stats(),
+            "jobs": _job_manager().stats(),
+            "admission": _admission().stats(),
+            "degradation": AgentOrchestrator.degradation_stats()
+        })
+
+    except Exception as e:
+        logger.error(f"Erro ao obter métricas: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": f"Erro ao obter métricas: {str(e)}"
+        })
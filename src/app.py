@@ -2,11 +2,14 @@
 Aplicação principal Flask.
 """
 from flask import Flask
+import atexit
 import os
 
-from src.api.routes import api_bp
+from src.api.routes import api_bp, create_admission_controller, create_job_manager
 from src.config.settings import config_by_name
 from src.config.agents import register_default_agents
+from src.services.agent_orchestrator import AgentOrchestrator
+from src.services.http import HttpSessionPool
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -31,6 +34,24 @@ def create_app(config_name='development'):
     register_default_agents()
     logger.info("Agentes padrão registrados")
 
+    # Orquestrador único da aplicação: os agentes do seu pool são reaproveitados entre requisições
+    orchestrator = AgentOrchestrator()
+    if app.config.get('AGENT_POOL_WARM'):
+        orchestrator.warm_agents()
+    app.extensions['agent_orchestrator'] = orchestrator
+
+    # Controle de admissão: limita os pipelines simultâneos de todas as rotas e dos jobs
+    admission = create_admission_controller(app.config)
+    app.extensions['admission_controller'] = admission
+
+    # Fila de jobs em segundo plano; jobs interrompidos voltam a ser executados
+    job_manager = create_job_manager(orchestrator, app.config, admission)
+    app.extensions['job_manager'] = job_manager
+    atexit.register(job_manager.shutdown)
+
+    # Fecha as conexões HTTP compartilhadas ao encerrar o processo
+    atexit.register(HttpSessionPool().close_all)
+
     # Registra blueprints
     app.register_blueprint(api_bp)
 
@@ -6,10 +6,14 @@ from typing import Dict, Any, List
 from src.config.settings import active_config
 from src.services.agents.registry import AgentRegistry
 from src.services.agents.langflow import LangflowFetcherAgent, LangflowProcessorAgent, LangflowFormatterAgent
+from src.services.agents.local import LocalExtractorFetcherAgent, LocalExtractorProcessorAgent, LocalFormatterAgent
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Tipo de formatador que desativa a etapa de formatação
+NO_FORMATTER = "none"
+
 def register_default_agents() -> None:
     """
     Registra os agentes padrão no registro de agentes.
@@ -48,6 +52,41 @@ def register_default_agents() -> None:
         )
     )
 
+    # Registra a extração local, com o fluxo LLM como fallback quando a confiança é baixa
+    registry.register_agent_class("local_extractor_fetcher", LocalExtractorFetcherAgent)
+    registry.register_agent_class("local_extractor_processor", LocalExtractorProcessorAgent)
+
+    registry.register_agent_factory(
+        "amazon_local_fetcher",
+        lambda: LocalExtractorFetcherAgent(
+            fallback=registry.create_agent("coletor_dados_amazon_fetcher"),
+            name="Extrator Local Amazon - Busca",
+            description="Agente que extrai produtos da Amazon localmente, com fallback para o fluxo LLM"
+        )
+    )
+
+    registry.register_agent_factory(
+        "amazon_local_processor",
+        lambda: LocalExtractorProcessorAgent(
+            fallback_processor=registry.create_agent("coletor_dados_amazon_processor"),
+            fallback_formatter=registry.create_agent("coletor_dados_amazon_formatter"),
+            name="Extrator Local Amazon - Processamento",
+            description="Agente que entrega os produtos extraídos localmente da Amazon"
+        )
+    )
+
+    # Registra a formatação local, com o fluxo de formatação como fallback para registros rejeitados
+    registry.register_agent_class("local_formatter", LocalFormatterAgent)
+
+    registry.register_agent_factory(
+        "amazon_local_formatter",
+        lambda: LocalFormatterAgent(
+            fallback=registry.create_agent("coletor_dados_amazon_formatter"),
+            name="Formatador Local Amazon",
+            description="Agente que formata os produtos localmente, com fallback para o fluxo de formatação"
+        )
+    )
+
     logger.info(f"Agentes padrão registrados: {registry.list_registered_agent_types()}")
 
 def get_agent_config() -> Dict[str, Any]:
@@ -60,7 +99,7 @@ def get_agent_config() -> Dict[str, Any]:
     return {
         "default_fetcher": "coletor_dados_amazon_fetcher",
         "default_processor": "coletor_dados_amazon_processor",
-        "default_formatter": "coletor_dados_amazon_formatter",
+        "default_formatter": "amazon_local_formatter",
         "available_agents": {
             "fetchers": [
                 {
@@ -72,6 +111,11 @@ def get_agent_config() -> Dict[str, Any]:
                     "id": "langflow_fetcher",
                     "name": "Langflow Fetcher",
                     "description": "Agente genérico para busca de dados usando Langflow"
+                },
+                {
+                    "id": "amazon_local_fetcher",
+                    "name": "Extrator Local Amazon - Busca",
+                    "description": "Extrai produtos da Amazon localmente, com fallback para o fluxo LLM"
                 }
             ],
             "processors": [
@@ -84,9 +128,19 @@ def get_agent_config() -> Dict[str, Any]:
                     "id": "langflow_processor",
                     "name": "Langflow Processor",
                     "description": "Agente genérico para processamento de dados do Langflow"
+                },
+                {
+                    "id": "amazon_local_processor",
+                    "name": "Extrator Local Amazon - Processamento",
+                    "description": "Entrega os produtos extraídos localmente, já no formato final"
                 }
             ],
             "formatters": [
+                {
+                    "id": "amazon_local_formatter",
+                    "name": "Formatador Local Amazon",
+                    "description": "Normaliza os produtos localmente; só os registros rejeitados vão ao fluxo de formatação"
+                },
                 {
                     "id": "coletor_dados_amazon_formatter",
                     "name": "ColetorDadosAmazon - Formatação",
@@ -96,11 +150,60 @@ def get_agent_config() -> Dict[str, Any]:
                     "id": "langflow_formatter",
                     "name": "Langflow Formatter",
                     "description": "Agente genérico para formatação de dados do Langflow"
+                },
+                {
+                    "id": NO_FORMATTER,
+                    "name": "Sem formatação",
+                    "description": "Usa a saída do processador diretamente (ex.: extração local)"
                 }
             ]
         }
     }
 
+def get_pipeline_config() -> List[Dict[str, Any]]:
+    """
+    Retorna a definição dos pipelines de agentes.
+    Cada etapa declara o agente que a executa e as etapas das quais recebe
+    artefatos; etapas sem dependência entre si são executadas em paralelo.
+
+    Returns:
+        List[Dict[str, Any]]: Pipelines com "id", "name", "description", "stages" e "output"
+    """
+    return [
+        {
+            "id": "amazon_llm",
+            "name": "Amazon - Fluxo LLM",
+            "description": "Busca e processa com o Langflow; formata localmente, com fallback para o fluxo de formatação",
+            "stages": [
+                {"id": "fetch", "kind": "fetch", "agent": "coletor_dados_amazon_fetcher"},
+                {"id": "process", "kind": "process", "agent": "coletor_dados_amazon_processor", "inputs": ["fetch"]},
+                {"id": "format", "kind": "process", "agent": "amazon_local_formatter", "inputs": ["process"]}
+            ],
+            "output": "format"
+        },
+        {
+            "id": "amazon_llm_formatter",
+            "name": "Amazon - Fluxo LLM com formatação LLM",
+            "description": "Busca, processa e formata todos os produtos com os fluxos do Langflow",
+            "stages": [
+                {"id": "fetch", "kind": "fetch", "agent": "coletor_dados_amazon_fetcher"},
+                {"id": "process", "kind": "process", "agent": "coletor_dados_amazon_processor", "inputs": ["fetch"]},
+                {"id": "format", "kind": "process", "agent": "coletor_dados_amazon_formatter", "inputs": ["process"]}
+            ],
+            "output": "format"
+        },
+        {
+            "id": "amazon_local",
+            "name": "Amazon - Extração local",
+            "description": "Extrai os produtos localmente, sem LLM quando a confiança da extração é suficiente",
+            "stages": [
+                {"id": "fetch", "kind": "fetch", "agent": "amazon_local_fetcher"},
+                {"id": "process", "kind": "process", "agent": "amazon_local_processor", "inputs": ["fetch"]}
+            ],
+            "output": "process"
+        }
+    ]
+
 def get_available_agents() -> List[Dict[str, Any]]:
     """
     Retorna a lista de agentes disponíveis.
@@ -15,10 +15,16 @@ class Config:
     TESTING = False
     SECRET_KEY = os.getenv('SECRET_KEY', 'chave-secreta-padrao')
 
-    # Configurações do Langflow
+    # Configurações do Langflow (uma URL ou réplicas equivalentes do fluxo separadas por vírgula)
     LANGFLOW_FETCHER_API_URL = os.getenv('LANGFLOW_FETCHER_API_URL')
     LANGFLOW_FORMATTER_API_URL = os.getenv('LANGFLOW_FORMATTER_API_URL')
 
+    # Formatação em partes: tamanho máximo de cada parte em tokens estimados (0 = sem divisão),
+    # partes formatadas simultaneamente e novas tentativas de uma parte sem produtos
+    FORMATTER_CHUNK_MAX_TOKENS = int(os.getenv('FORMATTER_CHUNK_MAX_TOKENS', '4000'))
+    FORMATTER_CHUNK_CONCURRENCY = int(os.getenv('FORMATTER_CHUNK_CONCURRENCY', '4'))
+    FORMATTER_CHUNK_RETRIES = int(os.getenv('FORMATTER_CHUNK_RETRIES', '1'))
+
     # Configurações de API
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
@@ -27,6 +33,124 @@ class Config:
     MAX_RETRIES = int(os.getenv('MAX_RETRIES'))
     RETRY_DELAY = int(os.getenv('RETRY_DELAY'))
 
+    # Configurações da política de retentativas (backoff exponencial com jitter)
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', RETRY_DELAY))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '60'))
+    RETRY_DEADLINE = float(os.getenv('RETRY_DEADLINE', '1200'))
+    RETRY_BUDGET_RATIO = float(os.getenv('RETRY_BUDGET_RATIO', '1.0'))
+    RETRY_BUDGET_MIN_PER_SECOND = float(os.getenv('RETRY_BUDGET_MIN_PER_SECOND', '0.1'))
+    RETRY_BUDGET_WINDOW = float(os.getenv('RETRY_BUDGET_WINDOW', '60'))
+
+    # Prazo de ponta a ponta das requisições em milissegundos (0 desativa); o parâmetro deadline_ms o substitui
+    REQUEST_DEADLINE_MS = int(os.getenv('REQUEST_DEADLINE_MS', '600000'))
+
+    # Degradação: sem formatação dentro do orçamento (segundos; 0 = apenas o prazo da requisição),
+    # entrega a saída do processador normalizada localmente
+    DEGRADATION_ENABLED = os.getenv('DEGRADATION_ENABLED', 'true').lower() == 'true'
+    FORMATTER_BUDGET = float(os.getenv('FORMATTER_BUDGET', '120'))
+    DEGRADATION_BACKGROUND_FORMAT = os.getenv('DEGRADATION_BACKGROUND_FORMAT', 'true').lower() == 'true'
+    DEGRADATION_FORMATTER_WORKERS = int(os.getenv('DEGRADATION_FORMATTER_WORKERS', '8'))
+    DEGRADATION_BACKGROUND_WORKERS = int(os.getenv('DEGRADATION_BACKGROUND_WORKERS', '2'))
+    DEGRADATION_BACKGROUND_QUEUE = int(os.getenv('DEGRADATION_BACKGROUND_QUEUE', '8'))
+
+    # Configurações do pool de conexões HTTP
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+    HTTP_KEEP_ALIVE = os.getenv('HTTP_KEEP_ALIVE', 'true').lower() == 'true'
+    HTTP_POOL_ENDPOINTS = os.getenv('HTTP_POOL_ENDPOINTS', '')
+
+    # Configurações do limitador de taxa (tokens por segundo[:rajada])
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_DEFAULT = os.getenv('RATE_LIMIT_DEFAULT', '')
+    RATE_LIMIT_RULES = os.getenv('RATE_LIMIT_RULES', '')
+
+    # Configurações dos disjuntores por endpoint
+    CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+    CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv('CIRCUIT_BREAKER_FAILURE_RATE', '0.5'))
+    CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv('CIRCUIT_BREAKER_MIN_CALLS', '5'))
+    CIRCUIT_BREAKER_WINDOW = float(os.getenv('CIRCUIT_BREAKER_WINDOW', '60'))
+    CIRCUIT_BREAKER_OPEN_TIMEOUT = float(os.getenv('CIRCUIT_BREAKER_OPEN_TIMEOUT', '30'))
+    CIRCUIT_BREAKER_MAX_OPEN_TIMEOUT = float(os.getenv('CIRCUIT_BREAKER_MAX_OPEN_TIMEOUT', '300'))
+
+    # Balanceamento entre réplicas dos fluxos ("least_outstanding" ou "ewma"); endpoints com
+    # EJECT_FAILURES falhas consecutivas saem de rotação por EJECT_TIMEOUT segundos (dobrando até o máximo)
+    LOAD_BALANCER_STRATEGY = os.getenv('LOAD_BALANCER_STRATEGY', 'ewma')
+    LOAD_BALANCER_EWMA_DECAY = float(os.getenv('LOAD_BALANCER_EWMA_DECAY', '0.3'))
+    LOAD_BALANCER_EJECT_FAILURES = int(os.getenv('LOAD_BALANCER_EJECT_FAILURES', '3'))
+    LOAD_BALANCER_EJECT_TIMEOUT = float(os.getenv('LOAD_BALANCER_EJECT_TIMEOUT', '30'))
+    LOAD_BALANCER_MAX_EJECT_TIMEOUT = float(os.getenv('LOAD_BALANCER_MAX_EJECT_TIMEOUT', '300'))
+
+    # Duplicação das chamadas lentas ao Langflow (hedging): após o percentil HEDGE_PERCENTILE
+    # das latências recentes, envia uma cópia ao mesmo endpoint ou ao alternativo
+    # (url_do_fluxo=url_alternativa;...), com no máximo HEDGE_MAX_RATIO cópias por chamada na janela
+    # e HEDGE_MAX_WORKERS chamadas com duplicação em execução simultânea
+    HEDGING_ENABLED = os.getenv('HEDGING_ENABLED', 'false').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '0.95'))
+    HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '20'))
+    HEDGE_MIN_DELAY = float(os.getenv('HEDGE_MIN_DELAY', '1'))
+    HEDGE_MAX_SAMPLES = int(os.getenv('HEDGE_MAX_SAMPLES', '200'))
+    HEDGE_MAX_RATIO = float(os.getenv('HEDGE_MAX_RATIO', '0.1'))
+    HEDGE_WINDOW = float(os.getenv('HEDGE_WINDOW', '60'))
+    HEDGE_ALTERNATES = os.getenv('HEDGE_ALTERNATES', '')
+    HEDGE_MAX_WORKERS = int(os.getenv('HEDGE_MAX_WORKERS', '32'))
+
+    # Configurações do cache da etapa de busca
+    FETCH_CACHE_ENABLED = os.getenv('FETCH_CACHE_ENABLED', 'true').lower() == 'true'
+    FETCH_CACHE_BACKEND = os.getenv('FETCH_CACHE_BACKEND', 'memory')
+    FETCH_CACHE_TTL = float(os.getenv('FETCH_CACHE_TTL', '900'))
+    FETCH_CACHE_CATEGORY_TTLS = os.getenv('FETCH_CACHE_CATEGORY_TTLS', '')
+    FETCH_CACHE_MAX_ENTRIES = int(os.getenv('FETCH_CACHE_MAX_ENTRIES', '256'))
+    FETCH_CACHE_DIR = os.getenv('FETCH_CACHE_DIR', '.cache/fetch')
+    LANGFLOW_FETCHER_FLOW_VERSION = os.getenv('LANGFLOW_FETCHER_FLOW_VERSION', '')
+
+    # Configurações da memoização das saídas do formatador (chave: hash da entrada, fluxo e versão)
+    MEMO_CACHE_ENABLED = os.getenv('MEMO_CACHE_ENABLED', 'true').lower() == 'true'
+    MEMO_CACHE_BACKEND = os.getenv('MEMO_CACHE_BACKEND', 'tiered')
+    MEMO_CACHE_TTL = float(os.getenv('MEMO_CACHE_TTL', '86400'))
+    MEMO_CACHE_MAX_ENTRIES = int(os.getenv('MEMO_CACHE_MAX_ENTRIES', '512'))
+    MEMO_CACHE_MAX_BYTES = int(os.getenv('MEMO_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    MEMO_CACHE_DIR = os.getenv('MEMO_CACHE_DIR', '.cache/memo')
+    LANGFLOW_FORMATTER_FLOW_VERSION = os.getenv('LANGFLOW_FORMATTER_FLOW_VERSION', '')
+
+    # Controle de admissão: pipelines simultâneos, fila de espera limitada (interativos antes de
+    # lotes e pré-carregamentos), espera máxima em segundos e vagas reservadas aos interativos
+    ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_MAX_CONCURRENT = int(os.getenv('ADMISSION_MAX_CONCURRENT', '8'))
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', '32'))
+    ADMISSION_MAX_WAIT = float(os.getenv('ADMISSION_MAX_WAIT', '30'))
+    ADMISSION_INTERACTIVE_RESERVED = int(os.getenv('ADMISSION_INTERACTIVE_RESERVED', '2'))
+
+    # Configurações de busca em lote
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '8'))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', '32'))
+    BATCH_PER_HOST_CONCURRENCY = int(os.getenv('BATCH_PER_HOST_CONCURRENCY', '8'))
+
+    # Produtos por evento na rota /fetch-data/stream
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '1'))
+
+    # Leitura incremental das respostas do Langflow (produtos entregues sem decodificar a resposta inteira)
+    STREAM_EXTRACTION_ENABLED = os.getenv('STREAM_EXTRACTION_ENABLED', 'true').lower() == 'true'
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', '65536'))
+
+    # Etapas simultâneas dos pipelines declarativos (ramos independentes do grafo)
+    PIPELINE_MAX_PARALLEL_STAGES = int(os.getenv('PIPELINE_MAX_PARALLEL_STAGES', '4'))
+
+    # Pool de instâncias de agentes reaproveitadas entre requisições
+    AGENT_POOL_MAX_IDLE = int(os.getenv('AGENT_POOL_MAX_IDLE', '8'))
+    AGENT_POOL_WARM = os.getenv('AGENT_POOL_WARM', 'true').lower() == 'true'
+
+    # Execução de pipelines em segundo plano (/jobs)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+    JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', '3600'))
+    JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', '.cache/jobs.sqlite3')
+    JOB_LEASE_TTL = float(os.getenv('JOB_LEASE_TTL', '60'))
+    JOB_EVENTS_HEARTBEAT = float(os.getenv('JOB_EVENTS_HEARTBEAT', '15'))
+
+    # Configurações da extração local de produtos
+    LOCAL_EXTRACTOR_READER_URL = os.getenv('LOCAL_EXTRACTOR_READER_URL', 'https://r.jina.ai/')
+    LOCAL_EXTRACTOR_MIN_CONFIDENCE = float(os.getenv('LOCAL_EXTRACTOR_MIN_CONFIDENCE', '0.6'))
+    LOCAL_EXTRACTOR_EXPECTED_PRODUCTS = int(os.getenv('LOCAL_EXTRACTOR_EXPECTED_PRODUCTS', '10'))
+
     # URL padrão para scraping
     DEFAULT_SCRAPE_URL = os.getenv('DEFAULT_SCRAPE_URL')
 
@@ -38,6 +162,8 @@ class TestingConfig(Config):
     """Configuração para ambiente de testes."""
     TESTING = True
     DEBUG = True
+    # Jobs dos testes não persistem entre execuções
+    JOB_STORE_PATH = ':memory:'
 
 class ProductionConfig(Config):
     """Configuração para ambiente de produção."""
@@ -2,7 +2,9 @@
 Módulo que define os modelos de dados para produtos.
 """
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any
+
+from src.utils.normalization import parse_count, parse_price, parse_rating, resolve_fields
 
 @dataclass
 class Product:
@@ -30,6 +32,8 @@ class Product:
     def from_dict(cls, data: Dict[str, Any]) -> 'Product':
         """
         Cria uma instância de Product a partir de um dicionário.
+        Aceita chaves alternativas (ex.: "nome", "preço", "avaliação") e valores
+        no formato brasileiro (ex.: "R$ 1.299,90", "4,5 de 5 estrelas").
         
         Args:
             data (Dict[str, Any]): Dicionário com os dados do produto
@@ -37,16 +41,33 @@ class Product:
         Returns:
             Product: Instância de Product
         """
+        fields = resolve_fields(data)
         return cls(
-            name=data.get('titulo', ''),
-            price=float(data.get('preco', 0.0)),
-            rating=float(data.get('rating', 0.0)) if data.get('rating') else None,
-            image_url=data.get('imagem', None),
-            url=data.get('url_produto', None),
-            description=data.get('descricao', None),
-            classificacao=data.get('classificacao', 0)
+            name=fields.get('titulo') or '',
+            price=parse_price(fields.get('preco')) or 0.0,
+            rating=parse_rating(fields.get('rating')) or None,
+            image_url=fields.get('imagem'),
+            url=fields.get('url_produto'),
+            description=fields.get('descricao'),
+            classificacao=parse_count(fields.get('classificacao'))
         )
 
+    @classmethod
+    def iter_from_dicts(cls, items: Iterable[Any]) -> Iterator['Product']:
+        """
+        Cria instâncias de Product à medida que os dicionários são consumidos.
+        Itens que não são dicionários são ignorados.
+
+        Args:
+            items (Iterable[Any]): Dicionários com os dados dos produtos, possivelmente um gerador
+
+        Returns:
+            Iterator[Product]: Instâncias de Product, na ordem dos dicionários
+        """
+        for item in items:
+            if isinstance(item, dict):
+                yield cls.from_dict(item)
+
 @dataclass
 class ProductStatistics:
     """
@@ -0,0 +1,367 @@
+"""
+Controle de admissão dos pipelines.
+Limita quantos pipelines executam ao mesmo tempo; os excedentes aguardam em
+uma fila limitada, ordenada por prioridade (requisições interativas antes de
+lotes e pré-carregamentos). Com a fila cheia ou a espera esgotada, o pedido
+é recusado imediatamente, com uma estimativa de quando tentar de novo.
+"""
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.services.deadline import remaining_time
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Prioridades, da mais para a menos urgente
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_PREFETCH = "prefetch"
+
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_PREFETCH)
+
+# Motivos de recusa
+QUEUE_FULL = "queue_full"
+EVICTED = "evicted"
+WAIT_TIMEOUT = "wait_timeout"
+
+class AdmissionRejected(Exception):
+    """
+    Exceção lançada quando um pipeline não é admitido.
+
+    Attributes:
+        reason (str): "queue_full", "evicted" ou "wait_timeout"
+        retry_after (int): Segundos sugeridos antes de uma nova tentativa
+        status_code (int): 429 se a fila estava cheia (ou o pedido foi preterido), 503 se a espera se esgotou
+    """
+
+    def __init__(self, message: str, reason: str, retry_after: int):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = 503 if reason == WAIT_TIMEOUT else 429
+
+def parse_priority(value: Optional[str], default: str = PRIORITY_INTERACTIVE) -> str:
+    """
+    Interpreta a prioridade informada pelo cliente (ex.: parâmetro "priority").
+
+    Args:
+        value (Optional[str]): Prioridade informada
+        default (str): Prioridade quando nenhuma é informada
+
+    Returns:
+        str: Prioridade válida
+
+    Raises:
+        ValueError: Se a prioridade for desconhecida
+    """
+    if value is None or value == "":
+        return default
+    priority = str(value).strip().lower()
+    if priority not in PRIORITIES:
+        raise ValueError(f"Prioridade inválida: {value}")
+    return priority
+
+class _Waiter:
+    """
+    Pedido aguardando na fila de admissão.
+    """
+
+    def __init__(self, priority: str, sequence: int):
+        self.priority = priority
+        self.rank = (PRIORITIES.index(priority), sequence)
+        self.event = threading.Event()
+        self.granted = False
+        self.evicted = False
+
+class AdmissionTicket:
+    """
+    Vaga de execução concedida a um pipeline; deve ser liberada ao final.
+    """
+
+    def __init__(self, controller: Optional['AdmissionController'], priority: str, waited: float):
+        """
+        Inicializa a vaga.
+
+        Args:
+            controller (Optional[AdmissionController]): Controlador que concedeu a vaga (None se desativado)
+            priority (str): Prioridade do pedido
+            waited (float): Tempo de espera na fila em segundos
+        """
+        self.priority = priority
+        self.waited = waited
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        """
+        Libera a vaga para o próximo pedido da fila. Chamadas repetidas são ignoradas.
+        """
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        if self._controller is not None:
+            self._controller._release(time.monotonic() - self._started)
+
+class AdmissionController:
+    """
+    Limite de pipelines simultâneos com fila de espera limitada e priorizada.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queue: int = 32, max_wait: float = 30.0,
+                 interactive_reserved: int = 0, enabled: bool = True):
+        """
+        Inicializa o controlador.
+
+        Args:
+            max_concurrent (int): Pipelines executados simultaneamente
+            max_queue (int): Pedidos que podem aguardar uma vaga (0 = recusa quando não há vaga)
+            max_wait (float): Espera máxima padrão por uma vaga em segundos
+            interactive_reserved (int): Vagas que apenas pedidos interativos podem ocupar
+            enabled (bool): Se False, todos os pedidos são admitidos imediatamente
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self.interactive_reserved = min(max(0, interactive_reserved), self.max_concurrent - 1)
+        self.enabled = enabled
+        self._active = 0
+        self._queue: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._service_time: Optional[float] = None
+        self._lock = threading.Lock()
+        self._admitted = {priority: 0 for priority in PRIORITIES}
+        self._rejected = {QUEUE_FULL: 0, EVICTED: 0, WAIT_TIMEOUT: 0}
+        self._waits = {priority: {"count": 0, "total": 0.0, "max": 0.0} for priority in PRIORITIES}
+
+    def acquire(self, priority: str = PRIORITY_INTERACTIVE, max_wait: Optional[float] = None) -> AdmissionTicket:
+        """
+        Obtém uma vaga de execução, aguardando na fila se necessário.
+        A espera também é limitada pelo prazo da requisição em andamento.
+
+        Args:
+            priority (str): "interactive", "batch" ou "prefetch"
+            max_wait (Optional[float]): Espera máxima em segundos (math.inf = sem limite
+                próprio). Se None, usa a espera padrão.
+
+        Returns:
+            AdmissionTicket: Vaga concedida
+
+        Raises:
+            AdmissionRejected: Se a fila estiver cheia, o pedido for preterido por outro
+                mais urgente ou a espera se esgotar
+        """
+        if not self.enabled:
+            return AdmissionTicket(None, priority, 0.0)
+
+        started = time.monotonic()
+        with self._lock:
+            waiter = _Waiter(priority, next(self._sequence))
+            if self._can_start(priority) and not any(queued.rank < waiter.rank for queued in self._queue):
+                return self._grant(priority, 0.0)
+
+            if len(self._queue) >= self.max_queue:
+                victim = max(self._queue, key=lambda queued: queued.rank, default=None)
+                if victim is None or victim.rank[0] <= waiter.rank[0]:
+                    raise self._reject(QUEUE_FULL, priority)
+                # Um pedido mais urgente toma o lugar do menos urgente da fila
+                self._queue.remove(victim)
+                victim.evicted = True
+                victim.event.set()
+            self._queue.append(waiter)
+
+        limit = self.max_wait if max_wait is None else max_wait
+        timeout = remaining_time(None if math.isinf(limit) else limit)
+        waiter.event.wait(timeout)
+
+        with self._lock:
+            if waiter.granted:
+                return self._record_wait(AdmissionTicket(self, priority, time.monotonic() - started))
+            if waiter.evicted:
+                raise self._reject(EVICTED, priority)
+            self._queue.remove(waiter)
+            raise self._reject(WAIT_TIMEOUT, priority)
+
+    @contextmanager
+    def admit(self, priority: str = PRIORITY_INTERACTIVE, max_wait: Optional[float] = None) -> Iterator[AdmissionTicket]:
+        """
+        Executa o bloco com uma vaga de execução (ver ``acquire``).
+
+        Args:
+            priority (str): "interactive", "batch" ou "prefetch"
+            max_wait (Optional[float]): Espera máxima em segundos. Se None, usa a espera padrão.
+
+        Returns:
+            Iterator[AdmissionTicket]: Vaga concedida, liberada ao fim do bloco
+
+        Raises:
+            AdmissionRejected: Se o pedido não for admitido
+        """
+        ticket = self.acquire(priority, max_wait)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def check(self, priority: str = PRIORITY_INTERACTIVE) -> Optional[AdmissionRejected]:
+        """
+        Verifica, sem entrar na fila, se um pedido seria recusado de imediato por fila cheia.
+
+        Args:
+            priority (str): Prioridade do pedido
+
+        Returns:
+            Optional[AdmissionRejected]: Recusa que o pedido receberia, ou None
+        """
+        if not self.enabled:
+            return None
+        rank = PRIORITIES.index(priority)
+        with self._lock:
+            if self._can_start(priority) or len(self._queue) < self.max_queue:
+                return None
+            if any(queued.rank[0] > rank for queued in self._queue):
+                return None
+            return AdmissionRejected(self._message(QUEUE_FULL), QUEUE_FULL, self._retry_after())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas de admissão.
+
+        Returns:
+            Dict[str, Any]: Vagas em uso, profundidade da fila, admissões, recusas e tempos de espera
+        """
+        with self._lock:
+            queued = {priority: 0 for priority in PRIORITIES}
+            for waiter in self._queue:
+                queued[waiter.priority] += 1
+            return {
+                "enabled": self.enabled,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queue_depth": len(self._queue),
+                "queued": queued,
+                "admitted": dict(self._admitted),
+                "rejected": dict(self._rejected),
+                "wait": {
+                    priority: {
+                        "avg": waits["total"] / waits["count"] if waits["count"] else 0.0,
+                        "max": waits["max"]
+                    }
+                    for priority, waits in self._waits.items()
+                },
+                "service_time": self._service_time
+            }
+
+    def _can_start(self, priority: str) -> bool:
+        """
+        Indica se há vaga livre para a prioridade (sem contar a fila).
+
+        Args:
+            priority (str): Prioridade do pedido
+
+        Returns:
+            bool: True se o pedido pode começar agora
+        """
+        reserved = 0 if priority == PRIORITY_INTERACTIVE else self.interactive_reserved
+        return self._active < self.max_concurrent - reserved
+
+    def _grant(self, priority: str, waited: float) -> AdmissionTicket:
+        """
+        Ocupa uma vaga (com o lock já adquirido).
+
+        Args:
+            priority (str): Prioridade do pedido
+            waited (float): Tempo de espera na fila em segundos
+
+        Returns:
+            AdmissionTicket: Vaga concedida
+        """
+        self._active += 1
+        self._admitted[priority] += 1
+        return self._record_wait(AdmissionTicket(self, priority, waited))
+
+    def _record_wait(self, ticket: AdmissionTicket) -> AdmissionTicket:
+        """
+        Registra o tempo de espera de uma vaga concedida (com o lock já adquirido).
+
+        Args:
+            ticket (AdmissionTicket): Vaga concedida
+
+        Returns:
+            AdmissionTicket: A mesma vaga
+        """
+        waits = self._waits[ticket.priority]
+        waits["count"] += 1
+        waits["total"] += ticket.waited
+        waits["max"] = max(waits["max"], ticket.waited)
+        return ticket
+
+    def _release(self, held: float) -> None:
+        """
+        Libera uma vaga e a repassa aos pedidos da fila, do mais urgente ao menos urgente.
+
+        Args:
+            held (float): Tempo em que a vaga ficou ocupada, em segundos
+        """
+        with self._lock:
+            self._active = max(0, self._active - 1)
+            self._service_time = held if self._service_time is None else 0.8 * self._service_time + 0.2 * held
+            while self._queue:
+                waiter = min(self._queue, key=lambda queued: queued.rank)
+                if not self._can_start(waiter.priority):
+                    break
+                self._queue.remove(waiter)
+                self._active += 1
+                self._admitted[waiter.priority] += 1
+                waiter.granted = True
+                waiter.event.set()
+
+    def _reject(self, reason: str, priority: str) -> AdmissionRejected:
+        """
+        Registra uma recusa (com o lock já adquirido).
+
+        Args:
+            reason (str): Motivo da recusa
+            priority (str): Prioridade do pedido recusado
+
+        Returns:
+            AdmissionRejected: Exceção a lançar
+        """
+        self._rejected[reason] += 1
+        logger.warning(f"Pipeline recusado pelo controle de admissão ({reason}, prioridade {priority}, "
+                       f"{self._active} em execução, {len(self._queue)} na fila)")
+        return AdmissionRejected(self._message(reason), reason, self._retry_after())
+
+    def _retry_after(self) -> int:
+        """
+        Estima em quanto tempo uma vaga deve ficar livre para um novo pedido
+        (com o lock já adquirido), a partir da duração média dos pipelines.
+
+        Returns:
+            int: Segundos sugeridos (no mínimo 1)
+        """
+        service_time = self._service_time or 1.0
+        return max(1, math.ceil(service_time * (len(self._queue) + 1) / self.max_concurrent))
+
+    @staticmethod
+    def _message(reason: str) -> str:
+        """
+        Monta a mensagem de recusa.
+
+        Args:
+            reason (str): Motivo da recusa
+
+        Returns:
+            str: Mensagem para o cliente
+        """
+        if reason == WAIT_TIMEOUT:
+            return "Servidor sobrecarregado: tempo de espera por uma vaga esgotado"
+        return "Servidor sobrecarregado: fila de execução cheia"
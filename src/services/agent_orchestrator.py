@@ -2,35 +2,107 @@
 Serviço de orquestração de agentes.
 Coordena a execução de múltiplos agentes para realizar tarefas complexas.
 """
-from typing import Any, Dict, List, Optional, Union
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
-from src.config.agents import get_agent_config
+from src.config.agents import NO_FORMATTER, get_agent_config, get_pipeline_config
 from src.config.settings import active_config
 from src.models.product import Product
-from src.services.agents.interfaces import DataFetcherAgentInterface, DataProcessorAgentInterface
+from src.services.agents.interfaces import (
+    DataFetcherAgentInterface,
+    DataProcessorAgentInterface,
+    IncompleteResultError,
+    IncrementalDataProcessorAgentInterface,
+    StreamingDataProcessorAgentInterface
+)
+from src.services.agents.langflow.extraction import UNWRAP_EXTRACTOR
+from src.services.agents.local import LocalFormatterAgent
+from src.services.agents.pool import AgentPool
 from src.services.agents.registry import AgentFactory
+from src.services.cache import memoization, normalize_source_url
+from src.services.deadline import Deadline, deadline_scope
+from src.services.pipeline import PipelineDefinition, PipelineExecutor, PipelineResult
+from src.services.pipeline.definition import STAGE_FETCH
+from src.services.single_flight import SingleFlight
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Mensagem de erro das execuções abandonadas por prazo esgotado
+DEADLINE_EXCEEDED_ERROR = "Prazo da requisição esgotado"
+
+# Qualidade dos produtos entregues
+QUALITY_FULL = "full"
+QUALITY_DEGRADED = "degraded"
+
+@dataclass
+class ProductsResult:
+    """
+    Produtos de uma execução e a qualidade com que foram obtidos.
+
+    Attributes:
+        products (List[Product]): Produtos
+        quality (str): "full" se todas as etapas concluíram ou "degraded" se os produtos vieram
+            da saída de uma etapa anterior, normalizada localmente
+        stage_reached (Optional[str]): Etapa cuja saída originou os produtos
+        reason (Optional[str]): Motivo da degradação
+    """
+    products: List[Product]
+    quality: str = QUALITY_FULL
+    stage_reached: Optional[str] = None
+    reason: Optional[str] = None
+
 class AgentOrchestrator:
     """
     Orquestrador de agentes.
     Coordena a execução de múltiplos agentes para realizar tarefas complexas.
     """
+    # Compartilhado entre instâncias para coalescer pipelines idênticos de requisições concorrentes
+    _pipeline_flights = SingleFlight("pipeline")
+
+    # Formatações com orçamento de tempo; cada uma para quando o seu orçamento se esgota
+    _formatting = ThreadPoolExecutor(max_workers=max(1, active_config.DEGRADATION_FORMATTER_WORKERS),
+                                     thread_name_prefix="formatter-budget")
+    # As que excedem o orçamento são refeitas em segundo plano em um pool próprio e limitado,
+    # para não ocupar as vagas das formatações das requisições; com a fila cheia, são descartadas
+    _background_formatting = ThreadPoolExecutor(max_workers=max(1, active_config.DEGRADATION_BACKGROUND_WORKERS),
+                                                thread_name_prefix="formatter-background")
+    _background_slots = threading.BoundedSemaphore(max(1, active_config.DEGRADATION_BACKGROUND_WORKERS)
+                                                   + max(0, active_config.DEGRADATION_BACKGROUND_QUEUE))
+    _degradation_lock = threading.Lock()
+    _degradation_counters = {"full": 0, "degraded": 0, "budget_exceeded": 0,
+                             "background_refreshed": 0, "background_failed": 0, "background_dropped": 0}
 
     def __init__(self):
         """
         Inicializa o orquestrador de agentes.
+        A aplicação cria um único orquestrador, compartilhado entre as requisições:
+        os agentes emprestados do seu pool são reaproveitados de uma requisição para outra.
         """
         self.agent_config = get_agent_config()
+        self.pipelines = {definition.id: definition
+                          for definition in map(PipelineDefinition.from_dict, get_pipeline_config())}
         self.factory = AgentFactory()
+        self.pool = AgentPool(self.factory)
+        # Normaliza localmente a saída do processador quando o formatador não entrega a tempo
+        self.local_formatter = LocalFormatterAgent(
+            name="Formatador de Degradação",
+            description="Normalização local usada quando o formatador falha ou excede o orçamento"
+        )
         logger.info("Orquestrador de agentes inicializado")
 
     def fetch_and_process_data(self, source: str,
                                fetcher_type: Optional[str] = None,
                                processor_type: Optional[str] = None,
-                               formatter_type: Optional[str] = None) -> Union[List[Dict[str, Any]], None]:
+                               formatter_type: Optional[str] = None,
+                               use_cache: bool = True,
+                               deadline: Optional[Deadline] = None) -> Union[List[Dict[str, Any]], None]:
         """
         Busca e processa dados usando os agentes especificados.
 
@@ -39,118 +111,406 @@ class AgentOrchestrator:
             fetcher_type (Optional[str]): Tipo do agente de busca. Se None, usa o padrão.
             processor_type (Optional[str]): Tipo do agente de processamento. Se None, usa o padrão.
             formatter_type (Optional[str]): Tipo do agente de formatação. Se None, usa o padrão.
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            deadline (Optional[Deadline]): Prazo da requisição; as etapas seguintes são abandonadas quando ele se esgota
 
         Returns:
             Union[List[Dict[str, Any]], None]: Dados processados ou None em caso de erro
         """
         # Determina os tipos de agentes a serem usados
-        fetcher_type = fetcher_type or self.agent_config["default_fetcher"]
-        processor_type = processor_type or self.agent_config["default_processor"]
-        formatter_type = formatter_type or self.agent_config.get("default_formatter")
+        fetcher_type, processor_type, formatter_type = self._resolve_agent_types(
+            fetcher_type, processor_type, formatter_type
+        )
 
-        # Cria os agentes
-        fetcher = self.factory.create_agent(fetcher_type)
-        processor = self.factory.create_agent(processor_type)
-        formatter = self.factory.create_agent(formatter_type) if formatter_type else None
+        # Executa a busca e o processamento
+        processed_data = self._fetch_and_process(source, fetcher_type, processor_type, formatter_type,
+                                                 use_cache, deadline)
+        if processed_data is None or not formatter_type:
+            return processed_data
 
-        if not fetcher or not isinstance(fetcher, DataFetcherAgentInterface):
-            logger.error(f"Agente de busca '{fetcher_type}' não encontrado ou inválido")
+        # Formata os dados; sem formatação a tempo, usa a saída do processador normalizada localmente
+        formatted_data, reason = self._format_or_degrade(formatter_type, processed_data, use_cache, deadline)
+        if not formatted_data:
+            logger.error("Falha ao formatar dados")
             return None
+        if reason:
+            logger.warning(f"Dados entregues sem formatação completa: {reason}")
 
-        if not processor or not isinstance(processor, DataProcessorAgentInterface):
-            logger.error(f"Agente de processamento '{processor_type}' não encontrado ou inválido")
-            return None
+        # Log do tipo de dados formatados
+        logger.info(f"Tipo de dados formatados: {type(formatted_data)}")
+        logger.info(f"Dados formatados retornados como lista com {len(formatted_data)} itens")
+        return formatted_data
 
-        if formatter_type and (not formatter or not isinstance(formatter, DataProcessorAgentInterface)):
-            logger.error(f"Agente de formatação '{formatter_type}' não encontrado ou inválido")
-            return None
+    def iter_products(self, source: str,
+                      fetcher_type: Optional[str] = None,
+                      processor_type: Optional[str] = None,
+                      formatter_type: Optional[str] = None,
+                      use_cache: bool = True,
+                      deadline: Optional[Deadline] = None) -> Iterator[Product]:
+        """
+        Executa o pipeline entregando os produtos um a um, à medida que são extraídos.
+        Com STREAM_EXTRACTION_ENABLED, a última etapa que suportar leitura incremental
+        lê a resposta do Langflow em pedaços, e cada produto é convertido assim que
+        lido: a memória de pico fica limitada a um produto em vez da resposta inteira.
 
-        # Executa a busca
-        raw_data = fetcher.fetch_data(source)
-        if not raw_data:
-            logger.error("Falha ao buscar dados")
-            return None
+        Args:
+            source (str): Fonte dos dados
+            fetcher_type (Optional[str]): Tipo do agente de busca. Se None, usa o padrão.
+            processor_type (Optional[str]): Tipo do agente de processamento. Se None, usa o padrão.
+            formatter_type (Optional[str]): Tipo do agente de formatação. Se None, usa o padrão.
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            deadline (Optional[Deadline]): Prazo da requisição; as etapas seguintes são abandonadas quando ele se esgota
 
-        # Processa os dados
-        processed_data = processor.process_data(raw_data)
-        if not processed_data:
-            logger.error("Falha ao processar dados")
-            return None
+        Returns:
+            Iterator[Product]: Produtos, na ordem em que são extraídos
 
-        # Log do tipo de dados processados
-        logger.info(f"Tipo de dados processados: {type(processed_data)}")
+        Raises:
+            IncompleteResultError: Se o formatador não conseguir formatar parte da entrada
+        """
+        fetcher_type, processor_type, formatter_type = self._resolve_agent_types(
+            fetcher_type, processor_type, formatter_type
+        )
+        with self._lease_agents(fetcher_type, processor_type, formatter_type) as agents:
+            if agents is None:
+                return
+            fetcher, processor, formatter = agents
+            incremental = active_config.STREAM_EXTRACTION_ENABLED
+
+            with deadline_scope(deadline):
+                raw_data = fetcher.fetch_data(source, use_cache=use_cache)
+            if not raw_data:
+                logger.error("Falha ao buscar dados")
+                return
+            if self._deadline_expired(deadline, "process"):
+                return
+
+            # As opções da requisição (ex.: memoização e prazo) valem na chamada dos agentes
+            with memoization(use_cache), deadline_scope(deadline):
+                if not formatter and incremental and isinstance(processor, IncrementalDataProcessorAgentInterface):
+                    items = processor.process_data_iter(raw_data)
+                else:
+                    processed_data = processor.process_data(raw_data)
+                    if not processed_data:
+                        logger.error("Falha ao processar dados")
+                        return
+                    processed_data = self._unwrap_processed_data(processed_data)
+
+                    if not formatter:
+                        items = processed_data if isinstance(processed_data, list) else []
+                    elif self._deadline_expired(deadline, "format"):
+                        return
+                    elif incremental and isinstance(formatter, IncrementalDataProcessorAgentInterface):
+                        logger.info("Formatando dados processados (leitura incremental)")
+                        items = formatter.process_data_iter(processed_data)
+                    else:
+                        logger.info("Formatando dados processados")
+                        items = formatter.process_data(processed_data) or []
+
+            yield from Product.iter_from_dicts(items)
+
+    def stream_products(self, source: str,
+                        fetcher_type: Optional[str] = None,
+                        processor_type: Optional[str] = None,
+                        formatter_type: Optional[str] = None,
+                        use_cache: bool = True,
+                        batch_size: Optional[int] = None,
+                        pipeline_id: Optional[str] = None,
+                        deadline: Optional[Deadline] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Executa o pipeline entregando eventos de etapa e lotes de produtos à medida que ficam prontos.
+        Formatadores com suporte a streaming entregam cada produto assim que ele é emitido;
+        os demais entregam todos os produtos ao final da formatação.
+        Com um pipeline declarativo, os produtos são entregues ao final da etapa de saída.
+        A leitura de um formatador em streaming acontece enquanto o consumidor itera, então
+        o consumidor deve iterar dentro de deadline_scope para que o prazo também a limite.
+
+        Args:
+            source (str): Fonte dos dados
+            fetcher_type (Optional[str]): Tipo do agente de busca. Se None, usa o padrão.
+            processor_type (Optional[str]): Tipo do agente de processamento. Se None, usa o padrão.
+            formatter_type (Optional[str]): Tipo do agente de formatação. Se None, usa o padrão.
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            batch_size (Optional[int]): Produtos por lote. Se None, usa STREAM_BATCH_SIZE.
+            pipeline_id (Optional[str]): Pipeline declarativo a executar no lugar dos agentes informados
+            deadline (Optional[Deadline]): Prazo da requisição; as etapas seguintes são abandonadas quando ele se esgota
+
+        Returns:
+            Iterator[Dict[str, Any]]: Eventos {"event": "stage", "stage": ...},
+                {"event": "products", "products": [Product, ...]},
+                {"event": "error", "error": ...} e, ao final, {"event": "done", "total": ...}
+        """
+        batch_size = max(1, batch_size or active_config.STREAM_BATCH_SIZE)
+        if pipeline_id:
+            yield from self._stream_pipeline(pipeline_id, source, use_cache, batch_size, deadline)
+            return
+
+        fetcher_type, processor_type, formatter_type = self._resolve_agent_types(
+            fetcher_type, processor_type, formatter_type
+        )
+
+        # Os agentes ficam emprestados até o consumidor terminar de ler os produtos
+        with self.pool.lease(fetcher_type) as fetcher, \
+                self.pool.lease(processor_type) as processor, \
+                self.pool.lease(formatter_type) as formatter:
+            for agent, agent_type, label in ((fetcher, fetcher_type, "busca"),
+                                             (processor, processor_type, "processamento"),
+                                             (formatter, formatter_type, "formatação")):
+                if agent_type and not agent:
+                    yield {"event": "error", "error": f"Agente de {label} '{agent_type}' não encontrado"}
+                    return
+
+            yield {"event": "stage", "stage": "fetch"}
+            with deadline_scope(deadline):
+                raw_data = fetcher.fetch_data(source, use_cache=use_cache)
+            if not raw_data:
+                yield {"event": "error", "error": "Falha ao buscar dados"}
+                return
+
+            if self._deadline_expired(deadline, "process"):
+                yield {"event": "error", "error": DEADLINE_EXCEEDED_ERROR}
+                return
+            yield {"event": "stage", "stage": "process"}
+            with memoization(use_cache), deadline_scope(deadline):
+                processed_data = processor.process_data(raw_data)
+            if not processed_data:
+                yield {"event": "error", "error": "Falha ao processar dados"}
+                return
+            processed_data = self._unwrap_processed_data(processed_data)
+
+            if not formatter:
+                items = processed_data if isinstance(processed_data, list) else []
+            elif self._deadline_expired(deadline, "format"):
+                yield {"event": "error", "error": DEADLINE_EXCEEDED_ERROR}
+                return
+            elif isinstance(formatter, StreamingDataProcessorAgentInterface):
+                yield {"event": "stage", "stage": "format"}
+                with memoization(use_cache), deadline_scope(deadline):
+                    items = formatter.process_data_stream(processed_data)
+            else:
+                yield {"event": "stage", "stage": "format"}
+                with memoization(use_cache), deadline_scope(deadline):
+                    items = formatter.process_data(processed_data) or []
 
-        # Extrai o conteúdo do campo "data" > "text" se for uma lista de dicionários
-        if isinstance(processed_data, list) and len(processed_data) > 0:
             try:
-                # Verifica se o primeiro item tem a estrutura esperada
-                first_item = processed_data[0]
-                if isinstance(first_item, dict) and "results" in first_item:
-                    results = first_item.get("results", {})
-                    if isinstance(results, dict) and "text" in results:
-                        text_obj = results.get("text", {})
-                        if isinstance(text_obj, dict) and "data" in text_obj:
-                            data_obj = text_obj.get("data", {})
-                            if isinstance(data_obj, dict) and "text" in data_obj:
-                                # Extrai apenas o texto
-                                text_content = data_obj.get("text", "")
-
-                                # Verifica se o texto extraído é uma string
-                                if isinstance(text_content, str):
-                                    logger.info("Extraiu o conteúdo do campo 'data' > 'text' como string")
-                                    logger.debug(f"Primeiros 200 caracteres do texto: {text_content[:200]}")
-                                    processed_data = text_content
-                                else:
-                                    logger.warning(f"O conteúdo do campo 'data' > 'text' não é uma string, é do tipo: {type(text_content).__name__}")
-                                    # Tenta converter para string se não for None
-                                    if text_content is not None:
-                                        try:
-                                            processed_data = str(text_content)
-                                            logger.info("Converteu o conteúdo para string")
-                                        except Exception as e:
-                                            logger.error(f"Erro ao converter para string: {str(e)}")
-            except Exception as e:
-                logger.error(f"Erro ao extrair conteúdo do campo 'data' > 'text': {str(e)}")
-                # Continua com os dados originais
+                yield from self._product_batches(Product.iter_from_dicts(items), batch_size)
+            except IncompleteResultError as e:
+                # Os lotes já enviados não formam a lista completa: a transmissão termina com erro
+                logger.error(f"Formatação incompleta: {e}")
+                yield {"event": "error", "error": f"Formatação incompleta: {e}"}
 
-        if isinstance(processed_data, str):
-            logger.info("Dados processados retornados como string")
-        elif isinstance(processed_data, list):
-            logger.info(f"Dados processados retornados como lista com {len(processed_data)} itens")
+    def _stream_pipeline(self, pipeline_id: str, source: str, use_cache: bool, batch_size: int,
+                         deadline: Optional[Deadline] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Executa um pipeline declarativo entregando um evento de etapa a cada etapa iniciada.
 
-        # Formata os dados, se houver um formatador
-        if formatter:
-            logger.info("Formatando dados processados")
-            formatted_data = formatter.process_data(processed_data)
-            if not formatted_data:
-                logger.error("Falha ao formatar dados")
-                return None
+        Args:
+            pipeline_id (str): Identificador do pipeline
+            source (str): Fonte dos dados
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            batch_size (int): Produtos por lote
+            deadline (Optional[Deadline]): Prazo da requisição
 
-            # Log do tipo de dados formatados
-            logger.info(f"Tipo de dados formatados: {type(formatted_data)}")
-            if isinstance(formatted_data, list):
-                logger.info(f"Dados formatados retornados como lista com {len(formatted_data)} itens")
+        Returns:
+            Iterator[Dict[str, Any]]: Eventos no formato de stream_products
+        """
+        definition = self.pipelines.get(pipeline_id)
+        if definition is None:
+            yield {"event": "error", "error": f"Pipeline '{pipeline_id}' não encontrado"}
+            return
 
-            return formatted_data
+        result = None
+        for event in PipelineExecutor(definition, self.pool).iter_events(source, use_cache, deadline):
+            if event["event"] == "stage_started":
+                yield {"event": "stage", "stage": event["stage"]}
+            elif event["event"] == "result":
+                result = event["result"]
 
-        return processed_data
+        if result.error:
+            yield {"event": "error", "error": result.error}
+            return
+        yield from self._product_batches(result.products(), batch_size)
+
+    def _product_batches(self, products: Iterable[Product], batch_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Agrupa os produtos em eventos de lote, encerrando com o evento "done".
+
+        Args:
+            products (Iterable[Product]): Produtos, possivelmente um gerador
+            batch_size (int): Produtos por lote
+
+        Returns:
+            Iterator[Dict[str, Any]]: Eventos "products" e, ao final, "done" (ou "error" sem produtos)
+        """
+        total = 0
+        batch: List[Product] = []
+        for product in products:
+            batch.append(product)
+            if len(batch) >= batch_size:
+                total += len(batch)
+                yield {"event": "products", "products": batch}
+                batch = []
+        if batch:
+            total += len(batch)
+            yield {"event": "products", "products": batch}
+
+        if not total:
+            yield {"event": "error", "error": "Nenhum produto encontrado"}
+            return
+
+        logger.info(f"Transmissão concluída com {total} produtos")
+        yield {"event": "done", "total": total}
+
+    def fetch_and_process_many(self, sources: Iterable[str],
+                               concurrency: Optional[int] = None,
+                               per_host_limit: Optional[int] = None,
+                               fetcher_type: Optional[str] = None,
+                               processor_type: Optional[str] = None,
+                               formatter_type: Optional[str] = None,
+                               use_cache: bool = True,
+                               pipeline_id: Optional[str] = None,
+                               deadline: Optional[Deadline] = None,
+                               admit: Optional[Callable[[], ContextManager[Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Executa pipelines completos para várias fontes em paralelo.
+        Os resultados são entregues à medida que cada fonte termina.
+
+        Args:
+            sources (Iterable[str]): Fontes dos dados (ex.: URLs de categorias)
+            concurrency (Optional[int]): Número de pipelines simultâneos. Se None, usa BATCH_CONCURRENCY.
+            per_host_limit (Optional[int]): Pipelines simultâneos por host de origem.
+                Se None, usa BATCH_PER_HOST_CONCURRENCY.
+            fetcher_type (Optional[str]): Tipo do agente de busca. Se None, usa o padrão.
+            processor_type (Optional[str]): Tipo do agente de processamento. Se None, usa o padrão.
+            formatter_type (Optional[str]): Tipo do agente de formatação. Se None, usa o padrão.
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            pipeline_id (Optional[str]): Pipeline declarativo a executar no lugar dos agentes informados
+            deadline (Optional[Deadline]): Prazo do lote inteiro; fontes ainda não iniciadas quando
+                ele se esgota são encerradas com erro
+            admit (Optional[Callable[[], ContextManager[Any]]]): Obtém a vaga de execução de cada fonte
+                (ex.: AdmissionController.admit); uma recusa encerra a fonte com erro
+
+        Returns:
+            Iterator[Dict[str, Any]]: Para cada fonte, um dicionário com "source", "products",
+                "error" e "elapsed" (segundos), na ordem de conclusão
+        """
+        sources = list(dict.fromkeys(source for source in sources if source))
+        if not sources:
+            return
+
+        concurrency = max(1, min(concurrency or active_config.BATCH_CONCURRENCY,
+                                 active_config.BATCH_MAX_CONCURRENCY, len(sources)))
+        per_host_limit = max(1, per_host_limit or active_config.BATCH_PER_HOST_CONCURRENCY)
+        host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        slots_lock = threading.Lock()
+
+        def run(source: str) -> Dict[str, Any]:
+            host = urlsplit(normalize_source_url(source)).netloc
+            with slots_lock:
+                slot = host_slots.setdefault(host, threading.BoundedSemaphore(per_host_limit))
+
+            with slot:
+                started = time.monotonic()
+                try:
+                    if self._deadline_expired(deadline, "fetch"):
+                        products, error = [], DEADLINE_EXCEEDED_ERROR
+                    else:
+                        # A espera pela vaga também conta no prazo do lote
+                        with deadline_scope(deadline):
+                            products = self.fetch_and_process_products(
+                                source, fetcher_type, processor_type, formatter_type, use_cache, pipeline_id,
+                                deadline, admit
+                            )
+                        error = None if products else "Erro ao obter ou processar dados"
+                except Exception as e:
+                    logger.error(f"Erro no pipeline da fonte {source}: {str(e)}")
+                    products, error = [], str(e)
+
+            return {
+                "source": source,
+                "products": products,
+                "error": error,
+                "elapsed": time.monotonic() - started
+            }
+
+        logger.info(f"Iniciando lote com {len(sources)} fontes "
+                    f"(concorrência={concurrency}, por host={per_host_limit})")
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+        try:
+            futures = [executor.submit(run, source) for source in sources]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Se o consumidor desistir (ex.: cliente desconectado), descarta as fontes ainda não iniciadas
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def coalescing_stats(cls) -> Dict[str, Any]:
+        """
+        Retorna as métricas de coalescência de pipelines.
+
+        Returns:
+            Dict[str, Any]: Métricas do grupo single-flight de pipelines
+        """
+        return cls._pipeline_flights.stats()
 
     def fetch_and_process_products(self, source: str,
                                   fetcher_type: Optional[str] = None,
                                   processor_type: Optional[str] = None,
-                                  formatter_type: Optional[str] = None) -> List[Product]:
+                                  formatter_type: Optional[str] = None,
+                                  use_cache: bool = True,
+                                  pipeline_id: Optional[str] = None,
+                                  deadline: Optional[Deadline] = None,
+                                  admit: Optional[Callable[[], ContextManager[Any]]] = None) -> List[Product]:
         """
-        Busca e processa produtos usando os agentes especificados.
+        Busca e processa produtos usando os agentes especificados ou um pipeline declarativo.
+        Ver fetch_products para obter também a qualidade dos produtos.
 
         Args:
             source (str): Fonte dos dados
             fetcher_type (Optional[str]): Tipo do agente de busca. Se None, usa o padrão.
             processor_type (Optional[str]): Tipo do agente de processamento. Se None, usa o padrão.
             formatter_type (Optional[str]): Tipo do agente de formatação. Se None, usa o padrão.
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            pipeline_id (Optional[str]): Pipeline declarativo a executar no lugar dos agentes informados
+            deadline (Optional[Deadline]): Prazo da requisição; as etapas seguintes são abandonadas quando ele se esgota
+            admit (Optional[Callable[[], ContextManager[Any]]]): Obtém a vaga de execução (ver fetch_products)
 
         Returns:
             List[Product]: Lista de produtos processados
         """
+        return self.fetch_products(source, fetcher_type, processor_type, formatter_type,
+                                   use_cache, pipeline_id, deadline, admit).products
+
+    def fetch_products(self, source: str,
+                       fetcher_type: Optional[str] = None,
+                       processor_type: Optional[str] = None,
+                       formatter_type: Optional[str] = None,
+                       use_cache: bool = True,
+                       pipeline_id: Optional[str] = None,
+                       deadline: Optional[Deadline] = None,
+                       admit: Optional[Callable[[], ContextManager[Any]]] = None) -> ProductsResult:
+        """
+        Busca e processa produtos usando os agentes especificados ou um pipeline declarativo.
+        Com um prazo, a espera por um pipeline idêntico em andamento também é limitada a ele.
+        Apenas a execução líder obtém a vaga de ``admit``: requisições que se juntam a um
+        pipeline idêntico em andamento só aguardam o seu resultado.
+        Com DEGRADATION_ENABLED, se a formatação falhar ou exceder o orçamento, os produtos
+        vêm da melhor saída disponível (ex.: a do processador), normalizada localmente.
+
+        Args:
+            source (str): Fonte dos dados
+            fetcher_type (Optional[str]): Tipo do agente de busca. Se None, usa o padrão.
+            processor_type (Optional[str]): Tipo do agente de processamento. Se None, usa o padrão.
+            formatter_type (Optional[str]): Tipo do agente de formatação. Se None, usa o padrão.
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            pipeline_id (Optional[str]): Pipeline declarativo a executar no lugar dos agentes informados
+            deadline (Optional[Deadline]): Prazo da requisição; as etapas seguintes são abandonadas quando ele se esgota
+            admit (Optional[Callable[[], ContextManager[Any]]]): Obtém a vaga de execução do pipeline
+                (ex.: AdmissionController.admit); a espera conta no prazo e a recusa é propagada
+
+        Returns:
+            ProductsResult: Produtos, qualidade e etapa de origem
+        """
         # Log para depuração
         logger.info(f"Orquestrador recebeu URL: {source}")
 
@@ -162,17 +522,493 @@ class AgentOrchestrator:
 
         # Busca e processa os dados
         logger.info(f"Iniciando busca e processamento com URL: {source}")
-        products_data = self.fetch_and_process_data(source, fetcher_type, processor_type, formatter_type)
+        key = self.request_key(source, fetcher_type, processor_type, formatter_type, pipeline_id, use_cache)
+        if pipeline_id:
+            run = lambda: self._pipeline_products(pipeline_id, source, use_cache, deadline)
+        else:
+            agent_types = self._resolve_agent_types(fetcher_type, processor_type, formatter_type)
+            run = lambda: self._agent_products(source, *agent_types, use_cache=use_cache, deadline=deadline)
+        if admit is not None:
+            execute = run
+
+            def run() -> ProductsResult:
+                with admit():
+                    return execute()
 
-        if not products_data:
+        try:
+            with deadline_scope(deadline):
+                result, shared = self._pipeline_flights.do(key, run, timeout=deadline.remaining() if deadline else None)
+        except TimeoutError as e:
+            logger.error(f"{DEADLINE_EXCEEDED_ERROR}: {e}")
+            return ProductsResult([])
+        if shared:
+            logger.info(f"Resultado compartilhado de pipeline em andamento para: {key[1]}")
+
+        if not result.products:
             logger.error("Nenhum produto encontrado")
+            return result
+
+        logger.info(f"Processados {len(result.products)} produtos (qualidade: {result.quality})")
+
+        return result
+
+    def _agent_products(self, source: str, fetcher_type: str, processor_type: str,
+                        formatter_type: Optional[str], use_cache: bool = True,
+                        deadline: Optional[Deadline] = None) -> ProductsResult:
+        """
+        Executa o pipeline de agentes e converte a sua saída em produtos.
+        Com degradação, a saída do processador é guardada para a normalização local, e a
+        formatação usa a mesma leitura incremental de ``iter_products`` (ver ``_format_task``).
+
+        Args:
+            source (str): Fonte dos dados
+            fetcher_type (str): Tipo do agente de busca
+            processor_type (str): Tipo do agente de processamento
+            formatter_type (Optional[str]): Tipo do agente de formatação, ou None para não formatar
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            ProductsResult: Produtos, qualidade e etapa de origem
+        """
+        if not formatter_type or not active_config.DEGRADATION_ENABLED:
+            # Sem degradação, cada produto é convertido assim que extraído
+            try:
+                products = list(self.iter_products(source, fetcher_type, processor_type, formatter_type,
+                                                   use_cache=use_cache, deadline=deadline))
+            except IncompleteResultError as e:
+                logger.error(f"Formatação incompleta: {e}")
+                return ProductsResult([])
+            return ProductsResult(products, stage_reached="format" if formatter_type else "process")
+
+        processed_data = self._fetch_and_process(source, fetcher_type, processor_type, formatter_type,
+                                                 use_cache, deadline)
+        if processed_data is None:
+            return ProductsResult([])
+
+        items, reason = self._format_or_degrade(formatter_type, processed_data, use_cache, deadline)
+        products = list(Product.iter_from_dicts(items or []))
+        if not products:
+            return ProductsResult([])
+        if reason:
+            return ProductsResult(products, QUALITY_DEGRADED, "process", reason)
+        return ProductsResult(products, stage_reached="format")
+
+    def request_key(self, source: str,
+                    fetcher_type: Optional[str] = None,
+                    processor_type: Optional[str] = None,
+                    formatter_type: Optional[str] = None,
+                    pipeline_id: Optional[str] = None,
+                    use_cache: bool = True) -> Tuple[Optional[str], ...]:
+        """
+        Calcula a chave que identifica execuções equivalentes: mesma fonte normalizada,
+        mesmos agentes (já com os padrões aplicados) ou mesmo pipeline, e mesmo uso do
+        cache (uma requisição que ignora o cache não aproveita uma execução que o usa).
+
+        Args:
+            source (str): Fonte dos dados
+            fetcher_type (Optional[str]): Tipo do agente de busca
+            processor_type (Optional[str]): Tipo do agente de processamento
+            formatter_type (Optional[str]): Tipo do agente de formatação
+            pipeline_id (Optional[str]): Pipeline declarativo
+            use_cache (bool): Se False, a execução ignora o cache da etapa de busca
+
+        Returns:
+            Tuple[Optional[str], ...]: Chave da execução
+        """
+        cache_mode = "cache" if use_cache else "bypass_cache"
+        if pipeline_id:
+            return ("products", normalize_source_url(source), pipeline_id, cache_mode)
+        return ("products", normalize_source_url(source)) + self._resolve_agent_types(
+            fetcher_type, processor_type, formatter_type
+        ) + (cache_mode,)
+
+    def run_pipeline(self, pipeline_id: str, source: str, use_cache: bool = True,
+                     deadline: Optional[Deadline] = None) -> Optional[PipelineResult]:
+        """
+        Executa um pipeline declarativo.
+
+        Args:
+            pipeline_id (str): Identificador do pipeline
+            source (str): Fonte dos dados
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            Optional[PipelineResult]: Resultado com o artefato de saída e as métricas das etapas,
+                ou None se o pipeline não existir
+        """
+        definition = self.pipelines.get(pipeline_id)
+        if definition is None:
+            logger.error(f"Pipeline '{pipeline_id}' não encontrado")
+            return None
+        return PipelineExecutor(definition, self.pool).run(source, use_cache, deadline)
+
+    def _pipeline_products(self, pipeline_id: str, source: str, use_cache: bool,
+                           deadline: Optional[Deadline] = None) -> ProductsResult:
+        """
+        Executa um pipeline declarativo e converte a sua saída em produtos.
+        Com DEGRADATION_ENABLED, se o pipeline não chegar à etapa de saída, usa o artefato
+        da etapa concluída mais avançada, normalizado localmente.
+
+        Args:
+            pipeline_id (str): Identificador do pipeline
+            source (str): Fonte dos dados
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            ProductsResult: Produtos (vazia se o pipeline não existir ou falhar sem artefato aproveitável)
+        """
+        result = self.run_pipeline(pipeline_id, source, use_cache, deadline)
+        if result is None:
+            return ProductsResult([])
+        if not result.error:
+            self._record_quality(QUALITY_FULL)
+            return ProductsResult(result.products(), stage_reached=self.pipelines[pipeline_id].output)
+
+        logger.error(f"Falha no pipeline '{pipeline_id}': {result.error}")
+        if not active_config.DEGRADATION_ENABLED:
+            return ProductsResult([])
+
+        for stage in reversed(self.pipelines[pipeline_id].stages):
+            artifact = result.artifacts.get(stage.id)
+            if artifact is None or stage.kind == STAGE_FETCH:
+                continue
+            products = list(Product.iter_from_dicts(self._normalize_locally(artifact.value)))
+            if products:
+                self._record_quality(QUALITY_DEGRADED)
+                logger.warning(f"Pipeline '{pipeline_id}' degradado: {len(products)} produtos da etapa '{stage.id}'")
+                return ProductsResult(products, QUALITY_DEGRADED, stage.id, result.error)
+        return ProductsResult([])
+
+    def _fetch_and_process(self, source: str, fetcher_type: str, processor_type: str,
+                           formatter_type: Optional[str], use_cache: bool,
+                           deadline: Optional[Deadline]) -> Optional[Any]:
+        """
+        Executa as etapas de busca e processamento, validando também o formatador.
+
+        Args:
+            source (str): Fonte dos dados
+            fetcher_type (str): Tipo do agente de busca
+            processor_type (str): Tipo do agente de processamento
+            formatter_type (Optional[str]): Tipo do agente de formatação, ou None para não formatar
+            use_cache (bool): Se False, ignora o cache da etapa de busca
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            Optional[Any]: Saída do processador, já extraída do envelope do Langflow, ou None em caso de erro
+        """
+        with self._lease_agents(fetcher_type, processor_type, formatter_type) as agents, deadline_scope(deadline):
+            if agents is None:
+                return None
+            fetcher, processor, _ = agents
+
+            # Executa a busca
+            raw_data = fetcher.fetch_data(source, use_cache=use_cache)
+            if not raw_data:
+                logger.error("Falha ao buscar dados")
+                return None
+
+            # Processa os dados
+            if self._deadline_expired(deadline, "process"):
+                return None
+            with memoization(use_cache):
+                processed_data = processor.process_data(raw_data)
+            if not processed_data:
+                logger.error("Falha ao processar dados")
+                return None
+
+        return self._unwrap_processed_data(processed_data)
+
+    def _format_or_degrade(self, formatter_type: str, processed_data: Any, use_cache: bool,
+                           deadline: Optional[Deadline]) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Formata a saída do processador dentro do orçamento de FORMATTER_BUDGET (limitado ao prazo
+        da requisição), contado a partir do início da formatação: a espera por uma vaga no pool
+        só é limitada pelo prazo. Se o formatador falhar ou não terminar a tempo (ex.: disjuntor
+        aberto ou fluxo lento), normaliza localmente a saída do processador. Com
+        DEGRADATION_BACKGROUND_FORMAT, uma formatação que excede o orçamento é refeita em segundo
+        plano e, ao terminar, grava o resultado memoizado que as próximas requisições reaproveitam.
+
+        Args:
+            formatter_type (str): Tipo do agente de formatação
+            processed_data (Any): Saída do processador
+            use_cache (bool): Se False, ignora os resultados memoizados
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            Tuple[Optional[List[Dict[str, Any]]], Optional[str]]: Produtos (formatados ou normalizados
+                localmente) e o motivo da degradação (None se a formatação concluiu)
+        """
+        if not active_config.DEGRADATION_ENABLED:
+            return self._format_task(formatter_type, processed_data, use_cache, deadline), None
+
+        budget = active_config.FORMATTER_BUDGET or None
+        reason = None
+        if deadline is not None and deadline.expired:
+            reason = "Sem tempo restante para a formatação"
+        else:
+            started = threading.Event()
+
+            def run() -> Optional[List[Dict[str, Any]]]:
+                started.set()
+                task_deadline = Deadline.after(budget) if budget is not None else None
+                with deadline_scope(deadline):
+                    return self._format_task(formatter_type, processed_data, use_cache, task_deadline)
+
+            future = self._formatting.submit(contextvars.copy_context().run, run)
+            try:
+                if not started.wait(timeout=deadline.remaining() if deadline is not None else None) \
+                        and future.cancel():
+                    raise FutureTimeoutError()
+                limit = budget
+                if deadline is not None:
+                    limit = deadline.remaining() if limit is None else min(limit, deadline.remaining())
+                formatted_data = future.result(timeout=limit)
+                if formatted_data:
+                    self._record_quality(QUALITY_FULL)
+                    return formatted_data, None
+                reason = "Falha na formatação"
+            except FutureTimeoutError:
+                reason = "Formatação não concluída dentro do orçamento" if started.is_set() \
+                    else "Sem vaga para a formatação dentro do prazo"
+                self._record_quality("budget_exceeded")
+                # Sem memoização, um resultado tardio não seria aproveitado
+                if active_config.DEGRADATION_BACKGROUND_FORMAT and use_cache:
+                    self._format_in_background(formatter_type, processed_data)
+
+        items = self._normalize_locally(processed_data)
+        if not items:
+            logger.error(f"{reason}; a saída do processador não pôde ser normalizada localmente")
+            return None, reason
+        self._record_quality(QUALITY_DEGRADED)
+        logger.warning(f"{reason}; entregando {len(items)} produtos normalizados localmente")
+        return items, reason
+
+    def _format_in_background(self, formatter_type: str, processed_data: Any) -> None:
+        """
+        Refaz em segundo plano uma formatação que excedeu o orçamento, para atualizar o resultado
+        memoizado. A formatação tem o prazo de REQUEST_DEADLINE_MS; com a fila cheia, é descartada.
+
+        Args:
+            formatter_type (str): Tipo do agente de formatação
+            processed_data (Any): Saída do processador
+        """
+        if not self._background_slots.acquire(blocking=False):
+            self._record_quality("background_dropped")
+            logger.warning("Fila de formatações em segundo plano cheia; formatação descartada")
+            return
+
+        logger.info("Formatação refeita em segundo plano para atualizar o resultado memoizado")
+        future = self._background_formatting.submit(
+            lambda: self._format_task(formatter_type, processed_data, True,
+                                      Deadline.from_ms(None, active_config.REQUEST_DEADLINE_MS))
+        )
+        future.add_done_callback(self._background_format_done)
+
+    def _format_task(self, formatter_type: str, processed_data: Any, use_cache: bool,
+                     deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Formata a saída do processador com um formatador emprestado do pool. Com
+        STREAM_EXTRACTION_ENABLED, lê a resposta de forma incremental, como ``iter_products``:
+        apenas a lista de produtos é materializada, não a resposta inteira do Langflow.
+
+        Args:
+            formatter_type (str): Tipo do agente de formatação
+            processed_data (Any): Saída do processador
+            use_cache (bool): Se False, ignora os resultados memoizados
+            deadline (Optional[Deadline]): Prazo da formatação
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Produtos formatados ou None em caso de erro
+        """
+        with self.pool.lease(formatter_type) as formatter, memoization(use_cache), deadline_scope(deadline):
+            if formatter is None:
+                logger.error(f"Agente de formatação '{formatter_type}' não encontrado")
+                return None
+            if active_config.STREAM_EXTRACTION_ENABLED and isinstance(formatter, IncrementalDataProcessorAgentInterface):
+                logger.info("Formatando dados processados (leitura incremental)")
+                try:
+                    return list(formatter.process_data_iter(processed_data))
+                except IncompleteResultError as e:
+                    logger.error(f"Formatação incompleta: {e}")
+                    return None
+            logger.info("Formatando dados processados")
+            return formatter.process_data(processed_data)
+
+    def _background_format_done(self, future: Future) -> None:
+        """
+        Registra o fim de uma formatação que excedeu o orçamento e continuou em segundo plano.
+
+        Args:
+            future (Future): Formatação concluída
+        """
+        self._background_slots.release()
+        refreshed = not future.cancelled() and future.exception() is None and bool(future.result())
+        self._record_quality("background_refreshed" if refreshed else "background_failed")
+        if refreshed:
+            logger.info("Formatação em segundo plano concluída; resultado memoizado atualizado")
+        else:
+            logger.warning("Formatação em segundo plano não produziu resultado")
+
+    def _normalize_locally(self, data: Any) -> List[Dict[str, Any]]:
+        """
+        Normaliza localmente, por regras, a saída de uma etapa anterior à formatação.
+
+        Args:
+            data (Any): Registros ou texto contendo um array JSON
+
+        Returns:
+            List[Dict[str, Any]]: Produtos normalizados (vazia se os dados não tiverem registros)
+        """
+        try:
+            return list(self.local_formatter.process_data_iter(data))
+        except Exception as e:
+            logger.error(f"Erro na normalização local: {str(e)}")
             return []
 
-        # Converte para objetos Product
-        products = [Product.from_dict(product) for product in products_data]
-        logger.info(f"Processados {len(products)} produtos")
+    @classmethod
+    def _record_quality(cls, counter: str) -> None:
+        """
+        Incrementa um contador de qualidade das entregas.
+
+        Args:
+            counter (str): Nome do contador
+        """
+        with cls._degradation_lock:
+            cls._degradation_counters[counter] += 1
+
+    @classmethod
+    def degradation_stats(cls) -> Dict[str, int]:
+        """
+        Retorna as métricas de degradação da formatação.
+
+        Returns:
+            Dict[str, int]: Entregas completas e degradadas, orçamentos excedidos e formatações
+                em segundo plano concluídas, falhas ou descartadas com a fila cheia
+        """
+        with cls._degradation_lock:
+            return dict(cls._degradation_counters)
+
+    @staticmethod
+    def _deadline_expired(deadline: Optional[Deadline], stage: str) -> bool:
+        """
+        Indica se o prazo da requisição se esgotou antes de uma etapa, registrando o abandono.
+
+        Args:
+            deadline (Optional[Deadline]): Prazo da requisição
+            stage (str): Etapa que seria iniciada
+
+        Returns:
+            bool: True se a etapa não deve ser iniciada
+        """
+        if deadline is None or not deadline.expired:
+            return False
+        logger.error(f"{DEADLINE_EXCEEDED_ERROR} antes da etapa '{stage}'")
+        return True
+
+    @contextmanager
+    def _lease_agents(self, fetcher_type: str, processor_type: str,
+                      formatter_type: Optional[str]) -> Iterator[Optional[Tuple[Any, Any, Any]]]:
+        """
+        Empresta do pool e valida os agentes do pipeline, devolvendo-os ao final do bloco.
+
+        Args:
+            fetcher_type (str): Tipo do agente de busca
+            processor_type (str): Tipo do agente de processamento
+            formatter_type (Optional[str]): Tipo do agente de formatação, ou None para não formatar
+
+        Returns:
+            Iterator[Optional[Tuple[Any, Any, Any]]]: Agentes de busca, processamento e formatação (ou None),
+                ou None se algum agente não for encontrado ou for inválido
+        """
+        with self.pool.lease(fetcher_type) as fetcher, \
+                self.pool.lease(processor_type) as processor, \
+                self.pool.lease(formatter_type) as formatter:
+            if not fetcher or not isinstance(fetcher, DataFetcherAgentInterface):
+                logger.error(f"Agente de busca '{fetcher_type}' não encontrado ou inválido")
+                yield None
+            elif not processor or not isinstance(processor, DataProcessorAgentInterface):
+                logger.error(f"Agente de processamento '{processor_type}' não encontrado ou inválido")
+                yield None
+            elif formatter_type and (not formatter or not isinstance(formatter, DataProcessorAgentInterface)):
+                logger.error(f"Agente de formatação '{formatter_type}' não encontrado ou inválido")
+                yield None
+            else:
+                yield fetcher, processor, formatter
+
+    def warm_agents(self) -> None:
+        """
+        Cria antecipadamente os agentes padrão e os dos pipelines declarados, para que as
+        primeiras requisições não paguem o custo de montá-los.
+        """
+        agent_types = [self.agent_config["default_fetcher"], self.agent_config["default_processor"],
+                       self.agent_config.get("default_formatter")]
+        agent_types += [stage.agent for definition in self.pipelines.values() for stage in definition.stages]
+        self.pool.warm(agent_type for agent_type in agent_types if agent_type != NO_FORMATTER)
 
-        return products
+    def agent_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna as métricas do pool de agentes.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Instâncias criadas, reaproveitadas, descartadas, em uso e ociosas por tipo
+        """
+        return self.pool.stats()
+
+    def _resolve_agent_types(self, fetcher_type: Optional[str],
+                             processor_type: Optional[str],
+                             formatter_type: Optional[str]) -> Tuple[str, str, Optional[str]]:
+        """
+        Determina os tipos de agentes a serem usados, aplicando os padrões configurados.
+        O formatador "none" desativa a etapa de formatação.
+
+        Args:
+            fetcher_type (Optional[str]): Tipo do agente de busca
+            processor_type (Optional[str]): Tipo do agente de processamento
+            formatter_type (Optional[str]): Tipo do agente de formatação
+
+        Returns:
+            Tuple[str, str, Optional[str]]: Tipos de busca, processamento e formatação
+        """
+        formatter_type = formatter_type or self.agent_config.get("default_formatter")
+        return (
+            fetcher_type or self.agent_config["default_fetcher"],
+            processor_type or self.agent_config["default_processor"],
+            None if formatter_type == NO_FORMATTER else formatter_type
+        )
+
+    def _unwrap_processed_data(self, processed_data: Any) -> Any:
+        """
+        Extrai o conteúdo do campo "data" > "text" da saída do processador, quando presente.
+
+        Args:
+            processed_data (Any): Dados retornados pelo agente de processamento
+
+        Returns:
+            Any: Conteúdo extraído ou os dados originais
+        """
+        # Log do tipo de dados processados
+        logger.info(f"Tipo de dados processados: {type(processed_data)}")
+
+        # Extrai o conteúdo do campo "data" > "text" se for uma lista de dicionários
+        match = UNWRAP_EXTRACTOR.extract(processed_data)
+        if match is not None:
+            text_content = match.value
+            if isinstance(text_content, str):
+                logger.info("Extraiu o conteúdo do campo 'data' > 'text' como string")
+            else:
+                logger.warning(f"O conteúdo do campo 'data' > 'text' não é uma string, é do tipo: {type(text_content).__name__}")
+                text_content = str(text_content)
+            processed_data = text_content
+
+        if isinstance(processed_data, str):
+            logger.info("Dados processados retornados como string")
+        elif isinstance(processed_data, list):
+            logger.info(f"Dados processados retornados como lista com {len(processed_data)} itens")
+
+        return processed_data
 
     def list_available_agents(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -182,3 +1018,12 @@ class AgentOrchestrator:
             Dict[str, List[Dict[str, Any]]]: Dicionário com agentes por tipo
         """
         return self.agent_config["available_agents"]
+
+    def list_available_pipelines(self) -> List[Dict[str, Any]]:
+        """
+        Lista os pipelines declarativos disponíveis.
+
+        Returns:
+            List[Dict[str, Any]]: Pipelines com as suas etapas
+        """
+        return [definition.to_dict() for definition in self.pipelines.values()]
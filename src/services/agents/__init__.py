@@ -1,17 +1,29 @@
 """
 Pacote de agentes para processamento de dados.
 """
-from src.services.agents.interfaces import AgentInterface, DataFetcherAgentInterface, DataProcessorAgentInterface
+from src.services.agents.interfaces import (
+    AgentInterface,
+    DataFetcherAgentInterface,
+    DataProcessorAgentInterface,
+    StreamingDataProcessorAgentInterface,
+    IncrementalDataProcessorAgentInterface,
+    IncompleteResultError
+)
 from src.services.agents.base import BaseAgent, BaseDataFetcherAgent, BaseDataProcessorAgent
 from src.services.agents.registry import AgentRegistry, AgentFactory
+from src.services.agents.pool import AgentPool
 
 __all__ = [
     'AgentInterface',
     'DataFetcherAgentInterface',
     'DataProcessorAgentInterface',
+    'StreamingDataProcessorAgentInterface',
+    'IncrementalDataProcessorAgentInterface',
+    'IncompleteResultError',
     'BaseAgent',
     'BaseDataFetcherAgent',
     'BaseDataProcessorAgent',
     'AgentRegistry',
-    'AgentFactory'
+    'AgentFactory',
+    'AgentPool'
 ]
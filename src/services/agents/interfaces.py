@@ -3,7 +3,14 @@ Interfaces para agentes de processamento.
 Define contratos que as implementações concretas de agentes devem seguir.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+class IncompleteResultError(Exception):
+    """
+    Parte da entrada não pôde ser processada. Lançada pelos métodos que entregam itens
+    à medida que ficam prontos (ex.: ``process_data_iter``), possivelmente depois de
+    alguns itens: os itens já recebidos não formam o resultado completo.
+    """
 
 class AgentInterface(ABC):
     """Interface base para todos os agentes."""
@@ -58,15 +65,16 @@ class DataFetcherAgentInterface(AgentInterface):
     """Interface para agentes que buscam dados externos."""
     
     @abstractmethod
-    def fetch_data(self, source: str) -> Optional[str]:
+    def fetch_data(self, source: str, use_cache: bool = True) -> Optional[Any]:
         """
         Busca dados de uma fonte externa.
         
         Args:
             source (str): Fonte dos dados (URL, caminho de arquivo, etc.)
+            use_cache (bool): Se False, ignora respostas armazenadas em cache
             
         Returns:
-            Optional[str]: Dados obtidos ou None em caso de erro
+            Optional[Any]: Dados obtidos (texto ou resposta já decodificada) ou None em caso de erro
         """
         pass
 
@@ -85,3 +93,35 @@ class DataProcessorAgentInterface(AgentInterface):
             Union[List[Dict[str, Any]], None]: Lista de dicionários com dados processados ou None em caso de erro
         """
         pass
+
+class StreamingDataProcessorAgentInterface(AgentInterface):
+    """Interface para agentes que entregam os itens processados à medida que ficam prontos."""
+    
+    @abstractmethod
+    def process_data_stream(self, data: str) -> Iterator[Dict[str, Any]]:
+        """
+        Processa dados brutos entregando cada item assim que é obtido.
+        
+        Args:
+            data (str): Dados brutos a serem processados
+            
+        Returns:
+            Iterator[Dict[str, Any]]: Itens processados, na ordem em que ficam prontos
+        """
+        pass
+
+class IncrementalDataProcessorAgentInterface(AgentInterface):
+    """Interface para agentes que extraem os itens sem materializar a resposta completa."""
+    
+    @abstractmethod
+    def process_data_iter(self, data: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Processa dados entregando cada item assim que é lido, mantendo em memória apenas o item em andamento.
+        
+        Args:
+            data (Any): Dados a serem processados
+            
+        Returns:
+            Iterator[Dict[str, Any]]: Itens processados, na ordem em que são lidos
+        """
+        pass
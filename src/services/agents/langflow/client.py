@@ -0,0 +1,342 @@
+"""
+Cliente HTTP compartilhado pelos agentes Langflow.
+Centraliza o envio das requisições aos fluxos: balanceamento entre réplicas
+equivalentes, sessões com pool de conexões, limitação de taxa, disjuntor por
+endpoint, política de retentativas e duplicação das chamadas lentas (hedging).
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import requests
+
+from src.config.settings import active_config
+from src.services.http import HttpSessionPool, RateLimiter, RateLimitTimeout
+from src.services.http.circuit_breaker import CLOSED, CircuitBreakerRegistry, CircuitOpenError
+from src.services.http.balancer import EndpointPoolRegistry
+from src.services.http.hedging import HedgingRegistry
+from src.services.http.retry import RetryError, RetryPolicy, get_default_retry_policy
+from src.utils import json_codec
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class LangflowClient:
+    """
+    Cliente para a API de execução de fluxos do Langflow.
+    """
+
+    def __init__(self, url: str, timeout: Optional[float] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limit_also: Iterable[str] = ()):
+        """
+        Inicializa o cliente.
+
+        Args:
+            url (str): URL do fluxo no Langflow, ou URLs de réplicas equivalentes do
+                fluxo separadas por vírgula (as requisições são balanceadas entre elas)
+            timeout (Optional[float]): Timeout de cada tentativa em segundos. Se None, usa REQUEST_TIMEOUT.
+            retry_policy (Optional[RetryPolicy]): Política de retentativas. Se None, usa a política padrão.
+            rate_limit_also (Iterable[str]): URLs adicionais cuja taxa cada execução do fluxo consome
+        """
+        self.url = url
+        self.timeout = timeout or active_config.REQUEST_TIMEOUT
+        self.retry_policy = retry_policy or get_default_retry_policy()
+        self.rate_limit_also = tuple(rate_limit_also)
+        self.session_pool = HttpSessionPool()
+        self.rate_limiter = RateLimiter()
+        self.endpoints = EndpointPoolRegistry().get(url)
+
+    def is_circuit_open(self) -> bool:
+        """
+        Indica se o fluxo está recusando requisições: em todas as réplicas o
+        disjuntor não está fechado ou o endpoint foi ejetado do balanceamento.
+
+        Returns:
+            bool: True se nenhuma réplica está plenamente disponível
+        """
+        registry = CircuitBreakerRegistry()
+        for url in self.endpoints.urls:
+            breaker = registry.get(url)
+            if not self.endpoints.is_ejected(url) and (breaker is None or breaker.state == CLOSED):
+                return False
+        return True
+
+    def post(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Optional[requests.Response]:
+        """
+        Envia o payload ao fluxo aplicando limitação de taxa, disjuntor e retentativas.
+        Com o circuito aberto, falha imediatamente sem contatar o fluxo.
+
+        Args:
+            payload (Dict[str, Any]): Payload da requisição
+            headers (Dict[str, str]): Cabeçalhos da requisição
+
+        Returns:
+            Optional[requests.Response]: Resposta bem-sucedida ou None em caso de erro
+        """
+        return self._call(payload, headers)
+
+    def open_response(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Optional[requests.Response]:
+        """
+        Envia o payload como em ``post``, mas sem ler o corpo da resposta, para que
+        ele seja consumido em pedaços (ver ``iter_response_text``). Cabe ao chamador
+        fechar a resposta.
+
+        Args:
+            payload (Dict[str, Any]): Payload da requisição
+            headers (Dict[str, str]): Cabeçalhos da requisição
+
+        Returns:
+            Optional[requests.Response]: Resposta bem-sucedida, com o corpo ainda não lido, ou None em caso de erro
+        """
+        return self._call(payload, headers, stream=True)
+
+    def stream(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """
+        Executa o fluxo no modo streaming do Langflow e entrega os eventos à medida que chegam.
+        As retentativas valem apenas até o início da resposta; uma falha no meio da
+        transmissão é entregue como um evento "error".
+
+        Args:
+            payload (Dict[str, Any]): Payload da requisição
+            headers (Dict[str, str]): Cabeçalhos da requisição
+
+        Returns:
+            Iterator[Dict[str, Any]]: Eventos no formato {"event": ..., "data": {...}}
+                (ex.: "add_message", "token", "end", "error")
+        """
+        response = self._call(payload, headers, params={"stream": "true"}, stream=True)
+        if response is None:
+            return
+
+        with response:
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    event = parse_stream_event(line)
+                    if event is not None:
+                        yield event
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Transmissão do Langflow interrompida: {e}")
+                yield {"event": "error", "data": {"error": str(e)}}
+
+    def _call(self, payload: Dict[str, Any], headers: Dict[str, str],
+              params: Optional[Dict[str, str]] = None, stream: bool = False) -> Optional[requests.Response]:
+        """
+        Executa a requisição com a política de retentativas.
+
+        Args:
+            payload (Dict[str, Any]): Payload da requisição
+            headers (Dict[str, str]): Cabeçalhos da requisição
+            params (Optional[Dict[str, str]]): Parâmetros da URL (ex.: modo streaming do Langflow)
+            stream (bool): Se True, não lê o corpo da resposta
+
+        Returns:
+            Optional[requests.Response]: Resposta bem-sucedida ou None em caso de erro
+        """
+        def attempt(number: int, remaining: Optional[float]) -> requests.Response:
+            url = self.endpoints.select()
+            logger.info(f"Tentativa {number} de {self.retry_policy.max_attempts}")
+            logger.info(f"Fazendo requisição para URL: {url}")
+
+            # O disjuntor é consultado antes do limitador para que uma recusa não consuma token
+            breaker = CircuitBreakerRegistry().get(url)
+            if breaker and not breaker.allow_request():
+                raise CircuitOpenError(breaker.name, breaker.retry_in())
+            try:
+                self.rate_limiter.acquire(url, also=self.rate_limit_also, timeout=remaining)
+            except RateLimitTimeout:
+                if breaker:
+                    breaker.release_probe()
+                raise
+
+            timeout = self.timeout if remaining is None else min(self.timeout, remaining)
+            hedger = HedgingRegistry().get(url)
+            if hedger is None:
+                return self._send(url, payload, headers, params, stream, timeout)
+            # As chamadas com duplicação não leem o corpo ao enviar: a perdedora é fechada
+            # assim que responde, devolvendo a conexão, e a vencedora é lida em seguida
+            response = hedger.call(
+                lambda target, limit: self._send(target or url, payload, headers, params, True, limit),
+                timeout,
+                accept=lambda response: not self.retry_policy.is_retryable_status(response.status_code),
+                discard=lambda response: response.close(),
+                can_hedge=lambda target: self._can_hedge(target or url),
+                choose_alternate=lambda: self.endpoints.select(exclude=[url]),
+                release=lambda target: self._release_hedge(target or url)
+            )
+            if not stream:
+                try:
+                    response.content
+                except Exception:
+                    response.close()
+                    raise
+            return response
+
+        try:
+            response = self.retry_policy.call(attempt)
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                # Em modo streaming o corpo não foi lido: a conexão só volta ao pool se fechada
+                response.close()
+                raise
+            return response
+        except RetryError as e:
+            # A última resposta (ex.: um 503 em modo streaming) ainda prende a conexão do pool
+            if e.response is not None:
+                e.response.close()
+            logger.error(f"Falha na requisição à API do Langflow: {e}")
+        except CircuitOpenError as e:
+            logger.warning(f"Requisição ao Langflow recusada pelo disjuntor: {e}")
+        except RateLimitTimeout as e:
+            logger.error(f"Limitador de taxa impediu a requisição dentro do prazo: {e}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Erro na requisição à API: {e}")
+        return None
+
+    def _send(self, url: str, payload: Dict[str, Any], headers: Dict[str, str],
+              params: Optional[Dict[str, str]], stream: bool, timeout: Optional[float]) -> requests.Response:
+        """
+        Envia uma requisição ao fluxo e registra o resultado no disjuntor do endpoint.
+
+        Args:
+            url (str): URL de destino (uma réplica do fluxo ou um endpoint alternativo)
+            payload (Dict[str, Any]): Payload da requisição
+            headers (Dict[str, str]): Cabeçalhos da requisição
+            params (Optional[Dict[str, str]]): Parâmetros da URL
+            stream (bool): Se True, não lê o corpo da resposta
+            timeout (Optional[float]): Timeout em segundos
+
+        Returns:
+            requests.Response: Resposta recebida
+        """
+        breaker = CircuitBreakerRegistry().get(url)
+        session = self.session_pool.get_session(url)
+        started = self.endpoints.begin(url)
+        try:
+            response = session.request(
+                method="POST",
+                url=url,
+                params=params,
+                json=payload,
+                headers=headers,
+                timeout=timeout,
+                stream=stream
+            )
+        except Exception:
+            self.endpoints.end(url, started, success=False)
+            if breaker:
+                breaker.record_failure()
+            raise
+
+        logger.info(f"Status Code: {response.status_code}")
+        self.endpoints.end(url, started, success=response.status_code < 500)
+        if breaker:
+            # Erros 4xx indicam problema na requisição, não no fluxo
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
+
+    def _can_hedge(self, url: str) -> bool:
+        """
+        Verifica se uma cópia da requisição pode ser enviada agora: o disjuntor do
+        destino precisa permitir e o limitador de taxa precisa liberá-la sem espera.
+        Se o limitador recusar, a sondagem reservada no disjuntor é devolvida.
+
+        Args:
+            url (str): URL de destino da cópia
+
+        Returns:
+            bool: True se a cópia pode ser enviada
+        """
+        breaker = CircuitBreakerRegistry().get(url)
+        if breaker and not breaker.allow_request():
+            return False
+        try:
+            self.rate_limiter.acquire(url, also=self.rate_limit_also, timeout=0)
+        except RateLimitTimeout:
+            if breaker:
+                breaker.release_probe()
+            return False
+        return True
+
+    def _release_hedge(self, url: str) -> None:
+        """
+        Devolve a sondagem reservada por ``_can_hedge`` para uma cópia que não foi enviada.
+
+        Args:
+            url (str): URL de destino da cópia
+        """
+        breaker = CircuitBreakerRegistry().get(url)
+        if breaker:
+            breaker.release_probe()
+
+def parse_stream_event(line: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Interpreta uma linha da resposta em streaming do Langflow.
+    Aceita tanto JSON por linha quanto linhas SSE ("data: {...}").
+
+    Args:
+        line (Optional[str]): Linha recebida
+
+    Returns:
+        Optional[Dict[str, Any]]: Evento decodificado ou None para linhas vazias, de controle ou inválidas
+    """
+    if not line:
+        return None
+    line = line.strip()
+    if line.startswith("data:"):
+        line = line[len("data:"):].strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        event = json.loads(line)
+    except json.JSONDecodeError:
+        logger.warning(f"Linha inválida na transmissão do Langflow: {line[:200]}")
+        return None
+    return event if isinstance(event, dict) else None
+
+def iter_response_text(response: requests.Response, chunk_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Lê o corpo de uma resposta aberta com ``open_response`` em pedaços de texto.
+    A decodificação é incremental, então caracteres divididos entre pedaços são preservados.
+
+    Args:
+        response (requests.Response): Resposta com o corpo ainda não lido
+        chunk_size (Optional[int]): Tamanho de cada leitura em bytes. Se None, usa STREAM_CHUNK_SIZE.
+
+    Returns:
+        Iterator[str]: Pedaços do corpo, na ordem em que chegam
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    for chunk in response.iter_content(chunk_size=chunk_size or active_config.STREAM_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def decode_json_response(response: requests.Response) -> Optional[Any]:
+    """
+    Decodifica o corpo JSON de uma resposta do Langflow uma única vez, direto dos bytes.
+
+    Args:
+        response (requests.Response): Resposta bem-sucedida
+
+    Returns:
+        Optional[Any]: Resposta decodificada ou None se o corpo não for JSON válido
+    """
+    content = response.content
+    try:
+        data = json_codec.loads(content)
+    except json_codec.JSONDecodeError:
+        logger.error("Resposta não é um JSON válido")
+        logger.error(f"Conteúdo da resposta: {json_codec.preview(content)}")
+        return None
+
+    logger.info(f"Resposta JSON recebida com sucesso ({len(content)} bytes, decodificador {json_codec.BACKEND})")
+    logger.debug(f"Resposta do Langflow (primeiros 500 caracteres): {json_codec.preview(content)}")
+    return data
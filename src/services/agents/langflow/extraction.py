@@ -0,0 +1,345 @@
+"""
+Extração declarativa de dados das respostas do Langflow.
+Caminhos como ``outputs[0].outputs[0].results.text.data.text|json`` são
+compilados uma única vez em uma árvore de prefixos, avaliada em uma só
+passada sobre a resposta: prefixos comuns são percorridos (e strings JSON
+decodificadas) uma vez para todos os caminhos. O caminho que casou por
+último em cada fluxo é tentado primeiro na chamada seguinte.
+"""
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from src.utils import json_codec
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Passos: ("key", nome), ("index", n), ("any", None) e ("json", None)
+Step = Tuple[str, Any]
+
+_TOKEN = re.compile(r'\.?([A-Za-z_][\w-]*)|\[(\d+)\]|\[\*\]|\.?\*|\|json')
+
+def compile_path(expression: str) -> Tuple[Step, ...]:
+    """
+    Compila uma expressão de caminho.
+
+    A sintaxe aceita chaves separadas por ponto, índices (``[0]``), curingas
+    (``*`` ou ``[*]``, qualquer valor de um dicionário ou item de uma lista)
+    e ``|json`` para decodificar uma string JSON naquele ponto.
+
+    Args:
+        expression (str): Expressão, ex.: ``outputs[0].outputs[0].data[0]|json``
+
+    Returns:
+        Tuple[Step, ...]: Passos do caminho
+
+    Raises:
+        ValueError: Se a expressão for inválida
+    """
+    steps = []
+    pos = 0
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Expressão de caminho inválida em '{expression}' (posição {pos})")
+        key, index = match.group(1), match.group(2)
+        token = match.group()
+        if key is not None:
+            steps.append(("key", key))
+        elif index is not None:
+            steps.append(("index", int(index)))
+        elif token == "|json":
+            steps.append(("json", None))
+        else:
+            steps.append(("any", None))
+        pos = match.end()
+    if not steps:
+        raise ValueError("Expressão de caminho vazia")
+    return tuple(steps)
+
+def stream_path(expression: str) -> Tuple[Any, ...]:
+    """
+    Compila uma expressão em um caminho para leitura incremental (ver
+    ``JsonPathStreamReader``). Apenas chaves e índices são aceitos.
+
+    Args:
+        expression (str): Expressão, ex.: ``outputs[0].outputs[0].results.text.data.text``
+
+    Returns:
+        Tuple[Any, ...]: Chaves e índices do caminho
+
+    Raises:
+        ValueError: Se a expressão for inválida ou usar curingas ou ``|json``
+    """
+    steps = compile_path(expression)
+    if any(kind not in ("key", "index") for kind, _ in steps):
+        raise ValueError(f"Caminho de leitura incremental aceita apenas chaves e índices: '{expression}'")
+    return tuple(arg for _, arg in steps)
+
+def _apply(step: Step, value: Any) -> Iterator[Any]:
+    """
+    Aplica um passo a um valor.
+
+    Args:
+        step (Step): Passo compilado
+        value (Any): Valor atual
+
+    Returns:
+        Iterator[Any]: Valores resultantes (nenhum se o passo não se aplica)
+    """
+    kind, arg = step
+    if kind == "key":
+        if isinstance(value, dict) and arg in value:
+            yield value[arg]
+    elif kind == "index":
+        if isinstance(value, list) and -len(value) <= arg < len(value):
+            yield value[arg]
+    elif kind == "json":
+        if isinstance(value, (str, bytes)):
+            try:
+                yield json_codec.loads(value)
+            except json_codec.JSONDecodeError as e:
+                logger.debug(f"String JSON inválida no caminho de extração: {e}")
+    elif isinstance(value, dict):
+        yield from value.values()
+    elif isinstance(value, list):
+        yield from value
+
+def is_dict_list(value: Any) -> bool:
+    """
+    Indica se o valor é uma lista não vazia de dicionários.
+
+    Args:
+        value (Any): Valor a verificar
+
+    Returns:
+        bool: True se é uma lista não vazia de dicionários
+    """
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+def is_present(value: Any) -> bool:
+    """
+    Indica se o valor existe e não é vazio.
+
+    Args:
+        value (Any): Valor a verificar
+
+    Returns:
+        bool: True se o valor não é None nem vazio
+    """
+    return value is not None and value != "" and value != [] and value != {}
+
+class _Node:
+    """Nó da árvore de prefixos dos caminhos."""
+    __slots__ = ("children", "terminal", "min_rank")
+
+    def __init__(self):
+        self.children: Dict[Step, "_Node"] = {}
+        self.terminal: Optional[int] = None
+        self.min_rank = float("inf")
+
+@dataclass
+class ExtractionMatch:
+    """
+    Resultado de uma extração.
+
+    Attributes:
+        value (Any): Valor encontrado
+        path (str): Expressão do caminho que casou
+    """
+    value: Any
+    path: str
+
+class ResponseExtractor:
+    """
+    Extrator compilado de um conjunto ordenado de caminhos.
+    A ordem declarada define a prioridade: entre os caminhos que casam,
+    vence o declarado primeiro.
+    """
+
+    def __init__(self, name: str, paths: Sequence[str], accept: Callable[[Any], bool] = is_present):
+        """
+        Compila os caminhos do extrator.
+
+        Args:
+            name (str): Nome do extrator (usado nos logs e métricas)
+            paths (Sequence[str]): Expressões de caminho, em ordem de prioridade
+            accept (Callable[[Any], bool]): Critério para aceitar o valor encontrado em um caminho
+        """
+        self.name = name
+        self.paths = list(paths)
+        self.accept = accept
+        self._compiled = [compile_path(path) for path in self.paths]
+        self._root = _Node()
+        for rank, steps in enumerate(self._compiled):
+            node = self._root
+            node.min_rank = min(node.min_rank, rank)
+            for step in steps:
+                node = node.children.setdefault(step, _Node())
+                node.min_rank = min(node.min_rank, rank)
+            if node.terminal is None:
+                node.terminal = rank
+
+        self._preferred: Dict[str, int] = {}
+        self._hits: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def extract(self, data: Any, flow: str = "") -> Optional[ExtractionMatch]:
+        """
+        Extrai o valor do caminho que casou por último neste fluxo ou, se ele não casar,
+        do caminho de maior prioridade que casa com a resposta.
+
+        Args:
+            data (Any): Resposta já decodificada
+            flow (str): Identificador do fluxo (ex.: URL), usado para lembrar o caminho que costuma casar
+
+        Returns:
+            Optional[ExtractionMatch]: Valor e caminho encontrados, ou None
+        """
+        preferred = self._preferred.get(flow)
+        if preferred is not None:
+            value = self._evaluate(self._compiled[preferred], data)
+            if value is not None:
+                return self._record(flow, preferred, value)
+
+        found = self._walk(self._root, data, None)
+        if found is None:
+            self._record(flow, None, None)
+            return None
+        return self._record(flow, found[0], found[1])
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna quantas vezes cada caminho casou, por fluxo.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Contagens por fluxo e caminho ("none" para respostas sem caminho)
+        """
+        with self._lock:
+            return {flow: dict(hits) for flow, hits in self._hits.items()}
+
+    def _evaluate(self, steps: Tuple[Step, ...], value: Any) -> Optional[Any]:
+        """
+        Avalia um único caminho.
+
+        Args:
+            steps (Tuple[Step, ...]): Passos do caminho
+            value (Any): Valor atual
+
+        Returns:
+            Optional[Any]: Primeiro valor aceito ou None
+        """
+        if not steps:
+            return value if self.accept(value) else None
+        for candidate in _apply(steps[0], value):
+            result = self._evaluate(steps[1:], candidate)
+            if result is not None:
+                return result
+        return None
+
+    def _walk(self, node: _Node, value: Any, best: Optional[Tuple[int, Any]]) -> Optional[Tuple[int, Any]]:
+        """
+        Percorre a árvore de prefixos, mantendo o melhor caminho encontrado.
+
+        Args:
+            node (_Node): Nó atual
+            value (Any): Valor correspondente ao nó
+            best (Optional[Tuple[int, Any]]): Melhor (prioridade, valor) encontrado até aqui
+
+        Returns:
+            Optional[Tuple[int, Any]]: Melhor (prioridade, valor) encontrado
+        """
+        if node.terminal is not None and (best is None or node.terminal < best[0]) and self.accept(value):
+            best = (node.terminal, value)
+
+        for step, child in node.children.items():
+            # Subárvores que só contêm caminhos de prioridade menor não podem melhorar o resultado
+            if best is not None and child.min_rank >= best[0]:
+                continue
+            for candidate in _apply(step, value):
+                best = self._walk(child, candidate, best)
+        return best
+
+    def _record(self, flow: str, rank: Optional[int], value: Any) -> Optional[ExtractionMatch]:
+        """
+        Registra o caminho que casou para o fluxo.
+
+        Args:
+            flow (str): Identificador do fluxo
+            rank (Optional[int]): Prioridade do caminho que casou, ou None
+            value (Any): Valor encontrado
+
+        Returns:
+            Optional[ExtractionMatch]: Resultado da extração
+        """
+        path = self.paths[rank] if rank is not None else "none"
+        with self._lock:
+            hits = self._hits.setdefault(flow, {})
+            hits[path] = hits.get(path, 0) + 1
+            if rank is not None:
+                self._preferred[flow] = rank
+
+        if rank is None:
+            logger.debug(f"Extrator {self.name}: nenhum caminho casou com a resposta do fluxo {flow}")
+            return None
+        logger.info(f"Extrator {self.name}: valor obtido pelo caminho '{path}'")
+        return ExtractionMatch(value=value, path=path)
+
+# Texto gerado pelo fluxo de coleta (saída do agente de busca)
+PROCESSOR_EXTRACTOR = ResponseExtractor("langflow_processor", [
+    "outputs[0].outputs[0].results.text.text",
+    "outputs[0].outputs[0].results.text.data.text",
+    "outputs[0].outputs[0].results.message.text",
+    "outputs[0].outputs[0].results.message.data.text",
+])
+
+# Texto embutido em resultados intermediários já extraídos ("data" > "text")
+UNWRAP_EXTRACTOR = ResponseExtractor("processed_data", [
+    "[0].results.text.data.text",
+])
+
+# Lista de produtos gerada pelo fluxo de formatação
+FORMATTER_EXTRACTOR = ResponseExtractor("langflow_formatter", [
+    "outputs[0].outputs[0].results.text.data.text|json",
+    "outputs[0].outputs[0].results.message.data.text|json",
+    "outputs[0].outputs[0].results.message.text|json",
+    "outputs[0].outputs[0].data[0]|json",
+    "outputs[0].outputs[0].data[0]|json.data",
+    "outputs[0].outputs[0].data[0]",
+    "outputs[0].outputs[0].data[0].data",
+    "outputs[0].outputs[0].data[0].products",
+    "*",
+    "*.*",
+], accept=is_dict_list)
+
+# Caminhos lidos de forma incremental, sem decodificar a resposta inteira. O alvo pode
+# ser o array de produtos ou a string que o contém; vale o primeiro que aparecer. Os
+# curingas dos extratores não entram aqui (casariam com o próprio envelope): sem
+# produtos por estes caminhos, a resposta passa pelo extrator completo.
+PROCESSOR_STREAM_PATHS = tuple(stream_path(path) for path in (
+    "outputs[0].outputs[0].results.text.data.text",
+    "outputs[0].outputs[0].results.text.text",
+    "outputs[0].outputs[0].results.message.data.text",
+    "outputs[0].outputs[0].results.message.text",
+))
+
+FORMATTER_STREAM_PATHS = tuple(stream_path(path) for path in (
+    "outputs[0].outputs[0].results.text.data.text",
+    "outputs[0].outputs[0].results.message.data.text",
+    "outputs[0].outputs[0].results.message.text",
+    "outputs[0].outputs[0].data[0]",
+    "outputs[0].outputs[0].data[0].data",
+    "outputs[0].outputs[0].data[0].products",
+))
+
+def extraction_stats() -> Dict[str, Dict[str, Dict[str, int]]]:
+    """
+    Retorna as métricas de todos os extratores de resposta.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, int]]]: Contagens por extrator, fluxo e caminho
+    """
+    return {extractor.name: extractor.stats()
+            for extractor in (PROCESSOR_EXTRACTOR, UNWRAP_EXTRACTOR, FORMATTER_EXTRACTOR)}
@@ -1,17 +1,20 @@
 """
 Agente para busca de dados usando Langflow.
 """
-import json
-import time
-import requests
 from typing import Optional, Dict, Any
 
 from src.config.settings import active_config
+from src.services.cache import FetchCache
+from src.services.agents.langflow.client import LangflowClient, decode_json_response
 from src.services.agents.base import BaseDataFetcherAgent
+from src.utils import json_codec
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Leitor de páginas acionado pelo fluxo do Langflow a cada busca
+JINA_READER_URL = "https://r.jina.ai/"
+
 class LangflowFetcherAgent(BaseDataFetcherAgent):
     """
     Agente para busca de dados usando a API do Langflow.
@@ -29,19 +32,27 @@ class LangflowFetcherAgent(BaseDataFetcherAgent):
         """
         super().__init__(name, description)
         self.url = api_url or active_config.LANGFLOW_FETCHER_API_URL
-        self.max_retries = active_config.MAX_RETRIES
-        self.retry_delay = active_config.RETRY_DELAY
         self.timeout = active_config.REQUEST_TIMEOUT
-
-    def fetch_data(self, source: str) -> Optional[str]:
+        # Cada execução do fluxo também consome uma leitura do r.jina.ai
+        self.client = LangflowClient(self.url, timeout=self.timeout, rate_limit_also=[JINA_READER_URL])
+        self.cache = FetchCache()
+        # Fluxos diferentes (ou versões do mesmo fluxo) respondem de forma diferente à mesma
+        # URL, então as respostas armazenadas ficam separadas por fluxo e versão
+        self.flow_version = active_config.LANGFLOW_FETCHER_FLOW_VERSION
+        self.cache_namespace = f"{self.url}@{self.flow_version}" if self.flow_version else self.url
+
+    def fetch_data(self, source: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Busca dados usando o Langflow.
+        Respostas do mesmo fluxo são reaproveitadas do cache de busca enquanto não expiram; com o
+        disjuntor do fluxo aberto, o cache é usado mesmo quando ignorado explicitamente.
 
         Args:
             source (str): URL ou texto a ser processado pelo Langflow
+            use_cache (bool): Se False, ignora o cache e força uma nova coleta
 
         Returns:
-            Optional[str]: Resposta do Langflow ou None em caso de erro
+            Optional[Dict[str, Any]]: Resposta do Langflow já decodificada ou None em caso de erro
         """
         # Log para depuração
         logger.info(f"Fetcher recebeu URL original: {source}")
@@ -55,11 +66,31 @@ class LangflowFetcherAgent(BaseDataFetcherAgent):
         formatted_url = self._format_url_for_bot(source)
         logger.info(f"URL formatada para o bot: {formatted_url}")
 
+        if use_cache:
+            cached = self.cache.get(formatted_url, namespace=self.cache_namespace)
+            if cached is not None:
+                return cached
+        else:
+            self.cache.record_bypass()
+
         # Prepara o payload com a URL formatada
         payload = self._prepare_payload(formatted_url)
         headers = self._get_headers()
 
-        return self._make_request(payload, headers)
+        # Quando o cache é ignorado explicitamente, também evita caches intermediários
+        if not use_cache:
+            headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+            headers['Pragma'] = 'no-cache'
+
+        response_data = self._make_request(payload, headers)
+        if response_data:
+            self.cache.set(formatted_url, response_data, namespace=self.cache_namespace)
+        elif not use_cache and self.client.is_circuit_open():
+            # Com o fluxo indisponível, a resposta armazenada é melhor que nenhuma
+            logger.warning("Circuito aberto; usando a resposta do cache apesar do pedido para ignorá-lo")
+            return self.cache.get(formatted_url, namespace=self.cache_namespace)
+
+        return response_data
 
     def _format_url_for_bot(self, url: str) -> str:
         """
@@ -142,91 +173,26 @@ class LangflowFetcherAgent(BaseDataFetcherAgent):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-    def _make_request(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Optional[str]:
+    def _make_request(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """
-        Faz a requisição para a API do Langflow com retry.
+        Faz a requisição para a API do Langflow com a política de retentativas compartilhada.
 
         Args:
             payload (Dict[str, Any]): Payload da requisição
             headers (Dict[str, str]): Cabeçalhos da requisição
 
         Returns:
-            Optional[str]: Resposta da API ou None em caso de erro
+            Optional[Dict[str, Any]]: Resposta da API já decodificada ou None em caso de erro
         """
         # Log do payload para depuração
-        logger.info(f"Payload da requisição: {json.dumps(payload)}")
+        logger.info(f"Payload da requisição: {payload}")
 
-        for attempt in range(self.max_retries):
-            try:
-                logger.info(f"Tentativa {attempt + 1} de {self.max_retries}")
-                logger.info(f"Fazendo requisição para URL: {self.url}")
-
-                # Adiciona headers para evitar cache
-                headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                headers['Pragma'] = 'no-cache'
-                headers['Expires'] = '0'
-
-                # Adiciona um timestamp ao payload para evitar cache
-                payload['timestamp'] = str(time.time())
-
-                response = requests.request(
-                    "POST",
-                    self.url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.timeout
-                )
-
-                logger.info(f"Status Code: {response.status_code}")
-
-                if response.status_code == 504:
-                    logger.warning("Erro 504 (Gateway Timeout) detectado. Tentando novamente...")
-                    if attempt < self.max_retries - 1:
-                        logger.info(f"Aguardando {self.retry_delay} segundos antes da próxima tentativa...")
-                        time.sleep(self.retry_delay)
-                        continue
-                    else:
-                        logger.error("Número máximo de tentativas atingido.")
-                        return None
-
-                response.raise_for_status()
-
-                # Verifica se a resposta é um JSON válido
-                try:
-                    data = response.json()
-                    logger.info("Resposta JSON recebida com sucesso")
-                    logger.info(f"Estrutura da resposta: {json.dumps(data)[:200]}...")
-
-                    # Verifica se a resposta contém o prefixo r.jina.ai
-                    response_text = response.text
-                    if "r.jina.ai" in response_text:
-                        logger.warning(f"A resposta contém o prefixo r.jina.ai: {response_text[:200]}...")
-
-                    # Log adicional para depuração
-                    logger.info(f"Resposta completa do Langflow (primeiros 500 caracteres): {response_text[:500]}...")
-
-                    return response_text
-                except json.JSONDecodeError:
-                    logger.error("Resposta não é um JSON válido")
-                    logger.error(f"Conteúdo da resposta: {response.text[:500]}")  # Mostra os primeiros 500 caracteres
-                    return None
-
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout na tentativa {attempt + 1}. Tentando novamente...")
-                if attempt < self.max_retries - 1:
-                    logger.info(f"Aguardando {self.retry_delay} segundos antes da próxima tentativa...")
-                    time.sleep(self.retry_delay)
-                else:
-                    logger.error("Número máximo de tentativas atingido.")
-                    return None
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Erro na requisição à API: {e}")
-                if attempt < self.max_retries - 1:
-                    logger.info(f"Aguardando {self.retry_delay} segundos antes da próxima tentativa...")
-                    time.sleep(self.retry_delay)
-                else:
-                    logger.error("Número máximo de tentativas atingido.")
-                    return None
-
-        return None
+        response = self.client.post(payload, headers)
+        if response is None:
+            return None
+
+        # Verifica se a resposta contém o prefixo r.jina.ai (busca nos bytes, sem decodificar)
+        if b"r.jina.ai" in response.content:
+            logger.warning(f"A resposta contém o prefixo r.jina.ai: {json_codec.preview(response.content, 200)}...")
+
+        return decode_json_response(response)
@@ -1,18 +1,45 @@
 """
 Agente para formatação de dados do Langflow.
 """
-import json
-import time
-import requests
-from typing import List, Dict, Any, Union, Optional
-
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.services.agents.langflow.client import LangflowClient, decode_json_response, iter_response_text
+from src.services.agents.langflow.extraction import FORMATTER_EXTRACTOR, FORMATTER_STREAM_PATHS
+from src.services.cache.memo_cache import MemoCache, memoization, memoization_enabled
+from src.services.deadline import current_deadline
+from src.services.http.retry import get_default_retry_policy
 from src.services.agents.base import BaseDataProcessorAgent
+from src.services.agents.interfaces import (
+    IncompleteResultError,
+    IncrementalDataProcessorAgentInterface,
+    StreamingDataProcessorAgentInterface
+)
+from src.utils import json_codec
+from src.utils.json_stream import JsonArrayStreamParser, JsonPathStreamReader, iter_json_array_items
 from src.utils.logging import get_logger
 from src.config.settings import active_config
 
 logger = get_logger(__name__)
 
-class LangflowFormatterAgent(BaseDataProcessorAgent):
+# Espaço de nomes das saídas memoizadas do fluxo de formatação
+MEMO_NAMESPACE = "formatter"
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estima o número de tokens de um texto (cerca de 4 bytes por token).
+
+    Args:
+        text (str): Texto a estimar
+
+    Returns:
+        int: Número estimado de tokens
+    """
+    return (len(text.encode("utf-8")) + 3) // 4
+
+class LangflowFormatterAgent(BaseDataProcessorAgent, StreamingDataProcessorAgentInterface,
+                             IncrementalDataProcessorAgentInterface):
     """
     Agente para formatação de dados processados pelo Langflow.
     """
@@ -21,7 +48,9 @@ class LangflowFormatterAgent(BaseDataProcessorAgent):
                  description: str = "Agente para formatação de dados processados pelo Langflow",
                  api_url: str = None,
                  timeout: int = None,
-                 max_retries: int = None):
+                 max_retries: int = None,
+                 chunk_max_tokens: int = None,
+                 chunk_concurrency: int = None):
         """
         Inicializa o agente de formatação Langflow.
 
@@ -31,15 +60,25 @@ class LangflowFormatterAgent(BaseDataProcessorAgent):
             api_url (str): URL da API do Langflow (opcional)
             timeout (int): Timeout para requisições em segundos (opcional)
             max_retries (int): Número máximo de tentativas (opcional)
+            chunk_max_tokens (int): Tamanho máximo de cada parte da entrada em tokens estimados (opcional)
+            chunk_concurrency (int): Partes formatadas simultaneamente (opcional)
         """
         super().__init__(name, description)
         self.url = api_url or active_config.LANGFLOW_FORMATTER_API_URL
         self.timeout = timeout or active_config.REQUEST_TIMEOUT
-        self.max_retries = max_retries or active_config.MAX_RETRIES
+        self.retry_policy = get_default_retry_policy().with_overrides(max_attempts=max_retries)
+        self.max_retries = self.retry_policy.max_attempts
+        self.client = LangflowClient(self.url, timeout=self.timeout, retry_policy=self.retry_policy)
+        self.chunk_max_tokens = active_config.FORMATTER_CHUNK_MAX_TOKENS if chunk_max_tokens is None else chunk_max_tokens
+        self.chunk_concurrency = max(1, chunk_concurrency or active_config.FORMATTER_CHUNK_CONCURRENCY)
+        self.chunk_retries = max(0, active_config.FORMATTER_CHUNK_RETRIES)
+        self.flow_version = active_config.LANGFLOW_FORMATTER_FLOW_VERSION
+        self.memo = MemoCache()
 
     def process_data(self, data: Union[str, List[Dict[str, Any]]]) -> Union[List[Dict[str, Any]], None]:
         """
         Formata os dados processados pelo agente anterior usando a API do Langflow.
+        Entradas já formatadas antes para o mesmo fluxo reaproveitam o resultado memoizado.
 
         Args:
             data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
@@ -52,66 +91,43 @@ class LangflowFormatterAgent(BaseDataProcessorAgent):
             logger.error("Dados vazios recebidos para formatação")
             return None
 
-        try:
-            # Converte os dados para o formato esperado pelo Langflow
-            if isinstance(data, list) and all(isinstance(item, dict) for item in data):
-                logger.info("Recebeu lista de dicionários, convertendo para JSON")
-                input_data = json.dumps(data)
-            elif isinstance(data, str):
-                # Verifica explicitamente se é uma string
-                logger.info(f"Recebeu dado do tipo: {type(data).__name__}")
-
-                # Verifica se a string não está vazia
-                if not data.strip():
-                    logger.error("String recebida está vazia ou contém apenas espaços")
-                    return None
-
-                # Verifica se é um JSON válido
-                try:
-                    # Tenta validar como JSON
-                    json.loads(data)
-                    logger.info("Recebeu string JSON válida")
-                    input_data = data
-                except json.JSONDecodeError as e:
-                    # Se não for um JSON válido, pode ser apenas texto bruto
-                    logger.info("Recebeu texto bruto (não é JSON)")
-                    logger.debug(f"Primeiros 200 caracteres do texto: {data[:200]}")
-                    # Usa o texto como está, sem tentar interpretá-lo como JSON
-                    input_data = data
-            else:
-                logger.error(f"Formato de dados não suportado: {type(data)}")
+        memoize = memoization_enabled()
+        chunks = self._split_input(data)
+        if not chunks:
+            return None
+        if len(chunks) > 1:
+            try:
+                formatted_products = list(self._format_chunks(chunks, memoize))
+            except IncompleteResultError as e:
+                logger.error(f"Formatação incompleta: {e}")
                 return None
+            logger.info(f"Produtos extraídos com sucesso: {len(formatted_products)} produtos de {len(chunks)} partes")
+            return formatted_products
+
+        try:
+            # A parte única já é o texto de entrada serializado
+            input_data = chunks[0]
+            cached = self._memoized(input_data, memoize)
+            if cached is not None:
+                return cached
 
             # Prepara o payload para a API do Langflow
             payload = self._prepare_payload(input_data)
             headers = self._get_headers()
 
-            # Faz a requisição para a API do Langflow
-            response_text = self._make_request(payload, headers)
-            if not response_text:
+            # Faz a requisição para a API do Langflow (a resposta chega já decodificada)
+            response_data = self._make_request(payload, headers)
+            if not response_data:
                 logger.error("Não foi possível obter resposta da API do Langflow")
                 return None
 
-            # Log detalhado da resposta
-            logger.info("Resposta recebida do Langflow")
-            logger.debug(f"Primeiros 1000 caracteres da resposta: {response_text[:1000]}")
-
-            # Processa a resposta
-            try:
-                response_data = json.loads(response_text)
-                logger.info("Resposta convertida para JSON com sucesso")
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro ao converter resposta para JSON: {e}")
-                logger.error(f"Resposta inválida: {response_text[:500]}...")
-                return None
-
             # Tenta extrair os produtos
             formatted_products = self._extract_products_from_response(response_data)
 
             # Log do resultado da extração
             if formatted_products:
                 logger.info(f"Produtos extraídos com sucesso: {len(formatted_products)} produtos")
-                logger.debug(f"Primeiro produto: {json.dumps(formatted_products[0]) if formatted_products else 'Nenhum'}")
+                logger.debug(f"Primeiro produto: {formatted_products[0]}")
             else:
                 logger.error("Não foi possível extrair produtos da resposta")
 
@@ -119,14 +135,385 @@ class LangflowFormatterAgent(BaseDataProcessorAgent):
                 logger.error("Não foi possível extrair produtos formatados da resposta")
                 return None
 
+            self._memoize(input_data, formatted_products, memoize)
             return formatted_products
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.error(f"Erro ao decodificar JSON: {e}")
             return None
         except Exception as e:
             logger.error(f"Erro ao formatar dados: {str(e)}")
             return None
 
+    def process_data_stream(self, data: Union[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Formata os dados usando o modo streaming do Langflow, entregando cada produto
+        assim que o formatador termina de emiti-lo.
+
+        Se o fluxo não emitir tokens (ex.: componentes sem streaming), usa o resultado
+        final da execução; se a transmissão for interrompida sem produzir nada,
+        recorre à chamada convencional.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados, na ordem em que ficam prontos
+
+        Raises:
+            IncompleteResultError: Se uma das partes de uma entrada dividida não puder ser formatada
+        """
+        # A opção de memoização da requisição é lida agora, não quando o gerador for consumido
+        return self._stream_products(data, memoization_enabled())
+
+    def _stream_products(self, data: Union[str, List[Dict[str, Any]]], memoize: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Implementa process_data_stream.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+            memoize (bool): Se resultados memoizados podem ser usados e gravados
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados, na ordem em que ficam prontos
+        """
+        if not data:
+            logger.error("Dados vazios recebidos para formatação")
+            return
+
+        chunks = self._split_input(data)
+        if len(chunks) > 1:
+            yield from self._format_chunks(chunks, memoize)
+            return
+        if not chunks:
+            return
+
+        input_data = chunks[0]
+
+        cached = self._memoized(input_data, memoize)
+        if cached is not None:
+            yield from cached
+            return
+
+        parser = JsonArrayStreamParser()
+        delivered: List[Dict[str, Any]] = []
+        final_result = None
+        received = False
+
+        for event in self.client.stream(self._prepare_payload(input_data), self._get_headers()):
+            received = True
+            kind = event.get("event")
+            body = event.get("data") or {}
+            if kind == "token":
+                for item in parser.feed(body.get("chunk") or ""):
+                    if isinstance(item, dict):
+                        delivered.append(item)
+                        yield item
+            elif kind == "end":
+                final_result = body.get("result")
+            elif kind == "error":
+                logger.error(f"Erro na transmissão do Langflow: {body}")
+                break
+
+        if delivered:
+            logger.info(f"Produtos formatados transmitidos: {len(delivered)}")
+            self._memoize(input_data, delivered, memoize)
+        elif isinstance(final_result, dict):
+            products = self._extract_products_from_response(final_result) or []
+            self._memoize(input_data, products, memoize)
+            yield from products
+        elif received:
+            # Sem eventos, a requisição já falhou após todas as tentativas; não vale repetir
+            logger.warning("Transmissão sem produtos; usando a chamada convencional do Langflow")
+            with memoization(memoize):
+                products = self.process_data(data) or []
+            yield from products
+
+    def process_data_iter(self, data: Union[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Formata os dados lendo a resposta do Langflow de forma incremental: os produtos
+        são extraídos à medida que o corpo chega, sem decodificar a resposta inteira
+        nem a string JSON aninhada. Se nenhum dos caminhos incrementais entregar
+        produtos, a resposta já recebida passa pelo extrator completo (sem nova chamada ao fluxo).
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados, na ordem em que são lidos
+
+        Raises:
+            IncompleteResultError: Se uma das partes de uma entrada dividida não puder ser formatada
+        """
+        # A opção de memoização da requisição é lida agora, não quando o gerador for consumido
+        return self._iter_products(data, memoization_enabled())
+
+    def _iter_products(self, data: Union[str, List[Dict[str, Any]]], memoize: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Implementa process_data_iter. Os produtos de uma parte são guardados apenas para
+        a memoização, então a memória fica limitada ao tamanho de uma parte. O corpo da
+        resposta só é guardado até o primeiro produto, para o extrator completo.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+            memoize (bool): Se resultados memoizados podem ser usados e gravados
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados, na ordem em que são lidos
+        """
+        if not data:
+            logger.error("Dados vazios recebidos para formatação")
+            return
+
+        chunks = self._split_input(data)
+        if len(chunks) > 1:
+            yield from self._format_chunks(chunks, memoize)
+            return
+        if not chunks:
+            return
+
+        input_data = chunks[0]
+
+        cached = self._memoized(input_data, memoize)
+        if cached is not None:
+            yield from cached
+            return
+
+        payload = self._prepare_payload(input_data)
+        logger.info(f"Payload da requisição: {len(input_data)} caracteres de entrada (leitura incremental)")
+        response = self.client.open_response(payload, self._get_headers())
+        if response is None:
+            return
+
+        reader = JsonPathStreamReader(FORMATTER_STREAM_PATHS)
+        delivered: List[Dict[str, Any]] = []
+        buffered: Optional[List[str]] = []
+        with response:
+            try:
+                for chunk in iter_response_text(response):
+                    if buffered is not None:
+                        buffered.append(chunk)
+                    for item in reader.feed(chunk):
+                        if isinstance(item, dict):
+                            buffered = None
+                            delivered.append(item)
+                            yield item
+                    if reader.done and delivered:
+                        break
+            except Exception as e:
+                logger.error(f"Erro na leitura incremental da resposta do Langflow: {str(e)}")
+                return
+
+        if delivered:
+            logger.info(f"Produtos lidos de forma incremental: {len(delivered)}")
+            self._memoize(input_data, delivered, memoize)
+            return
+
+        # Caminhos com curingas ou decodificação aninhada só existem no extrator completo
+        logger.warning("Leitura incremental sem produtos; usando o extrator completo na resposta recebida")
+        try:
+            response_data = json_codec.loads("".join(buffered))
+        except json_codec.JSONDecodeError as e:
+            logger.error(f"Erro ao decodificar JSON: {e}")
+            return
+        products = self._extract_products_from_response(response_data) if isinstance(response_data, dict) else None
+        if not products:
+            logger.error("Não foi possível extrair produtos da resposta")
+            return
+        self._memoize(input_data, products, memoize)
+        yield from products
+
+    def _split_input(self, data: Union[str, List[Dict[str, Any]]]) -> List[str]:
+        """
+        Divide a entrada em partes de até chunk_max_tokens tokens estimados.
+        Registros (lista de dicionários ou array JSON) nunca são divididos ao meio;
+        textos livres são divididos entre parágrafos e, se preciso, entre linhas.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+
+        Returns:
+            List[str]: Textos de entrada de cada parte, já serializados; uma única parte indica que a
+                entrada não precisa ser dividida e nenhuma, que o formato não é suportado
+        """
+        input_data = self._prepare_input_data(data)
+        if input_data is None:
+            return []
+        if self.chunk_max_tokens <= 0 or estimate_tokens(input_data) <= self.chunk_max_tokens:
+            return [input_data]
+
+        if isinstance(data, list):
+            records = data
+        else:
+            records = [item for item in iter_json_array_items([input_data]) if isinstance(item, dict)]
+
+        if records:
+            pieces = [json_codec.dumps(record) for record in records]
+            chunks = [f"[{','.join(group)}]" for group in self._pack(pieces, separator_tokens=1)]
+        else:
+            pieces = []
+            for paragraph in input_data.split("\n\n"):
+                if estimate_tokens(paragraph) > self.chunk_max_tokens:
+                    pieces.extend(paragraph.splitlines())
+                else:
+                    pieces.append(paragraph)
+            chunks = ["\n\n".join(group) for group in self._pack(pieces, separator_tokens=1)]
+
+        logger.info(f"Entrada com ~{estimate_tokens(input_data)} tokens dividida em {len(chunks)} partes")
+        return chunks
+
+    def _pack(self, pieces: List[str], separator_tokens: int) -> List[List[str]]:
+        """
+        Agrupa pedaços consecutivos sem ultrapassar chunk_max_tokens por grupo.
+        Um pedaço maior que o limite forma um grupo sozinho.
+
+        Args:
+            pieces (List[str]): Pedaços, na ordem original
+            separator_tokens (int): Tokens estimados do separador entre pedaços
+
+        Returns:
+            List[List[str]]: Grupos de pedaços, na ordem original
+        """
+        groups: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for piece in pieces:
+            tokens = estimate_tokens(piece) + separator_tokens
+            if current and size + tokens > self.chunk_max_tokens:
+                groups.append(current)
+                current, size = [], 0
+            current.append(piece)
+            size += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def _format_chunks(self, chunks: List[str], memoize: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Formata as partes simultaneamente e entrega os produtos na ordem original.
+        O tempo total acompanha a parte mais lenta; uma parte que falha é repetida
+        sozinha, sem refazer as demais.
+
+        Args:
+            chunks (List[str]): Textos de entrada de cada parte
+            memoize (bool): Se resultados memoizados podem ser usados e gravados
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados, na ordem das partes
+
+        Raises:
+            IncompleteResultError: Se uma parte continuar sem produtos após as tentativas
+                (os produtos das partes anteriores já podem ter sido entregues)
+        """
+        workers = min(self.chunk_concurrency, len(chunks))
+        logger.info(f"Formatando {len(chunks)} partes com {workers} requisições simultâneas")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="formatter")
+        try:
+            # Cada parte respeita o prazo da requisição do chamador
+            futures = [executor.submit(contextvars.copy_context().run, self._format_chunk, index, chunk, memoize)
+                       for index, chunk in enumerate(chunks)]
+            for index, future in enumerate(futures):
+                products = future.result()
+                if products is None:
+                    raise IncompleteResultError(f"a parte {index + 1} de {len(chunks)} não pôde ser formatada")
+                yield from products
+        finally:
+            # Se o consumidor desistir, descarta as partes ainda não iniciadas
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _format_chunk(self, index: int, input_data: str, memoize: bool) -> Optional[List[Dict[str, Any]]]:
+        """
+        Formata uma parte da entrada, repetindo-a se a resposta não tiver produtos.
+        Cada parte é memoizada separadamente, então listas que mudam pouco
+        reaproveitam as partes que não mudaram.
+
+        Args:
+            index (int): Posição da parte
+            input_data (str): Texto de entrada da parte
+            memoize (bool): Se resultados memoizados podem ser usados e gravados
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Produtos da parte ou None se todas as tentativas falharem
+        """
+        cached = self._memoized(input_data, memoize)
+        if cached is not None:
+            return cached
+
+        payload = self._prepare_payload(input_data)
+        headers = self._get_headers()
+        deadline = current_deadline()
+        for attempt in range(1, self.chunk_retries + 2):
+            if deadline is not None and deadline.expired:
+                logger.error(f"Prazo da requisição esgotado antes de formatar a parte {index + 1}")
+                return None
+            try:
+                response_data = self._make_request(payload, headers)
+                products = self._extract_products_from_response(response_data) if response_data else None
+            except Exception as e:
+                logger.error(f"Erro ao formatar a parte {index + 1}: {str(e)}")
+                products = None
+            if products:
+                self._memoize(input_data, products, memoize)
+                return products
+            if attempt <= self.chunk_retries:
+                logger.warning(f"Parte {index + 1} sem produtos; nova tentativa ({attempt} de {self.chunk_retries})")
+        return None
+
+    def _memoized(self, input_data: str, memoize: bool) -> Optional[List[Dict[str, Any]]]:
+        """
+        Obtém o resultado memoizado de uma entrada.
+
+        Args:
+            input_data (str): Texto de entrada do fluxo
+            memoize (bool): Se resultados memoizados podem ser usados
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Produtos memoizados ou None
+        """
+        with memoization(memoize):
+            return self.memo.get(MEMO_NAMESPACE, input_data, flow=self.url, version=self.flow_version)
+
+    def _memoize(self, input_data: str, products: Optional[List[Dict[str, Any]]], memoize: bool) -> None:
+        """
+        Memoiza os produtos obtidos para uma entrada.
+
+        Args:
+            input_data (str): Texto de entrada do fluxo
+            products (Optional[List[Dict[str, Any]]]): Produtos formatados
+            memoize (bool): Se o resultado pode ser gravado
+        """
+        if products:
+            with memoization(memoize):
+                self.memo.set(MEMO_NAMESPACE, input_data, products, flow=self.url, version=self.flow_version)
+
+    def _prepare_input_data(self, data: Union[str, List[Dict[str, Any]]]) -> Optional[str]:
+        """
+        Converte os dados recebidos para o texto de entrada do fluxo.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+
+        Returns:
+            Optional[str]: Texto de entrada ou None se o formato não for suportado
+        """
+        # Converte os dados para o formato esperado pelo Langflow
+        if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+            logger.info("Recebeu lista de dicionários, convertendo para JSON")
+            input_data = json_codec.dumps(data)
+        elif isinstance(data, str):
+            # Verifica se a string não está vazia
+            if not data.strip():
+                logger.error("String recebida está vazia ou contém apenas espaços")
+                return None
+
+            # JSON ou texto bruto seguem como estão; o fluxo recebe texto de qualquer forma
+            logger.info(f"Recebeu texto com {len(data)} caracteres")
+            input_data = data
+        else:
+            logger.error(f"Formato de dados não suportado: {type(data)}")
+            return None
+
+        return input_data
+
     def _prepare_payload(self, input_data: str) -> Dict[str, Any]:
         """
         Prepara o payload para a API do Langflow.
@@ -167,67 +554,25 @@ class LangflowFormatterAgent(BaseDataProcessorAgent):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-    def _make_request(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Optional[str]:
+    def _make_request(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """
-        Faz a requisição para a API do Langflow com retry.
+        Faz a requisição para a API do Langflow com a política de retentativas compartilhada.
 
         Args:
             payload (Dict[str, Any]): Payload da requisição
             headers (Dict[str, str]): Cabeçalhos da requisição
 
         Returns:
-            Optional[str]: Resposta da API ou None em caso de erro
+            Optional[Dict[str, Any]]: Resposta da API já decodificada ou None em caso de erro
         """
-        # Log do payload para depuração
-        logger.info(f"Payload da requisição: {json.dumps(payload)}")
+        # O payload leva todos os produtos; registra apenas o tamanho
+        logger.info(f"Payload da requisição: {len(payload['inputs']['text'])} caracteres de entrada")
 
-        for attempt in range(self.max_retries):
-            try:
-                logger.info(f"Tentativa {attempt + 1} de {self.max_retries}")
-                logger.info(f"Fazendo requisição para URL: {self.url}")
-
-                # Adiciona headers para evitar cache
-                headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                headers['Pragma'] = 'no-cache'
-                headers['Expires'] = '0'
-
-                # Adiciona um timestamp ao payload para evitar cache
-                payload['timestamp'] = str(time.time())
-
-                response = requests.request(
-                    "POST",
-                    self.url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.timeout
-                )
-
-                response.raise_for_status()
-
-                # Verifica se a resposta é um JSON válido
-                try:
-                    data = response.json()
-                    logger.info("Resposta JSON recebida com sucesso")
-                    logger.info(f"Estrutura da resposta: {json.dumps(data)[:200]}...")
-
-                    # Log adicional para depuração
-                    response_text = response.text
-                    logger.info(f"Resposta completa do Langflow (primeiros 500 caracteres): {response_text[:500]}...")
-
-                    return response_text
-                except json.JSONDecodeError:
-                    logger.error("Resposta não é um JSON válido")
-                    logger.error(f"Conteúdo da resposta: {response.text[:500]}")  # Mostra os primeiros 500 caracteres
-                    return None
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Erro na requisição (tentativa {attempt + 1}): {str(e)}")
-                if attempt == self.max_retries - 1:  # Última tentativa
-                    logger.error("Número máximo de tentativas atingido")
-                    return None
-                time.sleep(active_config.RETRY_DELAY)  # Espera antes de tentar novamente
+        response = self.client.post(payload, headers)
+        if response is None:
+            return None
 
-        return None
+        return decode_json_response(response)
 
     def _extract_products_from_response(self, response_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
         """
@@ -239,113 +584,11 @@ class LangflowFormatterAgent(BaseDataProcessorAgent):
         Returns:
             Optional[List[Dict[str, Any]]]: Lista de produtos formatados ou None se não for possível extrair
         """
-        try:
-            # Log da estrutura da resposta para depuração
-            logger.info(f"Estrutura da resposta: {json.dumps(response_data)[:500]}...")
-
-            # Tenta extrair produtos de diferentes maneiras
-
-            # Método 0: Estrutura específica para o formato {"results": {"text": {"text_key": "text", "data": {"text": "[...]"}}}}
-            if "outputs" in response_data and len(response_data["outputs"]) > 0:
-                outputs = response_data["outputs"][0]
-                logger.info(f"Outputs encontrados: {json.dumps(outputs)[:200]}...")
-
-                if "outputs" in outputs and len(outputs["outputs"]) > 0:
-                    outputssecond = outputs["outputs"][0]
-                    logger.info(f"Segundo nível de outputs: {json.dumps(outputssecond)[:200]}")
-
-                    # Verifica se tem a estrutura esperada com "results" > "text" > "data" > "text"
-                    if isinstance(outputssecond, dict) and "results" in outputssecond:
-                        results_obj = outputssecond["results"]
-                        logger.info(f"Objeto results: {json.dumps(results_obj)[:200]}")
-
-                        if isinstance(results_obj, dict) and "text" in results_obj:
-                            text_obj = results_obj["text"]
-                            logger.info(f"Objeto text: {json.dumps(text_obj)[:200]}")
-
-                            if isinstance(text_obj, dict) and "data" in text_obj:
-                                data_obj = text_obj["data"]
-                                logger.info(f"Objeto data: {json.dumps(data_obj)[:200]}")
-
-                                if isinstance(data_obj, dict) and "text" in data_obj:
-                                    text_content = data_obj["text"]
-                                    logger.info(f"Conteúdo text: {text_content[:200]}")
-
-                                    # Tenta converter o conteúdo para JSON
-                                    try:
-                                        products = json.loads(text_content)
-                                        if isinstance(products, list):
-                                            logger.info(f"Extraiu {len(products)} produtos do campo 'text' em 'data' (Método 0)")
-                                            return products
-                                        else:
-                                            logger.warning(f"O conteúdo de 'text' não é uma lista: {type(products)}")
-                                    except json.JSONDecodeError as e:
-                                        logger.warning(f"Não foi possível decodificar o JSON do campo 'text': {e}")
-
-            # Método 1: Estrutura padrão do Langflow
-            if "outputs" in response_data and len(response_data["outputs"]) > 0:
-                outputs = response_data["outputs"][0]
-                logger.info(f"Outputs encontrados: {json.dumps(outputs)[:200]}...")
-
-                if "outputs" in outputs and len(outputs["outputs"]) > 0:
-                    outputssecond = outputs["outputs"][0]
-                    logger.info(f"Tipo do resultado: {json.dumps(outputssecond)[:200]}")
-
-                if "data" in outputssecond and len(outputssecond["data"]) > 0:
-                    results = outputssecond["data"][0]
-                    logger.info(f"Tipo do resultado: {json.dumps(results)[:200]}")
-
-                    # Verifica se o resultado é uma string JSON
-                    if isinstance(results, str):
-                        logger.info(f"Resultado é uma string. Primeiros 200 caracteres: {results[:200]}...")
-                        try:
-                            products = json.loads(results)
-                            logger.info(f"Tipo após parse JSON: {type(products)}")
-
-                            if isinstance(products, list):
-                                logger.info(f"Extraiu {len(products)} produtos formatados (Método 1)")
-                                return products
-                            elif isinstance(products, dict) and "data" in products:
-                                # Tenta extrair do campo "data"
-                                data_content = products.get("data")
-                                if isinstance(data_content, list):
-                                    logger.info(f"Extraiu {len(data_content)} produtos do campo 'data' (Método 1.1)")
-                                    return data_content
-                            else:
-                                logger.warning(f"Resultado não é uma lista após parse JSON: {type(products)}")
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Não foi possível decodificar o JSON da resposta: {e}")
-                    # Verifica se o resultado já é uma lista
-                    elif isinstance(results, list):
-                        logger.info(f"Resultado já é uma lista com {len(results)} itens (Método 1.2)")
-                        return results
-                    # Verifica se o resultado é um dicionário
-                    elif isinstance(results, dict):
-                        # Tenta extrair do campo "data"
-                        if "data" in results:
-                            data_content = results.get("data")
-                            if isinstance(data_content, list):
-                                logger.info(f"Extraiu {len(data_content)} produtos do campo 'data' (Método 1.3)")
-                                return data_content
-                        # Tenta extrair do campo "products"
-                        elif "products" in results:
-                            products_content = results.get("products")
-                            if isinstance(products_content, list):
-                                logger.info(f"Extraiu {len(products_content)} produtos do campo 'products' (Método 1.4)")
-                                return products_content
-
-                if isinstance(value, list) and len(value) > 0 and all(isinstance(item, dict) for item in value):
-                    logger.info(f"Encontrou lista de dicionários no campo '{key}' (Método 3)")
-                    return value
-                elif isinstance(value, dict):
-                    for subkey, subvalue in value.items():
-                        if isinstance(subvalue, list) and len(subvalue) > 0 and all(isinstance(item, dict) for item in subvalue):
-                            logger.info(f"Encontrou lista de dicionários no campo '{key}.{subkey}' (Método 3.1)")
-                            return subvalue
-
-            logger.error("Não foi possível extrair produtos da resposta usando nenhum método")
-            logger.error(f"Estrutura de resposta completa: {json.dumps(response_data)}")
-            return None
-        except Exception as e:
-            logger.error(f"Erro ao extrair produtos da resposta: {str(e)}")
+        match = FORMATTER_EXTRACTOR.extract(response_data, flow=self.url)
+        if match is None:
+            logger.error("Não foi possível extrair produtos da resposta usando nenhum caminho")
+            logger.error(f"Chaves da resposta: {list(response_data) if isinstance(response_data, dict) else type(response_data).__name__}")
             return None
+
+        logger.info(f"Extraiu {len(match.value)} produtos pelo caminho '{match.path}'")
+        return match.value
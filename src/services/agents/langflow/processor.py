@@ -1,15 +1,18 @@
 """
 Agente para processamento de dados do Langflow.
 """
-import json
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Union, Optional
 
 from src.services.agents.base import BaseDataProcessorAgent
+from src.services.agents.interfaces import IncrementalDataProcessorAgentInterface
+from src.services.agents.langflow.extraction import PROCESSOR_EXTRACTOR, PROCESSOR_STREAM_PATHS
+from src.utils import json_codec
+from src.utils.json_stream import iter_json_array_items, iter_json_path_items
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-class LangflowProcessorAgent(BaseDataProcessorAgent):
+class LangflowProcessorAgent(BaseDataProcessorAgent, IncrementalDataProcessorAgentInterface):
     """
     Agente para processamento de dados retornados pelo Langflow.
     """
@@ -25,12 +28,13 @@ class LangflowProcessorAgent(BaseDataProcessorAgent):
         """
         super().__init__(name, description)
     
-    def process_data(self, data: str) -> Union[List[Dict[str, Any]], None]:
+    def process_data(self, data: Union[str, bytes, Dict[str, Any]]) -> Union[List[Dict[str, Any]], None]:
         """
         Processa os dados JSON retornados pelo Langflow.
         
         Args:
-            data (str): String JSON retornada pelo Langflow
+            data (Union[str, bytes, Dict[str, Any]]): Resposta do Langflow, já decodificada
+                pelo agente de busca ou ainda em JSON
             
         Returns:
             Union[List[Dict[str, Any]], None]: Lista de produtos processados ou None em caso de erro
@@ -40,8 +44,8 @@ class LangflowProcessorAgent(BaseDataProcessorAgent):
             return None
             
         try:
-            # Converte a string JSON para um dicionário
-            response_data = json.loads(data)
+            # Decodifica apenas se o agente de busca entregou o JSON ainda em texto
+            response_data = json_codec.loads(data) if isinstance(data, (str, bytes)) else data
             
             # Navega pela estrutura aninhada para extrair os produtos
             products = self._extract_products_from_response(response_data)
@@ -52,7 +56,7 @@ class LangflowProcessorAgent(BaseDataProcessorAgent):
                 
             return products
             
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.error(f"Erro ao decodificar JSON: {e}")
             return None
         except KeyError as e:
@@ -62,6 +66,47 @@ class LangflowProcessorAgent(BaseDataProcessorAgent):
             logger.error(f"Erro inesperado ao processar dados: {e}")
             return None
     
+    def process_data_iter(self, data: Union[str, bytes, Dict[str, Any], Iterable[str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Extrai os produtos da resposta do Langflow de forma incremental, sem decodificar
+        a resposta inteira nem a string JSON aninhada.
+
+        Args:
+            data (Union[str, bytes, Dict[str, Any], Iterable[str]]): Resposta do Langflow, já
+                decodificada, em JSON ou como pedaços de texto na ordem em que chegam
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos, na ordem em que são lidos
+        """
+        if not data:
+            logger.error("Dados vazios recebidos para processamento")
+            return
+
+        if isinstance(data, (dict, list)):
+            # Resposta já decodificada: só o texto com os produtos resta a ler
+            value = self._extract_products_from_response(data)
+            if isinstance(value, str):
+                items = iter_json_array_items([value])
+            else:
+                items = value if isinstance(value, list) else []
+        else:
+            if isinstance(data, bytes):
+                data = data.decode("utf-8", errors="replace")
+            chunks = [data] if isinstance(data, str) else data
+            items = iter_json_path_items(chunks, PROCESSOR_STREAM_PATHS)
+
+        delivered = 0
+        try:
+            for item in items:
+                if isinstance(item, dict):
+                    delivered += 1
+                    yield item
+        except Exception as e:
+            logger.error(f"Erro na leitura incremental dos dados: {e}")
+
+        if not delivered:
+            logger.error("Não foi possível extrair produtos da resposta")
+
     def _extract_products_from_response(self, response_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
         """
         Extrai a lista de produtos da estrutura de resposta aninhada do Langflow.
@@ -72,23 +117,9 @@ class LangflowProcessorAgent(BaseDataProcessorAgent):
         Returns:
             Optional[List[Dict[str, Any]]]: Lista de produtos ou None se não for possível extrair
         """
-        try:
-            # Verifica a estrutura da resposta
-            if "outputs" in response_data and len(response_data["outputs"]) > 0:
-                outputs = response_data["outputs"][0]
-                if "outputs" in outputs and len(outputs["outputs"]) > 0:
-                    results = outputs["outputs"][0]
-                    if "results" in results and "text" in results["results"]:
-                        text_data = results["results"]["text"]
-
-                        # Agora sim, temos a lista de produtos
-                        produtos = text_data["text"]
-                        
-                        return produtos
-            
+        match = PROCESSOR_EXTRACTOR.extract(response_data, flow=self.agent_name)
+        if match is None:
             logger.error("Estrutura da resposta não é a esperada")
             return None
-            
-        except Exception as e:
-            logger.error(f"Erro ao extrair produtos da resposta: {e}")
-            return None
+
+        return match.value
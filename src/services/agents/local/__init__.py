@@ -0,0 +1,17 @@
+"""
+Agentes de extração local, sem uso de LLM.
+"""
+from src.services.agents.local.extractor import BestsellerExtractor, ExtractionResult
+from src.services.agents.local.fetcher import LocalExtractorFetcherAgent
+from src.services.agents.local.formatter import LocalFormatterAgent
+from src.services.agents.local.normalizer import ProductNormalizer
+from src.services.agents.local.processor import LocalExtractorProcessorAgent
+
+__all__ = [
+    'BestsellerExtractor',
+    'ExtractionResult',
+    'LocalExtractorFetcherAgent',
+    'LocalExtractorProcessorAgent',
+    'LocalFormatterAgent',
+    'ProductNormalizer'
+]
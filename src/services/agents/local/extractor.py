@@ -0,0 +1,262 @@
+"""
+Extrator determinístico de produtos de páginas de mais vendidos da Amazon.
+Interpreta o markdown gerado pelo r.jina.ai ou o HTML bruto da página com
+expressões regulares pré-compiladas, sem depender de um LLM.
+"""
+import html
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.utils.logging import get_logger
+from src.utils.normalization import parse_price
+
+logger = get_logger(__name__)
+
+# Padrões comuns
+_ASIN = r'(?:/dp/|/gp/product/|/product-reviews/)([A-Z0-9]{10})'
+_PRICE = re.compile(r'R\$\s*([\d.]+(?:,\d{1,2})?)')
+_RATING = re.compile(r'(\d(?:[.,]\d)?)\s+de\s+5\s+estrelas', re.IGNORECASE)
+
+# Padrões do markdown do r.jina.ai
+_MD_TOKEN = re.compile(
+    r'(?P<image>\[!\[(?:Image\s+\d+:\s*)?(?P<alt>[^\]]*)\]\((?P<src>[^)\s]+)\)\]\((?P<image_href>[^)\s]+)\))'
+    r'|(?P<rating>\[(?P<rating_text>\d(?:[.,]\d)?\s+de\s+5\s+estrelas[^\]]*)\]\((?P<rating_href>[^)\s]+)\))'
+    r'|(?P<link>\[(?P<link_text>[^\]\[]+)\]\((?P<href>[^)\s]+)\))'
+    r'|(?P<price>R\$\s*(?P<price_value>[\d.]+(?:,\d{1,2})?))'
+    r'|(?P<rank>(?<![\w/])#(?P<rank_value>\d{1,3})(?!\d))',
+    re.IGNORECASE
+)
+_MD_ASIN = re.compile(_ASIN)
+
+# Padrões do HTML bruto
+_HTML_ITEM_SPLIT = re.compile(r'id="gridItemRoot"|id="p13n-asin-index-\d+"')
+_HTML_RANK = re.compile(r'class="zg-bdg-text"[^>]*>\s*#(\d+)')
+_HTML_IMAGE = re.compile(r'<img[^>]*?alt="([^"]*)"[^>]*?src="([^"]+)"|<img[^>]*?src="([^"]+)"[^>]*?alt="([^"]*)"')
+_HTML_HREF = re.compile(r'href="([^"]*' + _ASIN + r'[^"]*)"')
+_HTML_TITLE = re.compile(r'class="[^"]*(?:line-clamp|p13n-sc-truncate)[^"]*"[^>]*>\s*([^<]+?)\s*<')
+_HTML_RATING = re.compile(r'class="a-icon-alt"[^>]*>\s*([^<]+)<')
+_HTML_COUNT = re.compile(r'class="a-size-small"[^>]*>\s*([\d.]+)\s*<')
+_HTML_TAGS = re.compile(r'<[^>]+>')
+
+_COUNT = re.compile(r'(\d{1,3}(?:\.\d{3})+|\d+)\s*$')
+_REQUIRED_FIELDS = ("titulo", "preco", "url_produto")
+
+@dataclass
+class ExtractionResult:
+    """
+    Resultado de uma extração local.
+
+    Attributes:
+        products (List[Dict[str, Any]]): Produtos extraídos no formato esperado por Product.from_dict
+        confidence (float): Confiança da extração, entre 0 e 1
+        source_format (str): Formato interpretado ("markdown" ou "html")
+    """
+    products: List[Dict[str, Any]] = field(default_factory=list)
+    confidence: float = 0.0
+    source_format: str = "markdown"
+
+def _parse_rating(value: Optional[str]) -> Optional[float]:
+    """
+    Obtém a avaliação média de um texto como "4,7 de 5 estrelas".
+
+    Args:
+        value (Optional[str]): Texto da avaliação
+
+    Returns:
+        Optional[float]: Avaliação ou None se ausente
+    """
+    match = _RATING.search(value or '')
+    return float(match.group(1).replace(',', '.')) if match else None
+
+def _parse_count(value: Optional[str]) -> int:
+    """
+    Obtém o número de avaliações ao final de um texto como "4,7 de 5 estrelas 1.833".
+
+    Args:
+        value (Optional[str]): Texto com a contagem
+
+    Returns:
+        int: Número de avaliações (0 se ausente)
+    """
+    match = _COUNT.search((value or '').strip())
+    return int(match.group(1).replace('.', '')) if match else 0
+
+def _absolute_url(url: str, base_url: str) -> str:
+    """
+    Converte uma URL relativa da Amazon em absoluta.
+
+    Args:
+        url (str): URL possivelmente relativa
+        base_url (str): Esquema e host usados como base
+
+    Returns:
+        str: URL absoluta
+    """
+    if url.startswith('/'):
+        return base_url.rstrip('/') + url
+    return url
+
+class BestsellerExtractor:
+    """
+    Extrai produtos de páginas de mais vendidos da Amazon.
+    """
+
+    def __init__(self, base_url: str = "https://www.amazon.com.br", expected_products: int = 10):
+        """
+        Inicializa o extrator.
+
+        Args:
+            base_url (str): Base usada para completar URLs relativas
+            expected_products (int): Quantidade mínima de produtos esperada de uma página
+                completa; extrações menores têm a confiança reduzida
+        """
+        self.base_url = base_url
+        self.expected_products = expected_products
+
+    def extract(self, content: str) -> ExtractionResult:
+        """
+        Extrai produtos do conteúdo, detectando se é HTML ou markdown.
+
+        Args:
+            content (str): Conteúdo da página
+
+        Returns:
+            ExtractionResult: Produtos extraídos e confiança da extração
+        """
+        if not content:
+            return ExtractionResult()
+
+        if _HTML_ITEM_SPLIT.search(content):
+            products, source_format = self._extract_html(content), "html"
+        else:
+            products, source_format = self._extract_markdown(content), "markdown"
+
+        result = ExtractionResult(products, self._confidence(products), source_format)
+        logger.info(f"Extração local ({source_format}): {len(products)} produtos, "
+                    f"confiança {result.confidence:.2f}")
+        return result
+
+    def _extract_markdown(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Extrai produtos do markdown gerado pelo r.jina.ai.
+        Os tokens são percorridos em ordem e agrupados pelo ASIN dos links.
+
+        Args:
+            content (str): Markdown da página
+
+        Returns:
+            List[Dict[str, Any]]: Produtos extraídos
+        """
+        products: List[Dict[str, Any]] = []
+        current: Optional[Dict[str, Any]] = None
+        current_asin = None
+        pending_rank = None
+
+        for match in _MD_TOKEN.finditer(content):
+            if match.group('rank'):
+                pending_rank = int(match.group('rank_value'))
+                continue
+
+            if match.group('price'):
+                if current is not None and current["preco"] is None:
+                    current["preco"] = parse_price(match.group('price_value'))
+                continue
+
+            href = match.group('image_href') or match.group('rating_href') or match.group('href')
+            asin_match = _MD_ASIN.search(href or '')
+            asin = asin_match.group(1) if asin_match else None
+
+            if asin and asin != current_asin:
+                current_asin = asin
+                current = {
+                    "posicao": pending_rank or len(products) + 1,
+                    "imagem": None,
+                    "titulo": None,
+                    "preco": None,
+                    "rating": None,
+                    "url_produto": None,
+                    "classificacao": 0
+                }
+                products.append(current)
+                pending_rank = None
+
+            if current is None:
+                continue
+
+            if match.group('image'):
+                current["imagem"] = current["imagem"] or match.group('src')
+                current["titulo"] = current["titulo"] or match.group('alt').strip() or None
+                current["url_produto"] = current["url_produto"] or _absolute_url(href, self.base_url)
+            elif match.group('rating'):
+                text = match.group('rating_text')
+                current["rating"] = _parse_rating(text)
+                current["classificacao"] = _parse_count(text)
+            else:
+                text = match.group('link_text').strip()
+                price = _PRICE.search(text)
+                if price:
+                    if current["preco"] is None:
+                        current["preco"] = parse_price(price.group(1))
+                elif asin and len(text) > len(current["titulo"] or ''):
+                    current["titulo"] = text
+                    current["url_produto"] = current["url_produto"] or _absolute_url(href, self.base_url)
+
+        return products
+
+    def _extract_html(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Extrai produtos do HTML bruto da grade de mais vendidos.
+
+        Args:
+            content (str): HTML da página
+
+        Returns:
+            List[Dict[str, Any]]: Produtos extraídos
+        """
+        products = []
+        for block in _HTML_ITEM_SPLIT.split(content)[1:]:
+            href = _HTML_HREF.search(block)
+            if not href:
+                continue
+
+            image = _HTML_IMAGE.search(block)
+            alt, src = (image.group(1), image.group(2)) if image and image.group(2) else \
+                ((image.group(4), image.group(3)) if image else (None, None))
+            title = _HTML_TITLE.search(block)
+            rank = _HTML_RANK.search(block)
+            price = _PRICE.search(html.unescape(_HTML_TAGS.sub(' ', block)))
+            rating = _HTML_RATING.search(block)
+            count = _HTML_COUNT.search(block)
+
+            # Textos e atributos do HTML trazem entidades (ex.: &amp;, &quot;) que não fazem parte do valor
+            products.append({
+                "posicao": int(rank.group(1)) if rank else len(products) + 1,
+                "imagem": html.unescape(src) if src else src,
+                "titulo": html.unescape(title.group(1) if title else alt or '').strip() or None,
+                "preco": parse_price(price.group(1)) if price else None,
+                "rating": _parse_rating(rating.group(1)) if rating else None,
+                "url_produto": _absolute_url(html.unescape(href.group(1)), self.base_url),
+                "classificacao": _parse_count(count.group(1)) if count else 0
+            })
+
+        return products
+
+    def _confidence(self, products: List[Dict[str, Any]]) -> float:
+        """
+        Calcula a confiança da extração.
+        Considera a fração de produtos com os campos obrigatórios e se a
+        quantidade extraída é compatível com uma página completa.
+
+        Args:
+            products (List[Dict[str, Any]]): Produtos extraídos
+
+        Returns:
+            float: Confiança entre 0 e 1
+        """
+        if not products:
+            return 0.0
+
+        complete = sum(1 for product in products if all(product.get(name) for name in _REQUIRED_FIELDS))
+        coverage = min(1.0, len(products) / self.expected_products) if self.expected_products else 1.0
+        return (complete / len(products)) * coverage
@@ -0,0 +1,147 @@
+"""
+Agente de busca com extração local de produtos.
+"""
+from typing import Any, Dict, Optional, Union
+
+import requests
+
+from src.config.settings import active_config
+from src.services.agents.base import BaseDataFetcherAgent
+from src.services.agents.interfaces import DataFetcherAgentInterface
+from src.services.agents.local.extractor import BestsellerExtractor
+from src.services.cache import FetchCache
+from src.services.deadline import current_deadline, remaining_time
+from src.services.http import HttpSessionPool, RateLimiter, RateLimitTimeout
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Marcador que identifica respostas produzidas pela extração local
+LOCAL_EXTRACTOR_MARKER = "local_extractor"
+
+class LocalExtractorFetcherAgent(BaseDataFetcherAgent):
+    """
+    Agente que baixa a página de mais vendidos e extrai os produtos localmente.
+    Quando a confiança da extração é baixa, delega a busca ao agente de
+    fallback (o fluxo LLM do Langflow).
+    """
+
+    def __init__(self, fallback: Optional[DataFetcherAgentInterface] = None,
+                 name: str = "Extrator Local - Busca",
+                 description: str = "Agente que extrai produtos localmente, sem LLM",
+                 reader_url: Optional[str] = None,
+                 min_confidence: Optional[float] = None,
+                 expected_products: Optional[int] = None):
+        """
+        Inicializa o agente de extração local.
+
+        Args:
+            fallback (Optional[DataFetcherAgentInterface]): Agente usado quando a extração local falha
+            name (str): Nome do agente
+            description (str): Descrição do agente
+            reader_url (Optional[str]): Prefixo do leitor de páginas (ex.: https://r.jina.ai/).
+                Se vazio, a página é baixada diretamente em HTML.
+            min_confidence (Optional[float]): Confiança mínima para aceitar a extração local
+            expected_products (Optional[int]): Quantidade de produtos esperada de uma página completa
+        """
+        super().__init__(name, description)
+        self.fallback = fallback
+        self.reader_url = active_config.LOCAL_EXTRACTOR_READER_URL if reader_url is None else reader_url
+        self.min_confidence = min_confidence if min_confidence is not None else active_config.LOCAL_EXTRACTOR_MIN_CONFIDENCE
+        self.extractor = BestsellerExtractor(
+            expected_products=expected_products or active_config.LOCAL_EXTRACTOR_EXPECTED_PRODUCTS
+        )
+        self.timeout = active_config.REQUEST_TIMEOUT
+        self.session_pool = HttpSessionPool()
+        self.rate_limiter = RateLimiter()
+        self.cache = FetchCache()
+
+    def fetch_data(self, source: str, use_cache: bool = True) -> Optional[Union[Dict[str, Any], str]]:
+        """
+        Baixa a página e extrai os produtos localmente.
+
+        Args:
+            source (str): URL da página de mais vendidos
+            use_cache (bool): Se False, ignora o cache e força uma nova coleta
+
+        Returns:
+            Optional[Union[Dict[str, Any], str]]: Produtos extraídos, a resposta do agente
+                de fallback ou None em caso de erro
+        """
+        if not source or not isinstance(source, str):
+            logger.error(f"URL inválida: {source}")
+            return None
+
+        if use_cache:
+            cached = self.cache.get(source, namespace=LOCAL_EXTRACTOR_MARKER)
+            if cached is not None:
+                return cached
+        else:
+            self.cache.record_bypass()
+
+        content = self._download(source)
+        result = self.extractor.extract(content) if content else None
+
+        if result and result.confidence >= self.min_confidence:
+            payload = {
+                "extractor": LOCAL_EXTRACTOR_MARKER,
+                "source_format": result.source_format,
+                "confidence": result.confidence,
+                "products": result.products
+            }
+            self.cache.set(source, payload, namespace=LOCAL_EXTRACTOR_MARKER)
+            return payload
+
+        confidence = result.confidence if result else 0.0
+        if not self.fallback:
+            logger.error(f"Extração local com confiança baixa ({confidence:.2f}) e sem agente de fallback")
+            return None
+
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            logger.error(f"Extração local com confiança baixa ({confidence:.2f}) e prazo esgotado para o fallback")
+            return None
+
+        logger.warning(f"Extração local com confiança baixa ({confidence:.2f}); "
+                       f"usando o agente de fallback '{self.fallback.agent_name}'")
+        return self.fallback.fetch_data(source, use_cache=use_cache)
+
+    def _download(self, source: str) -> Optional[str]:
+        """
+        Baixa o conteúdo da página, pelo leitor de páginas ou diretamente.
+
+        Args:
+            source (str): URL da página
+
+        Returns:
+            Optional[str]: Conteúdo da página ou None em caso de erro
+        """
+        url = source
+        if "r.jina.ai/" in url:
+            url = url.split("r.jina.ai/", 1)[1]
+        if self.reader_url:
+            url = f"{self.reader_url.rstrip('/')}/{url}"
+
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            logger.error("Prazo da requisição esgotado antes do download da página")
+            return None
+
+        try:
+            self.rate_limiter.acquire(url, timeout=remaining_time())
+            session = self.session_pool.get_session(url)
+            response = session.request(
+                method="GET",
+                url=url,
+                headers={"Accept": "text/plain, text/html"},
+                # O timeout do requests não aceita zero, mesmo com o prazo recém-esgotado
+                timeout=max(remaining_time(self.timeout), 0.001)
+            )
+            response.raise_for_status()
+            return response.text
+        except RateLimitTimeout as e:
+            logger.error(f"Limitador de taxa impediu o download dentro do prazo: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Erro ao baixar a página para extração local: {e}")
+            return None
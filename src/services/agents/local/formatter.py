@@ -0,0 +1,153 @@
+"""
+Agente de formatação local de produtos.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.services.agents.base import BaseDataProcessorAgent
+from src.services.agents.interfaces import DataProcessorAgentInterface, IncrementalDataProcessorAgentInterface
+from src.services.agents.local.normalizer import ProductNormalizer
+from src.services.cache.memo_cache import memoization, memoization_enabled
+from src.utils import json_codec
+from src.utils.json_stream import iter_json_array_items
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class LocalFormatterAgent(BaseDataProcessorAgent, IncrementalDataProcessorAgentInterface):
+    """
+    Agente que formata os produtos localmente, por regras.
+    Normaliza chaves, preços, avaliações e contagens de cada registro; apenas
+    os registros que não puderem ser normalizados são enviados ao formatador
+    de fallback (o fluxo de formatação do Langflow).
+    """
+
+    def __init__(self, fallback: Optional[DataProcessorAgentInterface] = None,
+                 name: str = "Formatador Local",
+                 description: str = "Agente que formata produtos localmente, sem LLM"):
+        """
+        Inicializa o agente.
+
+        Args:
+            fallback (Optional[DataProcessorAgentInterface]): Formatador usado para os registros rejeitados
+            name (str): Nome do agente
+            description (str): Descrição do agente
+        """
+        super().__init__(name, description)
+        self.fallback = fallback
+        self.normalizer = ProductNormalizer()
+
+    def process_data(self, data: Union[str, List[Dict[str, Any]]]) -> Union[List[Dict[str, Any]], None]:
+        """
+        Formata os dados processados pelo agente anterior.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior,
+                como lista de dicionários ou texto contendo um array JSON
+
+        Returns:
+            Union[List[Dict[str, Any]], None]: Produtos formatados ou None em caso de erro
+        """
+        products = list(self.process_data_iter(data))
+        if not products:
+            logger.error("Não foi possível formatar os produtos")
+            return None
+        return products
+
+    def process_data_iter(self, data: Union[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Formata os dados entregando primeiro os produtos normalizados localmente e,
+        em seguida, os obtidos do fallback para os registros rejeitados.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados
+        """
+        # A opção de memoização da requisição é lida agora e repassada ao fallback
+        return self._iter_products(data, memoization_enabled())
+
+    def _iter_products(self, data: Union[str, List[Dict[str, Any]]], memoize: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Implementa process_data_iter.
+
+        Args:
+            data (Union[str, List[Dict[str, Any]]]): Dados processados pelo agente anterior
+            memoize (bool): Se o fallback pode usar resultados memoizados
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados
+        """
+        if not data:
+            logger.error("Dados vazios recebidos para formatação")
+            return
+
+        records = self._load_records(data)
+        if records is None:
+            # Texto sem registros estruturados: só o fluxo LLM consegue interpretá-lo
+            logger.info("Dados sem registros estruturados; usando o formatador de fallback")
+            yield from self._format_with_fallback(data, memoize)
+            return
+
+        normalized, rejected = self.normalizer.normalize_many(records)
+        logger.info(f"Formatação local: {len(normalized)} produtos normalizados, {len(rejected)} rejeitados")
+        yield from normalized
+
+        if rejected:
+            yield from self._format_with_fallback(rejected, memoize)
+
+    def _load_records(self, data: Union[str, List[Any]]) -> Optional[List[Any]]:
+        """
+        Obtém a lista de registros dos dados recebidos.
+
+        Args:
+            data (Union[str, List[Any]]): Lista de registros ou texto contendo um array JSON
+                (possivelmente entre cercas de markdown)
+
+        Returns:
+            Optional[List[Any]]: Registros ou None se os dados não contiverem registros
+        """
+        if isinstance(data, list):
+            return data or None
+        if isinstance(data, dict):
+            return [data]
+        if not isinstance(data, str):
+            logger.error(f"Formato de dados não suportado: {type(data)}")
+            return None
+
+        text = data.strip()
+        if text.startswith('{'):
+            try:
+                return [json_codec.loads(text)]
+            except json_codec.JSONDecodeError:
+                return None
+        return list(iter_json_array_items([text])) or None
+
+    def _format_with_fallback(self, data: Any, memoize: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Formata os dados com o formatador de fallback, normalizando o resultado quando possível.
+
+        Args:
+            data (Any): Registros rejeitados ou dados originais
+            memoize (bool): Se o fallback pode usar resultados memoizados
+
+        Returns:
+            Iterator[Dict[str, Any]]: Produtos formatados pelo fallback
+        """
+        if not self.fallback:
+            logger.warning("Registros não normalizados descartados: nenhum formatador de fallback configurado")
+            return
+
+        if isinstance(data, list) and not all(isinstance(item, dict) for item in data):
+            data = json_codec.dumps(data)
+
+        logger.info("Enviando registros ao formatador de fallback")
+        with memoization(memoize):
+            if isinstance(self.fallback, IncrementalDataProcessorAgentInterface):
+                items = self.fallback.process_data_iter(data)
+            else:
+                items = self.fallback.process_data(data) or []
+
+        for item in items:
+            if isinstance(item, dict):
+                yield self.normalizer.normalize(item) or item
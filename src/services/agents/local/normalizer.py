@@ -0,0 +1,88 @@
+"""
+Normalização local de registros de produtos.
+Converte registros com chaves e formatos variados (ex.: "nome", "preço",
+"R$ 1.299,90", "4,5 de 5 estrelas") para o formato esperado por
+Product.from_dict, sem depender do fluxo de formatação do Langflow.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.logging import get_logger
+from src.utils.normalization import (FIELD_ALIASES, normalize_key, parse_count, parse_price,
+                                     parse_rating, resolve_fields)
+
+logger = get_logger(__name__)
+
+class ProductNormalizer:
+    """
+    Normaliza registros de produtos para o formato titulo/preco/rating/imagem/url_produto/classificacao.
+    Registros sem título ou sem preço válido são rejeitados.
+    """
+
+    def normalize(self, record: Any) -> Optional[Dict[str, Any]]:
+        """
+        Normaliza um registro.
+
+        Args:
+            record (Any): Registro com chaves e formatos variados
+
+        Returns:
+            Optional[Dict[str, Any]]: Registro normalizado ou None se não for válido
+        """
+        if not isinstance(record, dict):
+            return None
+
+        fields = resolve_fields(record)
+
+        title = fields.get("titulo")
+        title = title.strip() if isinstance(title, str) else None
+        price = parse_price(fields.get("preco"))
+        if not title or price is None or price <= 0:
+            return None
+
+        normalized = {
+            "titulo": title,
+            "preco": price,
+            "rating": parse_rating(fields.get("rating")),
+            "imagem": self._text(fields.get("imagem")),
+            "url_produto": self._text(fields.get("url_produto")),
+            "descricao": self._text(fields.get("descricao")),
+            "classificacao": parse_count(fields.get("classificacao"))
+        }
+        if fields.get("posicao") is not None:
+            normalized["posicao"] = parse_count(fields["posicao"]) or None
+        return normalized
+
+    def normalize_many(self, records: List[Any]) -> Tuple[List[Dict[str, Any]], List[Any]]:
+        """
+        Normaliza uma lista de registros, separando os que não puderam ser normalizados.
+
+        Args:
+            records (List[Any]): Registros com chaves e formatos variados
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Any]]: Registros normalizados e registros rejeitados
+        """
+        normalized, rejected = [], []
+        for record in records:
+            result = self.normalize(record)
+            if result is None:
+                rejected.append(record)
+            else:
+                normalized.append(result)
+        return normalized, rejected
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        """
+        Converte um valor opcional em texto sem espaços nas pontas.
+
+        Args:
+            value (Any): Valor original
+
+        Returns:
+            Optional[str]: Texto ou None se vazio
+        """
+        if value is None:
+            return None
+        text = str(value).strip()
+        return text or None
@@ -0,0 +1,88 @@
+"""
+Agente de processamento para a extração local de produtos.
+"""
+from typing import Any, Dict, List, Optional, Union
+
+from src.services.agents.base import BaseDataProcessorAgent
+from src.services.agents.interfaces import DataProcessorAgentInterface
+from src.services.agents.local.fetcher import LOCAL_EXTRACTOR_MARKER
+from src.utils import json_codec
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class LocalExtractorProcessorAgent(BaseDataProcessorAgent):
+    """
+    Agente que entrega os produtos extraídos localmente.
+    Respostas vindas do fallback LLM são encaminhadas aos agentes de
+    processamento e formatação do Langflow, para que a saída tenha sempre
+    o mesmo formato.
+    """
+
+    def __init__(self, fallback_processor: Optional[DataProcessorAgentInterface] = None,
+                 fallback_formatter: Optional[DataProcessorAgentInterface] = None,
+                 name: str = "Extrator Local - Processamento",
+                 description: str = "Agente que entrega os produtos extraídos localmente"):
+        """
+        Inicializa o agente.
+
+        Args:
+            fallback_processor (Optional[DataProcessorAgentInterface]): Processador das respostas do fallback LLM
+            fallback_formatter (Optional[DataProcessorAgentInterface]): Formatador das respostas do fallback LLM
+            name (str): Nome do agente
+            description (str): Descrição do agente
+        """
+        super().__init__(name, description)
+        self.fallback_processor = fallback_processor
+        self.fallback_formatter = fallback_formatter
+
+    def process_data(self, data: Union[str, Dict[str, Any]]) -> Union[List[Dict[str, Any]], None]:
+        """
+        Obtém os produtos da resposta do agente de busca.
+
+        Args:
+            data (Union[str, Dict[str, Any]]): Resultado da extração local ou resposta do fallback LLM,
+                já decodificados ou em JSON
+
+        Returns:
+            Union[List[Dict[str, Any]], None]: Produtos no formato titulo/preco/rating/imagem/url_produto/classificacao
+        """
+        if not data:
+            logger.error("Dados vazios recebidos para processamento")
+            return None
+
+        try:
+            payload = json_codec.loads(data) if isinstance(data, (str, bytes)) else data
+        except json_codec.JSONDecodeError as e:
+            logger.error(f"Erro ao decodificar JSON: {e}")
+            return None
+
+        if isinstance(payload, dict) and payload.get("extractor") == LOCAL_EXTRACTOR_MARKER:
+            products = payload.get("products") or None
+            if products:
+                logger.info(f"{len(products)} produtos obtidos da extração local "
+                            f"(confiança {payload.get('confidence', 0):.2f})")
+            return products
+
+        return self._process_fallback(payload)
+
+    def _process_fallback(self, data: Any) -> Union[List[Dict[str, Any]], None]:
+        """
+        Processa e formata uma resposta do fallback LLM.
+
+        Args:
+            data (Any): Resposta do fluxo Langflow já decodificada
+
+        Returns:
+            Union[List[Dict[str, Any]], None]: Produtos formatados ou None em caso de erro
+        """
+        if not self.fallback_processor:
+            logger.error("Resposta do fallback LLM recebida sem processador configurado")
+            return None
+
+        logger.info("Processando resposta do fallback LLM")
+        processed = self.fallback_processor.process_data(data)
+        if not processed or not self.fallback_formatter:
+            return processed
+
+        return self.fallback_formatter.process_data(processed)
@@ -0,0 +1,157 @@
+"""
+Pool de instâncias de agentes reaproveitadas entre requisições.
+Criar um agente monta o seu cliente HTTP, o disjuntor e os extratores;
+com o pool, essa montagem acontece uma vez por instância, e as requisições
+seguintes tomam emprestada uma instância já pronta.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.config.settings import active_config
+from src.services.agents.interfaces import AgentInterface
+from src.services.agents.registry import AgentFactory, AgentRegistry
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class AgentPool:
+    """
+    Pool de agentes ociosos por tipo, com empréstimo (check-out) e devolução (check-in).
+    Cada instância emprestada é usada por uma única requisição por vez. Instâncias
+    criadas antes de um novo registro do seu tipo são descartadas na devolução.
+    Seguro para uso entre threads.
+    """
+
+    def __init__(self, factory: Optional[Any] = None, max_idle: Optional[int] = None):
+        """
+        Inicializa o pool.
+
+        Args:
+            factory (Optional[Any]): Fábrica com create_agent(agent_type). Se None, usa AgentFactory.
+            max_idle (Optional[int]): Instâncias ociosas mantidas por tipo. Se None, usa AGENT_POOL_MAX_IDLE.
+        """
+        self.factory = factory or AgentFactory()
+        self.max_idle = max(0, active_config.AGENT_POOL_MAX_IDLE if max_idle is None else max_idle)
+        self._idle: Dict[str, List[Tuple[int, AgentInterface]]] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def lease(self, agent_type: Optional[str]) -> Iterator[Optional[AgentInterface]]:
+        """
+        Empresta uma instância do tipo pelo tempo do bloco e a devolve ao final.
+
+        Args:
+            agent_type (Optional[str]): Tipo do agente; None empresta None (etapa desativada)
+
+        Returns:
+            Iterator[Optional[AgentInterface]]: Instância do agente ou None se não for possível criar
+        """
+        if not agent_type:
+            yield None
+            return
+
+        agent, version = self.checkout(agent_type)
+        try:
+            yield agent
+        finally:
+            if agent is not None:
+                self.checkin(agent_type, agent, version)
+
+    def checkout(self, agent_type: str) -> Tuple[Optional[AgentInterface], int]:
+        """
+        Retira uma instância ociosa do pool ou cria uma nova.
+
+        Args:
+            agent_type (str): Tipo do agente
+
+        Returns:
+            Tuple[Optional[AgentInterface], int]: Instância (None se não for possível criar)
+                e a versão do registro do tipo, a informar na devolução
+        """
+        version = AgentRegistry().agent_version(agent_type)
+        with self._lock:
+            counters = self._counters_for(agent_type)
+            idle = self._idle.get(agent_type, [])
+            while idle:
+                idle_version, agent = idle.pop()
+                if idle_version == version:
+                    counters["reused"] += 1
+                    counters["in_use"] += 1
+                    return agent, version
+
+        agent = self.factory.create_agent(agent_type)
+        if agent is not None:
+            with self._lock:
+                counters["created"] += 1
+                counters["in_use"] += 1
+        return agent, version
+
+    def checkin(self, agent_type: str, agent: AgentInterface, version: int) -> None:
+        """
+        Devolve uma instância ao pool.
+
+        Args:
+            agent_type (str): Tipo do agente
+            agent (AgentInterface): Instância emprestada
+            version (int): Versão do registro informada no empréstimo
+        """
+        current = AgentRegistry().agent_version(agent_type)
+        with self._lock:
+            counters = self._counters_for(agent_type)
+            counters["in_use"] = max(0, counters["in_use"] - 1)
+            idle = self._idle.setdefault(agent_type, [])
+            if version != current or len(idle) >= self.max_idle:
+                counters["discarded"] += 1
+                return
+            # Fábricas que devolvem sempre a mesma instância não a duplicam no pool
+            if not any(pooled is agent for _, pooled in idle):
+                idle.append((version, agent))
+
+    def warm(self, agent_types: Iterable[Optional[str]], per_type: int = 1) -> None:
+        """
+        Cria instâncias antecipadamente para que as primeiras requisições já as encontrem prontas.
+
+        Args:
+            agent_types (Iterable[Optional[str]]): Tipos de agentes (valores vazios são ignorados)
+            per_type (int): Instâncias por tipo
+        """
+        for agent_type in dict.fromkeys(agent_type for agent_type in agent_types if agent_type):
+            leased = [self.checkout(agent_type) for _ in range(max(1, per_type))]
+            for agent, version in leased:
+                if agent is not None:
+                    self.checkin(agent_type, agent, version)
+        logger.info(f"Pool de agentes aquecido: {sorted(self._idle)}")
+
+    def clear(self) -> None:
+        """
+        Descarta as instâncias ociosas.
+        """
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna as métricas do pool por tipo de agente.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Instâncias criadas, reaproveitadas, descartadas, em uso e ociosas
+        """
+        with self._lock:
+            return {
+                agent_type: {**counters, "idle": len(self._idle.get(agent_type, []))}
+                for agent_type, counters in self._counters.items()
+            }
+
+    def _counters_for(self, agent_type: str) -> Dict[str, int]:
+        """
+        Obtém os contadores de um tipo de agente. Deve ser chamado com o lock adquirido.
+
+        Args:
+            agent_type (str): Tipo do agente
+
+        Returns:
+            Dict[str, int]: Contadores do tipo
+        """
+        return self._counters.setdefault(agent_type, {"created": 0, "reused": 0, "discarded": 0, "in_use": 0})
@@ -21,6 +21,7 @@ class AgentRegistry:
             cls._instance = super(AgentRegistry, cls).__new__(cls)
             cls._instance._agents = {}
             cls._instance._agent_factories = {}
+            cls._instance._versions = {}
             logger.info("Registro de agentes inicializado")
         return cls._instance
     
@@ -36,6 +37,7 @@ class AgentRegistry:
             logger.warning(f"Substituindo classe de agente para o tipo '{agent_type}'")
         
         self._agents[agent_type] = agent_class
+        self._versions[agent_type] = self._versions.get(agent_type, 0) + 1
         logger.info(f"Classe de agente '{agent_class.__name__}' registrada para o tipo '{agent_type}'")
     
     def register_agent_factory(self, agent_type: str, factory: Callable[..., AgentInterface]) -> None:
@@ -50,6 +52,7 @@ class AgentRegistry:
             logger.warning(f"Substituindo fábrica de agente para o tipo '{agent_type}'")
         
         self._agent_factories[agent_type] = factory
+        self._versions[agent_type] = self._versions.get(agent_type, 0) + 1
         logger.info(f"Fábrica de agente registrada para o tipo '{agent_type}'")
     
     def get_agent_class(self, agent_type: str) -> Optional[Type[AgentInterface]]:
@@ -76,6 +79,19 @@ class AgentRegistry:
         """
         return self._agent_factories.get(agent_type)
     
+    def agent_version(self, agent_type: str) -> int:
+        """
+        Obtém a versão do registro de um tipo de agente, incrementada a cada novo registro.
+        Permite descartar instâncias reaproveitadas que foram criadas pela classe ou fábrica anterior.
+        
+        Args:
+            agent_type (str): Tipo do agente
+            
+        Returns:
+            int: Versão do registro (0 se o tipo não estiver registrado)
+        """
+        return self._versions.get(agent_type, 0)
+    
     def create_agent(self, agent_type: str, **kwargs) -> Optional[AgentInterface]:
         """
         Cria uma instância de um agente pelo tipo.
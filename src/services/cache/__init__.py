@@ -0,0 +1,18 @@
+"""
+Caches usados pelo pipeline de agentes.
+"""
+from src.services.cache.backends import CacheBackend, MemoryLRUCache, DiskCache, TieredCache
+from src.services.cache.fetch_cache import FetchCache, normalize_source_url
+from src.services.cache.memo_cache import MemoCache, memoization, memoization_enabled
+
+__all__ = [
+    'CacheBackend',
+    'MemoryLRUCache',
+    'DiskCache',
+    'TieredCache',
+    'FetchCache',
+    'MemoCache',
+    'memoization',
+    'memoization_enabled',
+    'normalize_source_url'
+]
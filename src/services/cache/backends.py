@@ -0,0 +1,266 @@
+"""
+Backends de cache com expiração (TTL).
+Oferece um cache LRU em memória, um cache persistente em disco e a
+combinação dos dois em camadas.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class CacheBackend(ABC):
+    """Interface base para backends de cache."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Obtém um valor do cache.
+
+        Args:
+            key (str): Chave do valor
+
+        Returns:
+            Optional[Any]: Valor armazenado ou None se ausente ou expirado
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Armazena um valor no cache.
+
+        Args:
+            key (str): Chave do valor
+            value (Any): Valor a ser armazenado (serializável em JSON)
+            ttl (float): Tempo de vida em segundos
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove um valor do cache.
+
+        Args:
+            key (str): Chave do valor
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove todos os valores do cache.
+        """
+        pass
+
+class MemoryLRUCache(CacheBackend):
+    """
+    Cache em memória com política LRU e expiração por entrada.
+    Seguro para uso entre threads.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 0):
+        """
+        Inicializa o cache em memória.
+
+        Args:
+            max_entries (int): Número máximo de entradas mantidas
+            max_bytes (int): Tamanho máximo estimado das entradas, em bytes do JSON (0 = sem limite)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        size = self._size_of(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            logger.debug(f"Entrada de {size} bytes maior que o limite do cache em memória; não armazenada")
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + ttl, value)
+            self._sizes[key] = size
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self.total_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove uma entrada e desconta o seu tamanho. Deve ser chamado com o lock adquirido.
+
+        Args:
+            key (str): Chave do valor
+        """
+        if self._entries.pop(key, None) is not None:
+            self.total_bytes -= self._sizes.pop(key, 0)
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        """
+        Estima o tamanho de um valor pelo seu JSON.
+
+        Args:
+            value (Any): Valor a ser armazenado
+
+        Returns:
+            int: Tamanho estimado em bytes
+        """
+        try:
+            return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        except (TypeError, ValueError):
+            return 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskCache(CacheBackend):
+    """
+    Cache persistente em disco, com um arquivo JSON por entrada.
+    Sobrevive a reinicializações e é compartilhado entre processos do mesmo host.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Inicializa o cache em disco.
+
+        Args:
+            directory (str): Diretório onde as entradas são gravadas
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path_for(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de cache em disco ilegível ({path}): {str(e)}")
+            self.delete(key)
+            return None
+
+        if entry.get("key") != key or entry.get("expires_at", 0) <= time.time():
+            self.delete(key)
+            return None
+
+        return entry.get("value")
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        entry = {"key": key, "expires_at": time.time() + ttl, "value": value}
+        try:
+            # Grava em arquivo temporário e move, para que leitores nunca vejam arquivos parciais
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, self._path_for(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Não foi possível gravar entrada de cache em disco: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path_for(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Não foi possível remover entrada de cache em disco: {str(e)}")
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _path_for(self, key: str) -> str:
+        """
+        Obtém o caminho do arquivo de uma chave.
+
+        Args:
+            key (str): Chave do valor
+
+        Returns:
+            str: Caminho do arquivo
+        """
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+class TieredCache(CacheBackend):
+    """
+    Cache em camadas: consulta a memória primeiro e recorre ao disco,
+    promovendo para a memória as entradas encontradas no disco.
+    """
+
+    def __init__(self, memory: MemoryLRUCache, disk: DiskCache, memory_ttl: float = 60.0):
+        """
+        Inicializa o cache em camadas.
+
+        Args:
+            memory (MemoryLRUCache): Camada em memória
+            disk (DiskCache): Camada em disco
+            memory_ttl (float): Tempo de vida na memória das entradas promovidas do disco
+        """
+        self.memory = memory
+        self.disk = disk
+        self.memory_ttl = memory_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value, self.memory_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.memory.set(key, value, min(ttl, self.memory_ttl) if self.memory_ttl else ttl)
+        self.disk.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
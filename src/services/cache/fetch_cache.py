@@ -0,0 +1,259 @@
+"""
+Cache de respostas da etapa de busca.
+As chaves são a URL de destino normalizada, de modo que variações da mesma
+página (prefixo r.jina.ai, parâmetros de rastreamento, barras finais)
+compartilham a mesma entrada.
+"""
+import re
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.config.settings import active_config
+from src.services.cache.backends import CacheBackend, DiskCache, MemoryLRUCache, TieredCache
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Parâmetros de consulta que não alteram o conteúdo da página
+_TRACKING_PARAMS = re.compile(
+    r'^(ref|ref_|tag|qid|sr|psc|th|crid|sprefix|smid|_encoding|content-id|'
+    r'pf_rd_\w+|pd_rd_\w+|utm_\w+)$',
+    re.IGNORECASE
+)
+# Segmentos de caminho no formato /ref=... usados pela Amazon para rastreamento
+_REF_PATH_SEGMENT = re.compile(r'/ref=[^/?#]*', re.IGNORECASE)
+_BESTSELLER_CATEGORY = re.compile(r'/(?:gp/)?bestsellers/([^/?#]+)', re.IGNORECASE)
+
+def normalize_source_url(url: str) -> str:
+    """
+    Normaliza a URL de origem para uso como chave de cache.
+    Remove o prefixo r.jina.ai, parâmetros e segmentos de rastreamento,
+    fragmentos e barras finais, e ordena os parâmetros restantes.
+
+    Args:
+        url (str): URL de origem (com ou sem o prefixo r.jina.ai)
+
+    Returns:
+        str: URL normalizada
+    """
+    url = url.strip()
+    if "r.jina.ai/" in url:
+        url = url.split("r.jina.ai/", 1)[1]
+    if not url.startswith("http"):
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    path = _REF_PATH_SEGMENT.sub('', parts.path).rstrip('/') or '/'
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(name)
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+def category_for_url(url: str) -> str:
+    """
+    Obtém a categoria de mais vendidos de uma URL normalizada.
+
+    Args:
+        url (str): URL normalizada
+
+    Returns:
+        str: Categoria (ex.: "electronics") ou "default" se não identificada
+    """
+    match = _BESTSELLER_CATEGORY.search(urlsplit(url).path)
+    return match.group(1).lower() if match else "default"
+
+def parse_category_ttls(raw: Optional[str]) -> Dict[str, float]:
+    """
+    Interpreta os TTLs por categoria no formato ``categoria=segundos,...``.
+
+    Args:
+        raw (Optional[str]): Valor bruto da configuração
+
+    Returns:
+        Dict[str, float]: TTL em segundos por categoria
+    """
+    ttls = {}
+    for entry in (raw or '').split(','):
+        name, _, value = entry.partition('=')
+        if not name.strip() or not value.strip():
+            continue
+        try:
+            ttls[name.strip().lower()] = float(value)
+        except ValueError:
+            logger.warning(f"TTL de cache inválido ignorado: {entry}")
+    return ttls
+
+def create_backend(kind: str, max_entries: int, directory: str,
+                   max_bytes: int = 0, memory_ttl: float = 60.0) -> CacheBackend:
+    """
+    Cria um backend de cache a partir do nome configurado.
+
+    Args:
+        kind (str): "memory", "disk" ou "tiered"
+        max_entries (int): Número máximo de entradas em memória
+        directory (str): Diretório do cache em disco
+        max_bytes (int): Tamanho máximo estimado das entradas em memória (0 = sem limite)
+        memory_ttl (float): Tempo de vida na memória das entradas promovidas do disco (backend "tiered")
+
+    Returns:
+        CacheBackend: Backend criado
+    """
+    kind = (kind or "memory").lower()
+    if kind == "disk":
+        return DiskCache(directory)
+    if kind == "tiered":
+        return TieredCache(MemoryLRUCache(max_entries, max_bytes), DiskCache(directory), memory_ttl=memory_ttl)
+    return MemoryLRUCache(max_entries, max_bytes)
+
+class FetchCache:
+    """
+    Cache de respostas do agente de busca com TTL por categoria.
+    Implementa o padrão Singleton para ser compartilhado por todos os agentes do processo.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(FetchCache, cls).__new__(cls)
+                    instance._configure(
+                        backend=create_backend(
+                            active_config.FETCH_CACHE_BACKEND,
+                            active_config.FETCH_CACHE_MAX_ENTRIES,
+                            active_config.FETCH_CACHE_DIR
+                        ),
+                        enabled=active_config.FETCH_CACHE_ENABLED,
+                        default_ttl=active_config.FETCH_CACHE_TTL,
+                        category_ttls=parse_category_ttls(active_config.FETCH_CACHE_CATEGORY_TTLS)
+                    )
+                    cls._instance = instance
+                    logger.info(f"Cache de busca inicializado (backend={active_config.FETCH_CACHE_BACKEND})")
+        return cls._instance
+
+    def _configure(self, backend: CacheBackend, enabled: bool, default_ttl: float,
+                   category_ttls: Dict[str, float]) -> None:
+        """
+        Define o backend e as políticas de expiração do cache.
+
+        Args:
+            backend (CacheBackend): Backend de armazenamento
+            enabled (bool): Se o cache está habilitado
+            default_ttl (float): TTL padrão em segundos
+            category_ttls (Dict[str, float]): TTL por categoria
+        """
+        self.backend = backend
+        self.enabled = enabled
+        self.default_ttl = default_ttl
+        self.category_ttls = category_ttls
+        self._counters = {"hits": 0, "misses": 0, "bypasses": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, key: str) -> float:
+        """
+        Obtém o TTL aplicável a uma chave.
+
+        Args:
+            key (str): URL normalizada
+
+        Returns:
+            float: TTL em segundos
+        """
+        return self.category_ttls.get(category_for_url(key), self.default_ttl)
+
+    def get(self, source: str, namespace: Optional[str] = None) -> Optional[Any]:
+        """
+        Obtém a resposta armazenada para uma URL de origem.
+
+        Args:
+            source (str): URL de origem
+            namespace (Optional[str]): Espaço de nomes que separa respostas de agentes diferentes
+
+        Returns:
+            Optional[Any]: Resposta armazenada ou None
+        """
+        if not self.enabled:
+            return None
+
+        key = self._key_for(source, namespace)
+        value = self.backend.get(key)
+        self._count("hits" if value is not None else "misses")
+        if value is not None:
+            logger.info(f"Resposta obtida do cache de busca para: {key}")
+        return value
+
+    def set(self, source: str, value: Any, namespace: Optional[str] = None) -> None:
+        """
+        Armazena a resposta de uma URL de origem.
+
+        Args:
+            source (str): URL de origem
+            value (Any): Resposta a ser armazenada
+            namespace (Optional[str]): Espaço de nomes que separa respostas de agentes diferentes
+        """
+        if not self.enabled or value is None:
+            return
+
+        ttl = self.ttl_for(normalize_source_url(source))
+        if ttl <= 0:
+            return
+        self.backend.set(self._key_for(source, namespace), value, ttl)
+        self._count("stores")
+
+    def record_bypass(self) -> None:
+        """
+        Registra uma busca que ignorou o cache explicitamente.
+        """
+        self._count("bypasses")
+
+    def invalidate(self, source: str, namespace: Optional[str] = None) -> None:
+        """
+        Remove a resposta armazenada de uma URL de origem.
+
+        Args:
+            source (str): URL de origem
+            namespace (Optional[str]): Espaço de nomes da resposta
+        """
+        self.backend.delete(self._key_for(source, namespace))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            Dict[str, Any]: Acertos, falhas, desvios, gravações e taxa de acerto
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = counters["hits"] / lookups if lookups else 0.0
+        counters["enabled"] = self.enabled
+        counters["backend"] = type(self.backend).__name__
+        return counters
+
+    def _key_for(self, source: str, namespace: Optional[str]) -> str:
+        """
+        Obtém a chave de cache de uma URL de origem.
+
+        Args:
+            source (str): URL de origem
+            namespace (Optional[str]): Espaço de nomes da resposta
+
+        Returns:
+            str: URL normalizada, prefixada pelo espaço de nomes quando informado
+        """
+        key = normalize_source_url(source)
+        return f"{namespace}:{key}" if namespace else key
+
+    def _count(self, name: str) -> None:
+        """
+        Incrementa um contador do cache.
+
+        Args:
+            name (str): Nome do contador
+        """
+        with self._lock:
+            self._counters[name] += 1
@@ -0,0 +1,180 @@
+"""
+Memoização das saídas de etapas caras do pipeline (ex.: o fluxo de formatação).
+As chaves são um hash estável do texto de entrada, do fluxo e da sua versão:
+entradas idênticas reaproveitam o resultado sem nova chamada ao LLM.
+"""
+import hashlib
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from src.config.settings import active_config
+from src.services.cache.backends import CacheBackend
+from src.services.cache.fetch_cache import create_backend
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Desativação da memoização no contexto da requisição atual (ex.: bypass_cache=true)
+_memoization_enabled: ContextVar[bool] = ContextVar("memoization_enabled", default=True)
+
+@contextmanager
+def memoization(enabled: bool = True) -> Iterator[None]:
+    """
+    Ativa ou desativa a memoização no contexto atual.
+    Agentes leem a configuração no momento da chamada, então basta envolver a chamada.
+
+    Args:
+        enabled (bool): Se False, as chamadas feitas no bloco ignoram resultados memoizados
+    """
+    token = _memoization_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        _memoization_enabled.reset(token)
+
+def memoization_enabled() -> bool:
+    """
+    Indica se a memoização está ativa no contexto atual.
+
+    Returns:
+        bool: False se a requisição atual optou por ignorar resultados memoizados
+    """
+    return _memoization_enabled.get()
+
+def content_key(namespace: str, text: str, flow: str = "", version: str = "") -> str:
+    """
+    Calcula a chave estável de uma entrada.
+
+    Args:
+        namespace (str): Espaço de nomes da etapa (ex.: "formatter")
+        text (str): Texto de entrada
+        flow (str): Identificador do fluxo (ex.: URL)
+        version (str): Versão do fluxo
+
+    Returns:
+        str: Chave no formato ``namespace:sha256``
+    """
+    digest = hashlib.sha256()
+    for part in (flow, version, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"{namespace}:{digest.hexdigest()}"
+
+class MemoCache:
+    """
+    Cache de resultados memoizados, com camada LRU em memória limitada por
+    tamanho e camada persistente em disco.
+    Implementa o padrão Singleton para ser compartilhado por todos os agentes do processo.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(MemoCache, cls).__new__(cls)
+                    instance.configure(
+                        backend=create_backend(
+                            active_config.MEMO_CACHE_BACKEND,
+                            active_config.MEMO_CACHE_MAX_ENTRIES,
+                            active_config.MEMO_CACHE_DIR,
+                            max_bytes=active_config.MEMO_CACHE_MAX_BYTES,
+                            memory_ttl=active_config.MEMO_CACHE_TTL
+                        ),
+                        enabled=active_config.MEMO_CACHE_ENABLED,
+                        ttl=active_config.MEMO_CACHE_TTL
+                    )
+                    cls._instance = instance
+                    logger.info(f"Cache de memoização inicializado (backend={active_config.MEMO_CACHE_BACKEND})")
+        return cls._instance
+
+    def configure(self, backend: CacheBackend, enabled: bool = True, ttl: float = 86400.0) -> None:
+        """
+        Define o backend e a expiração do cache, zerando as métricas.
+
+        Args:
+            backend (CacheBackend): Backend de armazenamento
+            enabled (bool): Se a memoização está habilitada
+            ttl (float): Tempo de vida dos resultados em segundos
+        """
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl = ttl
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, text: str, flow: str = "", version: str = "") -> Optional[Any]:
+        """
+        Obtém o resultado memoizado de uma entrada.
+
+        Args:
+            namespace (str): Espaço de nomes da etapa
+            text (str): Texto de entrada
+            flow (str): Identificador do fluxo
+            version (str): Versão do fluxo
+
+        Returns:
+            Optional[Any]: Resultado memoizado ou None
+        """
+        if not self.enabled:
+            return None
+        if not memoization_enabled():
+            self._count(namespace, "bypasses")
+            return None
+
+        value = self.backend.get(content_key(namespace, text, flow, version))
+        self._count(namespace, "hits" if value is not None else "misses")
+        if value is not None:
+            logger.info(f"Resultado memoizado reaproveitado ({namespace}, {len(text)} caracteres de entrada)")
+        return value
+
+    def set(self, namespace: str, text: str, value: Any, flow: str = "", version: str = "") -> None:
+        """
+        Memoiza o resultado de uma entrada.
+
+        Args:
+            namespace (str): Espaço de nomes da etapa
+            text (str): Texto de entrada
+            value (Any): Resultado (serializável em JSON)
+            flow (str): Identificador do fluxo
+            version (str): Versão do fluxo
+        """
+        if not self.enabled or not memoization_enabled() or value is None or self.ttl <= 0:
+            return
+        self.backend.set(content_key(namespace, text, flow, version), value, self.ttl)
+        self._count(namespace, "stores")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas do cache por espaço de nomes.
+        Cada acerto é uma chamada ao fluxo que deixou de ser feita.
+
+        Returns:
+            Dict[str, Any]: Acertos, falhas, desvios, gravações, taxa de acerto e chamadas economizadas
+        """
+        with self._lock:
+            counters = {namespace: dict(values) for namespace, values in self._counters.items()}
+        for values in counters.values():
+            lookups = values["hits"] + values["misses"]
+            values["hit_ratio"] = values["hits"] / lookups if lookups else 0.0
+            values["calls_saved"] = values["hits"]
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "namespaces": counters
+        }
+
+    def _count(self, namespace: str, name: str) -> None:
+        """
+        Incrementa um contador do cache.
+
+        Args:
+            namespace (str): Espaço de nomes da etapa
+            name (str): Nome do contador
+        """
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0, "bypasses": 0, "stores": 0})
+            counters[name] += 1
@@ -0,0 +1,133 @@
+"""
+Prazo de ponta a ponta das requisições.
+O prazo é definido na rota e acompanha a execução do pipeline: os timeouts
+HTTP, as esperas entre retentativas e a limitação de taxa usam apenas o tempo
+que ainda resta, e as etapas seguintes não são iniciadas depois que ele se esgota.
+"""
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+class Deadline:
+    """
+    Instante-limite (monotônico) para concluir uma requisição.
+    """
+
+    def __init__(self, expires_at: float):
+        """
+        Inicializa o prazo.
+
+        Args:
+            expires_at (float): Instante-limite no relógio monotônico
+        """
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> 'Deadline':
+        """
+        Cria um prazo que se esgota após o intervalo informado.
+
+        Args:
+            seconds (float): Segundos a partir de agora
+
+        Returns:
+            Deadline: Prazo correspondente
+        """
+        return cls(time.monotonic() + max(0.0, seconds))
+
+    @classmethod
+    def from_ms(cls, value: Optional[object], default_ms: int = 0) -> Optional['Deadline']:
+        """
+        Cria um prazo a partir de um valor em milissegundos (ex.: parâmetro "deadline_ms").
+
+        Args:
+            value (Optional[object]): Milissegundos informados pelo cliente (número ou texto)
+            default_ms (int): Prazo padrão em milissegundos; 0 desativa
+
+        Returns:
+            Optional[Deadline]: Prazo ou None se nenhum prazo se aplicar
+
+        Raises:
+            ValueError: Se o valor não for um número positivo
+        """
+        if value is None or value == "":
+            milliseconds = default_ms
+        else:
+            milliseconds = float(value)
+            if not math.isfinite(milliseconds) or milliseconds <= 0:
+                raise ValueError("deadline_ms deve ser um número positivo")
+        return cls.after(milliseconds / 1000.0) if milliseconds else None
+
+    def remaining(self) -> float:
+        """
+        Calcula o tempo que ainda resta.
+
+        Returns:
+            float: Segundos restantes (0 se o prazo já se esgotou)
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """
+        Indica se o prazo já se esgotou.
+
+        Returns:
+            bool: True se não resta tempo
+        """
+        return time.monotonic() >= self.expires_at
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Aplica um prazo às chamadas feitas dentro do bloco.
+    Prazos aninhados nunca estendem o prazo externo: vale o que se esgotar primeiro.
+
+    Args:
+        deadline (Optional[Deadline]): Prazo a aplicar; None mantém o prazo atual
+
+    Returns:
+        Iterator[Optional[Deadline]]: Prazo efetivo dentro do bloco
+    """
+    current = _current_deadline.get()
+    if deadline is None or (current is not None and current.expires_at <= deadline.expires_at):
+        yield current
+        return
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Retorna o prazo em vigor no contexto atual.
+
+    Returns:
+        Optional[Deadline]: Prazo ou None se a chamada não tiver prazo
+    """
+    return _current_deadline.get()
+
+def remaining_time(limit: Optional[float] = None) -> Optional[float]:
+    """
+    Limita um tempo de espera ao que resta do prazo em vigor.
+
+    Args:
+        limit (Optional[float]): Tempo máximo próprio da operação (ex.: timeout configurado)
+
+    Returns:
+        Optional[float]: O menor entre o limite e o tempo restante, ou None se não houver nenhum dos dois
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return limit
+    remaining = deadline.remaining()
+    return remaining if limit is None else min(limit, remaining)
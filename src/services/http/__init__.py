@@ -0,0 +1,29 @@
+"""
+Infraestrutura HTTP compartilhada pelos agentes.
+"""
+from src.services.http.balancer import EndpointPool, EndpointPoolRegistry
+from src.services.http.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+from src.services.http.hedging import Hedger, HedgingRegistry, LatencyTracker
+from src.services.http.pool import HttpSessionPool, PoolConfig
+from src.services.http.rate_limiter import RateLimiter, RateLimitTimeout, TokenBucket
+from src.services.http.retry import RetryBudget, RetryError, RetryPolicy, get_default_retry_policy
+
+__all__ = [
+    'CircuitBreaker',
+    'CircuitBreakerRegistry',
+    'CircuitOpenError',
+    'EndpointPool',
+    'EndpointPoolRegistry',
+    'Hedger',
+    'HedgingRegistry',
+    'HttpSessionPool',
+    'LatencyTracker',
+    'PoolConfig',
+    'RateLimiter',
+    'RateLimitTimeout',
+    'RetryBudget',
+    'RetryError',
+    'RetryPolicy',
+    'TokenBucket',
+    'get_default_retry_policy'
+]
@@ -0,0 +1,352 @@
+"""
+Balanceamento de carga entre endpoints equivalentes de um fluxo (ex.: réplicas do Langflow).
+Cada requisição vai ao endpoint com menos requisições em andamento ou com a
+menor latência média ponderada (EWMA); endpoints com falhas consecutivas são
+ejetados temporariamente e reintroduzidos ao fim do período de ejeção.
+"""
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import active_config
+from src.services.http.circuit_breaker import OPEN, CircuitBreakerRegistry
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Estratégias de seleção
+LEAST_OUTSTANDING = "least_outstanding"
+EWMA = "ewma"
+
+STRATEGIES = (LEAST_OUTSTANDING, EWMA)
+
+def parse_endpoints(raw: Optional[str]) -> List[str]:
+    """
+    Interpreta uma lista de endpoints equivalentes separados por vírgula ou espaço.
+
+    Args:
+        raw (Optional[str]): Valor bruto da configuração (uma ou várias URLs)
+
+    Returns:
+        List[str]: URLs sem repetições, na ordem informada
+    """
+    endpoints = []
+    for url in re.split(r'[\s,]+', raw or ''):
+        if url and url not in endpoints:
+            endpoints.append(url)
+    return endpoints
+
+class Endpoint:
+    """
+    Estado de um endpoint do pool: requisições em andamento, latência e ejeção.
+    """
+
+    def __init__(self, url: str):
+        """
+        Inicializa o endpoint.
+
+        Args:
+            url (str): URL do endpoint
+        """
+        self.url = url
+        self.outstanding = 0
+        self.ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejection_streak = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.reintroductions = 0
+
+    def is_ejected(self, now: float) -> bool:
+        """
+        Indica se o endpoint está fora de rotação.
+
+        Args:
+            now (float): Instante atual (monotônico)
+
+        Returns:
+            bool: True durante o período de ejeção
+        """
+        return now < self.ejected_until
+
+    def score(self, strategy: str, prior: float = 1.0) -> float:
+        """
+        Calcula a pontuação de seleção (menor é melhor).
+
+        Args:
+            strategy (str): Estratégia de seleção
+            prior (float): Latência presumida enquanto o endpoint não tem latência medida
+
+        Returns:
+            float: Requisições em andamento ou latência EWMA ponderada pela carga
+        """
+        if strategy == EWMA:
+            latency = self.ewma if self.ewma is not None else prior
+            return latency * (self.outstanding + 1)
+        return float(self.outstanding)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        """
+        Retorna as métricas do endpoint.
+
+        Args:
+            now (float): Instante atual (monotônico)
+
+        Returns:
+            Dict[str, Any]: Estado, carga, latência e contadores
+        """
+        return {
+            "state": "ejected" if self.is_ejected(now) else "active",
+            "outstanding": self.outstanding,
+            "ewma_latency": self.ewma,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejections": self.ejections,
+            "reintroductions": self.reintroductions,
+            "ejected_for": max(0.0, self.ejected_until - now)
+        }
+
+class EndpointPool:
+    """
+    Pool de endpoints equivalentes de um fluxo.
+    """
+
+    def __init__(self, urls: Iterable[str], strategy: str = EWMA, ewma_decay: float = 0.3,
+                 eject_failures: int = 3, eject_timeout: float = 30.0, max_eject_timeout: float = 300.0):
+        """
+        Inicializa o pool.
+
+        Args:
+            urls (Iterable[str]): URLs dos endpoints equivalentes
+            strategy (str): "least_outstanding" ou "ewma"
+            ewma_decay (float): Peso da latência mais recente na média (entre 0 e 1)
+            eject_failures (int): Falhas consecutivas que ejetam o endpoint (0 desativa a ejeção)
+            eject_timeout (float): Período da primeira ejeção em segundos
+            max_eject_timeout (float): Período máximo de ejeção, dobrado a cada nova ejeção seguida
+
+        Raises:
+            ValueError: Se a estratégia for desconhecida
+        """
+        self.endpoints = [Endpoint(url) for url in urls]
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estratégia de balanceamento desconhecida: {strategy}")
+        self.strategy = strategy
+        self.ewma_decay = ewma_decay
+        self.eject_failures = eject_failures
+        self.eject_timeout = eject_timeout
+        self.max_eject_timeout = max_eject_timeout
+        self._by_url = {endpoint.url: endpoint for endpoint in self.endpoints}
+        self._lock = threading.Lock()
+
+    @property
+    def urls(self) -> List[str]:
+        """
+        URLs dos endpoints, na ordem configurada.
+
+        Returns:
+            List[str]: URLs do pool
+        """
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def select(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Escolhe o endpoint da próxima requisição entre os disponíveis: fora de
+        ejeção e com o disjuntor não aberto. Se nenhum estiver disponível, usa
+        o que sairá da ejeção primeiro, para que o fluxo nunca fique sem destino.
+
+        Args:
+            exclude (Iterable[str]): URLs a evitar (ex.: o endpoint da requisição original de um hedge)
+
+        Returns:
+            Optional[str]: URL escolhida ou None se não houver endpoints além dos excluídos
+        """
+        excluded = set(exclude)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint.url not in excluded]
+            if not candidates:
+                return None
+
+            available = [endpoint for endpoint in candidates
+                         if not endpoint.is_ejected(now) and not self._circuit_open(endpoint.url)]
+            if not available:
+                return min(candidates, key=lambda endpoint: endpoint.ejected_until).url
+
+            # Endpoints ainda sem latência medida recebem a média dos demais, para que
+            # sejam experimentados sem atrair toda a carga de uma vez
+            measured = [endpoint.ewma for endpoint in self.endpoints if endpoint.ewma is not None]
+            prior = sum(measured) / len(measured) if measured else 1.0
+            scores = {endpoint.url: endpoint.score(self.strategy, prior) for endpoint in available}
+            best = min(scores.values())
+            chosen = random.choice([endpoint for endpoint in available if scores[endpoint.url] == best])
+            if chosen.ejected_until and chosen.consecutive_failures >= self.eject_failures > 0:
+                # Primeira requisição após a ejeção: o endpoint volta à rotação, mas uma
+                # nova falha o ejeta outra vez (por um período dobrado)
+                chosen.reintroductions += 1
+                chosen.consecutive_failures = self.eject_failures - 1
+                logger.info(f"Endpoint {chosen.url} reintroduzido no balanceamento")
+            return chosen.url
+
+    def begin(self, url: str) -> float:
+        """
+        Registra o início de uma requisição ao endpoint.
+
+        Args:
+            url (str): URL do endpoint
+
+        Returns:
+            float: Instante de início (monotônico), a repassar para ``end``
+        """
+        with self._lock:
+            endpoint = self._by_url.get(url)
+            if endpoint is not None:
+                endpoint.outstanding += 1
+                endpoint.requests += 1
+        return time.monotonic()
+
+    def end(self, url: str, started: float, success: bool) -> None:
+        """
+        Registra o fim de uma requisição: atualiza a latência média (apenas com
+        respostas bem-sucedidas, para que um endpoint que falha rápido não pareça o
+        mais rápido) e, após falhas consecutivas suficientes, ejeta o endpoint.
+
+        Args:
+            url (str): URL do endpoint
+            started (float): Instante de início retornado por ``begin``
+            success (bool): Se o endpoint respondeu sem erro de servidor ou de conexão
+        """
+        now = time.monotonic()
+        with self._lock:
+            endpoint = self._by_url.get(url)
+            if endpoint is None:
+                return
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+
+            if success:
+                latency = now - started
+                endpoint.ewma = latency if endpoint.ewma is None else \
+                    self.ewma_decay * latency + (1 - self.ewma_decay) * endpoint.ewma
+                endpoint.consecutive_failures = 0
+                endpoint.ejection_streak = 0
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if self.eject_failures > 0 and endpoint.consecutive_failures >= self.eject_failures \
+                    and not endpoint.is_ejected(now):
+                period = min(self.max_eject_timeout, self.eject_timeout * (2 ** endpoint.ejection_streak))
+                endpoint.ejected_until = now + period
+                endpoint.ejection_streak += 1
+                endpoint.ejections += 1
+                logger.warning(f"Endpoint {url} ejetado do balanceamento por {period:.0f}s "
+                               f"após {endpoint.consecutive_failures} falhas consecutivas")
+
+    def is_ejected(self, url: str) -> bool:
+        """
+        Indica se um endpoint do pool está fora de rotação.
+
+        Args:
+            url (str): URL do endpoint
+
+        Returns:
+            bool: True durante o período de ejeção
+        """
+        with self._lock:
+            endpoint = self._by_url.get(url)
+            return endpoint is not None and endpoint.is_ejected(time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas do pool.
+
+        Returns:
+            Dict[str, Any]: Estratégia e métricas por endpoint
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "endpoints": {endpoint.url: endpoint.stats(now) for endpoint in self.endpoints}
+            }
+
+    @staticmethod
+    def _circuit_open(url: str) -> bool:
+        """
+        Indica se o disjuntor do endpoint está aberto (recusando requisições).
+
+        Args:
+            url (str): URL do endpoint
+
+        Returns:
+            bool: True se o circuito está aberto
+        """
+        breaker = CircuitBreakerRegistry().get(url)
+        return breaker is not None and breaker.state == OPEN
+
+class EndpointPoolRegistry:
+    """
+    Registro dos pools de endpoints do processo, compartilhados pelos clientes do mesmo fluxo.
+    Implementa o padrão Singleton.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(EndpointPoolRegistry, cls).__new__(cls)
+                    instance.configure(
+                        strategy=active_config.LOAD_BALANCER_STRATEGY,
+                        ewma_decay=active_config.LOAD_BALANCER_EWMA_DECAY,
+                        eject_failures=active_config.LOAD_BALANCER_EJECT_FAILURES,
+                        eject_timeout=active_config.LOAD_BALANCER_EJECT_TIMEOUT,
+                        max_eject_timeout=active_config.LOAD_BALANCER_MAX_EJECT_TIMEOUT
+                    )
+                    cls._instance = instance
+        return cls._instance
+
+    def configure(self, **pool_options) -> None:
+        """
+        Define os parâmetros dos pools, descartando os existentes.
+
+        Args:
+            **pool_options: Parâmetros repassados a cada EndpointPool
+        """
+        self.pool_options = pool_options
+        self._pools: Dict[Tuple[str, ...], EndpointPool] = {}
+        self._lock = threading.Lock()
+
+    def get(self, raw: str) -> EndpointPool:
+        """
+        Obtém o pool de uma lista de endpoints, criando-o se necessário.
+
+        Args:
+            raw (str): Uma URL ou várias URLs equivalentes separadas por vírgula
+
+        Returns:
+            EndpointPool: Pool compartilhado dos endpoints
+        """
+        key = tuple(parse_endpoints(raw))
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = EndpointPool(key, **self.pool_options)
+                self._pools[key] = pool
+            return pool
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna as métricas dos pools.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Métricas por pool (chave: URLs separadas por vírgula)
+        """
+        with self._lock:
+            pools = dict(self._pools)
+        return {",".join(key): pool.stats() for key, pool in pools.items()}
@@ -0,0 +1,285 @@
+"""
+Disjuntores (circuit breakers) por endpoint.
+Quando um fluxo do Langflow passa a falhar, o disjuntor abre e as
+requisições seguintes falham imediatamente em vez de consumir todas as
+tentativas e timeouts; após uma espera crescente, uma requisição de
+sondagem decide se o circuito volta a fechar.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from src.config.settings import active_config
+from src.services.http.rate_limiter import rate_key
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Exceção lançada quando o disjuntor recusa uma requisição."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuito aberto para {name}; nova sondagem em {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """
+    Disjuntor com estados fechado, aberto e semiaberto.
+    Abre quando a taxa de falhas na janela deslizante atinge o limite e
+    dobra a espera até a próxima sondagem a cada sondagem malsucedida.
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, minimum_calls: int = 5,
+                 window: float = 60.0, open_timeout: float = 30.0, max_open_timeout: float = 300.0,
+                 half_open_max_calls: int = 1):
+        """
+        Inicializa o disjuntor.
+
+        Args:
+            name (str): Nome do disjuntor (chave do endpoint)
+            failure_rate (float): Fração de falhas na janela que abre o circuito
+            minimum_calls (int): Chamadas mínimas na janela antes de avaliar a taxa de falhas
+            window (float): Tamanho da janela deslizante em segundos
+            open_timeout (float): Espera inicial até a primeira sondagem em segundos
+            max_open_timeout (float): Espera máxima entre sondagens em segundos
+            half_open_max_calls (int): Sondagens simultâneas permitidas no estado semiaberto
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.open_timeout = open_timeout
+        self.max_open_timeout = max_open_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._calls = deque()
+        self._current_timeout = open_timeout
+        self._opened_at: Optional[float] = None
+        self._probes = 0
+        self._rejected = 0
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        Estado atual do disjuntor, considerando a passagem do tempo.
+        """
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Indica se uma requisição pode ser enviada, reservando uma sondagem no estado semiaberto.
+
+        Returns:
+            bool: True se a requisição é permitida
+        """
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                logger.info(f"Disjuntor {self.name}: enviando requisição de sondagem")
+                return True
+            self._rejected += 1
+            return False
+
+    def release_probe(self) -> None:
+        """
+        Devolve a sondagem reservada por ``allow_request`` quando a requisição acaba não sendo enviada.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def retry_in(self) -> float:
+        """
+        Calcula o tempo até a próxima sondagem.
+
+        Returns:
+            float: Segundos até a próxima sondagem (0 se o circuito não está aberto)
+        """
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._current_timeout - time.monotonic())
+
+    def record_success(self) -> None:
+        """
+        Registra uma chamada bem-sucedida.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                logger.info(f"Disjuntor {self.name}: sondagem bem-sucedida, circuito fechado")
+                self._close()
+                return
+            self._calls.append((now, True))
+            self._trim(now)
+
+    def record_failure(self) -> None:
+        """
+        Registra uma chamada malsucedida.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._current_timeout = min(self._current_timeout * 2, self.max_open_timeout)
+                logger.warning(f"Disjuntor {self.name}: sondagem falhou, circuito reaberto "
+                               f"por {self._current_timeout:.0f}s")
+                self._open(now)
+                return
+            if self._state == OPEN:
+                return
+
+            self._calls.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, success in self._calls if not success)
+            if len(self._calls) >= self.minimum_calls and failures / len(self._calls) >= self.failure_rate:
+                logger.warning(f"Disjuntor {self.name}: {failures} falhas em {len(self._calls)} chamadas, "
+                               f"circuito aberto por {self._current_timeout:.0f}s")
+                self._open(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna o estado e as métricas do disjuntor.
+
+        Returns:
+            Dict[str, Any]: Estado, chamadas e falhas na janela, recusas e próxima sondagem
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            self._trim(now)
+            failures = sum(1 for _, success in self._calls if not success)
+            return {
+                "state": self._state,
+                "calls": len(self._calls),
+                "failures": failures,
+                "failure_rate": failures / len(self._calls) if self._calls else 0.0,
+                "rejected": self._rejected,
+                "times_opened": self._times_opened,
+                "retry_in": max(0.0, self._opened_at + self._current_timeout - now) if self._state == OPEN else 0.0
+            }
+
+    def _advance(self, now: float) -> None:
+        """
+        Passa do estado aberto para o semiaberto quando chega a hora da sondagem.
+
+        Args:
+            now (float): Instante atual (monotônico)
+        """
+        if self._state == OPEN and now >= self._opened_at + self._current_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def _open(self, now: float) -> None:
+        """
+        Abre o circuito.
+
+        Args:
+            now (float): Instante atual (monotônico)
+        """
+        self._state = OPEN
+        self._opened_at = now
+        self._probes = 0
+        self._times_opened += 1
+
+    def _close(self) -> None:
+        """
+        Fecha o circuito e reinicia a janela e a espera entre sondagens.
+        """
+        self._state = CLOSED
+        self._calls.clear()
+        self._current_timeout = self.open_timeout
+        self._opened_at = None
+        self._probes = 0
+
+    def _trim(self, now: float) -> None:
+        """
+        Descarta as chamadas fora da janela.
+
+        Args:
+            now (float): Instante atual (monotônico)
+        """
+        while self._calls and self._calls[0][0] <= now - self.window:
+            self._calls.popleft()
+
+class CircuitBreakerRegistry:
+    """
+    Registro dos disjuntores do processo, um por endpoint.
+    Implementa o padrão Singleton.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(CircuitBreakerRegistry, cls).__new__(cls)
+                    instance.configure(
+                        enabled=active_config.CIRCUIT_BREAKER_ENABLED,
+                        failure_rate=active_config.CIRCUIT_BREAKER_FAILURE_RATE,
+                        minimum_calls=active_config.CIRCUIT_BREAKER_MIN_CALLS,
+                        window=active_config.CIRCUIT_BREAKER_WINDOW,
+                        open_timeout=active_config.CIRCUIT_BREAKER_OPEN_TIMEOUT,
+                        max_open_timeout=active_config.CIRCUIT_BREAKER_MAX_OPEN_TIMEOUT
+                    )
+                    cls._instance = instance
+        return cls._instance
+
+    def configure(self, enabled: bool, **breaker_options) -> None:
+        """
+        Define os parâmetros dos disjuntores, descartando os existentes.
+
+        Args:
+            enabled (bool): Se os disjuntores estão habilitados
+            **breaker_options: Parâmetros repassados a cada CircuitBreaker
+        """
+        self.enabled = enabled
+        self.breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[CircuitBreaker]:
+        """
+        Obtém o disjuntor de um endpoint, criando-o se necessário.
+
+        Args:
+            url (str): URL do endpoint
+
+        Returns:
+            Optional[CircuitBreaker]: Disjuntor do endpoint ou None se desabilitado
+        """
+        if not self.enabled:
+            return None
+
+        key = rate_key(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key, **self.breaker_options)
+                self._breakers[key] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna o estado de cada disjuntor.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Estado e métricas por endpoint
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.stats() for key, breaker in breakers.items()}
@@ -0,0 +1,428 @@
+"""
+Requisições duplicadas (hedging) para cortar a cauda de latência.
+Quando uma chamada demora mais que um percentil das latências recentes do
+endpoint, uma cópia é enviada ao mesmo endpoint (ou a um alternativo) e vale
+a primeira resposta utilizável. A taxa de cópias é limitada por um orçamento
+em janela deslizante.
+"""
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.config.settings import active_config
+from src.services.http.rate_limiter import rate_key
+from src.services.http.retry import RetryBudget
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+class LatencyTracker:
+    """
+    Latências recentes de um endpoint, para cálculo de percentis.
+    """
+
+    def __init__(self, max_samples: int = 200):
+        """
+        Inicializa o acompanhamento.
+
+        Args:
+            max_samples (int): Quantidade de latências mais recentes consideradas
+        """
+        self._samples = deque(maxlen=max(1, max_samples))
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        Registra a latência de uma chamada concluída.
+
+        Args:
+            seconds (float): Duração da chamada em segundos
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Calcula um percentil das latências registradas (método do valor mais próximo).
+
+        Args:
+            q (float): Percentil entre 0 e 1 (ex.: 0.95)
+
+        Returns:
+            Optional[float]: Latência em segundos ou None sem amostras
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))
+        return samples[index]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+class HedgeWorkers:
+    """
+    Threads que executam as chamadas com duplicação, em número limitado. Uma chamada
+    só é entregue a uma thread livre (nunca espera na fila do pool); sem thread
+    livre, a chamada original é feita na thread do chamador e não recebe cópia.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Inicializa as threads.
+
+        Args:
+            max_workers (int): Número máximo de chamadas em execução simultânea
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="hedge")
+        self._slots = threading.BoundedSemaphore(max(1, max_workers))
+
+    def reserve(self) -> bool:
+        """
+        Reserva uma thread livre, sem esperar.
+
+        Returns:
+            bool: True se a reserva foi feita (a repassar para ``submit`` ou ``cancel``)
+        """
+        return self._slots.acquire(blocking=False)
+
+    def cancel(self) -> None:
+        """
+        Devolve uma reserva que não foi usada.
+        """
+        self._slots.release()
+
+    def submit(self, func: Callable[[], T]) -> Future:
+        """
+        Executa a função em uma thread reservada, preservando as variáveis de
+        contexto (ex.: o prazo da requisição). A reserva é devolvida ao fim.
+
+        Args:
+            func (Callable[[], T]): Função a executar
+
+        Returns:
+            Future: Resultado da função
+        """
+        future = self._executor.submit(copy_context().run, func)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+class Hedger:
+    """
+    Duplicação das chamadas lentas a um endpoint.
+    """
+
+    def __init__(self, name: str, budget: RetryBudget, percentile: float = 0.95,
+                 min_samples: int = 20, min_delay: float = 1.0, max_samples: int = 200,
+                 alternate: Optional[str] = None, workers: Optional[HedgeWorkers] = None):
+        """
+        Inicializa o mecanismo de duplicação.
+
+        Args:
+            name (str): Identificação do endpoint (usada nos logs e métricas)
+            budget (RetryBudget): Orçamento que limita a taxa de cópias (compartilhado entre endpoints)
+            percentile (float): Percentil das latências recentes após o qual a cópia é enviada
+            min_samples (int): Latências registradas necessárias antes da primeira cópia
+            min_delay (float): Espera mínima em segundos antes de enviar uma cópia
+            max_samples (int): Latências mais recentes consideradas
+            alternate (Optional[str]): URL que recebe as cópias; se None, o próprio endpoint
+            workers (Optional[HedgeWorkers]): Threads das chamadas (compartilhadas entre endpoints);
+                se None, usa HEDGE_MAX_WORKERS threads próprias
+        """
+        self.name = name
+        self.budget = budget
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.alternate = alternate
+        self.latencies = LatencyTracker(max_samples)
+        self.workers = workers or HedgeWorkers(active_config.HEDGE_MAX_WORKERS)
+        self._lock = threading.Lock()
+        self._counters = {
+            "calls": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "primary_wins": 0,
+            "denied": 0,
+            "cancelled": 0,
+            "saturated": 0
+        }
+
+    def delay(self) -> Optional[float]:
+        """
+        Calcula a espera antes de enviar uma cópia.
+
+        Returns:
+            Optional[float]: Espera em segundos ou None se ainda não há latências suficientes
+        """
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    def call(self, send: Callable[[Optional[str], Optional[float]], T], timeout: Optional[float],
+             accept: Callable[[T], bool], discard: Callable[[T], None],
+             can_hedge: Callable[[Optional[str]], bool] = lambda url: True,
+             choose_alternate: Optional[Callable[[], Optional[str]]] = None,
+             release: Callable[[Optional[str]], None] = lambda url: None) -> T:
+        """
+        Executa a chamada, enviando uma cópia se ela passar do percentil configurado.
+        Vale a primeira resposta aceita; a outra chamada é cancelada (o seu
+        resultado é liberado com ``discard`` assim que chega). Se nenhuma for
+        aceita, prevalece o resultado da chamada original. Sem threads livres,
+        a chamada é feita sem cópia.
+
+        Args:
+            send (Callable[[Optional[str], Optional[float]], T]): Realiza uma chamada; recebe a URL
+                (None para o próprio endpoint) e o timeout em segundos
+            timeout (Optional[float]): Timeout da chamada original em segundos
+            accept (Callable[[T], bool]): Indica se uma resposta encerra a chamada
+                (ex.: não é um erro retentável)
+            discard (Callable[[T], None]): Libera uma resposta descartada (ex.: fecha a conexão;
+                para que a perdedora pare logo, ``send`` não deve ler o corpo da resposta)
+            can_hedge (Callable[[Optional[str]], bool]): Verificação final antes da cópia
+                (ex.: disjuntor e limitador de taxa do destino)
+            choose_alternate (Optional[Callable[[], Optional[str]]]): Escolhe, no momento da cópia,
+                a URL que a recebe (ex.: outra réplica do fluxo); se ausente ou se retornar None,
+                usa o alternativo configurado
+            release (Callable[[Optional[str]], None]): Devolve as reservas feitas por ``can_hedge``
+                quando a cópia acaba não sendo enviada (ex.: sondagem do disjuntor)
+
+        Returns:
+            T: Resposta vencedora
+
+        Raises:
+            Exception: Exceção da chamada original, se nenhuma resposta for aceita
+        """
+        self.budget.record_request()
+        with self._lock:
+            self._counters["calls"] += 1
+
+        started = time.monotonic()
+        delay = self.delay()
+        if delay is None or (timeout is not None and delay >= timeout):
+            return self._timed(send, None, timeout)
+        if not self.workers.reserve():
+            self._count("saturated")
+            return self._timed(send, None, timeout)
+
+        primary = self.workers.submit(lambda: self._timed(send, None, timeout))
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        if not self.workers.reserve():
+            self._count("saturated")
+            return primary.result()
+        target = (choose_alternate() if choose_alternate else None) or self.alternate
+        # O orçamento só é consumido por cópias que o destino aceita receber
+        if not can_hedge(target):
+            self.workers.cancel()
+            self._count("denied")
+            return primary.result()
+        if not self.budget.try_acquire():
+            self.workers.cancel()
+            release(target)
+            self._count("denied")
+            return primary.result()
+
+        elapsed = time.monotonic() - started
+        hedge_timeout = None if timeout is None else max(timeout - elapsed, 0.001)
+        logger.info(f"Chamada a {self.name} sem resposta após {elapsed:.2f}s; enviando cópia"
+                    f"{' para ' + target if target else ''}")
+        self._count("hedged")
+        hedge = self.workers.submit(lambda: self._timed(send, target, hedge_timeout))
+
+        winner, loser = self._first_accepted(primary, hedge, accept)
+        self._count("hedge_wins" if winner is hedge else "primary_wins")
+        self._cancel(loser, discard)
+        return winner.result()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas do endpoint.
+
+        Returns:
+            Dict[str, Any]: Chamadas, cópias enviadas e negadas, vitórias e espera atual
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats["hedge_win_rate"] = stats["hedge_wins"] / stats["hedged"] if stats["hedged"] else 0.0
+        stats["hedge_rate"] = stats["hedged"] / stats["calls"] if stats["calls"] else 0.0
+        stats["delay"] = self.delay()
+        stats["samples"] = len(self.latencies)
+        stats["alternate"] = self.alternate
+        return stats
+
+    def _timed(self, send: Callable[[Optional[str], Optional[float]], T],
+               url: Optional[str], timeout: Optional[float]) -> T:
+        """
+        Realiza uma chamada e registra a sua latência, quando ela termina com uma resposta.
+
+        Args:
+            send (Callable[[Optional[str], Optional[float]], T]): Realiza a chamada
+            url (Optional[str]): URL de destino (None para o próprio endpoint)
+            timeout (Optional[float]): Timeout em segundos
+
+        Returns:
+            T: Resposta
+        """
+        started = time.monotonic()
+        result = send(url, timeout)
+        self.latencies.record(time.monotonic() - started)
+        return result
+
+    @staticmethod
+    def _first_accepted(primary: Future, hedge: Future, accept: Callable[[Any], bool]) -> Tuple[Future, Future]:
+        """
+        Aguarda a primeira resposta aceita entre a chamada original e a cópia.
+
+        Args:
+            primary (Future): Chamada original
+            hedge (Future): Cópia
+            accept (Callable[[Any], bool]): Indica se uma resposta encerra a chamada
+
+        Returns:
+            Tuple[Future, Future]: Vencedora e perdedora (a original vence se nenhuma for aceita)
+        """
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None and accept(future.result()):
+                    return future, hedge if future is primary else primary
+        return primary, hedge
+
+    def _cancel(self, loser: Future, discard: Callable[[Any], None]) -> None:
+        """
+        Cancela a chamada perdedora: a resposta é liberada com ``discard`` assim
+        que chega (sem o corpo lido, a conexão volta logo ao pool).
+
+        Args:
+            loser (Future): Chamada perdedora
+            discard (Callable[[Any], None]): Libera uma resposta descartada
+        """
+        self._count("cancelled")
+
+        def release(future: Future) -> None:
+            if future.exception() is None:
+                discard(future.result())
+
+        loser.add_done_callback(release)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+def parse_alternates(raw: Optional[str]) -> Dict[str, str]:
+    """
+    Interpreta os endpoints alternativos no formato ``url_do_fluxo=url_alternativa;...``.
+
+    Args:
+        raw (Optional[str]): Valor bruto da configuração
+
+    Returns:
+        Dict[str, str]: URL alternativa por chave de endpoint
+    """
+    alternates = {}
+    for entry in (raw or '').split(';'):
+        target, _, alternate = entry.strip().partition('=')
+        if target and alternate.strip():
+            alternates[rate_key(target)] = alternate.strip()
+        elif entry.strip():
+            logger.warning(f"Endpoint alternativo inválido ignorado: {entry.strip()}")
+    return alternates
+
+class HedgingRegistry:
+    """
+    Registro dos mecanismos de duplicação do processo, um por endpoint,
+    com um orçamento de cópias compartilhado.
+    Implementa o padrão Singleton.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(HedgingRegistry, cls).__new__(cls)
+                    instance.configure(
+                        enabled=active_config.HEDGING_ENABLED,
+                        max_ratio=active_config.HEDGE_MAX_RATIO,
+                        window=active_config.HEDGE_WINDOW,
+                        alternates=parse_alternates(active_config.HEDGE_ALTERNATES),
+                        percentile=active_config.HEDGE_PERCENTILE,
+                        min_samples=active_config.HEDGE_MIN_SAMPLES,
+                        min_delay=active_config.HEDGE_MIN_DELAY,
+                        max_samples=active_config.HEDGE_MAX_SAMPLES,
+                        max_workers=active_config.HEDGE_MAX_WORKERS
+                    )
+                    cls._instance = instance
+        return cls._instance
+
+    def configure(self, enabled: bool, max_ratio: float = 0.1, window: float = 60.0,
+                  alternates: Optional[Dict[str, str]] = None, max_workers: int = 32,
+                  **hedger_options) -> None:
+        """
+        Define os parâmetros da duplicação, descartando os mecanismos existentes.
+
+        Args:
+            enabled (bool): Se a duplicação está habilitada
+            max_ratio (float): Cópias permitidas por chamada na janela (0.1 = até 10% a mais de carga)
+            window (float): Janela do orçamento de cópias em segundos
+            alternates (Optional[Dict[str, str]]): URL alternativa por chave de endpoint
+            max_workers (int): Chamadas com duplicação em execução simultânea, somando os endpoints
+            **hedger_options: Parâmetros repassados a cada Hedger
+        """
+        self.enabled = enabled
+        self.budget = RetryBudget(ratio=max_ratio, min_per_second=0.0, window=window)
+        self.alternates = alternates or {}
+        self.workers = HedgeWorkers(max_workers)
+        self.hedger_options = hedger_options
+        self._hedgers: Dict[str, Hedger] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Hedger]:
+        """
+        Obtém o mecanismo de duplicação de um endpoint, criando-o se necessário.
+
+        Args:
+            url (str): URL do endpoint
+
+        Returns:
+            Optional[Hedger]: Mecanismo do endpoint ou None se desabilitado
+        """
+        if not self.enabled:
+            return None
+
+        key = rate_key(url)
+        with self._lock:
+            hedger = self._hedgers.get(key)
+            if hedger is None:
+                hedger = Hedger(key, self.budget, alternate=self.alternates.get(key), workers=self.workers,
+                                **self.hedger_options)
+                self._hedgers[key] = hedger
+            return hedger
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas de duplicação.
+
+        Returns:
+            Dict[str, Any]: Orçamento de cópias e métricas por endpoint
+        """
+        with self._lock:
+            hedgers = dict(self._hedgers)
+        return {
+            "enabled": self.enabled,
+            "budget": self.budget.stats(),
+            "endpoints": {key: hedger.stats() for key, hedger in hedgers.items()}
+        }
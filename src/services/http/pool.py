@@ -0,0 +1,294 @@
+"""
+Pool de sessões HTTP compartilhado.
+Mantém conexões keep-alive reutilizáveis por endpoint, evitando novos
+handshakes TCP/TLS a cada requisição feita pelos agentes.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.timeout import Timeout
+
+from src.config.settings import active_config
+from src.services.deadline import remaining_time
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Configuração do pool de conexões de um endpoint.
+
+    Attributes:
+        pool_connections (int): Número de pools de conexão mantidos pelo adaptador
+        pool_maxsize (int): Número máximo de conexões simultâneas por host; requisições
+            além desse limite aguardam uma conexão livre em vez de abrir novas, no máximo
+            pelo timeout de conexão da requisição e pelo prazo em vigor
+        keep_alive (bool): Se as conexões devem ser mantidas abertas entre requisições
+    """
+    pool_connections: int
+    pool_maxsize: int
+    keep_alive: bool = True
+
+def endpoint_key(url: str) -> str:
+    """
+    Obtém a chave do endpoint (esquema + host + porta) de uma URL.
+
+    Args:
+        url (str): URL completa
+
+    Returns:
+        str: Chave do endpoint, ex.: "http://localhost:7860"
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+def parse_pool_overrides(raw: Optional[str]) -> Dict[str, PoolConfig]:
+    """
+    Interpreta as configurações de pool específicas por endpoint.
+
+    O formato esperado é uma lista separada por ponto e vírgula de
+    ``endpoint=conexoes:maximo[:keepalive]``, por exemplo:
+    ``http://localhost:7860=10:50:true;https://r.jina.ai=4:8``.
+
+    Args:
+        raw (Optional[str]): Valor bruto da configuração
+
+    Returns:
+        Dict[str, PoolConfig]: Configurações indexadas pela chave do endpoint
+    """
+    overrides = {}
+    if not raw:
+        return overrides
+
+    for entry in raw.split(';'):
+        entry = entry.strip()
+        if not entry or '=' not in entry:
+            continue
+
+        endpoint, _, values = entry.rpartition('=')
+        fields = values.split(':')
+        try:
+            config = PoolConfig(
+                pool_connections=int(fields[0]),
+                pool_maxsize=int(fields[1]) if len(fields) > 1 else int(fields[0]),
+                keep_alive=fields[2].strip().lower() != 'false' if len(fields) > 2 else True
+            )
+        except ValueError:
+            logger.warning(f"Configuração de pool inválida ignorada: {entry}")
+            continue
+
+        overrides[endpoint_key(endpoint.strip())] = config
+
+    return overrides
+
+def pool_wait(timeout: object) -> float:
+    """
+    Calcula a espera máxima por uma conexão livre do pool: o timeout de conexão da
+    requisição (ou REQUEST_TIMEOUT), limitado pelo prazo em vigor (ver src.services.deadline).
+
+    Args:
+        timeout (object): Timeout repassado ao urllib3 (Timeout, número ou None)
+
+    Returns:
+        float: Espera em segundos (zero com o prazo esgotado)
+    """
+    limit = timeout.connect_timeout if isinstance(timeout, Timeout) else timeout
+    if not isinstance(limit, (int, float)):
+        limit = active_config.REQUEST_TIMEOUT
+    return max(0.0, remaining_time(float(limit)))
+
+class _BoundedWaitMixin:
+    """
+    Limita a espera por uma conexão livre nos pools bloqueantes: sem ``pool_timeout``,
+    o urllib3 aguardaria indefinidamente, ignorando o timeout e o prazo da requisição.
+    """
+
+    def urlopen(self, method, url, *args, **kwargs):
+        if kwargs.get('pool_timeout') is None:
+            kwargs['pool_timeout'] = pool_wait(kwargs.get('timeout'))
+        return super().urlopen(method, url, *args, **kwargs)
+
+class _BoundedHTTPConnectionPool(_BoundedWaitMixin, HTTPConnectionPool):
+    pass
+
+class _BoundedHTTPSConnectionPool(_BoundedWaitMixin, HTTPSConnectionPool):
+    pass
+
+_BOUNDED_POOL_CLASSES = {"http": _BoundedHTTPConnectionPool, "https": _BoundedHTTPSConnectionPool}
+
+class BoundedPoolAdapter(HTTPAdapter):
+    """
+    Adaptador com pool bloqueante (``pool_maxsize`` é um limite real de conexões
+    simultâneas) e espera limitada por uma conexão livre. Esgotada a espera, a
+    requisição falha com ``requests.exceptions.ConnectionError``, tratada pela
+    política de retentativas como as demais falhas de conexão.
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int):
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _BOUNDED_POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs) -> PoolManager:
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # Proxies SOCKS usam pools próprios do urllib3 e mantêm a espera padrão
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = _BOUNDED_POOL_CLASSES
+        return manager
+
+    def send(self, request, **kwargs) -> requests.Response:
+        try:
+            return super().send(request, **kwargs)
+        except EmptyPoolError as e:
+            raise requests.exceptions.ConnectionError(
+                f"Nenhuma conexão livre no pool de {endpoint_key(request.url)} dentro do prazo", request=request
+            ) from e
+
+class HttpSessionPool:
+    """
+    Pool de sessões HTTP compartilhado por todo o processo.
+    Implementa o padrão Singleton; cada endpoint recebe uma única sessão
+    com seu próprio adaptador de conexões, segura para uso entre threads.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(HttpSessionPool, cls).__new__(cls)
+                    instance._sessions = {}
+                    instance._lock = threading.Lock()
+                    instance._default_config = PoolConfig(
+                        pool_connections=active_config.HTTP_POOL_CONNECTIONS,
+                        pool_maxsize=active_config.HTTP_POOL_MAXSIZE,
+                        keep_alive=active_config.HTTP_KEEP_ALIVE
+                    )
+                    instance._overrides = parse_pool_overrides(active_config.HTTP_POOL_ENDPOINTS)
+                    cls._instance = instance
+                    logger.info("Pool de sessões HTTP inicializado")
+        return cls._instance
+
+    def configure_endpoint(self, url: str, config: PoolConfig) -> None:
+        """
+        Define a configuração de pool de um endpoint.
+        Se já existir uma sessão para o endpoint, ela é fechada e recriada no próximo uso.
+
+        Args:
+            url (str): URL (ou base) do endpoint
+            config (PoolConfig): Configuração do pool
+        """
+        key = endpoint_key(url)
+        with self._lock:
+            self._overrides[key] = config
+            session = self._sessions.pop(key, None)
+        if session is not None:
+            session.close()
+        logger.info(f"Pool configurado para o endpoint '{key}': {config}")
+
+    def get_config(self, url: str) -> PoolConfig:
+        """
+        Obtém a configuração de pool aplicada a um endpoint.
+
+        Args:
+            url (str): URL do endpoint
+
+        Returns:
+            PoolConfig: Configuração do pool
+        """
+        return self._overrides.get(endpoint_key(url), self._default_config)
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        Obtém a sessão compartilhada para o endpoint da URL, criando-a se necessário.
+
+        Args:
+            url (str): URL de destino da requisição
+
+        Returns:
+            requests.Session: Sessão com pool de conexões do endpoint
+        """
+        key = endpoint_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session(key, self.get_config(url))
+                self._sessions[key] = session
+        return session
+
+    def close_all(self) -> None:
+        """
+        Fecha todas as sessões abertas, liberando as conexões do pool.
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+            self._sessions.clear()
+
+        for key, session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar sessão do endpoint '{key}': {str(e)}")
+
+        if sessions:
+            logger.info(f"Pool de sessões HTTP encerrado ({len(sessions)} sessões fechadas)")
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Retorna as sessões abertas e suas configurações.
+
+        Returns:
+            Dict[str, Dict[str, object]]: Configuração de cada endpoint com sessão ativa
+        """
+        with self._lock:
+            keys = list(self._sessions.keys())
+        return {
+            key: {
+                "pool_connections": self.get_config(key).pool_connections,
+                "pool_maxsize": self.get_config(key).pool_maxsize,
+                "keep_alive": self.get_config(key).keep_alive
+            }
+            for key in keys
+        }
+
+    def _create_session(self, key: str, config: PoolConfig) -> requests.Session:
+        """
+        Cria uma sessão com adaptador de conexões dimensionado para o endpoint.
+
+        Args:
+            key (str): Chave do endpoint
+            config (PoolConfig): Configuração do pool
+
+        Returns:
+            requests.Session: Nova sessão
+        """
+        session = requests.Session()
+        adapter = BoundedPoolAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if not config.keep_alive:
+            session.headers["Connection"] = "close"
+
+        logger.info(f"Sessão HTTP criada para o endpoint '{key}' "
+                    f"(conexões={config.pool_connections}, máximo={config.pool_maxsize}, "
+                    f"keep-alive={config.keep_alive})")
+        return session
@@ -0,0 +1,263 @@
+"""
+Limitador de taxa por host e por endpoint com baldes de tokens.
+Os agentes adquirem um token antes de cada requisição, mantendo o tráfego
+dentro do que o serviço de destino suporta sem respostas 429/504.
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.config.settings import active_config
+from src.services.http.pool import endpoint_key
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class RateLimitTimeout(Exception):
+    """Erro lançado quando a espera por um token excederia o tempo permitido."""
+    pass
+
+class TokenBucket:
+    """
+    Balde de tokens seguro para uso entre threads.
+    Os tokens são reservados sob o lock e a espera acontece fora dele,
+    de modo que as requisições são atendidas em ordem de chegada.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Inicializa o balde.
+
+        Args:
+            rate (float): Tokens repostos por segundo
+            burst (float): Capacidade máxima do balde
+        """
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self, timeout: Optional[float] = None) -> float:
+        """
+        Reserva um token e calcula quanto tempo é preciso esperar por ele.
+
+        Args:
+            timeout (Optional[float]): Espera máxima aceitável em segundos
+
+        Returns:
+            float: Tempo de espera em segundos
+
+        Raises:
+            RateLimitTimeout: Se a espera necessária exceder o timeout
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                raise RateLimitTimeout(f"Espera de {wait:.2f}s excede o limite de {timeout:.2f}s")
+
+            self._tokens -= 1.0
+            self.acquired += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def refund(self) -> None:
+        """
+        Devolve um token reservado que não foi usado.
+        """
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1.0)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna as métricas do balde.
+
+        Returns:
+            Dict[str, float]: Taxa, capacidade, tokens adquiridos e tempos de espera
+        """
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0
+            }
+
+def parse_rate(value: str) -> Optional[Tuple[float, float]]:
+    """
+    Interpreta uma taxa no formato ``taxa[:rajada]`` (tokens por segundo).
+
+    Args:
+        value (str): Taxa configurada, ex.: "0.5:2"
+
+    Returns:
+        Optional[Tuple[float, float]]: Taxa e rajada, ou None se vazia ou inválida
+    """
+    if not value or not value.strip():
+        return None
+    rate, _, burst = value.strip().partition(':')
+    try:
+        rate = float(rate)
+        burst = float(burst) if burst else max(1.0, rate)
+    except ValueError:
+        logger.warning(f"Taxa de requisições inválida ignorada: {value}")
+        return None
+    return (rate, burst) if rate > 0 else None
+
+def rate_key(url: str) -> str:
+    """
+    Obtém a chave de endpoint (URL sem consulta nem fragmento) usada nas regras.
+
+    Args:
+        url (str): URL de destino
+
+    Returns:
+        str: Chave do endpoint
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}".lower().rstrip('/')
+
+def parse_rate_rules(raw: Optional[str]) -> Dict[str, Tuple[float, float]]:
+    """
+    Interpreta as regras no formato ``host_ou_endpoint=taxa[:rajada];...``.
+
+    Args:
+        raw (Optional[str]): Valor bruto da configuração
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Taxa e rajada por chave
+    """
+    rules = {}
+    for entry in (raw or '').split(';'):
+        target, _, value = entry.strip().rpartition('=')
+        rate = parse_rate(value)
+        if target and rate:
+            rules[rate_key(target)] = rate
+    return rules
+
+class RateLimiter:
+    """
+    Limitador de taxa compartilhado por todo o processo.
+    Implementa o padrão Singleton; mantém um balde por host e, quando
+    configurado, um balde adicional por endpoint.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(RateLimiter, cls).__new__(cls)
+                    instance.configure(
+                        enabled=active_config.RATE_LIMIT_ENABLED,
+                        default_rate=parse_rate(active_config.RATE_LIMIT_DEFAULT),
+                        rules=parse_rate_rules(active_config.RATE_LIMIT_RULES)
+                    )
+                    cls._instance = instance
+        return cls._instance
+
+    def configure(self, enabled: bool, default_rate: Optional[Tuple[float, float]],
+                  rules: Dict[str, Tuple[float, float]]) -> None:
+        """
+        Define as regras do limitador, descartando os baldes existentes.
+
+        Args:
+            enabled (bool): Se o limitador está habilitado
+            default_rate (Optional[Tuple[float, float]]): Taxa aplicada a hosts sem regra própria
+            rules (Dict[str, Tuple[float, float]]): Taxas por host ou endpoint
+        """
+        self.enabled = enabled
+        self.default_rate = default_rate
+        self.rules = rules
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        logger.info(f"Limitador de taxa configurado (habilitado={enabled}, regras={len(rules)})")
+
+    def acquire(self, url: str, also: Iterable[str] = (), timeout: Optional[float] = None) -> float:
+        """
+        Aguarda os tokens necessários para uma requisição.
+
+        Args:
+            url (str): URL de destino da requisição
+            also (Iterable[str]): URLs adicionais cuja taxa a requisição também consome
+                (ex.: o leitor r.jina.ai acionado pelo fluxo do Langflow)
+            timeout (Optional[float]): Espera máxima aceitável em segundos
+
+        Returns:
+            float: Tempo total de espera em segundos
+
+        Raises:
+            RateLimitTimeout: Se a espera necessária exceder o timeout
+        """
+        if not self.enabled:
+            return 0.0
+
+        buckets = []
+        for target in [url, *also]:
+            buckets.extend(self._buckets_for(target))
+
+        reserved: List[TokenBucket] = []
+        wait = 0.0
+        try:
+            for bucket in buckets:
+                wait = max(wait, bucket.reserve(timeout))
+                reserved.append(bucket)
+        except RateLimitTimeout:
+            for bucket in reserved:
+                bucket.refund()
+            raise
+
+        if wait > 0:
+            logger.info(f"Aguardando {wait:.2f}s pelo limitador de taxa para {url}")
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna as métricas de cada balde.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Métricas por chave de host ou endpoint
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {key: bucket.stats() for key, bucket in buckets.items()}
+
+    def _buckets_for(self, url: str) -> List[TokenBucket]:
+        """
+        Obtém os baldes aplicáveis a uma URL (host e endpoint), criando-os se necessário.
+
+        Args:
+            url (str): URL de destino
+
+        Returns:
+            List[TokenBucket]: Baldes aplicáveis
+        """
+        host = rate_key(endpoint_key(url))
+        endpoint = rate_key(url)
+        candidates = [(host, self.rules.get(host, self.default_rate))]
+        if endpoint != host and endpoint in self.rules:
+            candidates.append((endpoint, self.rules[endpoint]))
+
+        buckets = []
+        with self._lock:
+            for key, rate in candidates:
+                if not rate:
+                    continue
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(*rate)
+                buckets.append(bucket)
+        return buckets
@@ -0,0 +1,310 @@
+"""
+Política de retentativas para chamadas HTTP.
+Aplica backoff exponencial com jitter completo, respeita o cabeçalho
+Retry-After, limita o tempo total por requisição (e ao prazo da requisição
+em andamento) e consome um orçamento global de retentativas para não
+multiplicar a carga durante incidentes.
+"""
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Type
+
+import requests
+
+from src.config.settings import active_config
+from src.services.deadline import remaining_time
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+DEFAULT_RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError
+)
+
+class RetryBudget:
+    """
+    Orçamento global de retentativas em uma janela deslizante.
+    Permite uma retentativa enquanto o total de retentativas na janela for
+    menor que ``ratio`` vezes o número de requisições originais, mais uma
+    reserva mínima por segundo para serviços com pouco tráfego.
+    """
+
+    def __init__(self, ratio: float = 1.0, min_per_second: float = 0.1, window: float = 60.0):
+        """
+        Inicializa o orçamento.
+
+        Args:
+            ratio (float): Retentativas permitidas por requisição original (1.0 = no máximo dobra a carga)
+            min_per_second (float): Retentativas por segundo sempre permitidas
+            window (float): Tamanho da janela em segundos
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self._requests = deque()
+        self._retries = deque()
+        self._denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """
+        Registra uma requisição original.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._requests.append(now)
+            self._trim(now)
+
+    def try_acquire(self) -> bool:
+        """
+        Tenta consumir o orçamento para uma retentativa.
+
+        Returns:
+            bool: True se a retentativa é permitida
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            allowed = len(self._requests) * self.ratio + self.min_per_second * self.window
+            if len(self._retries) >= allowed:
+                self._denied += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas do orçamento na janela atual.
+
+        Returns:
+            Dict[str, Any]: Requisições, retentativas e retentativas negadas
+        """
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "window": self.window,
+                "ratio": self.ratio,
+                "requests": len(self._requests),
+                "retries": len(self._retries),
+                "denied": self._denied
+            }
+
+    def _trim(self, now: float) -> None:
+        """
+        Descarta os registros fora da janela.
+
+        Args:
+            now (float): Instante atual (monotônico)
+        """
+        limit = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] < limit:
+                events.popleft()
+
+class RetryError(Exception):
+    """Erro lançado quando as tentativas se esgotam sem uma resposta utilizável."""
+
+    def __init__(self, message: str, response: Optional[requests.Response] = None):
+        super().__init__(message)
+        self.response = response
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interpreta o cabeçalho Retry-After (segundos ou data HTTP).
+
+    Args:
+        value (Optional[str]): Valor do cabeçalho
+
+    Returns:
+        Optional[float]: Espera em segundos ou None se ausente/inválido
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Política de retentativas reutilizável.
+
+    Attributes:
+        max_attempts (int): Número máximo de tentativas (incluindo a primeira)
+        base_delay (float): Espera base do backoff exponencial em segundos
+        max_delay (float): Espera máxima entre tentativas em segundos
+        deadline (Optional[float]): Tempo total máximo por requisição em segundos
+        retryable_statuses (FrozenSet[int]): Códigos HTTP que justificam nova tentativa
+        retryable_exceptions (Tuple[Type[BaseException], ...]): Exceções que justificam nova tentativa
+        budget (Optional[RetryBudget]): Orçamento global de retentativas
+    """
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    deadline: Optional[float] = None
+    retryable_statuses: FrozenSet[int] = DEFAULT_RETRYABLE_STATUSES
+    retryable_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRYABLE_EXCEPTIONS
+    budget: Optional[RetryBudget] = field(default=None, compare=False)
+
+    def with_overrides(self, **changes) -> 'RetryPolicy':
+        """
+        Cria uma cópia da política com alguns valores alterados, mantendo o mesmo orçamento.
+
+        Args:
+            **changes: Atributos a alterar (valores None são ignorados)
+
+        Returns:
+            RetryPolicy: Nova política
+        """
+        return replace(self, **{name: value for name, value in changes.items() if value is not None})
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Calcula a espera antes da próxima tentativa (backoff exponencial com jitter completo).
+
+        Args:
+            attempt (int): Número da tentativa que falhou, começando em 1
+
+        Returns:
+            float: Espera em segundos
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """
+        Indica se um código HTTP justifica nova tentativa.
+
+        Args:
+            status_code (int): Código HTTP
+
+        Returns:
+            bool: True se é possível tentar novamente
+        """
+        return status_code in self.retryable_statuses
+
+    def is_retryable_exception(self, error: BaseException) -> bool:
+        """
+        Indica se uma exceção justifica nova tentativa.
+
+        Args:
+            error (BaseException): Exceção lançada pela tentativa
+
+        Returns:
+            bool: True se é possível tentar novamente
+        """
+        return isinstance(error, self.retryable_exceptions)
+
+    def call(self, attempt_func: Callable[[int, Optional[float]], requests.Response]) -> requests.Response:
+        """
+        Executa uma requisição aplicando a política.
+
+        Args:
+            attempt_func (Callable[[int, Optional[float]], requests.Response]): Função que realiza
+                uma tentativa; recebe o número da tentativa e o tempo restante até o prazo (ou None)
+
+        Returns:
+            requests.Response: Primeira resposta não retentável (sucesso ou erro definitivo)
+
+        Raises:
+            RetryError: Se as tentativas se esgotarem ou o prazo/orçamento impedirem novas tentativas
+            Exception: Exceções não retentáveis lançadas pela tentativa
+        """
+        started = time.monotonic()
+        if self.budget:
+            self.budget.record_request()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = self._remaining(started)
+            if remaining is not None and remaining <= 0:
+                raise RetryError("Prazo da requisição esgotado antes da tentativa")
+            response = None
+            try:
+                response = attempt_func(attempt, remaining)
+                if not self.is_retryable_status(response.status_code):
+                    return response
+                reason = f"status {response.status_code}"
+                delay = parse_retry_after(response.headers.get('Retry-After'))
+            except Exception as e:
+                if not self.is_retryable_exception(e):
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+                delay = None
+
+            logger.warning(f"Tentativa {attempt} de {self.max_attempts} falhou ({reason})")
+
+            if attempt >= self.max_attempts:
+                raise RetryError(f"Número máximo de tentativas atingido ({reason})", response)
+
+            delay = self.backoff(attempt) if delay is None else min(delay, self.max_delay)
+            remaining = self._remaining(started)
+            if remaining is not None and delay >= remaining:
+                raise RetryError(f"Prazo da requisição esgotado ({reason})", response)
+
+            if self.budget and not self.budget.try_acquire():
+                raise RetryError(f"Orçamento de retentativas esgotado ({reason})", response)
+
+            if response is not None:
+                response.close()
+
+            logger.info(f"Aguardando {delay:.2f} segundos antes da próxima tentativa...")
+            time.sleep(delay)
+
+    def _remaining(self, started: float) -> Optional[float]:
+        """
+        Calcula o tempo restante: o menor entre o prazo da política e o prazo da
+        requisição em andamento (ver src.services.deadline).
+
+        Args:
+            started (float): Instante de início (monotônico)
+
+        Returns:
+            Optional[float]: Segundos restantes ou None se não houver prazo
+        """
+        if self.deadline is None:
+            return remaining_time()
+        return remaining_time(max(0.0, self.deadline - (time.monotonic() - started)))
+
+_default_budget = RetryBudget(
+    ratio=active_config.RETRY_BUDGET_RATIO,
+    min_per_second=active_config.RETRY_BUDGET_MIN_PER_SECOND,
+    window=active_config.RETRY_BUDGET_WINDOW
+)
+
+def get_default_retry_policy() -> RetryPolicy:
+    """
+    Retorna a política de retentativas padrão, compartilhada pelos agentes Langflow.
+
+    Returns:
+        RetryPolicy: Política configurada a partir das configurações da aplicação
+    """
+    return RetryPolicy(
+        max_attempts=active_config.MAX_RETRIES,
+        base_delay=active_config.RETRY_BASE_DELAY,
+        max_delay=active_config.RETRY_MAX_DELAY,
+        deadline=active_config.RETRY_DEADLINE or None,
+        budget=_default_budget
+    )
+
+def retry_budget_stats() -> Dict[str, Any]:
+    """
+    Retorna as métricas do orçamento global de retentativas.
+
+    Returns:
+        Dict[str, Any]: Métricas do orçamento
+    """
+    return _default_budget.stats()
@@ -0,0 +1,16 @@
+"""
+Execução de pipelines em segundo plano (jobs).
+"""
+from src.services.jobs.manager import JobError, JobManager
+from src.services.jobs.store import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, Job, JobStore
+
+__all__ = [
+    'JOB_DONE',
+    'JOB_FAILED',
+    'JOB_QUEUED',
+    'JOB_RUNNING',
+    'Job',
+    'JobError',
+    'JobManager',
+    'JobStore'
+]
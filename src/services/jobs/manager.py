@@ -0,0 +1,209 @@
+"""
+Execução de pipelines em segundo plano.
+As requisições enfileiram o job e recebem o seu identificador imediatamente;
+um pool de workers do próprio processo executa os jobs e grava o estado no
+armazenamento persistente. Processos que compartilham o armazenamento não
+executam o mesmo job duas vezes (ver JobStore).
+"""
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.services.jobs.store import Job, JobStore
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class JobError(Exception):
+    """
+    Exceção lançada pelo executor de um job para encerrá-lo com uma mensagem de erro.
+    """
+
+class JobManager:
+    """
+    Fila de jobs com workers em threads.
+    Jobs com a mesma chave são deduplicados: enquanto um está em andamento, ou
+    enquanto o seu resultado estiver retido, novos pedidos recebem o mesmo job.
+    """
+
+    def __init__(self, runner: Callable[[Dict[str, Any]], Any],
+                 key_func: Callable[[Dict[str, Any]], str],
+                 store: JobStore,
+                 workers: int = 4,
+                 result_ttl: float = 3600.0):
+        """
+        Inicializa a fila e inicia a renovação das concessões dos jobs deste processo,
+        que também adota os jobs abandonados por processos encerrados.
+
+        Args:
+            runner (Callable[[Dict[str, Any]], Any]): Executa um job a partir dos seus parâmetros
+                e retorna o resultado serializável em JSON (ou lança JobError)
+            key_func (Callable[[Dict[str, Any]], str]): Calcula a chave de deduplicação dos parâmetros
+            store (JobStore): Armazenamento dos jobs
+            workers (int): Jobs executados simultaneamente
+            result_ttl (float): Tempo de retenção dos resultados em segundos
+        """
+        self.runner = runner
+        self.key_func = key_func
+        self.store = store
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+        self._changed = threading.Condition()
+        self._version = 0
+        self._counters = {"submitted": 0, "deduplicated": 0, "completed": 0, "failed": 0,
+                          "adopted": 0, "claim_lost": 0}
+        self._stopped = threading.Event()
+
+        self._adopt_abandoned()
+        self._heartbeat = threading.Thread(target=self._renew_leases, name="job-lease", daemon=True)
+        self._heartbeat.start()
+
+    def submit(self, params: Dict[str, Any], reuse_results: bool = True) -> Tuple[Job, bool]:
+        """
+        Enfileira uma execução, ou reaproveita um job equivalente.
+
+        Args:
+            params (Dict[str, Any]): Parâmetros da execução
+            reuse_results (bool): Se resultados já concluídos podem ser reaproveitados;
+                jobs em andamento são sempre compartilhados
+
+        Returns:
+            Tuple[Job, bool]: Job e se ele foi reaproveitado de um pedido anterior
+        """
+        self.store.purge_expired()
+        key = self.key_func(params)
+
+        with self._changed:
+            self._counters["submitted"] += 1
+            existing = self.store.find_reusable(key, include_finished=reuse_results)
+            if existing is not None:
+                self._counters["deduplicated"] += 1
+                logger.info(f"Pedido reaproveita o job {existing.id} ({existing.status})")
+                return existing, True
+            job = self.store.create(uuid.uuid4().hex, key, params)
+
+        self._executor.submit(self._run, job)
+        logger.info(f"Job {job.id} enfileirado")
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Obtém o estado atual de um job.
+
+        Args:
+            job_id (str): Identificador do job
+
+        Returns:
+            Optional[Job]: Job ou None se não existir ou tiver expirado
+        """
+        return self.store.get(job_id)
+
+    @property
+    def version(self) -> int:
+        """
+        Contador de mudanças de estado dos jobs, para uso com wait_for_change.
+
+        Returns:
+            int: Versão atual
+        """
+        with self._changed:
+            return self._version
+
+    def wait_for_change(self, since: int, timeout: float) -> int:
+        """
+        Aguarda a mudança de estado de algum job após a versão informada.
+        Ler a versão antes de consultar o job evita perder mudanças ocorridas entre a consulta e a espera.
+
+        Args:
+            since (int): Versão lida antes da última consulta
+            timeout (float): Tempo máximo de espera em segundos
+
+        Returns:
+            int: Versão atual (igual a since se o tempo se esgotou sem mudanças)
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != since, timeout)
+            return self._version
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas da fila.
+
+        Returns:
+            Dict[str, Any]: Pedidos, deduplicações, conclusões, falhas, jobs adotados de outros
+                processos, reivindicações perdidas e jobs por status
+        """
+        with self._changed:
+            counters = dict(self._counters)
+        counters["jobs"] = self.store.counts()
+        return counters
+
+    def shutdown(self) -> None:
+        """
+        Encerra os workers e a renovação das concessões. Jobs não concluídos continuam
+        no armazenamento e são adotados por outro processo quando a concessão expirar.
+        """
+        self._stopped.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job) -> None:
+        """
+        Executa um job e grava o resultado.
+
+        Args:
+            job (Job): Job a executar
+        """
+        if not self.store.claim(job.id):
+            with self._changed:
+                self._counters["claim_lost"] += 1
+            logger.info(f"Job {job.id} já reivindicado por outro processo")
+            return
+        self._notify()
+        result, error = None, None
+        try:
+            result = self.runner(job.params)
+        except JobError as e:
+            error = str(e)
+        except Exception as e:
+            logger.error(f"Erro no job {job.id}: {str(e)}")
+            error = f"Erro no servidor: {str(e)}"
+
+        self.store.mark_finished(job.id, result=result, error=error, ttl=self.result_ttl)
+        with self._changed:
+            self._counters["failed" if error else "completed"] += 1
+            self._version += 1
+            self._changed.notify_all()
+        logger.info(f"Job {job.id} {'falhou: ' + error if error else 'concluído'}")
+
+    def _adopt_abandoned(self) -> None:
+        """
+        Enfileira os jobs abandonados por processos encerrados (concessão expirada).
+        """
+        jobs = self.store.requeue_interrupted()
+        for job in jobs:
+            logger.info(f"Job {job.id} interrompido devolvido à fila")
+            self._executor.submit(self._run, job)
+        if jobs:
+            with self._changed:
+                self._counters["adopted"] += len(jobs)
+
+    def _renew_leases(self) -> None:
+        """
+        Renova periodicamente as concessões dos jobs deste processo e adota os abandonados.
+        """
+        interval = max(0.01, self.store.lease_ttl / 3)
+        while not self._stopped.wait(interval):
+            try:
+                self.store.renew_leases()
+                self._adopt_abandoned()
+            except Exception as e:
+                logger.error(f"Erro ao renovar as concessões dos jobs: {str(e)}")
+
+    def _notify(self) -> None:
+        """
+        Avisa os interessados de que o estado de um job mudou.
+        """
+        with self._changed:
+            self._version += 1
+            self._changed.notify_all()
@@ -0,0 +1,350 @@
+"""
+Armazenamento persistente das execuções em segundo plano (jobs) em SQLite.
+Vários processos (ex.: workers do gunicorn) podem compartilhar o mesmo banco:
+cada job ativo pertence ao processo que o enfileirou ou adotou, que renova
+periodicamente a sua concessão (lease). Um job só é executado por quem o
+reivindica primeiro, e apenas jobs com a concessão expirada mudam de dono.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.utils import json_codec
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Estados de um job
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status);
+CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+"""
+
+# Colunas acrescentadas depois da primeira versão do esquema, criadas em bancos existentes
+_LEASE_COLUMNS = (("owner", "TEXT"), ("heartbeat_at", "REAL"))
+
+@dataclass
+class Job:
+    """
+    Execução de pipeline em segundo plano.
+
+    Attributes:
+        id (str): Identificador do job
+        key (str): Chave da execução; jobs com a mesma chave têm o mesmo resultado
+        status (str): "queued", "running", "done" ou "failed"
+        params (Dict[str, Any]): Parâmetros da execução
+        result (Optional[Any]): Resultado, quando concluído
+        error (Optional[str]): Erro, quando falhou
+        created_at (float): Criação (timestamp Unix)
+        started_at (Optional[float]): Início da execução
+        finished_at (Optional[float]): Fim da execução
+        expires_at (Optional[float]): Expiração do resultado
+    """
+    id: str
+    key: str
+    status: str
+    params: Dict[str, Any]
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        """
+        Indica se o job terminou, com sucesso ou falha.
+
+        Returns:
+            bool: True se o status for "done" ou "failed"
+        """
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """
+        Converte o job para dicionário.
+
+        Args:
+            include_result (bool): Se o resultado deve ser incluído
+
+        Returns:
+            Dict[str, Any]: Job serializável em JSON
+        """
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.expires_at
+        }
+        if include_result and self.status == JOB_DONE:
+            data["result"] = self.result
+        return data
+
+class JobStore:
+    """
+    Armazenamento dos jobs em SQLite, compartilhado entre as threads do processo
+    e entre os processos que abrem o mesmo arquivo.
+    """
+
+    def __init__(self, path: str, lease_ttl: float = 60.0):
+        """
+        Abre (ou cria) o banco de jobs.
+
+        Args:
+            path (str): Caminho do arquivo SQLite (":memory:" para um banco temporário)
+            lease_ttl (float): Segundos sem renovação após os quais os jobs de um processo
+                são considerados abandonados e podem ser adotados por outro
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lease_ttl = lease_ttl
+        # Identifica este armazenamento como dono dos jobs (processo e instância)
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for name, kind in _LEASE_COLUMNS:
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def create(self, job_id: str, key: str, params: Dict[str, Any]) -> Job:
+        """
+        Registra um novo job na fila.
+
+        Args:
+            job_id (str): Identificador do job
+            key (str): Chave da execução
+            params (Dict[str, Any]): Parâmetros da execução
+
+        Returns:
+            Job: Job criado
+        """
+        job = Job(id=job_id, key=key, status=JOB_QUEUED, params=params, created_at=time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, key, status, params, created_at, owner, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.key, job.status, json_codec.dumps(params), job.created_at, self.owner, job.created_at)
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Obtém um job. Jobs com o resultado expirado não são retornados.
+
+        Args:
+            job_id (str): Identificador do job
+
+        Returns:
+            Optional[Job]: Job ou None se não existir ou tiver expirado
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (job_id, time.time())
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def find_reusable(self, key: str, include_finished: bool = True) -> Optional[Job]:
+        """
+        Procura um job com a mesma chave cujo resultado possa ser compartilhado:
+        um job em andamento ou, opcionalmente, um job concluído com sucesso e ainda válido.
+
+        Args:
+            key (str): Chave da execução
+            include_finished (bool): Se jobs já concluídos podem ser reaproveitados
+
+        Returns:
+            Optional[Job]: Job mais recente que atende aos critérios, ou None
+        """
+        statuses = ACTIVE_STATUSES + ((JOB_DONE,) if include_finished else ())
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT * FROM jobs WHERE key = ? AND status IN ({placeholders}) "
+                "AND (expires_at IS NULL OR expires_at > ?) ORDER BY created_at DESC LIMIT 1",
+                (key, *statuses, time.time())
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Reivindica um job da fila para execução. A troca de estado é atômica: entre
+        processos que compartilham o banco, apenas um consegue reivindicar o job.
+
+        Args:
+            job_id (str): Identificador do job
+
+        Returns:
+            bool: True se o job foi reivindicado por este armazenamento
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (JOB_RUNNING, now, self.owner, now, job_id, JOB_QUEUED, self.owner)
+            )
+        return cursor.rowcount == 1
+
+    def renew_leases(self) -> int:
+        """
+        Renova a concessão de todos os jobs ativos deste armazenamento.
+
+        Returns:
+            int: Quantidade de jobs renovados
+        """
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN ({placeholders})",
+                (time.time(), self.owner, *ACTIVE_STATUSES)
+            )
+        return cursor.rowcount
+
+    def mark_finished(self, job_id: str, result: Any = None, error: Optional[str] = None, ttl: float = 3600.0) -> None:
+        """
+        Registra o fim de um job; o resultado fica disponível até expirar.
+
+        Args:
+            job_id (str): Identificador do job
+            result (Any): Resultado serializável em JSON, em caso de sucesso
+            error (Optional[str]): Erro, em caso de falha
+            ttl (float): Tempo de retenção do resultado em segundos
+        """
+        now = time.time()
+        status = JOB_FAILED if error else JOB_DONE
+        encoded = json_codec.dumps(result) if error is None else None
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ? "
+                "WHERE id = ? AND (owner IS NULL OR owner = ?)",
+                (status, encoded, error, now, now + ttl, job_id, self.owner)
+            )
+        if cursor.rowcount == 0:
+            logger.warning(f"Job {job_id} adotado por outro processo; resultado descartado")
+
+    def requeue_interrupted(self) -> List[Job]:
+        """
+        Adota os jobs abandonados: ativos (na fila ou em execução) cuja concessão não é
+        renovada há mais de lease_ttl segundos (ex.: o processo dono terminou). Eles voltam
+        à fila sob este armazenamento. Jobs de processos ativos não são afetados.
+
+        Returns:
+            List[Job]: Jobs adotados que devem ser executados, na ordem de criação
+        """
+        now = time.time()
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        expired = f"status IN ({placeholders}) AND (heartbeat_at IS NULL OR heartbeat_at < ?)"
+        with self._lock:
+            # A transação impede que dois processos adotem o mesmo job
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(f"SELECT id FROM jobs WHERE {expired}",
+                                          (*ACTIVE_STATUSES, now - self.lease_ttl)).fetchall()
+                ids = [row["id"] for row in rows]
+                for job_id in ids:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = NULL, owner = ?, heartbeat_at = ? WHERE id = ?",
+                        (JOB_QUEUED, self.owner, now, job_id)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if not ids:
+                return []
+            id_placeholders = ", ".join("?" for _ in ids)
+            rows = self._conn.execute(f"SELECT * FROM jobs WHERE id IN ({id_placeholders}) ORDER BY created_at",
+                                      ids).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def purge_expired(self) -> int:
+        """
+        Remove os jobs cujo resultado expirou.
+
+        Returns:
+            int: Quantidade de jobs removidos
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                                        (time.time(),))
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Conta os jobs por status.
+
+        Returns:
+            Dict[str, int]: Quantidade de jobs em cada status
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["total"] for row in rows}
+
+    def close(self) -> None:
+        """
+        Fecha a conexão com o banco.
+        """
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Job:
+        """
+        Converte uma linha do banco em Job.
+
+        Args:
+            row (sqlite3.Row): Linha da tabela de jobs
+
+        Returns:
+            Job: Job correspondente
+        """
+        return Job(
+            id=row["id"],
+            key=row["key"],
+            status=row["status"],
+            params=json_codec.loads(row["params"]),
+            result=json_codec.loads(row["result"]) if row["result"] is not None else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            expires_at=row["expires_at"]
+        )
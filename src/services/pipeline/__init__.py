@@ -0,0 +1,21 @@
+"""
+Pipelines declarativos de agentes.
+"""
+from src.services.pipeline.definition import (
+    Artifact,
+    PipelineDefinition,
+    PipelineDefinitionError,
+    StageDefinition
+)
+from src.services.pipeline.executor import PipelineExecutor, PipelineResult, StageMetrics, pipeline_stats
+
+__all__ = [
+    'Artifact',
+    'PipelineDefinition',
+    'PipelineDefinitionError',
+    'PipelineExecutor',
+    'PipelineResult',
+    'StageDefinition',
+    'StageMetrics',
+    'pipeline_stats'
+]
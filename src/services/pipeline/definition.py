@@ -0,0 +1,228 @@
+"""
+Definição declarativa de pipelines de agentes.
+Um pipeline é um grafo de etapas: cada etapa declara o agente que executa
+e as etapas das quais recebe artefatos. Etapas sem dependência entre si
+podem ser executadas em paralelo.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.product import Product
+
+# Tipos de artefato trocados entre as etapas
+ARTIFACT_RAW = "raw"
+ARTIFACT_TEXT = "text"
+ARTIFACT_RECORDS = "records"
+ARTIFACT_PRODUCTS = "products"
+
+# Tipos de etapa
+STAGE_FETCH = "fetch"
+STAGE_PROCESS = "process"
+STAGE_MERGE = "merge"
+
+STAGE_KINDS = (STAGE_FETCH, STAGE_PROCESS, STAGE_MERGE)
+
+class PipelineDefinitionError(ValueError):
+    """
+    Exceção lançada quando a definição de um pipeline é inválida.
+    """
+
+@dataclass(frozen=True)
+class Artifact:
+    """
+    Artefato produzido por uma etapa do pipeline.
+
+    Attributes:
+        kind (str): Tipo do artefato ("raw", "text", "records" ou "products")
+        value (Any): Conteúdo do artefato
+    """
+    kind: str
+    value: Any
+
+    @classmethod
+    def of(cls, value: Any) -> 'Artifact':
+        """
+        Cria o artefato classificando a saída de um agente de processamento.
+
+        Args:
+            value (Any): Saída do agente
+
+        Returns:
+            Artifact: Artefato com o tipo correspondente ao conteúdo
+        """
+        if isinstance(value, list):
+            if value and all(isinstance(item, Product) for item in value):
+                return cls(ARTIFACT_PRODUCTS, value)
+            return cls(ARTIFACT_RECORDS, value)
+        if isinstance(value, str):
+            return cls(ARTIFACT_TEXT, value)
+        return cls(ARTIFACT_RAW, value)
+
+@dataclass(frozen=True)
+class StageDefinition:
+    """
+    Etapa de um pipeline.
+
+    Attributes:
+        id (str): Identificador da etapa, único no pipeline
+        kind (str): "fetch" (recebe a fonte), "process" (recebe o artefato de uma etapa)
+            ou "merge" (concatena os registros de várias etapas, sem agente)
+        agent (Optional[str]): Tipo do agente registrado que executa a etapa
+        inputs (Tuple[str, ...]): Etapas cujos artefatos a etapa recebe
+    """
+    id: str
+    kind: str
+    agent: Optional[str] = None
+    inputs: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte a etapa para dicionário.
+
+        Returns:
+            Dict[str, Any]: Etapa no formato da configuração
+        """
+        return {"id": self.id, "kind": self.kind, "agent": self.agent, "inputs": list(self.inputs)}
+
+@dataclass(frozen=True)
+class PipelineDefinition:
+    """
+    Pipeline de agentes validado, com as etapas em ordem topológica.
+
+    Attributes:
+        id (str): Identificador do pipeline
+        name (str): Nome do pipeline
+        description (str): Descrição do pipeline
+        stages (Tuple[StageDefinition, ...]): Etapas, cada uma depois das etapas de que depende
+        output (str): Etapa cujo artefato é o resultado do pipeline
+    """
+    id: str
+    name: str
+    description: str
+    stages: Tuple[StageDefinition, ...]
+    output: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PipelineDefinition':
+        """
+        Cria e valida um pipeline a partir da configuração.
+
+        Args:
+            data (Dict[str, Any]): Pipeline com "id", "name", "description", "stages"
+                (lista de {"id", "kind", "agent", "inputs"}) e, opcionalmente, "output"
+                (por padrão, a última etapa)
+
+        Returns:
+            PipelineDefinition: Pipeline validado
+
+        Raises:
+            PipelineDefinitionError: Se a definição for inválida
+        """
+        pipeline_id = data.get("id")
+        if not pipeline_id:
+            raise PipelineDefinitionError("Pipeline sem identificador")
+
+        stages = [StageDefinition(
+            id=stage.get("id", ""),
+            kind=stage.get("kind", STAGE_PROCESS),
+            agent=stage.get("agent"),
+            inputs=tuple(stage.get("inputs") or ())
+        ) for stage in data.get("stages") or []]
+        if not stages:
+            raise PipelineDefinitionError(f"Pipeline '{pipeline_id}' sem etapas")
+
+        by_id: Dict[str, StageDefinition] = {}
+        for stage in stages:
+            _validate_stage(pipeline_id, stage)
+            if stage.id in by_id:
+                raise PipelineDefinitionError(f"Etapa '{stage.id}' repetida no pipeline '{pipeline_id}'")
+            by_id[stage.id] = stage
+
+        for stage in stages:
+            unknown = [name for name in stage.inputs if name not in by_id]
+            if unknown:
+                raise PipelineDefinitionError(
+                    f"Etapa '{stage.id}' do pipeline '{pipeline_id}' depende de etapas inexistentes: {unknown}"
+                )
+
+        output = data.get("output") or stages[-1].id
+        if output not in by_id:
+            raise PipelineDefinitionError(f"Etapa de saída '{output}' não existe no pipeline '{pipeline_id}'")
+
+        return cls(
+            id=pipeline_id,
+            name=data.get("name", pipeline_id),
+            description=data.get("description", ""),
+            stages=_topological_order(pipeline_id, stages),
+            output=output
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte o pipeline para dicionário (ex.: para a rota /agents).
+
+        Returns:
+            Dict[str, Any]: Pipeline no formato da configuração
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "stages": [stage.to_dict() for stage in self.stages],
+            "output": self.output
+        }
+
+def _validate_stage(pipeline_id: str, stage: StageDefinition) -> None:
+    """
+    Valida o tipo, o agente e as entradas de uma etapa.
+
+    Args:
+        pipeline_id (str): Identificador do pipeline
+        stage (StageDefinition): Etapa a validar
+
+    Raises:
+        PipelineDefinitionError: Se a etapa for inválida
+    """
+    where = f"Etapa '{stage.id}' do pipeline '{pipeline_id}'"
+    if not stage.id:
+        raise PipelineDefinitionError(f"Etapa sem identificador no pipeline '{pipeline_id}'")
+    if stage.kind not in STAGE_KINDS:
+        raise PipelineDefinitionError(f"{where} tem tipo inválido: {stage.kind}")
+    if stage.kind != STAGE_MERGE and not stage.agent:
+        raise PipelineDefinitionError(f"{where} não define o agente")
+    if stage.kind == STAGE_FETCH and stage.inputs:
+        raise PipelineDefinitionError(f"{where} é de busca e não pode ter entradas")
+    if stage.kind == STAGE_PROCESS and len(stage.inputs) != 1:
+        raise PipelineDefinitionError(f"{where} deve ter exatamente uma entrada")
+    if stage.kind == STAGE_MERGE and len(stage.inputs) < 2:
+        raise PipelineDefinitionError(f"{where} deve ter ao menos duas entradas")
+
+def _topological_order(pipeline_id: str, stages: List[StageDefinition]) -> Tuple[StageDefinition, ...]:
+    """
+    Ordena as etapas de modo que cada uma venha depois das suas entradas,
+    preservando a ordem declarada entre etapas independentes.
+
+    Args:
+        pipeline_id (str): Identificador do pipeline
+        stages (List[StageDefinition]): Etapas declaradas
+
+    Returns:
+        Tuple[StageDefinition, ...]: Etapas ordenadas
+
+    Raises:
+        PipelineDefinitionError: Se houver dependência circular
+    """
+    ordered: List[StageDefinition] = []
+    placed = set()
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if all(name in placed for name in stage.inputs)]
+        if not ready:
+            raise PipelineDefinitionError(
+                f"Dependência circular no pipeline '{pipeline_id}': {[stage.id for stage in pending]}"
+            )
+        for stage in ready:
+            ordered.append(stage)
+            placed.add(stage.id)
+        pending = [stage for stage in pending if stage.id not in placed]
+    return tuple(ordered)
@@ -0,0 +1,383 @@
+"""
+Execução de pipelines declarativos de agentes.
+As etapas são agendadas assim que as suas entradas ficam prontas, em um pool
+de threads: ramos independentes do grafo são executados em paralelo. Cada
+etapa registra o tempo de execução, o tamanho e a quantidade de itens do
+artefato produzido.
+"""
+import contextvars
+import dataclasses
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import active_config
+from src.models.product import Product
+from src.services.agents.interfaces import DataFetcherAgentInterface, DataProcessorAgentInterface
+from src.services.agents.langflow.extraction import UNWRAP_EXTRACTOR
+from src.services.agents.pool import AgentPool
+from src.services.cache.memo_cache import memoization
+from src.services.deadline import Deadline, deadline_scope
+from src.services.pipeline.definition import (
+    ARTIFACT_PRODUCTS,
+    ARTIFACT_RAW,
+    ARTIFACT_RECORDS,
+    STAGE_FETCH,
+    STAGE_MERGE,
+    Artifact,
+    PipelineDefinition,
+    StageDefinition
+)
+from src.utils import json_codec
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class StageMetrics:
+    """
+    Métricas da execução de uma etapa.
+
+    Attributes:
+        stage (str): Identificador da etapa
+        agent (Optional[str]): Tipo do agente da etapa
+        wall_time (float): Tempo de execução em segundos
+        bytes (int): Tamanho do artefato produzido (JSON ou texto em UTF-8)
+        items (Optional[int]): Quantidade de itens do artefato, quando for uma lista
+        artifact (Optional[str]): Tipo do artefato produzido
+        error (Optional[str]): Erro da etapa, se ela falhou
+    """
+    stage: str
+    agent: Optional[str]
+    wall_time: float
+    bytes: int = 0
+    items: Optional[int] = None
+    artifact: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte as métricas para dicionário.
+
+        Returns:
+            Dict[str, Any]: Métricas da etapa
+        """
+        return dataclasses.asdict(self)
+
+@dataclass
+class PipelineResult:
+    """
+    Resultado da execução de um pipeline.
+
+    Attributes:
+        pipeline (str): Identificador do pipeline
+        output (Optional[Artifact]): Artefato da etapa de saída
+        metrics (List[StageMetrics]): Métricas das etapas, na ordem de conclusão
+        error (Optional[str]): Erro da primeira etapa que falhou
+        artifacts (Dict[str, Artifact]): Artefatos das etapas concluídas, por etapa
+    """
+    pipeline: str
+    output: Optional[Artifact] = None
+    metrics: List[StageMetrics] = field(default_factory=list)
+    error: Optional[str] = None
+    artifacts: Dict[str, Artifact] = field(default_factory=dict)
+
+    def products(self) -> List[Product]:
+        """
+        Converte o artefato de saída em produtos.
+
+        Returns:
+            List[Product]: Produtos do pipeline (vazia se a saída não contiver registros)
+        """
+        if self.output is None:
+            return []
+        if self.output.kind == ARTIFACT_PRODUCTS:
+            return list(self.output.value)
+        if self.output.kind == ARTIFACT_RECORDS:
+            return list(Product.iter_from_dicts(self.output.value))
+        return []
+
+class PipelineStats:
+    """
+    Métricas acumuladas das execuções de pipelines, por pipeline e etapa.
+    Seguro para uso entre threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pipelines: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, pipeline_id: str, metrics: List[StageMetrics], failed: bool) -> None:
+        """
+        Registra uma execução.
+
+        Args:
+            pipeline_id (str): Identificador do pipeline
+            metrics (List[StageMetrics]): Métricas das etapas executadas
+            failed (bool): Se a execução falhou
+        """
+        with self._lock:
+            pipeline = self._pipelines.setdefault(pipeline_id, {"runs": 0, "failures": 0, "stages": {}})
+            pipeline["runs"] += 1
+            pipeline["failures"] += int(failed)
+            for metric in metrics:
+                stage = pipeline["stages"].setdefault(metric.stage, {
+                    "runs": 0, "failures": 0, "wall_time_total": 0.0, "wall_time_max": 0.0,
+                    "bytes_total": 0, "items_total": 0
+                })
+                stage["runs"] += 1
+                stage["failures"] += int(metric.error is not None)
+                stage["wall_time_total"] += metric.wall_time
+                stage["wall_time_max"] = max(stage["wall_time_max"], metric.wall_time)
+                stage["bytes_total"] += metric.bytes
+                stage["items_total"] += metric.items or 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas acumuladas, com o tempo médio de cada etapa.
+
+        Returns:
+            Dict[str, Any]: Execuções, falhas e métricas por etapa de cada pipeline
+        """
+        with self._lock:
+            pipelines = {
+                pipeline_id: {**values, "stages": {name: dict(stage) for name, stage in values["stages"].items()}}
+                for pipeline_id, values in self._pipelines.items()
+            }
+        for values in pipelines.values():
+            for stage in values["stages"].values():
+                stage["wall_time_avg"] = stage["wall_time_total"] / stage["runs"] if stage["runs"] else 0.0
+        return pipelines
+
+_stats = PipelineStats()
+
+def pipeline_stats() -> Dict[str, Any]:
+    """
+    Retorna as métricas acumuladas das execuções de pipelines.
+
+    Returns:
+        Dict[str, Any]: Métricas por pipeline e etapa
+    """
+    return _stats.stats()
+
+class PipelineExecutor:
+    """
+    Executor de um pipeline declarativo.
+    """
+
+    def __init__(self, definition: PipelineDefinition,
+                 pool: Optional[AgentPool] = None,
+                 max_parallel: Optional[int] = None):
+        """
+        Inicializa o executor.
+
+        Args:
+            definition (PipelineDefinition): Pipeline a executar
+            pool (Optional[AgentPool]): Pool de onde os agentes das etapas são emprestados.
+                Se None, usa um pool próprio.
+            max_parallel (Optional[int]): Etapas simultâneas. Se None, usa PIPELINE_MAX_PARALLEL_STAGES.
+        """
+        self.definition = definition
+        self.pool = pool or AgentPool()
+        self.max_parallel = max(1, max_parallel or active_config.PIPELINE_MAX_PARALLEL_STAGES)
+
+    def run(self, source: str, use_cache: bool = True, deadline: Optional[Deadline] = None) -> PipelineResult:
+        """
+        Executa o pipeline até o fim.
+
+        Args:
+            source (str): Fonte dos dados, entregue às etapas de busca
+            use_cache (bool): Se False, ignora o cache de busca e os resultados memoizados
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            PipelineResult: Artefato de saída e métricas das etapas
+        """
+        result = None
+        for event in self.iter_events(source, use_cache, deadline):
+            if event["event"] == "result":
+                result = event["result"]
+        return result
+
+    def iter_events(self, source: str, use_cache: bool = True,
+                    deadline: Optional[Deadline] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Executa o pipeline entregando eventos à medida que as etapas começam e terminam.
+        Após a primeira falha, nenhuma etapa nova é iniciada; com o prazo esgotado,
+        o pipeline é encerrado sem aguardar as etapas em andamento.
+
+        Args:
+            source (str): Fonte dos dados, entregue às etapas de busca
+            use_cache (bool): Se False, ignora o cache de busca e os resultados memoizados
+            deadline (Optional[Deadline]): Prazo da requisição, aplicado a cada etapa
+
+        Returns:
+            Iterator[Dict[str, Any]]: Eventos {"event": "stage_started", "stage": ...},
+                {"event": "stage_finished", "metrics": StageMetrics} e, ao final,
+                {"event": "result", "result": PipelineResult}
+        """
+        definition = self.definition
+        result = PipelineResult(pipeline=definition.id)
+        artifacts = result.artifacts
+        pending = list(definition.stages)
+        running: Dict[Future, StageDefinition] = {}
+        started = time.monotonic()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="pipeline")
+        try:
+            while pending or running:
+                if deadline is not None and deadline.expired and not result.error:
+                    unfinished = [stage.id for stage in running.values()] or [stage.id for stage in pending]
+                    result.error = f"Prazo esgotado antes do fim das etapas: {', '.join(unfinished)}"
+                    break
+                ready = [] if result.error else [
+                    stage for stage in pending if all(name in artifacts for name in stage.inputs)
+                ]
+                for stage in ready[:self.max_parallel - len(running)]:
+                    pending.remove(stage)
+                    inputs = [artifacts[name] for name in stage.inputs]
+                    # Cada etapa vê as opções da requisição (ex.: memoização) do chamador
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, self._run_stage, stage, inputs, source, use_cache,
+                                            deadline)] = stage
+                    yield {"event": "stage_started", "stage": stage.id}
+
+                if not running:
+                    break
+
+                done, _ = wait(running, timeout=deadline.remaining() if deadline else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    artifact, metrics = future.result()
+                    result.metrics.append(metrics)
+                    if artifact is None:
+                        result.error = result.error or metrics.error
+                    else:
+                        artifacts[stage.id] = artifact
+                    yield {"event": "stage_finished", "metrics": metrics}
+        finally:
+            # Se o consumidor desistir (ex.: cliente desconectado), descarta as etapas ainda não iniciadas
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        result.output = artifacts.get(definition.output)
+        if result.output is None and not result.error:
+            result.error = f"Etapa de saída '{definition.output}' não produziu resultado"
+
+        _stats.record(definition.id, result.metrics, failed=result.error is not None)
+        logger.info(f"Pipeline '{definition.id}' concluído em {time.monotonic() - started:.2f}s: " +
+                    ", ".join(f"{m.stage}={m.wall_time:.2f}s/{m.bytes}B/{m.items}" for m in result.metrics))
+        yield {"event": "result", "result": result}
+
+    def _run_stage(self, stage: StageDefinition, inputs: List[Artifact], source: str, use_cache: bool,
+                   deadline: Optional[Deadline] = None) -> Tuple[Optional[Artifact], StageMetrics]:
+        """
+        Executa uma etapa medindo o tempo e o artefato produzido.
+
+        Args:
+            stage (StageDefinition): Etapa a executar
+            inputs (List[Artifact]): Artefatos das etapas de entrada
+            source (str): Fonte dos dados
+            use_cache (bool): Se False, ignora o cache de busca e os resultados memoizados
+            deadline (Optional[Deadline]): Prazo da requisição
+
+        Returns:
+            Tuple[Optional[Artifact], StageMetrics]: Artefato (None em caso de falha) e métricas
+        """
+        started = time.monotonic()
+        try:
+            with deadline_scope(deadline):
+                artifact = self._execute(stage, inputs, source, use_cache)
+            error = None if artifact is not None else f"Falha na etapa '{stage.id}'"
+        except Exception as e:
+            logger.error(f"Erro na etapa '{stage.id}' do pipeline '{self.definition.id}': {str(e)}")
+            artifact, error = None, f"Erro na etapa '{stage.id}': {str(e)}"
+
+        metrics = StageMetrics(stage=stage.id, agent=stage.agent, wall_time=time.monotonic() - started, error=error)
+        if artifact is not None:
+            metrics.artifact = artifact.kind
+            metrics.bytes = _size_of(artifact.value)
+            metrics.items = len(artifact.value) if isinstance(artifact.value, list) else None
+        return artifact, metrics
+
+    def _execute(self, stage: StageDefinition, inputs: List[Artifact],
+                 source: str, use_cache: bool) -> Optional[Artifact]:
+        """
+        Executa o agente de uma etapa.
+
+        Args:
+            stage (StageDefinition): Etapa a executar
+            inputs (List[Artifact]): Artefatos das etapas de entrada
+            source (str): Fonte dos dados
+            use_cache (bool): Se False, ignora o cache de busca e os resultados memoizados
+
+        Returns:
+            Optional[Artifact]: Artefato produzido ou None se a etapa não produziu dados
+
+        Raises:
+            ValueError: Se o agente da etapa não for encontrado ou for inválido
+        """
+        if stage.kind == STAGE_MERGE:
+            return _merge(stage, inputs)
+
+        with self.pool.lease(stage.agent) as agent:
+            if stage.kind == STAGE_FETCH:
+                if not isinstance(agent, DataFetcherAgentInterface):
+                    raise ValueError(f"Agente de busca '{stage.agent}' não encontrado ou inválido")
+                value = agent.fetch_data(source, use_cache=use_cache)
+                return Artifact(ARTIFACT_RAW, value) if value else None
+
+            if not isinstance(agent, DataProcessorAgentInterface):
+                raise ValueError(f"Agente de processamento '{stage.agent}' não encontrado ou inválido")
+            with memoization(use_cache):
+                value = agent.process_data(inputs[0].value)
+        if not value:
+            return None
+
+        # Saídas no envelope do Langflow são reduzidas ao conteúdo do campo "data" > "text"
+        match = UNWRAP_EXTRACTOR.extract(value)
+        if match is not None:
+            value = match.value if isinstance(match.value, str) else str(match.value)
+        return Artifact.of(value)
+
+def _merge(stage: StageDefinition, inputs: List[Artifact]) -> Optional[Artifact]:
+    """
+    Concatena os registros das etapas de entrada.
+
+    Args:
+        stage (StageDefinition): Etapa de junção
+        inputs (List[Artifact]): Artefatos das etapas de entrada
+
+    Returns:
+        Optional[Artifact]: Registros concatenados ou None se nenhuma entrada tiver registros
+    """
+    records: List[Any] = []
+    for name, artifact in zip(stage.inputs, inputs):
+        if artifact.kind in (ARTIFACT_RECORDS, ARTIFACT_PRODUCTS):
+            records.extend(artifact.value)
+        else:
+            logger.warning(f"Entrada '{name}' da etapa '{stage.id}' ignorada: artefato do tipo {artifact.kind}")
+    return Artifact.of(records) if records else None
+
+def _size_of(value: Any) -> int:
+    """
+    Calcula o tamanho de um artefato em bytes.
+
+    Args:
+        value (Any): Conteúdo do artefato
+
+    Returns:
+        int: Tamanho do texto em UTF-8 ou do JSON equivalente
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, list):
+        value = [dataclasses.asdict(item) if isinstance(item, Product) else item for item in value]
+    try:
+        return len(json_codec.dumps(value).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(value).encode("utf-8"))
@@ -0,0 +1,106 @@
+"""
+Coalescência de chamadas idênticas concorrentes (single-flight).
+Enquanto uma execução para uma chave está em andamento, chamadas
+concorrentes com a mesma chave aguardam e recebem o mesmo resultado.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class _Flight:
+    """
+    Execução em andamento para uma chave.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Grupo de execuções coalescidas por chave.
+    Seguro para uso entre threads.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        """
+        Inicializa o grupo.
+
+        Args:
+            name (str): Nome do grupo, usado nos logs
+        """
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "executions": 0, "coalesced": 0, "max_waiters": 0}
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Executa a função uma única vez para chamadas concorrentes com a mesma chave.
+        Exceções da execução são propagadas a todos os participantes.
+
+        Args:
+            key (Hashable): Chave que identifica chamadas equivalentes
+            func (Callable[[], Any]): Função a ser executada
+            timeout (Optional[float]): Espera máxima, em segundos, por uma execução já em andamento
+
+        Returns:
+            Tuple[Any, bool]: Resultado e se ele foi compartilhado com uma execução já em andamento
+
+        Raises:
+            TimeoutError: Se a execução em andamento não terminar dentro do timeout
+        """
+        with self._lock:
+            self._counters["calls"] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._counters["coalesced"] += 1
+                self._counters["max_waiters"] = max(self._counters["max_waiters"], flight.waiters)
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._counters["executions"] += 1
+                leader = True
+
+        if not leader:
+            logger.info(f"[{self.name}] Aguardando execução em andamento para {key} "
+                        f"({flight.waiters} aguardando)")
+            if not flight.done.wait(timeout):
+                with self._lock:
+                    flight.waiters -= 1
+                raise TimeoutError(f"[{self.name}] Execução em andamento para {key} não terminou em {timeout:.2f}s")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas de coalescência.
+
+        Returns:
+            Dict[str, Any]: Chamadas, execuções, chamadas coalescidas, aguardando agora e razão de coalescência
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters["in_flight"] = len(self._flights)
+            counters["waiting"] = sum(flight.waiters for flight in self._flights.values())
+        counters["coalescing_ratio"] = counters["coalesced"] / counters["calls"] if counters["calls"] else 0.0
+        return counters
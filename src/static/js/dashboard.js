@@ -13,6 +13,16 @@ let progressBar, loadingStatus, mainContent, loadingOverlay, errorMessage, error
 // Variável para armazenar a instância do gráfico
 let chartInstance = null;
 
+// Transmissão de produtos em andamento (EventSource)
+let activeStream = null;
+
+// Progresso exibido ao iniciar cada etapa do pipeline
+const STAGE_PROGRESS = {
+    fetch: { value: 10, message: "Coletando informações da Amazon..." },
+    process: { value: 45, message: "Processando dados com ColetorDadosAmazon..." },
+    format: { value: 65, message: "Formatando dados dos produtos..." }
+};
+
 // Inicialização quando o DOM estiver carregado
 document.addEventListener('DOMContentLoaded', () => {
     // Inicializa as referências aos elementos do DOM
@@ -518,11 +528,96 @@ function renderChart(dados) {
 }
 
 /**
- * Busca os dados da API
+ * Busca os dados da API com entrega progressiva dos produtos
+ * @param {string} [customUrl] - URL personalizada para buscar dados
+ */
+function fetchData(customUrl) {
+    // Navegadores sem suporte a Server-Sent Events recebem a resposta completa
+    if (!window.EventSource) {
+        return fetchDataAtOnce(customUrl);
+    }
+
+    // Reset UI
+    resetUI();
+
+    // Encerra a transmissão anterior, se houver
+    if (activeStream) {
+        activeStream.close();
+        activeStream = null;
+    }
+
+    let apiUrl;
+    try {
+        apiUrl = buildApiUrl('/fetch-data/stream', customUrl);
+    } catch (error) {
+        showError(error.message);
+        return;
+    }
+
+    console.log(`Iniciando transmissão de produtos: ${apiUrl}`);
+    const produtos = [];
+    const stream = new EventSource(apiUrl);
+    activeStream = stream;
+
+    stream.addEventListener('stage', (event) => {
+        const { stage } = JSON.parse(event.data);
+        const stageProgress = STAGE_PROGRESS[stage];
+        if (stageProgress) {
+            setProgress(stageProgress.value, stageProgress.message);
+        }
+    });
+
+    stream.addEventListener('products', (event) => {
+        const { produtos: lote } = JSON.parse(event.data);
+        produtos.push(...lote);
+        renderProducts(produtos);
+        setProgress(Math.min(95, progress + 2), `${produtos.length} produtos recebidos...`);
+
+        // Mostra os produtos assim que o primeiro lote chega
+        if (produtos.length === lote.length) {
+            showContent();
+        }
+    });
+
+    stream.addEventListener('done', (event) => {
+        stream.close();
+        activeStream = null;
+
+        const data = JSON.parse(event.data);
+        completeProgress();
+        renderData({ produtos: produtos, dados_grafico: data.dados_grafico });
+        showContent();
+
+        // Atualiza o título da página com a categoria selecionada
+        if (customUrl) {
+            updatePageTitle(customUrl);
+        }
+    });
+
+    // Recebe tanto o evento "error" do servidor quanto falhas de conexão
+    stream.addEventListener('error', (event) => {
+        stream.close();
+        activeStream = null;
+
+        let message = 'Erro na conexão com o servidor';
+        if (event.data) {
+            try {
+                message = JSON.parse(event.data).error || message;
+            } catch (e) {
+                console.error('Evento de erro inválido:', event.data);
+            }
+        }
+        console.error('Erro na transmissão de produtos:', message);
+        showError(message);
+    });
+}
+
+/**
+ * Busca os dados da API aguardando a resposta completa
  * @param {string} [customUrl] - URL personalizada para buscar dados
  * @returns {Promise<void>}
  */
-async function fetchData(customUrl) {
+async function fetchDataAtOnce(customUrl) {
     // Reset UI
     resetUI();
 
@@ -577,15 +672,14 @@ function resetUI() {
 }
 
 /**
- * Busca os dados da API
+ * Monta a URL da API de produtos
+ * @param {string} path - Caminho da rota
  * @param {string} [customUrl] - URL personalizada para buscar dados
- * @returns {Promise<Object>} Dados da API
+ * @returns {string} URL da API
  */
-async function fetchDataFromAPI(customUrl) {
-    console.log('Iniciando busca de dados...');
-
+function buildApiUrl(path, customUrl) {
     // Constrói a URL da API com o parâmetro source, se fornecido
-    let apiUrl = '/fetch-data';
+    let apiUrl = path;
     if (customUrl) {
         // Garante que a URL seja válida
         if (!customUrl.startsWith('http')) {
@@ -600,13 +694,27 @@ async function fetchDataFromAPI(customUrl) {
         console.log('Usando URL padrão (nenhuma URL personalizada fornecida)');
     }
 
-    // Adiciona o parâmetro formatter para usar o novo agente de formatação
+    // Usa o pipeline escolhido na URL da página (ids listados em /agents) ou o agente de formatação padrão
+    const pipeline = new URLSearchParams(window.location.search).get('pipeline');
     apiUrl += apiUrl.includes('?') ? '&' : '?';
-    apiUrl += 'formatter=coletor_dados_amazon_formatter';
+    apiUrl += pipeline ? `pipeline=${encodeURIComponent(pipeline)}` : 'formatter=coletor_dados_amazon_formatter';
 
     // Adiciona um timestamp para evitar cache
     apiUrl += `&_t=${Date.now()}`;
 
+    return apiUrl;
+}
+
+/**
+ * Busca os dados da API
+ * @param {string} [customUrl] - URL personalizada para buscar dados
+ * @returns {Promise<Object>} Dados da API
+ */
+async function fetchDataFromAPI(customUrl) {
+    console.log('Iniciando busca de dados...');
+
+    const apiUrl = buildApiUrl('/fetch-data', customUrl);
+
     console.log(`URL final da API: ${apiUrl}`);
 
     try {
@@ -634,6 +742,17 @@ async function fetchDataFromAPI(customUrl) {
     }
 }
 
+/**
+ * Define a barra de progresso e a mensagem de status
+ * @param {number} value - Progresso em porcentagem
+ * @param {string} message - Mensagem de status
+ */
+function setProgress(value, message) {
+    progress = value;
+    progressBar.style.width = `${progress}%`;
+    loadingStatus.textContent = message;
+}
+
 /**
  * Completa a barra de progresso
  */
@@ -735,7 +854,7 @@ function processarDadosGrafico(produtos) {
 
 /**
  * Mostra o conteúdo principal com animação
- * @param {number} progressInterval - ID do intervalo de progresso para limpar
+ * @param {number} [progressInterval] - ID do intervalo de progresso para limpar
  */
 function showContent(progressInterval) {
     setTimeout(() => {
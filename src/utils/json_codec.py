@@ -0,0 +1,63 @@
+"""
+Codificação e decodificação de JSON.
+Usa o orjson quando estiver instalado (dependência opcional, bem mais
+rápida em respostas grandes) e recorre ao módulo json da biblioteca padrão.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError é subclasse de json.JSONDecodeError
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND = "orjson" if orjson else "json"
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Decodifica um documento JSON.
+
+    Args:
+        data (Union[str, bytes, bytearray]): Documento em texto ou bytes UTF-8
+
+    Returns:
+        Any: Objeto decodificado
+
+    Raises:
+        JSONDecodeError: Se o documento não for JSON válido
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any) -> str:
+    """
+    Codifica um objeto em JSON compacto, preservando caracteres não ASCII.
+
+    Args:
+        obj (Any): Objeto serializável
+
+    Returns:
+        str: Documento JSON
+    """
+    if orjson:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def preview(data: Union[str, bytes, bytearray], limit: int = 500) -> str:
+    """
+    Obtém o início de um documento para registro em log, sem decodificá-lo por inteiro.
+
+    Args:
+        data (Union[str, bytes, bytearray]): Documento em texto ou bytes UTF-8
+        limit (int): Número máximo de caracteres
+
+    Returns:
+        str: Início do documento
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data[:limit]).decode('utf-8', errors='replace')
+    return data[:limit]
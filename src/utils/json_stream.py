@@ -0,0 +1,403 @@
+"""
+Utilitários para leitura incremental de JSON.
+Permite extrair os itens de um array JSON à medida que o texto chega em
+pedaços (ex.: tokens emitidos por um LLM ou o corpo de uma resposta HTTP),
+sem esperar nem materializar o documento completo.
+"""
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Caracteres que alteram o estado do parser fora e dentro de strings
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+class JsonArrayStreamParser:
+    """
+    Parser incremental dos itens do primeiro array JSON de um texto.
+    Texto antes do array (ex.: cercas de markdown) é ignorado; apenas
+    itens do tipo objeto ou array são reconhecidos. A memória usada é
+    limitada ao item em andamento.
+    """
+
+    def __init__(self):
+        """
+        Inicializa o parser.
+        """
+        self.started = False
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._parts: List[str] = []
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Processa um pedaço de texto.
+
+        Args:
+            chunk (str): Próximo pedaço do texto
+
+        Returns:
+            List[Any]: Itens do array concluídos neste pedaço
+        """
+        items = []
+        pos = 0
+        length = len(chunk)
+        item_start = 0
+
+        while pos < length and not self.done:
+            if self._depth == 0:
+                if not self.started:
+                    index = chunk.find('[', pos)
+                    if index < 0:
+                        break
+                    self.started = True
+                    pos = index + 1
+                    continue
+
+                # Entre itens: ignora espaços e vírgulas até o próximo item ou o fim do array
+                char = chunk[pos]
+                if char in '{[':
+                    self._depth = 1
+                    item_start = pos
+                elif char == ']':
+                    self.done = True
+                pos += 1
+                continue
+
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+
+            match = (_STRING_SPECIAL if self._in_string else _STRUCTURAL).search(chunk, pos)
+            if not match:
+                pos = length
+                break
+
+            char = match.group()
+            pos = match.end()
+            if self._in_string:
+                if char == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[item_start:pos])
+                    item = self._complete_item()
+                    if item is not None:
+                        items.append(item)
+
+        if self._depth > 0:
+            self._parts.append(chunk[item_start:])
+
+        return items
+
+    def _complete_item(self) -> Any:
+        """
+        Decodifica o item acumulado e reinicia o buffer.
+
+        Returns:
+            Any: Item decodificado ou None se o texto não for JSON válido
+        """
+        text = ''.join(self._parts)
+        self._parts = []
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Item inválido ignorado no array JSON transmitido: {e}")
+            return None
+
+def iter_json_array_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Extrai os itens do primeiro array JSON de uma sequência de pedaços de texto.
+
+    Args:
+        chunks (Iterable[str]): Pedaços do texto, na ordem em que chegam
+
+    Returns:
+        Iterator[Any]: Itens do array, entregues assim que cada um é concluído
+    """
+    parser = JsonArrayStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            break
+
+# Caracteres que alteram o estado da leitura do documento externo
+_OUTER_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+
+PathKey = Union[str, int]
+
+class JsonPathStreamReader:
+    """
+    Leitura incremental dos itens de um array localizado em um documento JSON.
+    O documento é percorrido em pedaços sem ser materializado; ao chegar a um
+    dos caminhos-alvo, os itens do array ali presente são entregues um a um.
+    O alvo pode ser o próprio array ou uma string contendo o array em JSON
+    (ex.: ``"text": "[{...}, ...]"``), decodificada à medida que chega.
+    A memória usada é limitada ao item em andamento.
+    """
+
+    def __init__(self, paths: Sequence[Sequence[PathKey]]):
+        """
+        Inicializa a leitura.
+
+        Args:
+            paths (Sequence[Sequence[PathKey]]): Caminhos-alvo, como sequências de chaves
+                e índices (ex.: ``("outputs", 0, "results", "text")``). Vale o primeiro encontrado.
+        """
+        self.targets = {tuple(path) for path in paths}
+        self.matched_path: Optional[Tuple[PathKey, ...]] = None
+        self.done = False
+        # Cada nível: [tipo ("obj" ou "arr"), chave ou índice atual, aguardando chave]
+        self._stack: List[list] = []
+        self._mode = "structure"
+        self._escape = False
+        self._key_parts: List[str] = []
+        self._pending_escape = ""
+        self._high_surrogate = ""
+        self._inner: Optional[JsonArrayStreamParser] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Processa um pedaço do documento.
+
+        Args:
+            chunk (str): Próximo pedaço do documento
+
+        Returns:
+            List[Any]: Itens do array-alvo concluídos neste pedaço
+        """
+        items: List[Any] = []
+        pos = 0
+        length = len(chunk)
+
+        while pos < length and not self.done:
+            if self._mode == "structure":
+                pos = self._feed_structure(chunk, pos)
+            elif self._mode == "target_array":
+                items.extend(self._inner.feed(chunk[pos:]))
+                self.done = self._inner.done
+                pos = length
+            elif self._mode == "target_string":
+                pos = self._feed_target_string(chunk, pos, items)
+            else:
+                pos = self._feed_plain_string(chunk, pos)
+
+        return items
+
+    def _current_path(self) -> Tuple[PathKey, ...]:
+        """
+        Retorna o caminho do valor que começa na posição atual.
+
+        Returns:
+            Tuple[PathKey, ...]: Chaves e índices desde a raiz
+        """
+        return tuple(frame[1] for frame in self._stack)
+
+    def _feed_structure(self, chunk: str, pos: int) -> int:
+        """
+        Avança sobre a estrutura do documento até o próximo caractere relevante.
+
+        Args:
+            chunk (str): Pedaço atual
+            pos (int): Posição inicial
+
+        Returns:
+            int: Nova posição
+        """
+        match = _OUTER_STRUCTURAL.search(chunk, pos)
+        if not match:
+            return len(chunk)
+
+        char = match.group()
+        frame = self._stack[-1] if self._stack else None
+        if char == '"':
+            if frame is not None and frame[2]:
+                self._mode = "key"
+                self._key_parts = []
+            elif self._current_path() in self.targets:
+                self._start_target("target_string")
+            else:
+                self._mode = "skip_string"
+        elif char == '[' and self._current_path() in self.targets:
+            self._start_target("target_array")
+            # O parser interno precisa ver o "[" de abertura
+            return match.start()
+        elif char == '{':
+            self._stack.append(["obj", None, True])
+        elif char == '[':
+            self._stack.append(["arr", 0, False])
+        elif char in '}]':
+            if self._stack:
+                self._stack.pop()
+        elif frame is not None:
+            if char == ':':
+                frame[2] = False
+            elif frame[0] == "obj":
+                frame[2] = True
+            else:
+                frame[1] += 1
+        return match.end()
+
+    def _start_target(self, mode: str) -> None:
+        """
+        Passa a ler o valor do caminho-alvo atual.
+
+        Args:
+            mode (str): "target_string" ou "target_array"
+        """
+        self.matched_path = self._current_path()
+        self._mode = mode
+        self._inner = JsonArrayStreamParser()
+        logger.debug(f"Caminho-alvo encontrado na leitura incremental: {self.matched_path}")
+
+    def _feed_plain_string(self, chunk: str, pos: int) -> int:
+        """
+        Avança sobre uma string fora do alvo, guardando-a apenas se for uma chave.
+
+        Args:
+            chunk (str): Pedaço atual
+            pos (int): Posição inicial
+
+        Returns:
+            int: Nova posição
+        """
+        is_key = self._mode == "key"
+        if self._escape:
+            self._escape = False
+            if is_key:
+                self._key_parts.append(chunk[pos])
+            return pos + 1
+
+        match = _STRING_SPECIAL.search(chunk, pos)
+        end = match.start() if match else len(chunk)
+        if is_key:
+            self._key_parts.append(chunk[pos:end])
+        if not match:
+            return end
+
+        if match.group() == '\\':
+            self._escape = True
+            if is_key:
+                self._key_parts.append('\\')
+        else:
+            if is_key:
+                self._stack[-1][1] = json.loads('"' + ''.join(self._key_parts) + '"')
+                self._key_parts = []
+            self._mode = "structure"
+        return match.end()
+
+    def _feed_target_string(self, chunk: str, pos: int, items: List[Any]) -> int:
+        """
+        Decodifica o conteúdo da string-alvo e o repassa ao parser do array.
+
+        Args:
+            chunk (str): Pedaço atual
+            pos (int): Posição inicial
+            items (List[Any]): Lista que recebe os itens concluídos
+
+        Returns:
+            int: Nova posição
+        """
+        length = len(chunk)
+        if self._pending_escape:
+            # Sequência de escape dividida entre pedaços: \x ou \uXXXX
+            while pos < length and not self._escape_complete():
+                self._pending_escape += chunk[pos]
+                pos += 1
+            if self._escape_complete():
+                self._emit(self._decode_escape(), items)
+                self._pending_escape = ""
+            return pos
+
+        match = _STRING_SPECIAL.search(chunk, pos)
+        end = match.start() if match else length
+        if end > pos:
+            self._emit(chunk[pos:end], items)
+        if not match:
+            return length
+
+        if match.group() == '\\':
+            self._pending_escape = '\\'
+        else:
+            # Fim da string-alvo: não há mais itens a ler
+            self.done = True
+        return match.end()
+
+    def _escape_complete(self) -> bool:
+        """
+        Indica se a sequência de escape pendente está completa.
+
+        Returns:
+            bool: True se a sequência pode ser decodificada
+        """
+        escape = self._pending_escape
+        return len(escape) >= 2 and (escape[1] != 'u' or len(escape) >= 6)
+
+    def _decode_escape(self) -> str:
+        """
+        Decodifica a sequência de escape pendente, combinando pares substitutos (\\uD83D\\uDE00).
+
+        Returns:
+            str: Texto decodificado (vazio se for a primeira metade de um par)
+        """
+        try:
+            text = json.loads('"' + self._pending_escape + '"')
+        except json.JSONDecodeError:
+            logger.warning(f"Sequência de escape inválida na string transmitida: {self._pending_escape}")
+            return ""
+
+        if '\ud800' <= text <= '\udbff':
+            self._high_surrogate = text
+            return ""
+        if self._high_surrogate and '\udc00' <= text <= '\udfff':
+            text = (self._high_surrogate + text).encode("utf-16", "surrogatepass").decode("utf-16")
+            self._high_surrogate = ""
+        return text
+
+    def _emit(self, text: str, items: List[Any]) -> None:
+        """
+        Repassa texto decodificado da string-alvo ao parser do array.
+
+        Args:
+            text (str): Texto decodificado
+            items (List[Any]): Lista que recebe os itens concluídos
+        """
+        if not text:
+            return
+        if self._high_surrogate:
+            text = self._high_surrogate + text
+            self._high_surrogate = ""
+        items.extend(self._inner.feed(text))
+        if self._inner.done:
+            self.done = True
+
+def iter_json_path_items(chunks: Iterable[str], paths: Sequence[Sequence[PathKey]]) -> Iterator[Any]:
+    """
+    Extrai os itens do array localizado em um dos caminhos de um documento JSON recebido em pedaços.
+
+    Args:
+        chunks (Iterable[str]): Pedaços do documento, na ordem em que chegam
+        paths (Sequence[Sequence[PathKey]]): Caminhos-alvo, como sequências de chaves e índices
+
+    Returns:
+        Iterator[Any]: Itens do array, entregues assim que cada um é concluído
+    """
+    reader = JsonPathStreamReader(paths)
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+        if reader.done:
+            break
@@ -0,0 +1,246 @@
+"""
+Normalização de valores de produtos: preços em reais, avaliações e contagens.
+Os padrões são pré-compilados e a conversão de textos repetidos é
+reaproveitada; a API em lote converte colunas inteiras em uma só passada
+sobre os registros.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Nome canônico de cada campo e as chaves aceitas para ele (sem acentos e em minúsculas)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "titulo": ("titulo", "nome", "name", "title", "produto", "product", "product_name", "nome_produto"),
+    "preco": ("preco", "price", "valor", "preco_atual", "current_price", "preco_brl"),
+    "rating": ("rating", "avaliacao", "avaliacao_media", "nota", "estrelas", "stars"),
+    "imagem": ("imagem", "image", "image_url", "imagem_url", "img", "foto", "thumbnail"),
+    "url_produto": ("url_produto", "url", "link", "product_url", "href", "link_produto"),
+    "descricao": ("descricao", "description", "desc", "detalhes"),
+    "classificacao": ("classificacao", "avaliacoes", "num_avaliacoes", "quantidade_avaliacoes",
+                      "reviews", "review_count", "ratings_count", "total_avaliacoes"),
+    "posicao": ("posicao", "rank", "ranking", "position", "colocacao"),
+}
+
+_ALIAS_TO_FIELD = {alias: name for name, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+_KEY_SEPARATORS = re.compile(r'[\s\-]+')
+# Valor em reais: com separador de milhar (1.299,90), com vírgula decimal (99,9) ou com ponto decimal (99.90)
+_PRICE_NUMBER = re.compile(r'\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?(?!\d)|\d+,\d{1,2}(?!\d)|\d+(?:\.\d{1,2})?(?!\d)')
+_PRICE_WITH_SYMBOL = re.compile(r'R\$\s*(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:[.,]\d{1,2})?)')
+# Parcelas ("12x de R$ 108,33") não são o preço do produto
+_INSTALLMENT = re.compile(r'\d+\s*x\s*(?:de\s*)?(?:R\$\s*)?[\d.,]+', re.IGNORECASE)
+_THOUSANDS_ONLY = re.compile(r'\d{1,3}(?:\.\d{3})+')
+_RATING_NUMBER = re.compile(r'\d+(?:[.,]\d+)?')
+_COUNT_THOUSANDS = re.compile(r'[.,](?=\d{3}(?:\D|$))')
+_COUNT_NUMBER = re.compile(r'(\d{1,3}(?:[.,]\d{3})+|\d+(?:[.,]\d+)?)\s*(mil|k)?\b', re.IGNORECASE)
+
+_MISSING = frozenset(("", "-", "--", "n/a", "na", "null", "none", "indisponivel", "indisponível", "sem preco", "sem preço"))
+
+def normalize_key(key: Any) -> str:
+    """
+    Normaliza o nome de uma chave: sem acentos, em minúsculas e com "_" no lugar de espaços.
+
+    Args:
+        key (Any): Nome original da chave
+
+    Returns:
+        str: Nome normalizado
+    """
+    key = unicodedata.normalize("NFKD", str(key)).encode("ascii", "ignore").decode("ascii")
+    return _KEY_SEPARATORS.sub("_", key.strip().lower())
+
+def resolve_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mapeia as chaves de um registro para os nomes canônicos (ex.: "nome" e "name" para "titulo").
+    Em chaves equivalentes repetidas, vale o primeiro valor preenchido.
+
+    Args:
+        record (Dict[str, Any]): Registro com chaves variadas
+
+    Returns:
+        Dict[str, Any]: Valores pelos nomes canônicos; chaves desconhecidas são descartadas
+    """
+    fields: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = _ALIAS_TO_FIELD.get(key) or _ALIAS_TO_FIELD.get(normalize_key(key))
+        if name and fields.get(name) in (None, ""):
+            fields[name] = value
+    return fields
+
+def _is_missing(value: Any) -> bool:
+    """
+    Indica se o valor representa um dado ausente.
+
+    Args:
+        value (Any): Valor a verificar
+
+    Returns:
+        bool: True para None, booleanos e textos como "", "-" ou "Indisponível"
+    """
+    return value is None or isinstance(value, bool) or (isinstance(value, str) and value.strip().lower() in _MISSING)
+
+@lru_cache(maxsize=4096)
+def _parse_price_text(text: str) -> Optional[float]:
+    """
+    Converte um texto de preço em float. Faixas ("R$ 10,00 - R$ 20,00") e preços
+    iniciais ("a partir de R$ 99,90") resultam no menor valor; parcelas são ignoradas.
+
+    Args:
+        text (str): Texto do preço
+
+    Returns:
+        Optional[float]: Preço ou None se não houver valor
+    """
+    text = _INSTALLMENT.sub(' ', text)
+    numbers = _PRICE_WITH_SYMBOL.findall(text) if "R$" in text else _PRICE_NUMBER.findall(text)
+    values = []
+    for number in numbers:
+        if ',' in number or _THOUSANDS_ONLY.fullmatch(number):
+            number = number.replace('.', '').replace(',', '.')
+        values.append(float(number))
+    return min(values) if values else None
+
+def parse_price(value: Any) -> Optional[float]:
+    """
+    Converte um preço em float, aceitando números e textos no formato brasileiro.
+
+    Args:
+        value (Any): Preço como 1299.9, "1299.90", "1.299,90", "R$ 1.299,90",
+            "a partir de R$ 99,90" ou "R$ 10,00 - R$ 20,00"
+
+    Returns:
+        Optional[float]: Preço (o menor, em faixas) ou None se ausente ou inválido
+    """
+    if _is_missing(value):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_price_text(str(value).strip())
+
+@lru_cache(maxsize=1024)
+def _parse_rating_text(text: str) -> Optional[float]:
+    """
+    Converte um texto de avaliação em float.
+
+    Args:
+        text (str): Texto da avaliação
+
+    Returns:
+        Optional[float]: Avaliação ou None se não houver valor
+    """
+    match = _RATING_NUMBER.search(text)
+    return float(match.group().replace(',', '.')) if match else None
+
+def parse_rating(value: Any) -> Optional[float]:
+    """
+    Converte uma avaliação em float entre 0 e 5.
+
+    Args:
+        value (Any): Avaliação como 4.5, "4,5" ou "4,5 de 5 estrelas"
+
+    Returns:
+        Optional[float]: Avaliação ou None se ausente ou fora da escala
+    """
+    if _is_missing(value):
+        return None
+    rating = float(value) if isinstance(value, (int, float)) else _parse_rating_text(str(value).strip())
+    return rating if rating is not None and 0 <= rating <= 5 else None
+
+@lru_cache(maxsize=4096)
+def _parse_count_text(text: str) -> int:
+    """
+    Converte um texto de contagem em inteiro.
+
+    Args:
+        text (str): Texto da contagem
+
+    Returns:
+        int: Contagem (0 se não houver valor)
+    """
+    match = _COUNT_NUMBER.search(text)
+    if not match:
+        return 0
+    number, multiplier = match.groups()
+    if multiplier and number.count('.') + number.count(',') <= 1:
+        # "1,2 mil" e "1.2k": o separador é decimal
+        return int(float(number.replace(',', '.')) * 1000)
+    count = int(float(_COUNT_THOUSANDS.sub('', number).replace(',', '.')))
+    return count * 1000 if multiplier else count
+
+def parse_count(value: Any) -> int:
+    """
+    Converte uma contagem (ex.: número de avaliações) em inteiro.
+
+    Args:
+        value (Any): Contagem como 1833, "1.833", "(1.833)" ou "1,2 mil"
+
+    Returns:
+        int: Contagem (0 se ausente ou inválida)
+    """
+    if _is_missing(value):
+        return 0
+    if isinstance(value, (int, float)):
+        return max(0, int(value))
+    return _parse_count_text(str(value).strip())
+
+def parse_prices(values: Iterable[Any]) -> List[Optional[float]]:
+    """
+    Converte uma coluna de preços.
+
+    Args:
+        values (Iterable[Any]): Preços em qualquer formato aceito por parse_price
+
+    Returns:
+        List[Optional[float]]: Preços convertidos, na mesma ordem
+    """
+    return [parse_price(value) for value in values]
+
+def parse_ratings(values: Iterable[Any]) -> List[Optional[float]]:
+    """
+    Converte uma coluna de avaliações.
+
+    Args:
+        values (Iterable[Any]): Avaliações em qualquer formato aceito por parse_rating
+
+    Returns:
+        List[Optional[float]]: Avaliações convertidas, na mesma ordem
+    """
+    return [parse_rating(value) for value in values]
+
+def parse_counts(values: Iterable[Any]) -> List[int]:
+    """
+    Converte uma coluna de contagens.
+
+    Args:
+        values (Iterable[Any]): Contagens em qualquer formato aceito por parse_count
+
+    Returns:
+        List[int]: Contagens convertidas, na mesma ordem
+    """
+    return [parse_count(value) for value in values]
+
+_COLUMN_PARSERS = {"preco": parse_price, "rating": parse_rating, "classificacao": parse_count}
+
+def normalize_columns(records: Iterable[Dict[str, Any]],
+                      fields: Sequence[str] = ("preco", "rating", "classificacao")) -> Dict[str, List[Any]]:
+    """
+    Converte as colunas numéricas de vários registros em uma só passada,
+    resolvendo as chaves alternativas de cada registro (ex.: "preço", "price").
+
+    Args:
+        records (Iterable[Dict[str, Any]]): Registros de produtos
+        fields (Sequence[str]): Colunas a converter, entre "preco", "rating" e "classificacao";
+            "titulo" também é aceito e entregue sem conversão
+
+    Returns:
+        Dict[str, List[Any]]: Valores convertidos por coluna, alinhados aos registros
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in fields}
+    parsers = [(name, _COLUMN_PARSERS.get(name), columns[name]) for name in fields]
+    for record in records:
+        values = resolve_fields(record) if isinstance(record, dict) else {}
+        for name, parser, column in parsers:
+            value = values.get(name)
+            column.append(parser(value) if parser else value)
+    return columns
@@ -5,6 +5,7 @@ from typing import List, Dict, Any
 from statistics import mean
 
 from src.models.product import Product, ProductStatistics
+from src.utils.normalization import normalize_columns
 
 def calculate_product_statistics(products: List[Product]) -> ProductStatistics:
     """
@@ -40,27 +41,29 @@ def prepare_chart_data(products) -> Dict[str, Any]:
     # Verifica se estamos lidando com objetos Product ou dicionários
     is_dict_format = isinstance(products[0], dict) if products else False
 
-    # Filtra produtos com preços válidos
+    # Extrai preços e nomes dos produtos com preços válidos
     if is_dict_format:
-        # Formato do agente (dicionários)
-        produtos_validos = []
-        for p in products:
-            # Tenta obter o preço em diferentes formatos
-            preco = p.get('preco') or p.get('price') or p.get('preço')
-            if preco is not None:
-                # Converte string para número se necessário
-                if isinstance(preco, str):
-                    try:
-                        preco = float(preco.replace('R$', '').replace('.', '').replace(',', '.').strip())
-                    except ValueError:
-                        continue
-                if isinstance(preco, (int, float)) and preco > 0:
-                    produtos_validos.append(p)
+        # Formato do agente (dicionários): converte as colunas em uma só passada
+        columns = normalize_columns(products, ("titulo", "preco"))
+        precos = []
+        labels = []
+        for nome, preco in zip(columns["titulo"], columns["preco"]):
+            if preco is None or preco <= 0:
+                continue
+            precos.append(preco)
+            # Extrai nome para label
+            nome = str(nome) if nome else f"Produto {len(labels)+1}"
+            # Limita tamanho do nome
+            nome = nome[:20] + '...' if len(nome) > 20 else nome
+            labels.append(nome)
     else:
         # Formato da API (objetos Product)
         produtos_validos = [p for p in products if p.price is not None and isinstance(p.price, (int, float))]
+        precos = [float(produto.price) for produto in produtos_validos]
+        labels = [produto.name[:20] + '...' if produto.name and len(produto.name) > 20 else f"Produto {i+1}"
+                 for i, produto in enumerate(produtos_validos)]
 
-    if not produtos_validos:
+    if not precos:
         return {
             'labels': [],
             'precos': [],
@@ -69,29 +72,6 @@ def prepare_chart_data(products) -> Dict[str, Any]:
             'maximo': 0
         }
 
-    # Extrai preços e nomes
-    if is_dict_format:
-        # Formato do agente
-        precos = []
-        labels = []
-        for p in produtos_validos:
-            # Extrai preço
-            preco = p.get('preco') or p.get('price') or p.get('preço') or 0
-            if isinstance(preco, str):
-                preco = float(preco.replace('R$', '').replace('.', '').replace(',', '.').strip())
-            precos.append(float(preco))
-
-            # Extrai nome para label
-            nome = p.get('titulo') or p.get('name') or p.get('nome') or f"Produto {len(labels)+1}"
-            # Limita tamanho do nome
-            nome = nome[:20] + '...' if len(nome) > 20 else nome
-            labels.append(nome)
-    else:
-        # Formato da API
-        precos = [float(produto.price) for produto in produtos_validos]
-        labels = [produto.name[:20] + '...' if produto.name and len(produto.name) > 20 else f"Produto {i+1}"
-                 for i, produto in enumerate(produtos_validos)]
-
     # Calcula estatísticas
     media_precos = mean(precos) if precos else 0
     preco_min = min(precos) if precos else 0
@@ -0,0 +1,61 @@
+"""
+Configuração compartilhada dos testes.
+"""
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.cache import MemoCache, MemoryLRUCache
+from src.services.http import HttpSessionPool
+
+@pytest.fixture(autouse=True)
+def isolated_memo_cache():
+    """Usa uma memoização vazia e apenas em memória em cada teste."""
+    MemoCache().configure(backend=MemoryLRUCache(), enabled=True)
+    yield
+
+@pytest.fixture
+def local_server():
+    """
+    Inicia servidores HTTP locais; cada POST recebido é respondido pela função
+    informada, que recebe o handler e o número da requisição (a partir de 1).
+    """
+    servers = []
+
+    def start(respond):
+        counter = itertools.count(1)
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with lock:
+                    number = next(counter)
+                respond(self, number)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    HttpSessionPool().close_all()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def send_json(handler, status, body=b'{"ok": true}'):
+    """Envia uma resposta JSON completa pelo handler do servidor local."""
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
@@ -0,0 +1,170 @@
+"""
+Testes para o controle de admissão dos pipelines.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.app import create_app
+from src.services.admission import (
+    EVICTED, PRIORITY_BATCH, PRIORITY_INTERACTIVE, PRIORITY_PREFETCH, QUEUE_FULL, WAIT_TIMEOUT,
+    AdmissionController, AdmissionRejected, parse_priority
+)
+from src.services.agent_orchestrator import AgentOrchestrator, ProductsResult
+from src.services.deadline import Deadline, deadline_scope
+
+def _queue_in_background(controller, priority, results, hold=0.0):
+    depth = controller.stats()["queue_depth"]
+
+    def run():
+        try:
+            with controller.admit(priority, max_wait=5):
+                results.append(priority)
+                time.sleep(hold)
+        except AdmissionRejected as e:
+            results.append(e.reason)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    for _ in range(100):
+        if controller.stats()["queue_depth"] > depth:
+            break
+        time.sleep(0.01)
+    return thread
+
+def test_parse_priority():
+    """Testa a leitura da prioridade informada pelo cliente."""
+    assert parse_priority(None) == PRIORITY_INTERACTIVE
+    assert parse_priority("", PRIORITY_BATCH) == PRIORITY_BATCH
+    assert parse_priority(" Prefetch ") == PRIORITY_PREFETCH
+    with pytest.raises(ValueError):
+        parse_priority("urgente")
+
+def test_interactive_served_before_batch():
+    """Testa se a vaga liberada vai ao pedido interativo, mesmo que o lote tenha chegado antes."""
+    controller = AdmissionController(max_concurrent=1, max_queue=4)
+    ticket = controller.acquire(PRIORITY_INTERACTIVE)
+    order = []
+
+    batch = _queue_in_background(controller, PRIORITY_BATCH, order, hold=0.05)
+    interactive = _queue_in_background(controller, PRIORITY_INTERACTIVE, order, hold=0.05)
+    assert controller.stats()["queued"] == {PRIORITY_INTERACTIVE: 1, PRIORITY_BATCH: 1, PRIORITY_PREFETCH: 0}
+
+    ticket.release()
+    interactive.join(5)
+    batch.join(5)
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BATCH]
+    stats = controller.stats()
+    assert stats["active"] == 0
+    assert stats["admitted"] == {PRIORITY_INTERACTIVE: 2, PRIORITY_BATCH: 1, PRIORITY_PREFETCH: 0}
+    assert stats["wait"][PRIORITY_BATCH]["max"] > stats["wait"][PRIORITY_INTERACTIVE]["max"] > 0
+
+def test_queue_full_and_eviction():
+    """Testa a recusa com a fila cheia e a substituição do pedido menos urgente por um interativo."""
+    controller = AdmissionController(max_concurrent=1, max_queue=1)
+    ticket = controller.acquire(PRIORITY_INTERACTIVE)
+    results = []
+    prefetch = _queue_in_background(controller, PRIORITY_PREFETCH, results)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire(PRIORITY_PREFETCH)
+    assert rejected.value.reason == QUEUE_FULL
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after >= 1
+    assert controller.check(PRIORITY_BATCH) is None
+    assert controller.check(PRIORITY_PREFETCH).reason == QUEUE_FULL
+
+    interactive = _queue_in_background(controller, PRIORITY_INTERACTIVE, [])
+    prefetch.join(5)
+    assert results == [EVICTED]
+
+    ticket.release()
+    interactive.join(5)
+    assert controller.stats()["rejected"] == {QUEUE_FULL: 1, EVICTED: 1, WAIT_TIMEOUT: 0}
+
+def test_wait_timeout_respects_deadline():
+    """Testa se a espera por vaga termina com 503 no limite próprio ou no prazo da requisição."""
+    controller = AdmissionController(max_concurrent=1, max_queue=4, max_wait=60)
+    ticket = controller.acquire()
+
+    started = time.monotonic()
+    with deadline_scope(Deadline.after(0.05)), pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire()
+    assert time.monotonic() - started < 1
+    assert rejected.value.reason == WAIT_TIMEOUT
+    assert rejected.value.status_code == 503
+    assert controller.stats()["queue_depth"] == 0
+
+    ticket.release()
+    ticket.release()
+    assert controller.stats()["active"] == 0
+
+def test_reserved_slots_for_interactive():
+    """Testa se as vagas reservadas não são ocupadas por lotes."""
+    controller = AdmissionController(max_concurrent=2, max_queue=0, interactive_reserved=1)
+    batch = controller.acquire(PRIORITY_BATCH)
+
+    with pytest.raises(AdmissionRejected):
+        controller.acquire(PRIORITY_BATCH)
+    controller.acquire(PRIORITY_INTERACTIVE).release()
+    batch.release()
+
+def test_fetch_data_route_overloaded():
+    """Testa a resposta 429 com Retry-After quando não há vaga nem fila."""
+    app = create_app('testing')
+    app.extensions['admission_controller'] = AdmissionController(max_concurrent=1, max_queue=0)
+    client = app.test_client()
+
+    assert client.get('/fetch-data?priority=urgente').status_code == 400
+
+    ticket = app.extensions['admission_controller'].acquire()
+    with patch.object(AgentOrchestrator, '_agent_products', return_value=ProductsResult([])) as mock_run:
+        response = client.get('/fetch-data')
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert response.get_json()["reason"] == QUEUE_FULL
+        mock_run.assert_not_called()
+
+        ticket.release()
+        assert client.get('/fetch-data').status_code == 200
+        mock_run.assert_called_once()
+
+    assert client.get('/stats').get_json()["admission"]["admitted"][PRIORITY_INTERACTIVE] == 2
+
+def test_coalesced_requests_share_the_leader_slot():
+    """Testa se requisições idênticas a uma em andamento aguardam o seu resultado sem ocupar outra vaga."""
+    app = create_app('testing')
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    app.extensions['admission_controller'] = controller
+    started, release = threading.Event(), threading.Event()
+
+    def slow_run(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return ProductsResult([])
+
+    responses = []
+
+    def request():
+        responses.append(app.test_client().get('/fetch-data?source=https://www.amazon.com.br/igual').status_code)
+
+    with patch.object(AgentOrchestrator, '_agent_products', side_effect=slow_run) as mock_run:
+        leader = threading.Thread(target=request)
+        leader.start()
+        assert started.wait(5)
+        follower = threading.Thread(target=request)
+        follower.start()
+        for _ in range(100):
+            if AgentOrchestrator.coalescing_stats()["waiting"]:
+                break
+            time.sleep(0.01)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+    assert mock_run.call_count == 1
+    assert 429 not in responses
+    assert controller.stats()["admitted"][PRIORITY_INTERACTIVE] == 1
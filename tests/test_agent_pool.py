@@ -0,0 +1,90 @@
+"""
+Testes para o pool de agentes reaproveitados entre requisições.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.app import create_app
+from src.services.agents.base import BaseDataFetcherAgent
+from src.services.agents.pool import AgentPool
+from src.services.agents.registry import AgentRegistry
+
+class CountingFetcher(BaseDataFetcherAgent):
+    created = 0
+
+    def __init__(self):
+        super().__init__("Busca", "Busca de teste")
+        CountingFetcher.created += 1
+
+    def fetch_data(self, source, use_cache=True):
+        return source
+
+def _register(agent_type="pool_fetcher"):
+    CountingFetcher.created = 0
+    AgentRegistry().register_agent_class(agent_type, CountingFetcher)
+    return agent_type
+
+def test_lease_reuses_instances():
+    """Testa se a instância devolvida é reaproveitada no empréstimo seguinte."""
+    agent_type = _register()
+    pool = AgentPool()
+
+    with pool.lease(agent_type) as first:
+        pass
+    with pool.lease(agent_type) as second:
+        pass
+
+    assert first is second
+    assert CountingFetcher.created == 1
+    assert pool.stats()[agent_type] == {"created": 1, "reused": 1, "discarded": 0, "in_use": 0, "idle": 1}
+
+def test_concurrent_leases_get_distinct_instances():
+    """Testa se empréstimos simultâneos recebem instâncias diferentes e o ocioso respeita o limite."""
+    agent_type = _register()
+    pool = AgentPool(max_idle=2)
+    barrier = threading.Barrier(4, timeout=5)
+
+    def lease(_):
+        with pool.lease(agent_type) as agent:
+            barrier.wait()
+            return id(agent)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        ids = list(executor.map(lease, range(4)))
+
+    assert len(set(ids)) == 4
+    stats = pool.stats()[agent_type]
+    assert stats["idle"] == 2
+    assert stats["discarded"] == 2
+    assert stats["in_use"] == 0
+
+def test_reregistration_discards_pooled_instances():
+    """Testa se instâncias criadas antes de um novo registro do tipo não são reaproveitadas."""
+    agent_type = _register()
+    pool = AgentPool()
+    with pool.lease(agent_type) as first:
+        pass
+
+    AgentRegistry().register_agent_class(agent_type, CountingFetcher)
+    with pool.lease(agent_type) as second:
+        pass
+
+    assert first is not second
+
+def test_unknown_agent_and_disabled_stage():
+    """Testa empréstimos de tipos inexistentes e de etapas desativadas."""
+    pool = AgentPool()
+    with pool.lease("tipo_inexistente") as agent:
+        assert agent is None
+    with pool.lease(None) as agent:
+        assert agent is None
+
+def test_app_shares_one_orchestrator():
+    """Testa se a aplicação cria um único orquestrador com os agentes padrão já prontos."""
+    app = create_app('testing')
+    orchestrator = app.extensions['agent_orchestrator']
+
+    stats = orchestrator.agent_pool_stats()
+    assert stats[orchestrator.agent_config["default_fetcher"]]["idle"] == 1
+    assert app.test_client().get('/agents').get_json()["success"]
+    assert app.extensions['agent_orchestrator'] is orchestrator
@@ -0,0 +1,91 @@
+"""
+Testes para a busca em lote de várias categorias.
+"""
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.app import create_app
+from src.models.product import Product
+from src.services.agent_orchestrator import AgentOrchestrator
+
+def _slow_pipeline(tracker):
+    """Cria um pipeline simulado que registra a concorrência máxima."""
+    lock = threading.Lock()
+
+    def pipeline(self, source, *args, **kwargs):
+        with lock:
+            tracker["running"] += 1
+            tracker["max"] = max(tracker["max"], tracker["running"])
+        time.sleep(0.05)
+        with lock:
+            tracker["running"] -= 1
+        if source.endswith("falha"):
+            return []
+        return [Product(name=f"Produto {source}", price=10.0)]
+
+    return pipeline
+
+def test_fetch_and_process_many_runs_in_parallel():
+    """Testa a execução paralela limitada pela concorrência configurada."""
+    tracker = {"running": 0, "max": 0}
+    sources = [f"https://www.amazon.com.br/gp/bestsellers/cat{i}" for i in range(6)]
+
+    with patch.object(AgentOrchestrator, 'fetch_and_process_products', _slow_pipeline(tracker)):
+        results = list(AgentOrchestrator().fetch_and_process_many(sources, concurrency=3, per_host_limit=3))
+
+    assert sorted(result["source"] for result in results) == sorted(sources)
+    assert all(result["error"] is None for result in results)
+    assert tracker["max"] == 3
+
+def test_per_host_limit():
+    """Testa o limite de pipelines simultâneos por host."""
+    tracker = {"running": 0, "max": 0}
+    sources = [f"https://www.amazon.com.br/gp/bestsellers/cat{i}" for i in range(4)]
+
+    with patch.object(AgentOrchestrator, 'fetch_and_process_products', _slow_pipeline(tracker)):
+        list(AgentOrchestrator().fetch_and_process_many(sources, concurrency=4, per_host_limit=1))
+
+    assert tracker["max"] == 1
+
+def test_fetch_batch_route_streams_ndjson():
+    """Testa a rota /fetch-batch com resposta em NDJSON."""
+    tracker = {"running": 0, "max": 0}
+    client = create_app('testing').test_client()
+
+    with patch.object(AgentOrchestrator, 'fetch_and_process_products', _slow_pipeline(tracker)):
+        response = client.post('/fetch-batch', json={
+            "sources": ["https://www.amazon.com.br/gp/bestsellers/books", "https://www.amazon.com.br/falha"]
+        })
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == 'application/x-ndjson'
+    by_source = {line["source"]: line for line in lines if "source" in line}
+    assert by_source["https://www.amazon.com.br/gp/bestsellers/books"]["produtos"][0]["price"] == 10.0
+    assert by_source["https://www.amazon.com.br/falha"]["success"] is False
+    assert lines[-1] == {"done": True, "total": 2, "failed": 1}
+
+def test_fetch_batch_requires_sources():
+    """Testa a validação do corpo da requisição."""
+    client = create_app('testing').test_client()
+
+    assert client.post('/fetch-batch', json={}).status_code == 400
+    assert client.post('/fetch-batch', json={"sources": ["ftp://x"]}).status_code == 400
+
+def test_fetch_batch_validates_limits():
+    """Testa a recusa de limites de concorrência inválidos antes do início da transmissão."""
+    client = create_app('testing').test_client()
+    sources = ["https://www.amazon.com.br/gp/bestsellers/books"]
+
+    for invalid in ("muitos", 0, -2, True, [4]):
+        assert client.post('/fetch-batch', json={"sources": sources, "concurrency": invalid}).status_code == 400
+    assert client.post('/fetch-batch', json={"sources": sources, "per_host_limit": "x"}).status_code == 400
+
+    with patch.object(AgentOrchestrator, 'fetch_and_process_many', return_value=iter([])) as mock_many:
+        response = client.post('/fetch-batch', json={"sources": sources, "concurrency": "1000", "per_host_limit": 2})
+        assert response.status_code == 200
+    assert mock_many.call_args.kwargs["concurrency"] == client.application.config['BATCH_MAX_CONCURRENCY']
+    assert mock_many.call_args.kwargs["per_host_limit"] == 2
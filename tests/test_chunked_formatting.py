@@ -0,0 +1,104 @@
+"""
+Testes para a formatação em partes paralelas.
+"""
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.services.agents.interfaces import IncompleteResultError
+from src.services.agents.langflow.formatter import LangflowFormatterAgent, estimate_tokens
+
+URL = "http://langflow:7860/api/v1/run/formatador"
+RECORDS = [{"titulo": f"Produto {i}", "descricao": "x" * 40} for i in range(12)]
+
+def _response(records):
+    """Monta a resposta do fluxo de formatação para os registros recebidos."""
+    products = [{"titulo": record["titulo"], "preco": 10.0} for record in records]
+    return {"outputs": [{"outputs": [{"results": {"text": {"data": {"text": json.dumps(products)}}}}]}]}
+
+def test_split_keeps_records_whole_and_bounded():
+    """Testa se a divisão respeita o limite sem cortar registros."""
+    formatter = LangflowFormatterAgent(api_url=URL, chunk_max_tokens=60)
+
+    chunks = formatter._split_input(RECORDS)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 60 for chunk in chunks)
+    assert [record for chunk in chunks for record in json.loads(chunk)] == RECORDS
+
+def test_small_input_is_not_split():
+    """Testa se entradas pequenas seguem em uma única requisição, serializadas uma única vez."""
+    formatter = LangflowFormatterAgent(api_url=URL, chunk_max_tokens=4000)
+    assert len(formatter._split_input(RECORDS)) == 1
+    assert formatter._split_input(42) == []
+
+    with patch.object(formatter, '_make_request', return_value=_response(RECORDS)) as mock_request, \
+            patch.object(formatter, '_prepare_input_data', wraps=formatter._prepare_input_data) as mock_prepare:
+        assert len(formatter.process_data(RECORDS)) == len(RECORDS)
+
+    mock_prepare.assert_called_once()
+    assert json.loads(mock_request.call_args.args[0]["inputs"]["text"]) == RECORDS
+
+def test_chunks_run_concurrently_and_keep_order():
+    """Testa a formatação simultânea das partes com o resultado na ordem original."""
+    formatter = LangflowFormatterAgent(api_url=URL, chunk_max_tokens=60, chunk_concurrency=8)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_request(payload, headers):
+        records = json.loads(payload["inputs"]["text"])
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        # Partes iniciais mais lentas: a ordem de conclusão difere da ordem original
+        time.sleep(0.05 if records[0] == RECORDS[0] else 0.01)
+        with lock:
+            active["now"] -= 1
+        return _response(records)
+
+    with patch.object(formatter, '_make_request', side_effect=fake_request):
+        products = formatter.process_data(RECORDS)
+
+    assert [product["titulo"] for product in products] == [record["titulo"] for record in RECORDS]
+    assert active["peak"] > 1
+
+def test_failed_chunk_is_retried_alone():
+    """Testa se apenas a parte que falhou é repetida."""
+    formatter = LangflowFormatterAgent(api_url=URL, chunk_max_tokens=60, chunk_concurrency=2)
+    calls = []
+    lock = threading.Lock()
+
+    def fake_request(payload, headers):
+        records = json.loads(payload["inputs"]["text"])
+        with lock:
+            calls.append(records[0]["titulo"])
+            first_try = calls.count(records[0]["titulo"]) == 1
+        if records[0] == RECORDS[0] and first_try:
+            return {"outputs": []}
+        return _response(records)
+
+    with patch.object(formatter, '_make_request', side_effect=fake_request):
+        products = formatter.process_data(RECORDS)
+
+    chunk_count = len(formatter._split_input(RECORDS))
+    assert len(products) == len(RECORDS)
+    assert len(calls) == chunk_count + 1
+    assert calls.count(RECORDS[0]["titulo"]) == 2
+
+def test_chunk_that_keeps_failing_fails_the_whole_result():
+    """Testa se uma parte sem produtos após as tentativas invalida o resultado, em vez de truncá-lo."""
+    formatter = LangflowFormatterAgent(api_url=URL, chunk_max_tokens=60, chunk_concurrency=2)
+
+    def fake_request(payload, headers):
+        records = json.loads(payload["inputs"]["text"])
+        if RECORDS[-1] in records:
+            return {"outputs": []}
+        return _response(records)
+
+    with patch.object(formatter, '_make_request', side_effect=fake_request):
+        assert formatter.process_data(RECORDS) is None
+        with pytest.raises(IncompleteResultError):
+            list(formatter.process_data_stream(RECORDS))
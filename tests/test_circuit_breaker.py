@@ -0,0 +1,100 @@
+"""
+Testes para os disjuntores por endpoint.
+"""
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.services.agents.langflow.client import LangflowClient
+from src.services.http import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy
+from src.services.http.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+
+def test_opens_on_failure_rate():
+    """Testa se o circuito abre apenas com chamadas suficientes e taxa de falhas atingida."""
+    breaker = CircuitBreaker("fluxo", failure_rate=0.5, minimum_calls=4, open_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+    assert 0 < breaker.retry_in() <= 30
+
+@patch('src.services.http.circuit_breaker.time.monotonic')
+def test_probe_schedule(mock_monotonic):
+    """Testa a sondagem no estado semiaberto e a espera dobrada após sondagem malsucedida."""
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker("fluxo", minimum_calls=1, open_timeout=10, max_open_timeout=15)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    mock_monotonic.return_value = 110.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    mock_monotonic.return_value = 124.0
+    assert breaker.state == OPEN
+    mock_monotonic.return_value = 125.0
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls"] == 0
+
+def test_client_fails_fast_while_open():
+    """Testa se o cliente Langflow deixa de contatar o fluxo com o circuito aberto."""
+    registry = CircuitBreakerRegistry()
+    registry.configure(enabled=True, failure_rate=0.5, minimum_calls=2, window=60,
+                       open_timeout=60, max_open_timeout=60)
+    try:
+        client = LangflowClient("http://langflow:7860/api/v1/run/fluxo", timeout=5,
+                                retry_policy=RetryPolicy(max_attempts=1))
+        session = MagicMock()
+        session.request.side_effect = requests.exceptions.ConnectionError("recusada")
+
+        with patch.object(client.session_pool, 'get_session', return_value=session), \
+                patch.object(client.rate_limiter, 'acquire', return_value=0.0) as acquire:
+            assert client.post({}, {}) is None
+            assert client.post({}, {}) is None
+            assert client.is_circuit_open()
+            assert client.post({}, {}) is None
+
+        assert session.request.call_count == 2
+        assert acquire.call_count == 2
+        assert registry.stats()["http://langflow:7860/api/v1/run/fluxo"]["state"] == OPEN
+    finally:
+        CircuitBreakerRegistry._instance = None
+
+@patch('src.services.http.circuit_breaker.time.monotonic')
+def test_release_probe(mock_monotonic):
+    """Testa a devolução da sondagem reservada para uma requisição que não foi enviada."""
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker("fluxo", minimum_calls=1, open_timeout=10)
+    breaker.record_failure()
+
+    mock_monotonic.return_value = 110.0
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_client_closes_failed_stream():
+    """Testa se a resposta em streaming com erro HTTP é fechada, devolvendo a conexão ao pool."""
+    client = LangflowClient("http://langflow:7860/api/v1/run/fluxo", timeout=5,
+                            retry_policy=RetryPolicy(max_attempts=1))
+    response = MagicMock()
+    response.status_code = 404
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("não encontrado")
+    session = MagicMock()
+    session.request.return_value = response
+
+    with patch.object(client.session_pool, 'get_session', return_value=session):
+        assert client.open_response({}, {}) is None
+    response.close.assert_called_once()
@@ -0,0 +1,159 @@
+"""
+Testes para o prazo de ponta a ponta das requisições.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.app import create_app
+from src.services.agent_orchestrator import AgentOrchestrator, ProductsResult
+from src.services.agents.base import BaseDataFetcherAgent, BaseDataProcessorAgent
+from src.services.agents.pool import AgentPool
+from src.services.deadline import Deadline, current_deadline, deadline_scope, remaining_time
+from src.services.http import RetryError, RetryPolicy
+from src.services.pipeline import PipelineDefinition, PipelineExecutor
+from src.services.single_flight import SingleFlight
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+def test_from_ms_and_nested_scopes():
+    """Testa a leitura de deadline_ms e que prazos aninhados nunca estendem o externo."""
+    assert Deadline.from_ms(None, 0) is None
+    assert 0.9 < Deadline.from_ms("1000").remaining() <= 1.0
+    assert 4.9 < Deadline.from_ms("", 5000).remaining() <= 5.0
+    for value in ("abc", "0", "-5", "nan"):
+        with pytest.raises(ValueError):
+            Deadline.from_ms(value)
+
+    short, long = Deadline.after(1.0), Deadline.after(60.0)
+    assert remaining_time(10.0) == 10.0
+    with deadline_scope(short):
+        with deadline_scope(long) as effective:
+            assert effective is short
+            assert remaining_time(10.0) <= 1.0
+        assert current_deadline() is short
+    assert current_deadline() is None
+
+def test_retry_policy_respects_request_deadline():
+    """Testa se as tentativas recebem o tempo restante do prazo e param quando a espera não cabe nele."""
+    attempt_func = MagicMock(return_value=_response(503, {'Retry-After': '5'}))
+    policy = RetryPolicy(max_attempts=5, max_delay=60.0, deadline=120.0)
+
+    with deadline_scope(Deadline.after(2.0)):
+        with pytest.raises(RetryError):
+            policy.call(attempt_func)
+
+    assert attempt_func.call_count == 1
+    assert attempt_func.call_args[0][1] <= 2.0
+
+    with deadline_scope(Deadline.after(0.0)):
+        with pytest.raises(RetryError):
+            policy.call(attempt_func)
+    assert attempt_func.call_count == 1
+
+def test_single_flight_waiter_gives_up_at_timeout():
+    """Testa se quem aguarda uma execução em andamento desiste no timeout sem afetá-la."""
+    flights = SingleFlight("teste")
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "ok"
+
+    leader = threading.Thread(target=lambda: flights.do("k", slow))
+    leader.start()
+    started.wait(5)
+
+    with pytest.raises(TimeoutError):
+        flights.do("k", slow, timeout=0.05)
+
+    release.set()
+    leader.join(5)
+    assert flights.stats()["waiting"] == 0
+
+class SlowFetcher(BaseDataFetcherAgent):
+    release = threading.Event()
+
+    def __init__(self):
+        super().__init__("Busca", "Busca lenta")
+
+    def fetch_data(self, source, use_cache=True):
+        SlowFetcher.release.wait(5)
+        return "pagina"
+
+class RecordingProcessor(BaseDataProcessorAgent):
+    calls = []
+
+    def __init__(self):
+        super().__init__("Processamento", "Processamento de teste")
+
+    def process_data(self, data):
+        RecordingProcessor.calls.append(current_deadline())
+        return [{"titulo": "A", "preco": "R$ 1,00"}]
+
+class FakeFactory:
+    def __init__(self, agents):
+        self.agents = agents
+
+    def create_agent(self, agent_type, **kwargs):
+        return self.agents[agent_type]() if agent_type in self.agents else None
+
+def test_pipeline_abandons_stages_after_deadline():
+    """Testa se o pipeline termina no prazo sem iniciar as etapas seguintes."""
+    SlowFetcher.release.clear()
+    RecordingProcessor.calls = []
+    definition = PipelineDefinition.from_dict({"id": "prazo", "stages": [
+        {"id": "fetch", "kind": "fetch", "agent": "lenta"},
+        {"id": "process", "agent": "registro", "inputs": ["fetch"]}
+    ]})
+    executor = PipelineExecutor(definition, AgentPool(FakeFactory({"lenta": SlowFetcher, "registro": RecordingProcessor})))
+
+    started = time.monotonic()
+    result = executor.run("http://x", deadline=Deadline.after(0.1))
+    SlowFetcher.release.set()
+
+    assert time.monotonic() - started < 2
+    assert "Prazo esgotado" in result.error
+    assert "fetch" in result.error
+    assert RecordingProcessor.calls == []
+
+def test_pipeline_stages_see_request_deadline():
+    """Testa se as etapas executadas em outras threads recebem o prazo da requisição."""
+    SlowFetcher.release.set()
+    RecordingProcessor.calls = []
+    definition = PipelineDefinition.from_dict({"id": "prazo_ok", "stages": [
+        {"id": "fetch", "kind": "fetch", "agent": "lenta"},
+        {"id": "process", "agent": "registro", "inputs": ["fetch"]}
+    ]})
+    deadline = Deadline.after(30.0)
+
+    result = PipelineExecutor(
+        definition, AgentPool(FakeFactory({"lenta": SlowFetcher, "registro": RecordingProcessor}))
+    ).run("http://x", deadline=deadline)
+
+    assert result.error is None
+    assert RecordingProcessor.calls == [deadline]
+
+def test_fetch_data_route_deadline():
+    """Testa a validação de deadline_ms e a resposta 504 quando o prazo se esgota."""
+    client = create_app('testing').test_client()
+
+    assert client.get('/fetch-data?deadline_ms=abc').status_code == 400
+
+    def expire(*args, deadline=None, **kwargs):
+        time.sleep(deadline.remaining())
+        return ProductsResult([])
+
+    with patch.object(AgentOrchestrator, 'fetch_products', side_effect=expire) as mock_fetch:
+        response = client.get('/fetch-data?deadline_ms=20')
+
+    assert response.status_code == 504
+    assert response.get_json()["success"] is False
+    assert mock_fetch.call_args.kwargs["deadline"] is not None
@@ -0,0 +1,241 @@
+"""
+Testes para a degradação controlada quando o formatador falha ou excede o orçamento.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.app import create_app
+from src.config.settings import active_config
+from src.models.product import Product
+from src.services.agent_orchestrator import QUALITY_DEGRADED, QUALITY_FULL, AgentOrchestrator, ProductsResult
+from src.services.agents.base import BaseDataFetcherAgent, BaseDataProcessorAgent
+from src.services.agents.interfaces import IncompleteResultError, IncrementalDataProcessorAgentInterface
+from src.services.agents.registry import AgentRegistry
+from src.services.pipeline import PipelineDefinition
+
+RECORDS = [{"titulo": "Produto A", "preco": "R$ 10,00"}, {"titulo": "Produto B", "preco": "R$ 20,50"}]
+
+class RecordsFetcher(BaseDataFetcherAgent):
+    def __init__(self):
+        super().__init__("Busca", "Busca de teste")
+
+    def fetch_data(self, source, use_cache=True):
+        return "pagina"
+
+class RecordsProcessor(BaseDataProcessorAgent):
+    def __init__(self):
+        super().__init__("Processamento", "Processamento de teste")
+
+    def process_data(self, data):
+        return [dict(record) for record in RECORDS]
+
+class SlowFormatter(BaseDataProcessorAgent):
+    release = threading.Event()
+
+    def __init__(self):
+        super().__init__("Formatação", "Formatação lenta")
+
+    def process_data(self, data):
+        SlowFormatter.release.wait(5)
+        return [{"titulo": "Formatado", "preco": 1.0}]
+
+class FastFormatter(BaseDataProcessorAgent):
+    def __init__(self):
+        super().__init__("Formatação", "Formatação rápida")
+
+    def process_data(self, data):
+        return [{"titulo": "Formatado", "preco": 1.0}]
+
+class IncrementalFormatter(BaseDataProcessorAgent, IncrementalDataProcessorAgentInterface):
+    def __init__(self):
+        super().__init__("Formatação", "Formatação incremental")
+
+    def process_data(self, data):
+        raise AssertionError("a resposta não deveria ser materializada")
+
+    def process_data_iter(self, data):
+        yield {"titulo": "Incremental", "preco": 2.0}
+
+class PartialFormatter(BaseDataProcessorAgent, IncrementalDataProcessorAgentInterface):
+    def __init__(self):
+        super().__init__("Formatação", "Formatação com parte perdida")
+
+    def process_data(self, data):
+        return None
+
+    def process_data_iter(self, data):
+        yield {"titulo": "Parte 1", "preco": 2.0}
+        raise IncompleteResultError("a parte 2 de 2 não pôde ser formatada")
+
+class FailingFormatter(BaseDataProcessorAgent):
+    def __init__(self):
+        super().__init__("Formatação", "Formatação com falha")
+
+    def process_data(self, data):
+        return None
+
+def _register():
+    registry = AgentRegistry()
+    registry.register_agent_class("deg_fetcher", RecordsFetcher)
+    registry.register_agent_class("deg_processor", RecordsProcessor)
+    registry.register_agent_class("deg_slow_formatter", SlowFormatter)
+    registry.register_agent_class("deg_failing_formatter", FailingFormatter)
+    registry.register_agent_class("deg_fast_formatter", FastFormatter)
+    registry.register_agent_class("deg_incremental_formatter", IncrementalFormatter)
+    registry.register_agent_class("deg_partial_formatter", PartialFormatter)
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_slow_formatter_degrades_and_finishes_in_background():
+    """Testa a entrega da saída do processador quando o formatador excede o orçamento."""
+    _register()
+    SlowFormatter.release.clear()
+    before = AgentOrchestrator.degradation_stats()
+
+    with patch.object(active_config, 'FORMATTER_BUDGET', 0.1):
+        started = time.monotonic()
+        result = AgentOrchestrator().fetch_products(
+            "https://www.amazon.com.br/lento", "deg_fetcher", "deg_processor", "deg_slow_formatter"
+        )
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 2
+    assert result.quality == QUALITY_DEGRADED
+    assert result.stage_reached == "process"
+    assert [product.price for product in result.products] == [10.0, 20.5]
+
+    SlowFormatter.release.set()
+    assert _wait_for(lambda: AgentOrchestrator.degradation_stats()["background_refreshed"]
+                     > before["background_refreshed"])
+    assert AgentOrchestrator.degradation_stats()["budget_exceeded"] == before["budget_exceeded"] + 1
+
+def test_budget_starts_when_formatting_starts():
+    """Testa se a espera por uma vaga no pool de formatação não consome o orçamento."""
+    _register()
+    formatting = ThreadPoolExecutor(max_workers=1)
+    formatting.submit(time.sleep, 0.3)
+
+    with patch.object(active_config, 'FORMATTER_BUDGET', 0.1), \
+            patch.object(AgentOrchestrator, '_formatting', formatting):
+        result = AgentOrchestrator().fetch_products(
+            "https://www.amazon.com.br/fila", "deg_fetcher", "deg_processor", "deg_fast_formatter"
+        )
+    formatting.shutdown()
+
+    assert result.quality == QUALITY_FULL
+    assert [product.name for product in result.products] == ["Formatado"]
+
+def test_background_format_dropped_when_queue_is_full():
+    """Testa o descarte da formatação em segundo plano quando o seu pool está cheio."""
+    _register()
+    SlowFormatter.release.clear()
+    before = AgentOrchestrator.degradation_stats()
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+
+    with patch.object(active_config, 'FORMATTER_BUDGET', 0.1), \
+            patch.object(AgentOrchestrator, '_background_slots', slots):
+        result = AgentOrchestrator().fetch_products(
+            "https://www.amazon.com.br/cheia", "deg_fetcher", "deg_processor", "deg_slow_formatter"
+        )
+    SlowFormatter.release.set()
+
+    assert result.quality == QUALITY_DEGRADED
+    stats = AgentOrchestrator.degradation_stats()
+    assert stats["background_dropped"] == before["background_dropped"] + 1
+    assert stats["background_refreshed"] == before["background_refreshed"]
+
+def test_degradation_uses_incremental_formatter():
+    """Testa se a formatação com orçamento usa a leitura incremental do formatador."""
+    _register()
+
+    with patch.object(active_config, 'STREAM_EXTRACTION_ENABLED', True):
+        result = AgentOrchestrator().fetch_products(
+            "https://www.amazon.com.br/incremental", "deg_fetcher", "deg_processor", "deg_incremental_formatter"
+        )
+
+    assert result.quality == QUALITY_FULL
+    assert [product.name for product in result.products] == ["Incremental"]
+
+def test_failing_formatter_degrades():
+    """Testa a degradação quando o formatador falha (ex.: disjuntor aberto)."""
+    _register()
+
+    result = AgentOrchestrator().fetch_products(
+        "https://www.amazon.com.br/falha", "deg_fetcher", "deg_processor", "deg_failing_formatter"
+    )
+
+    assert result.quality == QUALITY_DEGRADED
+    assert result.reason == "Falha na formatação"
+    assert [product.name for product in result.products] == ["Produto A", "Produto B"]
+
+def test_incomplete_formatting_is_not_delivered_as_full():
+    """Testa se a falha de uma parte da formatação leva à degradação, e não a uma lista truncada."""
+    _register()
+
+    with patch.object(active_config, 'STREAM_EXTRACTION_ENABLED', True):
+        result = AgentOrchestrator().fetch_products(
+            "https://www.amazon.com.br/parcial", "deg_fetcher", "deg_processor", "deg_partial_formatter"
+        )
+        assert result.quality == QUALITY_DEGRADED
+        assert result.reason == "Falha na formatação"
+        assert [product.name for product in result.products] == ["Produto A", "Produto B"]
+
+        with patch.object(active_config, 'DEGRADATION_ENABLED', False):
+            result = AgentOrchestrator().fetch_products(
+                "https://www.amazon.com.br/parcial-sem-degradacao", "deg_fetcher", "deg_processor",
+                "deg_partial_formatter"
+            )
+        assert result.products == []
+
+def test_degradation_can_be_disabled():
+    """Testa que, sem degradação, a falha do formatador não devolve produtos."""
+    _register()
+
+    with patch.object(active_config, 'DEGRADATION_ENABLED', False):
+        result = AgentOrchestrator().fetch_products(
+            "https://www.amazon.com.br/falha", "deg_fetcher", "deg_processor", "deg_failing_formatter"
+        )
+
+    assert result.products == []
+
+def test_pipeline_degrades_to_last_completed_stage():
+    """Testa a degradação de um pipeline declarativo para a saída da etapa concluída mais avançada."""
+    _register()
+    orchestrator = AgentOrchestrator()
+    orchestrator.pipelines["degradado"] = PipelineDefinition.from_dict({"id": "degradado", "stages": [
+        {"id": "fetch", "kind": "fetch", "agent": "deg_fetcher"},
+        {"id": "process", "agent": "deg_processor", "inputs": ["fetch"]},
+        {"id": "format", "agent": "deg_failing_formatter", "inputs": ["process"]}
+    ]})
+
+    result = orchestrator.fetch_products("https://www.amazon.com.br/pipeline", pipeline_id="degradado")
+
+    assert result.quality == QUALITY_DEGRADED
+    assert result.stage_reached == "process"
+    assert len(result.products) == 2
+
+def test_fetch_data_reports_quality():
+    """Testa os campos de qualidade na resposta de /fetch-data."""
+    client = create_app('testing').test_client()
+    degraded = ProductsResult([Product(name="Produto", price=10.0)], QUALITY_DEGRADED, "process", "Falha na formatação")
+
+    with patch.object(AgentOrchestrator, 'fetch_products', return_value=degraded):
+        data = client.get('/fetch-data').get_json()
+    assert data["success"] is True
+    assert data["quality"] == QUALITY_DEGRADED
+    assert data["stage_reached"] == "process"
+    assert data["degraded_reason"] == "Falha na formatação"
+
+    with patch.object(AgentOrchestrator, 'fetch_products', return_value=ProductsResult(degraded.products, stage_reached="format")):
+        data = client.get('/fetch-data').get_json()
+    assert data["quality"] == QUALITY_FULL
+    assert "degraded_reason" not in data
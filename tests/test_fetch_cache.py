@@ -0,0 +1,87 @@
+"""
+Testes para o cache da etapa de busca.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.config.settings import active_config
+from src.services.agents.langflow.fetcher import LangflowFetcherAgent
+from src.services.cache import DiskCache, FetchCache, MemoryLRUCache, TieredCache, normalize_source_url
+from src.services.cache.fetch_cache import category_for_url, parse_category_ttls
+
+def test_normalize_source_url():
+    """Testa a normalização de URLs equivalentes para a mesma chave."""
+    expected = "https://www.amazon.com.br/gp/bestsellers/electronics"
+
+    assert normalize_source_url("https://www.amazon.com.br/gp/bestsellers/electronics/ref=zg_bs_nav_0") == expected
+    assert normalize_source_url("https://r.jina.ai/https://www.amazon.com.br/gp/bestsellers/electronics/?ref_=nav") == expected
+    assert normalize_source_url("www.Amazon.com.br/gp/bestsellers/electronics#topo") == expected
+    assert normalize_source_url("https://www.amazon.com.br/s?k=tv&ref=x&page=2") == "https://www.amazon.com.br/s?k=tv&page=2"
+
+def test_category_ttls():
+    """Testa a identificação da categoria e a leitura dos TTLs."""
+    assert category_for_url("https://www.amazon.com.br/gp/bestsellers/books") == "books"
+    assert category_for_url("https://www.amazon.com.br/gp/bestsellers") == "default"
+    assert parse_category_ttls("books=3600, electronics=60,invalido") == {"books": 3600.0, "electronics": 60.0}
+
+def test_memory_lru_eviction_and_expiry():
+    """Testa a remoção por LRU e a expiração das entradas em memória."""
+    cache = MemoryLRUCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+
+def test_tiered_cache_survives_memory_loss(tmp_path):
+    """Testa se o cache em camadas recupera entradas do disco."""
+    disk = DiskCache(str(tmp_path))
+    cache = TieredCache(MemoryLRUCache(), disk)
+    cache.set("chave", {"produtos": [1, 2]}, ttl=60)
+
+    restarted = TieredCache(MemoryLRUCache(), DiskCache(str(tmp_path)))
+    assert restarted.get("chave") == {"produtos": [1, 2]}
+
+def test_fetch_cache_counters():
+    """Testa os contadores de acertos e falhas do cache de busca."""
+    cache = FetchCache()
+    cache._configure(MemoryLRUCache(), enabled=True, default_ttl=60, category_ttls={"books": 0})
+
+    assert cache.get("https://www.amazon.com.br/gp/bestsellers/toys") is None
+    cache.set("https://r.jina.ai/https://www.amazon.com.br/gp/bestsellers/toys/ref=zg", "resposta")
+    assert cache.get("https://www.amazon.com.br/gp/bestsellers/toys") == "resposta"
+
+    # Categorias com TTL zero não são armazenadas
+    cache.set("https://www.amazon.com.br/gp/bestsellers/books", "resposta")
+    assert cache.get("https://www.amazon.com.br/gp/bestsellers/books") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["stores"] == 1
+
+def test_fetcher_cache_is_separated_by_flow():
+    """Testa se fetchers de fluxos (ou versões de fluxo) diferentes não compartilham respostas."""
+    FetchCache()._configure(MemoryLRUCache(), enabled=True, default_ttl=60, category_ttls={})
+    source = "https://www.amazon.com.br/gp/bestsellers/toys"
+    first = LangflowFetcherAgent(api_url="http://langflow:7860/api/v1/run/busca-1")
+    second = LangflowFetcherAgent(api_url="http://langflow:7860/api/v1/run/busca-2")
+    with patch.object(active_config, 'LANGFLOW_FETCHER_FLOW_VERSION', 'v2'):
+        updated = LangflowFetcherAgent(api_url="http://langflow:7860/api/v1/run/busca-1")
+
+    with patch.object(first, '_make_request', return_value={"fluxo": 1}), \
+            patch.object(second, '_make_request', return_value={"fluxo": 2}), \
+            patch.object(updated, '_make_request', return_value={"fluxo": 3}):
+        assert first.fetch_data(source) == {"fluxo": 1}
+        assert second.fetch_data(source) == {"fluxo": 2}
+        assert updated.fetch_data(source) == {"fluxo": 3}
+        assert first.fetch_data(source) == {"fluxo": 1}
+        assert first._make_request.call_count == 1
@@ -0,0 +1,200 @@
+"""
+Testes para a duplicação das chamadas lentas ao Langflow (hedging).
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.services.agents.langflow.client import LangflowClient
+from src.services.http import (
+    Hedger, HedgingRegistry, HttpSessionPool, LatencyTracker, PoolConfig, RetryBudget, RetryPolicy
+)
+from src.services.http.hedging import HedgeWorkers, parse_alternates
+from tests.conftest import send_json
+
+FLUXO = "http://langflow:7860/api/v1/run/fluxo"
+ALTERNATIVO = "http://langflow-2:7860/api/v1/run/fluxo"
+
+def _hedger(ratio=1.0, **options):
+    hedger = Hedger("fluxo", RetryBudget(ratio=ratio, min_per_second=0.0), min_samples=1, min_delay=0.05, **options)
+    hedger.latencies.record(0.05)
+    return hedger
+
+def _response(status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+def test_percentile():
+    """Testa o percentil das latências recentes e o limite de amostras."""
+    tracker = LatencyTracker(max_samples=10)
+    assert tracker.percentile(0.95) is None
+
+    for value in range(1, 21):
+        tracker.record(float(value))
+    assert len(tracker) == 10
+    assert tracker.percentile(0.5) == 15.0
+    assert tracker.percentile(0.95) == 20.0
+
+def test_no_hedge_before_enough_samples():
+    """Testa se a chamada não é duplicada enquanto não há latências suficientes."""
+    hedger = Hedger("fluxo", RetryBudget(min_per_second=0.0), min_samples=5)
+    send = MagicMock(return_value="resposta")
+
+    assert hedger.call(send, 5, accept=lambda r: True, discard=MagicMock()) == "resposta"
+    send.assert_called_once_with(None, 5)
+    assert hedger.stats()["hedged"] == 0
+
+def test_hedge_wins_and_loser_is_discarded():
+    """Testa se a cópia vence a chamada lenta e a resposta da perdedora é descartada ao chegar."""
+    hedger = _hedger(alternate=ALTERNATIVO)
+    release = threading.Event()
+    discard = MagicMock()
+
+    def send(url, timeout):
+        if url is None:
+            release.wait(5)
+            return "lenta"
+        return "cópia"
+
+    assert hedger.call(send, 5, accept=lambda r: True, discard=discard) == "cópia"
+    release.set()
+    for _ in range(100):
+        if discard.called:
+            break
+        time.sleep(0.01)
+
+    discard.assert_called_once_with("lenta")
+    stats = hedger.stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["cancelled"] == 1
+    assert stats["hedge_win_rate"] == 1.0
+
+def test_rejected_answer_waits_for_the_other():
+    """Testa se uma resposta não aceita (ex.: 503) não encerra a chamada enquanto a outra está pendente."""
+    hedger = _hedger()
+    calls = []
+
+    def send(url, timeout):
+        calls.append(url)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            return "ok"
+        return "erro"
+
+    assert hedger.call(send, 5, accept=lambda r: r == "ok", discard=MagicMock()) == "ok"
+    assert hedger.stats()["primary_wins"] == 1
+
+def test_hedge_rate_is_capped():
+    """Testa se o orçamento limita as cópias por chamada."""
+    hedger = _hedger(ratio=0.5)
+    hedger.delay = lambda: 0.05
+
+    def send(url, timeout):
+        time.sleep(0.15)
+        return "ok"
+
+    for _ in range(4):
+        hedger.call(send, 5, accept=lambda r: True, discard=MagicMock())
+
+    stats = hedger.stats()
+    assert stats["hedged"] == 2
+    assert stats["denied"] == 2
+
+def test_refused_hedge_keeps_budget():
+    """Testa se a cópia recusada pelo destino não consome o orçamento e se a reserva é devolvida."""
+    hedger = _hedger(ratio=0.5)
+    hedger.delay = lambda: 0.05
+    release = MagicMock()
+
+    def send(url, timeout):
+        time.sleep(0.15)
+        return "ok"
+
+    hedger.call(send, 5, accept=lambda r: True, discard=MagicMock(), can_hedge=lambda url: False)
+    assert hedger.budget.stats()["retries"] == 0
+
+    hedger.budget.try_acquire = lambda: False
+    hedger.call(send, 5, accept=lambda r: True, discard=MagicMock(), release=release)
+    release.assert_called_once_with(None)
+    assert hedger.stats()["denied"] == 2
+
+def test_no_hedge_without_free_workers():
+    """Testa se, sem threads livres, a chamada é feita na thread do chamador e sem cópia."""
+    hedger = _hedger(workers=HedgeWorkers(1))
+    assert hedger.workers.reserve()
+    send = MagicMock(return_value="ok")
+
+    assert hedger.call(send, 5, accept=lambda r: True, discard=MagicMock()) == "ok"
+    hedger.workers.cancel()
+    assert hedger.stats()["saturated"] == 1
+    assert hedger.stats()["hedged"] == 0
+
+def test_parse_alternates():
+    """Testa a leitura dos endpoints alternativos."""
+    assert parse_alternates(f"{FLUXO}/={ALTERNATIVO}; inválido") == {FLUXO: ALTERNATIVO}
+    assert parse_alternates("") == {}
+
+def test_client_hedges_slow_flow():
+    """Testa se o cliente Langflow envia a cópia ao endpoint alternativo e entrega a primeira resposta."""
+    registry = HedgingRegistry()
+    registry.configure(enabled=True, max_ratio=1.0, alternates={FLUXO: ALTERNATIVO},
+                       percentile=0.95, min_samples=1, min_delay=0.05, max_samples=10)
+    try:
+        client = LangflowClient(FLUXO, timeout=5, retry_policy=RetryPolicy(max_attempts=1))
+        registry.get(FLUXO).latencies.record(0.05)
+        slow, fast = _response(), _response()
+
+        def request(method, url, **kwargs):
+            if url == FLUXO:
+                time.sleep(0.3)
+                return slow
+            return fast
+
+        session = MagicMock()
+        session.request.side_effect = request
+        with patch.object(client.session_pool, 'get_session', return_value=session), \
+                patch.object(client.rate_limiter, 'acquire', return_value=0.0):
+            assert client.post({}, {}) is fast
+            time.sleep(0.4)
+
+        slow.close.assert_called_once()
+        endpoint = registry.stats()["endpoints"][FLUXO]
+        assert endpoint["hedge_wins"] == 1
+        assert endpoint["alternate"] == ALTERNATIVO
+    finally:
+        HedgingRegistry._instance = None
+
+def test_losing_call_releases_its_connection(local_server):
+    """Testa se a chamada perdedora devolve a conexão ao pool sem esperar o corpo da resposta."""
+    def respond(handler, number):
+        if number > 1:
+            send_json(handler, 200)
+            return
+        time.sleep(0.3)
+        handler.send_response(200)
+        handler.send_header("Content-Length", "100")
+        handler.end_headers()
+        handler.wfile.flush()
+        time.sleep(3)
+
+    url = local_server(respond) + "/api/v1/run/fluxo"
+    HttpSessionPool().configure_endpoint(url, PoolConfig(2, 2))
+    registry = HedgingRegistry()
+    registry.configure(enabled=True, max_ratio=1.0, percentile=0.95, min_samples=1,
+                       min_delay=0.05, max_samples=10)
+    try:
+        client = LangflowClient(url, timeout=5, retry_policy=RetryPolicy(max_attempts=1))
+        registry.get(url).latencies.record(0.05)
+        assert client.post({}, {}).json() == {"ok": True}
+
+        connections = HttpSessionPool().get_session(url).get_adapter(url).poolmanager.connection_from_url(url).pool
+        for _ in range(100):
+            if connections.qsize() == 2:
+                break
+            time.sleep(0.01)
+        assert connections.qsize() == 2
+        assert registry.get(url).stats()["cancelled"] == 1
+    finally:
+        HedgingRegistry._instance = None
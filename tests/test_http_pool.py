@@ -0,0 +1,89 @@
+"""
+Testes para o pool de sessões HTTP.
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from src.services.agents.langflow.client import LangflowClient
+from src.services.http import HttpSessionPool, PoolConfig, RetryPolicy
+from src.services.deadline import Deadline, deadline_scope
+from src.services.http.pool import endpoint_key, parse_pool_overrides
+from tests.conftest import send_json
+
+def test_endpoint_key():
+    """Testa a extração da chave do endpoint a partir da URL."""
+    assert endpoint_key("http://LocalHost:7860/api/v1/run/abc") == "http://localhost:7860"
+    assert endpoint_key("https://r.jina.ai/https://www.amazon.com.br") == "https://r.jina.ai"
+
+def test_parse_pool_overrides():
+    """Testa a leitura das configurações de pool por endpoint."""
+    overrides = parse_pool_overrides("http://localhost:7860=10:50:false; https://r.jina.ai=4;invalido")
+
+    assert overrides["http://localhost:7860"] == PoolConfig(10, 50, False)
+    assert overrides["https://r.jina.ai"] == PoolConfig(4, 4, True)
+    assert len(overrides) == 2
+
+def test_session_reuse_per_endpoint():
+    """Testa se a mesma sessão é reutilizada para URLs do mesmo endpoint."""
+    pool = HttpSessionPool()
+
+    first = pool.get_session("http://pool-test:7860/api/v1/run/fluxo-1")
+    second = pool.get_session("http://pool-test:7860/api/v1/run/fluxo-2")
+    other = pool.get_session("http://outro-host:7860/api/v1/run/fluxo-1")
+
+    assert first is second
+    assert first is not other
+
+    pool.close_all()
+    assert pool.get_session("http://pool-test:7860/api/v1/run/fluxo-1") is not first
+    pool.close_all()
+
+def test_configure_endpoint_applies_pool_size():
+    """Testa se a configuração por endpoint dimensiona o adaptador de conexões."""
+    pool = HttpSessionPool()
+    pool.configure_endpoint("http://pool-config:7860", PoolConfig(2, 7, False))
+
+    session = pool.get_session("http://pool-config:7860/api/v1/run/fluxo")
+    adapter = session.get_adapter("http://pool-config:7860/")
+
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+    assert session.headers["Connection"] == "close"
+    pool.close_all()
+
+def test_streamed_server_error_releases_connection(local_server):
+    """Testa se um 5xx em streaming com as tentativas esgotadas devolve a conexão ao pool."""
+    url = local_server(lambda handler, number: send_json(handler, 503 if number == 1 else 200)) + "/api/v1/run/fluxo"
+    HttpSessionPool().configure_endpoint(url, PoolConfig(1, 1))
+    client = LangflowClient(url, timeout=2, retry_policy=RetryPolicy(max_attempts=1))
+
+    assert client.open_response({}, {}) is None
+
+    responses = []
+    thread = threading.Thread(target=lambda: responses.append(client.open_response({}, {})), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert responses[0].status_code == 200
+    responses[0].close()
+
+def test_pool_wait_is_bounded(local_server):
+    """Testa se a espera por uma conexão livre respeita o timeout e o prazo da requisição."""
+    url = local_server(lambda handler, number: send_json(handler, 200)) + "/api/v1/run/fluxo"
+    pool = HttpSessionPool()
+    pool.configure_endpoint(url, PoolConfig(1, 1))
+    session = pool.get_session(url)
+    held = session.post(url, json={}, timeout=2, stream=True)
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.post(url, json={}, timeout=0.2)
+    with deadline_scope(Deadline.after(0.2)), pytest.raises(requests.exceptions.ConnectionError):
+        session.post(url, json={}, timeout=30)
+    assert time.monotonic() - started < 2
+
+    held.close()
+    assert session.post(url, json={}, timeout=2).status_code == 200
@@ -0,0 +1,95 @@
+"""
+Testes para a leitura incremental das respostas do Langflow.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+from src.models.product import Product
+from src.services.agents.langflow.extraction import FORMATTER_STREAM_PATHS, stream_path
+from src.services.agents.langflow.formatter import LangflowFormatterAgent
+from src.services.agents.langflow.processor import LangflowProcessorAgent
+from src.utils.json_stream import JsonPathStreamReader, iter_json_path_items
+
+PRODUCTS = [
+    {"titulo": "Fone \"Pro\" 😀", "preco": 199.9, "descricao": "linha 1\nlinha 2 \\ [fim]"},
+    {"titulo": "Teclado {mecânico}", "preco": 349.0, "tags": ["a", {"b": 1}]}
+]
+
+def _envelope(products):
+    """Monta uma resposta do Langflow com os produtos em uma string JSON aninhada."""
+    inner = "```json\n" + json.dumps(products) + "\n```"
+    return json.dumps({
+        "session_id": "s",
+        "outputs": [{
+            "inputs": {"text": '[{"titulo": "entrada"}]'},
+            "outputs": [{"results": {"text": {"data": {"text": inner}}}}]
+        }]
+    })
+
+def test_reader_extracts_nested_string_across_any_chunking():
+    """Testa a leitura dos produtos de uma string aninhada, com escapes divididos entre pedaços."""
+    document = _envelope(PRODUCTS)
+
+    for size in (1, 2, 3, 7, 64, len(document)):
+        chunks = [document[i:i + size] for i in range(0, len(document), size)]
+        assert list(iter_json_path_items(chunks, FORMATTER_STREAM_PATHS)) == PRODUCTS
+
+def test_reader_extracts_array_target_and_stops_early():
+    """Testa a leitura de um array como alvo e a parada ao fim do array."""
+    document = json.dumps({"outputs": [{"outputs": [{"data": [PRODUCTS, "resto"]}]}]})
+    reader = JsonPathStreamReader([stream_path("outputs[0].outputs[0].data[0]")])
+
+    items = []
+    for i in range(0, len(document), 5):
+        items += reader.feed(document[i:i + 5])
+
+    assert items == PRODUCTS
+    assert reader.done
+    assert reader.matched_path == ("outputs", 0, "outputs", 0, "data", 0)
+
+def test_formatter_reads_response_incrementally():
+    """Testa se o formatador extrai os produtos do corpo lido em pedaços."""
+    body = _envelope(PRODUCTS).encode("utf-8")
+    response = MagicMock()
+    response.encoding = None
+    response.iter_content.return_value = iter([body[i:i + 3] for i in range(0, len(body), 3)])
+
+    formatter = LangflowFormatterAgent(api_url="http://langflow:7860/api/v1/run/formatador")
+    with patch.object(formatter.client, 'open_response', return_value=response), \
+            patch.object(formatter, 'process_data') as mock_process_data:
+        products = list(Product.iter_from_dicts(formatter.process_data_iter('[{"texto": "bruto"}]')))
+
+    assert [product.name for product in products] == ["Fone \"Pro\" 😀", "Teclado {mecânico}"]
+    mock_process_data.assert_not_called()
+
+def test_formatter_falls_back_when_no_path_matches():
+    """Testa o uso do extrator completo na resposta já recebida, sem nova chamada ao fluxo."""
+    body = json.dumps({"outro": PRODUCTS}).encode("utf-8")
+    response = MagicMock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = iter([body[i:i + 7] for i in range(0, len(body), 7)])
+
+    # Fluxo próprio: o extrator lembra o caminho que casou por fluxo
+    formatter = LangflowFormatterAgent(api_url="http://langflow:7860/api/v1/run/formatador-curinga")
+    with patch.object(formatter.client, 'open_response', return_value=response) as mock_open, \
+            patch.object(formatter, 'process_data') as mock_process_data:
+        assert list(formatter.process_data_iter('[{"texto": "bruto"}]')) == PRODUCTS
+
+    mock_open.assert_called_once()
+    mock_process_data.assert_not_called()
+
+def test_stream_paths_cover_products_key():
+    """Testa a leitura incremental de produtos sob "data[0].products"."""
+    document = json.dumps({"outputs": [{"outputs": [{"data": [{"products": PRODUCTS}]}]}]})
+    assert list(iter_json_path_items([document], FORMATTER_STREAM_PATHS)) == PRODUCTS
+
+def test_processor_reads_chunks_and_decoded_responses():
+    """Testa a leitura incremental do processador a partir de pedaços e de respostas decodificadas."""
+    text = json.dumps(PRODUCTS)
+    envelope = {"outputs": [{"outputs": [{"results": {"text": {"text": text}}}]}]}
+    document = json.dumps(envelope)
+    processor = LangflowProcessorAgent()
+
+    chunks = (document[i:i + 4] for i in range(0, len(document), 4))
+    assert list(processor.process_data_iter(chunks)) == PRODUCTS
+    assert list(processor.process_data_iter(envelope)) == PRODUCTS
@@ -0,0 +1,143 @@
+"""
+Testes para a execução de pipelines em segundo plano (jobs).
+"""
+import threading
+import time
+from unittest.mock import patch
+
+from src.app import create_app
+from src.models.product import Product
+from src.services.agent_orchestrator import AgentOrchestrator, ProductsResult
+from src.services.jobs import JOB_DONE, JOB_FAILED, JOB_QUEUED, JobError, JobManager, JobStore
+
+def _wait(manager, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.finished:
+            return job
+        manager.wait_for_change(manager.version, 0.05)
+    raise AssertionError(f"Job {job_id} não terminou")
+
+def _manager(runner, **kwargs):
+    return JobManager(runner, key_func=lambda params: params["source"], store=JobStore(":memory:"), **kwargs)
+
+def test_store_hides_expired_results():
+    """Testa se resultados expirados deixam de ser retornados e são removidos."""
+    store = JobStore(":memory:")
+    store.create("a", "k", {"source": "x"})
+    store.mark_finished("a", result={"ok": True}, ttl=-1)
+
+    assert store.get("a") is None
+    assert store.find_reusable("k") is None
+    assert store.purge_expired() == 1
+
+def test_in_flight_and_finished_jobs_are_deduplicated():
+    """Testa se pedidos equivalentes compartilham o job em andamento e o resultado retido."""
+    release = threading.Event()
+    calls = []
+
+    def runner(params):
+        calls.append(params)
+        release.wait(5)
+        return {"source": params["source"]}
+
+    manager = _manager(runner)
+    first, deduplicated = manager.submit({"source": "http://x"})
+    second, shared = manager.submit({"source": "http://x"})
+    assert not deduplicated and shared
+    assert second.id == first.id
+
+    release.set()
+    job = _wait(manager, first.id)
+    assert job.status == JOB_DONE
+    assert job.to_dict()["result"] == {"source": "http://x"}
+
+    third, reused = manager.submit({"source": "http://x"})
+    assert reused and third.id == first.id
+    fourth, reused = manager.submit({"source": "http://x"}, reuse_results=False)
+    assert not reused
+    _wait(manager, fourth.id)
+
+    assert len(calls) == 2
+    assert manager.stats()["deduplicated"] == 2
+    manager.shutdown()
+
+def test_job_error_marks_job_failed():
+    """Testa se JobError encerra o job com a mensagem informada e não é reaproveitado."""
+    def runner(params):
+        raise JobError("Sem produtos")
+
+    manager = _manager(runner)
+    job, _ = manager.submit({"source": "http://x"})
+    job = _wait(manager, job.id)
+
+    assert job.status == JOB_FAILED
+    assert job.error == "Sem produtos"
+    assert "result" not in job.to_dict()
+    assert not manager.submit({"source": "http://x"})[1]
+    manager.shutdown()
+
+def test_interrupted_jobs_are_requeued(tmp_path):
+    """Testa se jobs de um processo encerrado voltam a ser executados quando a concessão expira."""
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    store.create("a", "k", {"source": "http://x"})
+    assert store.claim("a")
+    store.close()
+
+    manager = JobManager(lambda params: [params["source"]], key_func=lambda params: params["source"],
+                         store=JobStore(path, lease_ttl=0.1))
+    job = _wait(manager, "a")
+
+    assert job.status == JOB_DONE
+    assert job.result == ["http://x"]
+    assert manager.stats()["adopted"] == 1
+    manager.shutdown()
+
+def test_jobs_are_claimed_once_across_processes(tmp_path):
+    """Testa se processos que compartilham o banco não executam nem adotam o mesmo job ativo."""
+    path = str(tmp_path / "jobs.sqlite3")
+    first, second = JobStore(path), JobStore(path)
+    first.create("a", "k", {"source": "http://x"})
+
+    # O job de um processo ativo não é adotado; só o dono pode reivindicá-lo, e uma única vez
+    assert second.requeue_interrupted() == []
+    assert not second.claim("a")
+    assert first.claim("a")
+    assert not first.claim("a")
+    assert first.get("a").status == "running"
+
+    # Sem renovação, a concessão expira e o job passa a outro processo, uma única vez
+    expired = JobStore(path, lease_ttl=0)
+    assert [job.id for job in expired.requeue_interrupted()] == ["a"]
+    assert second.requeue_interrupted() == []
+    assert expired.claim("a")
+    first.mark_finished("a", result=["antigo"])
+    expired.mark_finished("a", result=["novo"])
+    assert expired.get("a").result == ["novo"]
+
+def test_job_routes():
+    """Testa o fluxo das rotas de jobs: criação, consulta e eventos."""
+    app = create_app('testing')
+    client = app.test_client()
+    products = [Product(name="Produto", price=10.0, rating=4.5)]
+
+    with patch.object(AgentOrchestrator, 'fetch_products', return_value=ProductsResult(products, stage_reached="format")):
+        response = client.post('/jobs', json={"source": "https://www.amazon.com.br/s?k=teste"})
+        assert response.status_code == 202
+        body = response.get_json()
+        job = _wait(app.extensions['job_manager'], body["job_id"])
+
+    assert job.status == JOB_DONE
+    data = client.get(body["status_url"]).get_json()
+    assert data["job"]["result"]["produtos"][0]["name"] == "Produto"
+
+    events = client.get(body["events_url"]).get_data(as_text=True)
+    assert "event: status" in events
+    assert "event: done" in events
+
+    assert client.post('/jobs', json={"source": "ftp://x"}).status_code == 400
+    assert client.post('/jobs', json={"source": "https://x", "pipeline": "nenhum"}).status_code == 400
+    assert client.get('/jobs/inexistente').status_code == 404
+    assert client.get('/stats').get_json()["jobs"]["submitted"] >= 1
@@ -0,0 +1,34 @@
+"""
+Testes para a decodificação única das respostas do Langflow.
+"""
+from unittest.mock import MagicMock, patch
+
+from src.services.agents.langflow.client import decode_json_response
+from src.services.agents.langflow.processor import LangflowProcessorAgent
+from src.utils import json_codec
+
+RESPONSE = {"outputs": [{"outputs": [{"results": {"text": {"text": [{"titulo": "Câmera"}]}}}]}]}
+
+def test_codec_roundtrip_and_preview():
+    """Testa a codificação compacta, a decodificação de bytes e a prévia para logs."""
+    encoded = json_codec.dumps({"titulo": "Câmera", "preco": 1.5})
+
+    assert encoded == '{"titulo":"Câmera","preco":1.5}'
+    assert json_codec.loads(encoded.encode('utf-8')) == {"titulo": "Câmera", "preco": 1.5}
+    assert json_codec.preview("é".encode('utf-8') * 3, 3) == "é�"
+
+def test_response_decoded_once_from_bytes():
+    """Testa se a resposta é decodificada dos bytes e o processador reaproveita o objeto."""
+    response = MagicMock(content=json_codec.dumps(RESPONSE).encode('utf-8'))
+
+    with patch.object(json_codec, 'loads', wraps=json_codec.loads) as mock_loads:
+        data = decode_json_response(response)
+        products = LangflowProcessorAgent().process_data(data)
+
+    assert mock_loads.call_count == 1
+    response.json.assert_not_called()
+    assert products == [{"titulo": "Câmera"}]
+
+def test_invalid_response_returns_none():
+    """Testa o tratamento de respostas que não são JSON."""
+    assert decode_json_response(MagicMock(content=b"<html>erro</html>")) is None
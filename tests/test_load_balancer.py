@@ -0,0 +1,121 @@
+"""
+Testes para o balanceamento entre réplicas dos fluxos do Langflow.
+"""
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.services.agents.langflow.client import LangflowClient
+from src.services.http import CircuitBreakerRegistry, EndpointPool, EndpointPoolRegistry, RetryPolicy
+from src.services.http.balancer import LEAST_OUTSTANDING, parse_endpoints
+
+REPLICA_A = "http://langflow-a:7860/api/v1/run/fluxo"
+REPLICA_B = "http://langflow-b:7860/api/v1/run/fluxo"
+
+def test_parse_endpoints():
+    """Testa a leitura de uma ou várias URLs equivalentes."""
+    assert parse_endpoints(REPLICA_A) == [REPLICA_A]
+    assert parse_endpoints(f"{REPLICA_A}, {REPLICA_B},{REPLICA_A}") == [REPLICA_A, REPLICA_B]
+    assert parse_endpoints(None) == []
+
+def test_least_outstanding():
+    """Testa se a réplica com menos requisições em andamento é escolhida."""
+    pool = EndpointPool([REPLICA_A, REPLICA_B], strategy=LEAST_OUTSTANDING)
+    pool.begin(REPLICA_A)
+
+    assert pool.select() == REPLICA_B
+    assert pool.select(exclude=[REPLICA_B]) == REPLICA_A
+    assert pool.stats()["endpoints"][REPLICA_A]["outstanding"] == 1
+
+@patch('src.services.http.balancer.time.monotonic')
+def test_ewma_prefers_faster_replica(mock_monotonic):
+    """Testa se a estratégia EWMA prefere a réplica com menor latência recente."""
+    pool = EndpointPool([REPLICA_A, REPLICA_B], ewma_decay=0.5)
+    for url, latency in ((REPLICA_A, 10.0), (REPLICA_B, 2.0)):
+        mock_monotonic.return_value = 100.0
+        started = pool.begin(url)
+        mock_monotonic.return_value = 100.0 + latency
+        pool.end(url, started, success=True)
+
+    assert pool.select() == REPLICA_B
+    assert pool.stats()["endpoints"][REPLICA_B]["ewma_latency"] == 2.0
+
+@patch('src.services.http.balancer.time.monotonic')
+def test_ewma_ignores_fast_failures_and_weighs_new_replicas(mock_monotonic):
+    """Testa se falhas rápidas não baixam a latência média e se réplicas sem medida não atraem toda a carga."""
+    pool = EndpointPool([REPLICA_A, REPLICA_B], eject_failures=0)
+    mock_monotonic.return_value = 100.0
+    started = pool.begin(REPLICA_A)
+    mock_monotonic.return_value = 102.0
+    pool.end(REPLICA_A, started, success=True)
+    started = pool.begin(REPLICA_A)
+    mock_monotonic.return_value = 102.01
+    pool.end(REPLICA_A, started, success=False)
+    assert pool.stats()["endpoints"][REPLICA_A]["ewma_latency"] == 2.0
+
+    pool.begin(REPLICA_B)
+    pool.begin(REPLICA_B)
+    assert pool.select() == REPLICA_A
+
+@patch('src.services.http.balancer.time.monotonic')
+def test_ejection_and_reintroduction(mock_monotonic):
+    """Testa a ejeção após falhas consecutivas, a reintrodução e a ejeção dobrada após nova falha."""
+    mock_monotonic.return_value = 100.0
+    pool = EndpointPool([REPLICA_A, REPLICA_B], strategy=LEAST_OUTSTANDING,
+                        eject_failures=2, eject_timeout=10, max_eject_timeout=15)
+    for _ in range(2):
+        pool.end(REPLICA_A, pool.begin(REPLICA_A), success=False)
+
+    assert pool.is_ejected(REPLICA_A)
+    assert {pool.select() for _ in range(10)} == {REPLICA_B}
+
+    mock_monotonic.return_value = 110.0
+    pool.begin(REPLICA_B)
+    assert pool.select() == REPLICA_A
+    stats = pool.stats()["endpoints"][REPLICA_A]
+    assert stats["state"] == "active"
+    assert stats["reintroductions"] == 1
+
+    pool.end(REPLICA_A, pool.begin(REPLICA_A), success=False)
+    assert pool.stats()["endpoints"][REPLICA_A]["ejected_for"] == 15
+
+def test_all_replicas_ejected_still_routes():
+    """Testa se, com todas as réplicas ejetadas, o pool continua escolhendo um destino."""
+    pool = EndpointPool([REPLICA_A], eject_failures=1)
+    pool.end(REPLICA_A, pool.begin(REPLICA_A), success=False)
+
+    assert pool.is_ejected(REPLICA_A)
+    assert pool.select() == REPLICA_A
+
+def test_client_fails_over_between_replicas():
+    """Testa se o cliente Langflow deixa de usar a réplica com falhas e as métricas são expostas."""
+    CircuitBreakerRegistry().configure(enabled=False)
+    EndpointPoolRegistry().configure(strategy=LEAST_OUTSTANDING, ewma_decay=0.3, eject_failures=1,
+                                     eject_timeout=60, max_eject_timeout=60)
+    try:
+        client = LangflowClient(f"{REPLICA_A},{REPLICA_B}", timeout=5, retry_policy=RetryPolicy(max_attempts=1))
+        ok = MagicMock(status_code=200)
+
+        def request(method, url, **kwargs):
+            if url == REPLICA_A:
+                raise requests.exceptions.ConnectionError("recusada")
+            return ok
+
+        session = MagicMock()
+        session.request.side_effect = request
+        with patch.object(client.session_pool, 'get_session', return_value=session), \
+                patch.object(client.rate_limiter, 'acquire', return_value=0.0), \
+                patch.object(client.endpoints, 'select', side_effect=[REPLICA_A, REPLICA_B]):
+            assert client.post({}, {}) is None
+            assert client.post({}, {}) is ok
+
+        assert client.endpoints.is_ejected(REPLICA_A)
+        assert client.endpoints.select() == REPLICA_B
+        assert not client.is_circuit_open()
+
+        stats = EndpointPoolRegistry().stats()[f"{REPLICA_A},{REPLICA_B}"]["endpoints"]
+        assert stats[REPLICA_A]["state"] == "ejected"
+        assert stats[REPLICA_B]["requests"] == 1
+    finally:
+        CircuitBreakerRegistry._instance = None
+        EndpointPoolRegistry._instance = None
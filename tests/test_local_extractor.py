@@ -0,0 +1,126 @@
+"""
+Testes para a extração local de produtos.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.product import Product
+from src.services.agents.local import BestsellerExtractor, LocalExtractorFetcherAgent, LocalExtractorProcessorAgent
+from src.services.cache import FetchCache, MemoryLRUCache
+from src.services.http import HttpSessionPool
+
+MARKDOWN = """Mais vendidos em Eletrônicos
+
+#1
+[![Image 3: Echo Pop](https://m.media-amazon.com/images/I/61a.jpg)](https://www.amazon.com.br/echo-pop/dp/B0BSHH8Y8K/ref=zg_bs_1)
+[Echo Pop | Smart speaker compacto com Alexa](https://www.amazon.com.br/echo-pop/dp/B0BSHH8Y8K/ref=zg_bs_1)
+[4,8 de 5 estrelas 12.345](https://www.amazon.com.br/product-reviews/B0BSHH8Y8K/ref=zg_bs_1)
+[R$ 379,05](https://www.amazon.com.br/echo-pop/dp/B0BSHH8Y8K/ref=zg_bs_1)
+
+#2
+[![Image 4: Kindle](https://m.media-amazon.com/images/I/71b.jpg)](https://www.amazon.com.br/kindle/dp/B09SWW583J/ref=zg_bs_2)
+[Kindle 11ª Geração](https://www.amazon.com.br/kindle/dp/B09SWW583J/ref=zg_bs_2)
+[4,9 de 5 estrelas 1.833](https://www.amazon.com.br/product-reviews/B09SWW583J)
+R$ 1.299,90
+"""
+
+HTML = (
+    '<div id="gridItemRoot"><span class="zg-bdg-text">#1</span>'
+    '<a href="/echo-pop/dp/B0BSHH8Y8K/ref=zg"><img alt="Echo Pop" src="https://m.media-amazon.com/i.jpg"></a>'
+    '<div class="_cDEzb_p13n-sc-css-line-clamp-3_g3dy1">Echo Pop | Smart speaker</div>'
+    '<span class="a-icon-alt">4,8 de 5 estrelas</span><span class="a-size-small">12.345</span>'
+    '<span class="_cDEzb_p13n-sc-price_3mJ9Z">R$&nbsp;379,05</span></div>'
+)
+
+HTML_ENTITIES = (
+    '<div id="gridItemRoot"><span class="zg-bdg-text">#1</span>'
+    '<a href="/fone/dp/B0C1234567/ref=zg?psc=1&amp;th=1"><img alt="Fone" src="https://m.media-amazon.com/i.jpg"></a>'
+    '<div class="_cDEzb_p13n-sc-css-line-clamp-3_g3dy1">Fone JBL &amp; Case &quot;Pro&quot; &#8211; Preto</div>'
+    '<span class="_cDEzb_p13n-sc-price_3mJ9Z">R$&nbsp;199,90</span></div>'
+    '<div id="gridItemRoot"><span class="zg-bdg-text">#2</span>'
+    '<a href="/cabo/dp/B0C7654321/ref=zg"><img alt="Cabo USB-C &amp; Lightning" src="https://m.media-amazon.com/c.jpg"></a>'
+    '<span class="_cDEzb_p13n-sc-price_3mJ9Z">R$&nbsp;49,90</span></div>'
+)
+
+@pytest.fixture(autouse=True)
+def isolated_fetch_cache():
+    """Usa um cache de busca vazio em cada teste."""
+    FetchCache()._configure(MemoryLRUCache(), enabled=True, default_ttl=60, category_ttls={})
+
+def test_extract_markdown():
+    """Testa a extração de produtos do markdown do r.jina.ai."""
+    result = BestsellerExtractor(expected_products=2).extract(MARKDOWN)
+
+    assert result.source_format == "markdown"
+    assert result.confidence == 1.0
+    assert result.products[0] == {
+        "posicao": 1,
+        "imagem": "https://m.media-amazon.com/images/I/61a.jpg",
+        "titulo": "Echo Pop | Smart speaker compacto com Alexa",
+        "preco": 379.05,
+        "rating": 4.8,
+        "url_produto": "https://www.amazon.com.br/echo-pop/dp/B0BSHH8Y8K/ref=zg_bs_1",
+        "classificacao": 12345
+    }
+    assert result.products[1]["preco"] == 1299.90
+
+    product = Product.from_dict(result.products[1])
+    assert product.name == "Kindle 11ª Geração"
+    assert product.classificacao == 1833
+
+def test_extract_html():
+    """Testa a extração de produtos do HTML bruto."""
+    result = BestsellerExtractor(expected_products=1).extract(HTML)
+
+    assert result.source_format == "html"
+    assert result.products[0]["titulo"] == "Echo Pop | Smart speaker"
+    assert result.products[0]["preco"] == 379.05
+    assert result.products[0]["url_produto"] == "https://www.amazon.com.br/echo-pop/dp/B0BSHH8Y8K/ref=zg"
+    assert result.confidence == 1.0
+
+def test_extract_html_unescapes_entities():
+    """Testa se as entidades HTML dos títulos e links são decodificadas."""
+    products = BestsellerExtractor(expected_products=2).extract(HTML_ENTITIES).products
+
+    assert products[0]["titulo"] == 'Fone JBL & Case "Pro" – Preto'
+    assert products[0]["url_produto"] == "https://www.amazon.com.br/fone/dp/B0C1234567/ref=zg?psc=1&th=1"
+    assert products[1]["titulo"] == "Cabo USB-C & Lightning"
+
+def test_low_confidence_extraction():
+    """Testa a confiança baixa para páginas sem produtos suficientes."""
+    assert BestsellerExtractor(expected_products=10).extract(MARKDOWN).confidence == pytest.approx(0.2)
+    assert BestsellerExtractor().extract("página sem produtos").confidence == 0.0
+
+@patch.object(HttpSessionPool, 'get_session')
+def test_local_pipeline_skips_llm(mock_get_session):
+    """Testa se a extração confiável não aciona o fallback LLM."""
+    mock_get_session.return_value.request.return_value = MagicMock(text=MARKDOWN, status_code=200)
+    fallback = MagicMock()
+
+    fetcher = LocalExtractorFetcherAgent(fallback=fallback, reader_url="https://r.jina.ai/",
+                                         min_confidence=0.5, expected_products=2)
+    raw = fetcher.fetch_data("https://www.amazon.com.br/gp/bestsellers/electronics")
+    products = LocalExtractorProcessorAgent().process_data(raw)
+
+    fallback.fetch_data.assert_not_called()
+    _, kwargs = mock_get_session.return_value.request.call_args
+    assert kwargs["url"] == "https://r.jina.ai/https://www.amazon.com.br/gp/bestsellers/electronics"
+    assert [product["posicao"] for product in products] == [1, 2]
+
+@patch.object(HttpSessionPool, 'get_session')
+def test_low_confidence_uses_llm_fallback(mock_get_session):
+    """Testa o uso do fluxo LLM quando a confiança da extração é baixa."""
+    mock_get_session.return_value.request.return_value = MagicMock(text="conteúdo inesperado", status_code=200)
+    fallback = MagicMock()
+    fallback.fetch_data.return_value = '{"outputs": []}'
+    fallback_processor = MagicMock()
+    fallback_processor.process_data.return_value = [{"titulo": "Produto LLM", "preco": 10.0}]
+
+    fetcher = LocalExtractorFetcherAgent(fallback=fallback)
+    raw = fetcher.fetch_data("https://www.amazon.com.br/gp/bestsellers/books")
+    products = LocalExtractorProcessorAgent(fallback_processor=fallback_processor).process_data(raw)
+
+    fallback.fetch_data.assert_called_once_with("https://www.amazon.com.br/gp/bestsellers/books", use_cache=True)
+    assert products == [{"titulo": "Produto LLM", "preco": 10.0}]
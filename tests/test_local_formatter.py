@@ -0,0 +1,80 @@
+"""
+Testes para a formatação local de produtos.
+"""
+from unittest.mock import MagicMock
+
+from src.models.product import Product
+from src.services.agents.local.formatter import LocalFormatterAgent
+from src.services.agents.local.normalizer import ProductNormalizer, parse_count, parse_price, parse_rating
+
+def test_parse_values():
+    """Testa a conversão de preços, avaliações e contagens."""
+    assert parse_price("R$ 1.299,90") == 1299.9
+    assert parse_price("99,9") == 99.9
+    assert parse_price("1299.90") == 1299.9
+    assert parse_price("1.299") == 1299.0
+    assert parse_price(49) == 49.0
+    assert parse_price("indisponível") is None
+    assert parse_rating("4,5 de 5 estrelas") == 4.5
+    assert parse_rating(7) is None
+    assert parse_count("(1.833)") == 1833
+    assert parse_count(None) == 0
+
+def test_normalizer_resolves_aliases():
+    """Testa a normalização de chaves alternativas."""
+    record = {
+        "Nome": " Fone ",
+        "preço": "R$ 199,90",
+        "avaliação": "4,7",
+        "Image URL": "https://m.media-amazon.com/a.jpg",
+        "link": "https://www.amazon.com.br/dp/B000000001",
+        "avaliações": "1.024"
+    }
+
+    normalized = ProductNormalizer().normalize(record)
+
+    assert normalized == {
+        "titulo": "Fone",
+        "preco": 199.9,
+        "rating": 4.7,
+        "imagem": "https://m.media-amazon.com/a.jpg",
+        "url_produto": "https://www.amazon.com.br/dp/B000000001",
+        "descricao": None,
+        "classificacao": 1024
+    }
+    assert Product.from_dict(normalized).price == 199.9
+    assert ProductNormalizer().normalize({"nome": "Sem preço"}) is None
+
+def test_formatter_sends_only_rejected_records_to_fallback():
+    """Testa se apenas os registros rejeitados vão ao formatador remoto."""
+    fallback = MagicMock()
+    fallback.process_data.return_value = [{"titulo": "Mouse", "preco": 59.9}]
+    formatter = LocalFormatterAgent(fallback=fallback)
+
+    text = '```json\n[{"nome": "Fone", "preco": "R$ 199,90"}, {"descricao": "Mouse sem fio por cinquenta e nove"}]\n```'
+    products = formatter.process_data(text)
+
+    assert [product["titulo"] for product in products] == ["Fone", "Mouse"]
+    fallback.process_data.assert_called_once_with([{"descricao": "Mouse sem fio por cinquenta e nove"}])
+
+def test_formatter_skips_fallback_when_all_records_normalize():
+    """Testa o caminho comum, sem chamada ao formatador remoto."""
+    fallback = MagicMock()
+    formatter = LocalFormatterAgent(fallback=fallback)
+
+    products = formatter.process_data([{"title": "Teclado", "price": 349}])
+
+    assert products[0]["preco"] == 349.0
+    fallback.process_data.assert_not_called()
+
+def test_formatter_delegates_unstructured_text():
+    """Testa o envio de texto sem registros ao formatador remoto."""
+    fallback = MagicMock()
+    fallback.process_data.return_value = [{"titulo": "Fone", "preco": "199,90"}]
+    formatter = LocalFormatterAgent(fallback=fallback)
+
+    assert formatter.process_data("Fone de ouvido por R$ 199,90") == [{
+        "titulo": "Fone", "preco": 199.9, "rating": None, "imagem": None,
+        "url_produto": None, "descricao": None, "classificacao": 0
+    }]
+    fallback.process_data.assert_called_once_with("Fone de ouvido por R$ 199,90")
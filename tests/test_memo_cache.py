@@ -0,0 +1,65 @@
+"""
+Testes para a memoização das saídas do formatador.
+"""
+import json
+from unittest.mock import patch
+
+from src.services.cache import DiskCache, MemoCache, MemoryLRUCache, TieredCache, memoization
+from src.services.agents.langflow.formatter import LangflowFormatterAgent
+
+URL = "http://langflow:7860/api/v1/run/formatador"
+RECORDS = [{"titulo": "Fone", "descricao": "sem fio"}]
+RESPONSE = {"outputs": [{"outputs": [{"results": {"text": {"data": {
+    "text": json.dumps([{"titulo": "Fone", "preco": 199.9}])
+}}}}]}]}
+
+def test_memory_lru_evicts_by_size():
+    """Testa a remoção das entradas mais antigas ao ultrapassar o limite de tamanho."""
+    cache = MemoryLRUCache(max_entries=100, max_bytes=40)
+    cache.set("a", "x" * 15, ttl=60)
+    cache.set("b", "y" * 15, ttl=60)
+    cache.set("c", "z" * 15, ttl=60)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "z" * 15
+    assert cache.total_bytes <= 40
+
+    cache.set("grande", "w" * 100, ttl=60)
+    assert cache.get("grande") is None
+
+def test_formatter_reuses_memoized_output():
+    """Testa se entradas repetidas não chamam o fluxo de novo."""
+    formatter = LangflowFormatterAgent(api_url=URL)
+
+    with patch.object(formatter, '_make_request', return_value=RESPONSE) as mock_request:
+        first = formatter.process_data(RECORDS)
+        second = formatter.process_data(RECORDS)
+
+    assert first == second == [{"titulo": "Fone", "preco": 199.9}]
+    assert mock_request.call_count == 1
+    assert MemoCache().stats()["namespaces"]["formatter"]["calls_saved"] == 1
+
+def test_opt_out_and_version_change_skip_memoized_output():
+    """Testa a opção por requisição e a invalidação pela versão do fluxo."""
+    formatter = LangflowFormatterAgent(api_url=URL)
+
+    with patch.object(formatter, '_make_request', return_value=RESPONSE) as mock_request:
+        formatter.process_data(RECORDS)
+        with memoization(False):
+            formatter.process_data(RECORDS)
+        formatter.flow_version = "v2"
+        formatter.process_data(RECORDS)
+
+    assert mock_request.call_count == 3
+    assert MemoCache().stats()["namespaces"]["formatter"]["bypasses"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Testa se os resultados memoizados em disco sobrevivem a uma reinicialização."""
+    MemoCache().configure(backend=TieredCache(MemoryLRUCache(), DiskCache(str(tmp_path))))
+    with patch.object(LangflowFormatterAgent, '_make_request', return_value=RESPONSE) as mock_request:
+        LangflowFormatterAgent(api_url=URL).process_data(RECORDS)
+
+        MemoCache().configure(backend=TieredCache(MemoryLRUCache(), DiskCache(str(tmp_path))))
+        assert LangflowFormatterAgent(api_url=URL).process_data(RECORDS) == [{"titulo": "Fone", "preco": 199.9}]
+
+    assert mock_request.call_count == 1
@@ -0,0 +1,60 @@
+"""
+Testes para a normalização de preços, avaliações e contagens.
+"""
+from src.models.product import Product
+from src.utils.normalization import normalize_columns, parse_count, parse_price, parse_prices, resolve_fields
+from src.utils.statistics import prepare_chart_data
+
+def test_parse_price_ranges_and_missing():
+    """Testa faixas de preço, preços iniciais e valores ausentes."""
+    assert parse_price("R$ 10,00 - R$ 20,00") == 10.0
+    assert parse_price("a partir de R$ 1.099,00") == 1099.0
+    assert parse_price("R$ 1.299,90 ou 12x de R$ 108,33") == 1299.9
+    assert parse_price("12x de 108,33") is None
+    assert parse_price("-") is None
+    assert parse_price("") is None
+    assert parse_prices(["R$ 5,50", None, 7]) == [5.5, None, 7.0]
+
+def test_parse_count_multipliers():
+    """Testa contagens com separador de milhar e multiplicadores."""
+    assert parse_count("12.345") == 12345
+    assert parse_count("1,2 mil") == 1200
+    assert parse_count("1.2k") == 1200
+    assert parse_count("2 mil avaliações") == 2000
+
+def test_normalize_columns_single_pass():
+    """Testa a conversão das colunas com chaves alternativas."""
+    records = [
+        {"titulo": "A", "preco": "R$ 1.299,90", "rating": "4,5", "classificacao": "(1.833)"},
+        {"nome": "B", "preço": "indisponível", "avaliação": 9, "avaliacoes": None},
+        "registro inválido"
+    ]
+    columns = normalize_columns(records, ("titulo", "preco", "rating", "classificacao"))
+    assert columns["titulo"] == ["A", "B", None]
+    assert columns["preco"] == [1299.9, None, None]
+    assert columns["rating"] == [4.5, None, None]
+    assert columns["classificacao"] == [1833, 0, 0]
+
+def test_resolve_fields_first_filled_value():
+    """Testa que vale o primeiro valor preenchido entre chaves equivalentes."""
+    assert resolve_fields({"nome": "", "Título": "Fone", "extra": 1}) == {"titulo": "Fone"}
+
+def test_product_from_dict_brl_text():
+    """Testa a criação de um produto com valores no formato brasileiro."""
+    product = Product.from_dict({"titulo": "Fone", "preco": "R$ 1.299,90", "rating": "4,7 de 5 estrelas",
+                                 "classificacao": "1.833"})
+    assert product.price == 1299.9
+    assert product.rating == 4.7
+    assert product.classificacao == 1833
+
+def test_prepare_chart_data_from_dicts():
+    """Testa os dados de gráfico a partir de dicionários com preços em texto."""
+    data = prepare_chart_data([
+        {"titulo": "Produto com um nome bem comprido", "preco": "R$ 1.000,00"},
+        {"name": "Barato", "price": "R$ 10,00 - R$ 20,00"},
+        {"titulo": "Sem preço", "preco": "indisponível"}
+    ])
+    assert data["precos"] == [1000.0, 10.0]
+    assert data["labels"] == ["Produto com um nome ...", "Barato"]
+    assert data["minimo"] == 10.0
+    assert data["maximo"] == 1000.0
@@ -0,0 +1,127 @@
+"""
+Testes para os pipelines declarativos de agentes.
+"""
+import threading
+
+import pytest
+
+from src.config.agents import get_pipeline_config
+from src.services.agents.base import BaseDataFetcherAgent, BaseDataProcessorAgent
+from src.services.agents.pool import AgentPool
+from src.services.pipeline import PipelineDefinition, PipelineDefinitionError, PipelineExecutor, pipeline_stats
+
+class FakeFetcher(BaseDataFetcherAgent):
+    def __init__(self):
+        super().__init__("Busca", "Busca de teste")
+
+    def fetch_data(self, source, use_cache=True):
+        return f"pagina:{source}"
+
+class FakeProcessor(BaseDataProcessorAgent):
+    def __init__(self, func):
+        super().__init__("Processamento", "Processamento de teste")
+        self.func = func
+
+    def process_data(self, data):
+        return self.func(data)
+
+class FakeFactory:
+    def __init__(self, agents):
+        self.agents = agents
+
+    def create_agent(self, agent_type, **kwargs):
+        return self.agents[agent_type]() if agent_type in self.agents else None
+
+def _definition(stages, output=None):
+    return PipelineDefinition.from_dict({"id": "teste", "stages": stages, "output": output})
+
+def test_definition_orders_stages_and_validates():
+    """Testa a ordenação topológica e a validação da definição."""
+    definition = _definition([
+        {"id": "format", "agent": "f", "inputs": ["process"]},
+        {"id": "fetch", "kind": "fetch", "agent": "b"},
+        {"id": "process", "agent": "p", "inputs": ["fetch"]}
+    ], output="format")
+    assert [stage.id for stage in definition.stages] == ["fetch", "process", "format"]
+
+    with pytest.raises(PipelineDefinitionError):
+        _definition([{"id": "a", "agent": "p", "inputs": ["b"]}, {"id": "b", "agent": "p", "inputs": ["a"]}])
+    with pytest.raises(PipelineDefinitionError):
+        _definition([{"id": "fetch", "kind": "fetch", "agent": "b"}, {"id": "x", "agent": "p", "inputs": ["y"]}])
+    with pytest.raises(PipelineDefinitionError):
+        _definition([{"id": "fetch", "kind": "fetch", "agent": "b", "inputs": ["x"]}])
+
+def test_configured_pipelines_are_valid():
+    """Testa se os pipelines declarados na configuração são válidos."""
+    for data in get_pipeline_config():
+        assert PipelineDefinition.from_dict(data).id == data["id"]
+
+def test_executor_runs_branches_in_parallel_and_records_metrics():
+    """Testa a execução paralela de ramos independentes, a junção e as métricas."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(title):
+        def run(data):
+            # Os dois ramos só avançam se estiverem em execução ao mesmo tempo
+            barrier.wait()
+            return [{"titulo": title, "preco": "R$ 10,00", "origem": data}]
+        return run
+
+    factory = FakeFactory({
+        "busca": FakeFetcher,
+        "ramo_a": lambda: FakeProcessor(branch("A")),
+        "ramo_b": lambda: FakeProcessor(branch("B"))
+    })
+    definition = PipelineDefinition.from_dict({"id": "paralelo", "stages": [
+        {"id": "fetch", "kind": "fetch", "agent": "busca"},
+        {"id": "a", "agent": "ramo_a", "inputs": ["fetch"]},
+        {"id": "b", "agent": "ramo_b", "inputs": ["fetch"]},
+        {"id": "merge", "kind": "merge", "inputs": ["a", "b"]}
+    ]})
+
+    result = PipelineExecutor(definition, AgentPool(factory), max_parallel=2).run("http://x")
+
+    assert result.error is None
+    assert [product.name for product in result.products()] == ["A", "B"]
+    assert result.products()[0].price == 10.0
+    metrics = {metric.stage: metric for metric in result.metrics}
+    assert set(metrics) == {"fetch", "a", "b", "merge"}
+    assert metrics["fetch"].artifact == "raw"
+    assert metrics["fetch"].bytes == len("pagina:http://x")
+    assert metrics["merge"].items == 2
+    assert pipeline_stats()["paralelo"]["stages"]["merge"]["items_total"] >= 2
+
+def test_executor_stops_after_failure():
+    """Testa que nenhuma etapa dependente é executada após uma falha."""
+    calls = []
+
+    def format_data(data):
+        calls.append(data)
+        return data
+
+    factory = FakeFactory({
+        "busca": FakeFetcher,
+        "falha": lambda: FakeProcessor(lambda data: None),
+        "formato": lambda: FakeProcessor(format_data)
+    })
+    definition = _definition([
+        {"id": "fetch", "kind": "fetch", "agent": "busca"},
+        {"id": "process", "agent": "falha", "inputs": ["fetch"]},
+        {"id": "format", "agent": "formato", "inputs": ["process"]}
+    ])
+
+    events = list(PipelineExecutor(definition, AgentPool(factory)).iter_events("http://x"))
+
+    result = events[-1]["result"]
+    assert result.error == "Falha na etapa 'process'"
+    assert result.products() == []
+    assert calls == []
+    assert [event["stage"] for event in events if event["event"] == "stage_started"] == ["fetch", "process"]
+
+def test_executor_reports_unknown_agent():
+    """Testa o erro de uma etapa cujo agente não está registrado."""
+    definition = _definition([{"id": "fetch", "kind": "fetch", "agent": "inexistente"}])
+
+    result = PipelineExecutor(definition, AgentPool(FakeFactory({}))).run("http://x")
+
+    assert "inexistente" in result.error
@@ -0,0 +1,54 @@
+"""
+Testes para o limitador de taxa.
+"""
+import pytest
+
+from src.services.http import RateLimiter, RateLimitTimeout, TokenBucket
+from src.services.http.rate_limiter import parse_rate, parse_rate_rules
+
+def test_parse_rate_rules():
+    """Testa a leitura das regras de taxa por host e endpoint."""
+    rules = parse_rate_rules("http://localhost:7860=2:4; https://r.jina.ai/=0.5;http://x=abc")
+
+    assert rules == {"http://localhost:7860": (2.0, 4.0), "https://r.jina.ai": (0.5, 1.0)}
+    assert parse_rate("") is None
+    assert parse_rate("0") is None
+
+def test_token_bucket_burst_then_wait():
+    """Testa se a rajada é atendida sem espera e os tokens seguintes aguardam a reposição."""
+    bucket = TokenBucket(rate=10.0, burst=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    with pytest.raises(RateLimitTimeout):
+        bucket.reserve(timeout=0.1)
+
+    stats = bucket.stats()
+    assert stats["acquired"] == 4
+    assert stats["max_wait"] == pytest.approx(0.2, abs=0.01)
+
+def test_rate_limiter_host_and_endpoint_buckets():
+    """Testa a aplicação dos baldes de host, de endpoint e adicionais."""
+    limiter = RateLimiter()
+    limiter.configure(
+        enabled=True,
+        default_rate=None,
+        rules=parse_rate_rules("http://langflow:7860=1000:10;"
+                               "http://langflow:7860/api/v1/run/fluxo=1000:10;"
+                               "https://r.jina.ai=1000:10")
+    )
+
+    limiter.acquire("http://langflow:7860/api/v1/run/fluxo", also=["https://r.jina.ai/"])
+    limiter.acquire("http://langflow:7860/api/v1/run/outro")
+    limiter.acquire("http://sem-regra:8080/")
+
+    stats = limiter.stats()
+    assert stats["http://langflow:7860"]["acquired"] == 2
+    assert stats["http://langflow:7860/api/v1/run/fluxo"]["acquired"] == 1
+    assert stats["https://r.jina.ai"]["acquired"] == 1
+    assert "http://sem-regra:8080" not in stats
+
+    limiter.configure(enabled=False, default_rate=None, rules={})
@@ -0,0 +1,65 @@
+"""
+Testes para o extrator declarativo de respostas do Langflow.
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.services.agents.langflow.extraction import (
+    FORMATTER_EXTRACTOR,
+    ResponseExtractor,
+    compile_path,
+    is_dict_list
+)
+from src.utils import json_codec
+
+PRODUCTS = [{"titulo": "Echo Dot", "preco": 379.05}]
+
+def _envelope(**second_level):
+    return {"outputs": [{"outputs": [second_level]}]}
+
+def test_compile_path():
+    """Testa a compilação das expressões de caminho."""
+    assert compile_path("outputs[0].results.text|json") == (
+        ("key", "outputs"), ("index", 0), ("key", "results"), ("key", "text"), ("json", None)
+    )
+    assert compile_path("[0].*") == (("index", 0), ("any", None))
+
+    with pytest.raises(ValueError):
+        compile_path("outputs..text")
+
+def test_formatter_paths():
+    """Testa os formatos de resposta conhecidos do fluxo de formatação."""
+    text_data = _envelope(results={"text": {"data": {"text": json.dumps(PRODUCTS)}}})
+    data_string = _envelope(data=[json.dumps({"data": PRODUCTS})])
+    data_list = _envelope(data=[PRODUCTS])
+
+    assert FORMATTER_EXTRACTOR.extract(text_data, flow="teste").value == PRODUCTS
+    assert FORMATTER_EXTRACTOR.extract(data_string, flow="teste").path == "outputs[0].outputs[0].data[0]|json.data"
+    assert FORMATTER_EXTRACTOR.extract(data_list, flow="teste").value == PRODUCTS
+    assert FORMATTER_EXTRACTOR.extract({"produtos": PRODUCTS}, flow="teste").path == "*"
+    assert FORMATTER_EXTRACTOR.extract({"outputs": []}, flow="teste") is None
+
+def test_priority_and_shared_prefix_decoded_once():
+    """Testa a prioridade declarada e a decodificação única de prefixos comuns."""
+    extractor = ResponseExtractor("teste", ["a|json.produtos", "a|json.itens", "b"], accept=is_dict_list)
+    data = {"a": json.dumps({"itens": PRODUCTS}), "b": [{"outro": 1}]}
+
+    with patch.object(json_codec, 'loads', wraps=json_codec.loads) as mock_loads:
+        match = extractor.extract(data)
+
+    assert match.path == "a|json.itens"
+    assert mock_loads.call_count == 1
+
+def test_preferred_path_per_flow():
+    """Testa se o caminho que casou por último em cada fluxo é tentado primeiro."""
+    extractor = ResponseExtractor("teste", ["primeiro", "segundo"])
+
+    assert extractor.extract({"segundo": 2}, flow="fluxo-a").path == "segundo"
+    with patch.object(extractor, '_walk') as mock_walk:
+        assert extractor.extract({"primeiro": 1, "segundo": 2}, flow="fluxo-a").path == "segundo"
+        mock_walk.assert_not_called()
+
+    assert extractor.extract({"primeiro": 1, "segundo": 2}, flow="fluxo-b").path == "primeiro"
+    assert extractor.stats() == {"fluxo-a": {"segundo": 2}, "fluxo-b": {"primeiro": 1}}
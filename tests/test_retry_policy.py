@@ -0,0 +1,94 @@
+"""
+Testes para a política de retentativas.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.services.http import RetryBudget, RetryError, RetryPolicy
+from src.services.http.retry import parse_retry_after
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+def test_backoff_full_jitter_bounds():
+    """Testa se o backoff fica entre zero e o teto exponencial limitado por max_delay."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+    for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (10, 5.0)]:
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        assert all(0.0 <= delay <= ceiling for delay in delays)
+
+def test_parse_retry_after():
+    """Testa a leitura do cabeçalho Retry-After em segundos e em data HTTP."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("invalido") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+@patch('src.services.http.retry.time.sleep')
+def test_retries_until_success_respecting_retry_after(mock_sleep):
+    """Testa se respostas retentáveis são repetidas e o Retry-After é respeitado."""
+    responses = [_response(503, {'Retry-After': '2'}), _response(200)]
+    policy = RetryPolicy(max_attempts=3, max_delay=10.0)
+
+    result = policy.call(lambda attempt, remaining: responses[attempt - 1])
+
+    assert result.status_code == 200
+    mock_sleep.assert_called_once_with(2.0)
+    responses[0].close.assert_called_once()
+
+@patch('src.services.http.retry.time.sleep')
+def test_non_retryable_status_is_returned(mock_sleep):
+    """Testa se um erro definitivo é devolvido sem novas tentativas."""
+    attempt_func = MagicMock(return_value=_response(404))
+
+    result = RetryPolicy(max_attempts=5).call(attempt_func)
+
+    assert result.status_code == 404
+    assert attempt_func.call_count == 1
+    mock_sleep.assert_not_called()
+
+@patch('src.services.http.retry.time.sleep')
+def test_exhausted_attempts_raise(mock_sleep):
+    """Testa se o esgotamento das tentativas gera RetryError e exceções não retentáveis propagam."""
+    attempt_func = MagicMock(side_effect=requests.exceptions.ConnectionError("recusada"))
+
+    with pytest.raises(RetryError):
+        RetryPolicy(max_attempts=3, base_delay=0.01).call(attempt_func)
+    assert attempt_func.call_count == 3
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=3).call(MagicMock(side_effect=ValueError("erro")))
+
+def test_deadline_stops_retries():
+    """Testa se uma espera maior que o prazo restante interrompe as tentativas."""
+    attempt_func = MagicMock(return_value=_response(429, {'Retry-After': '30'}))
+    policy = RetryPolicy(max_attempts=5, max_delay=60.0, deadline=1.0)
+
+    with pytest.raises(RetryError) as error:
+        policy.call(attempt_func)
+
+    assert attempt_func.call_count == 1
+    assert error.value.response.status_code == 429
+
+@patch('src.services.http.retry.time.sleep')
+def test_budget_denies_retry_storm(mock_sleep):
+    """Testa se o orçamento global limita as retentativas em relação às requisições originais."""
+    budget = RetryBudget(ratio=0.5, min_per_second=0.0, window=60.0)
+    policy = RetryPolicy(max_attempts=2, base_delay=0.01, budget=budget)
+    failing = MagicMock(return_value=_response(503))
+
+    for _ in range(4):
+        with pytest.raises(RetryError):
+            policy.call(failing)
+
+    stats = budget.stats()
+    assert stats["requests"] == 4
+    assert stats["retries"] == 2
+    assert stats["denied"] == 2
+    assert policy.with_overrides(max_attempts=None, deadline=5.0).budget is budget
@@ -0,0 +1,68 @@
+"""
+Testes para a coalescência de chamadas concorrentes.
+"""
+import threading
+import time
+
+import pytest
+
+from src.app import create_app
+from src.services.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    """Testa se chamadas concorrentes com a mesma chave executam a função uma única vez."""
+    flights = SingleFlight("teste")
+    executions = []
+    release = threading.Event()
+
+    def slow_pipeline():
+        executions.append(1)
+        release.wait(timeout=5)
+        return ["produto"]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do(("url", "fetcher"), slow_pipeline)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Aguarda todos os participantes entrarem no voo antes de liberar a execução
+    while flights.stats()["calls"] < 5:
+        time.sleep(0.01)
+    assert flights.stats()["waiting"] == 4
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1
+    assert [result for result, _ in results] == [["produto"]] * 5
+    assert sum(1 for _, shared in results if shared) == 4
+
+    stats = flights.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["coalescing_ratio"] == pytest.approx(0.8)
+    assert stats["in_flight"] == 0
+
+def test_errors_propagate_and_key_is_released():
+    """Testa a propagação de erros e a liberação da chave após a execução."""
+    flights = SingleFlight("teste")
+
+    def failing():
+        raise RuntimeError("falha no Langflow")
+
+    with pytest.raises(RuntimeError):
+        flights.do("chave", failing)
+
+    result, shared = flights.do("chave", lambda: "ok")
+    assert result == "ok"
+    assert shared is False
+
+def test_request_key_separates_cache_bypass():
+    """Testa se uma requisição que ignora o cache não se junta a uma execução que o usa."""
+    orchestrator = create_app('testing').extensions['agent_orchestrator']
+    cached = orchestrator.request_key("https://www.amazon.com.br/s?k=notebook")
+    assert cached == orchestrator.request_key("https://www.amazon.com.br/s?k=notebook", use_cache=True)
+    assert cached != orchestrator.request_key("https://www.amazon.com.br/s?k=notebook", use_cache=False)
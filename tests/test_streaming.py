@@ -0,0 +1,82 @@
+"""
+Testes para a entrega progressiva de produtos.
+"""
+import json
+from unittest.mock import patch
+
+from src.app import create_app
+from src.models.product import Product
+from src.services.agent_orchestrator import AgentOrchestrator
+from src.services.agents.langflow.client import parse_stream_event
+from src.services.agents.langflow.formatter import LangflowFormatterAgent
+from src.utils.json_stream import JsonArrayStreamParser, iter_json_array_items
+
+PRODUCTS = [
+    {"titulo": "Fone \"Pro\" [2024]", "preco": 199.9, "rating": 4.5},
+    {"titulo": "Teclado {mecânico}", "preco": 349.0, "rating": 4.8, "tags": ["a\\\\", {"b": 1}]}
+]
+
+def test_array_items_across_any_chunking():
+    """Testa a extração dos itens independentemente de como o texto é dividido."""
+    text = "```json\n" + json.dumps(PRODUCTS, ensure_ascii=False) + "\n```"
+
+    for size in (1, 2, 5, 13, len(text)):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(iter_json_array_items(chunks)) == PRODUCTS
+
+def test_parser_delivers_items_before_array_ends():
+    """Testa se cada item é entregue assim que é concluído."""
+    parser = JsonArrayStreamParser()
+
+    assert parser.feed('Aqui está: [{"titulo": "A"}, {"titu') == [{"titulo": "A"}]
+    assert parser.feed('lo": "B"}') == [{"titulo": "B"}]
+    assert not parser.done
+    assert parser.feed(', {"quebrado": }, {"titulo": "C"}]') == [{"titulo": "C"}]
+    assert parser.done
+
+def test_parse_stream_event():
+    """Testa a leitura das linhas da transmissão do Langflow."""
+    assert parse_stream_event('{"event": "token", "data": {"chunk": "["}}') == {"event": "token", "data": {"chunk": "["}}
+    assert parse_stream_event('data: {"event": "end", "data": {}}') == {"event": "end", "data": {}}
+    assert parse_stream_event('event: token') is None
+    assert parse_stream_event('') is None
+
+def test_formatter_streams_products_from_tokens():
+    """Testa se o formatador entrega os produtos a partir dos tokens emitidos."""
+    text = json.dumps(PRODUCTS)
+    events = [{"event": "add_message", "data": {}}]
+    events += [{"event": "token", "data": {"chunk": text[i:i + 7]}} for i in range(0, len(text), 7)]
+    events.append({"event": "end", "data": {"result": {}}})
+
+    formatter = LangflowFormatterAgent(api_url="http://langflow:7860/api/v1/run/formatador")
+    with patch.object(formatter.client, 'stream', return_value=iter(events)), \
+            patch.object(formatter, 'process_data') as mock_process_data:
+        assert list(formatter.process_data_stream('[{"texto": "bruto"}]')) == PRODUCTS
+
+    mock_process_data.assert_not_called()
+
+def test_fetch_data_stream_route_ndjson():
+    """Testa a rota /fetch-data/stream com eventos de etapa, lotes e resumo final."""
+    def fake_stream(self, source, *args, **kwargs):
+        yield {"event": "stage", "stage": "fetch"}
+        yield {"event": "products", "products": [Product(name="A", price=10.0)]}
+        yield {"event": "products", "products": [Product(name="B", price=30.0)]}
+        yield {"event": "done", "total": 2}
+
+    client = create_app('testing').test_client()
+    with patch.object(AgentOrchestrator, 'stream_products', fake_stream):
+        response = client.get('/fetch-data/stream?format=ndjson&source=https://www.amazon.com.br/gp/bestsellers')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == 'application/x-ndjson'
+    assert [line["event"] for line in lines] == ["stage", "products", "products", "done"]
+    assert lines[1]["produtos"][0]["name"] == "A"
+    assert lines[-1]["total"] == 2
+    assert lines[-1]["dados_grafico"]["media"] == 20.0
+
+    with patch.object(AgentOrchestrator, 'stream_products', fake_stream):
+        response = client.get('/fetch-data/stream?source=https://www.amazon.com.br/gp/bestsellers')
+        body = response.get_data(as_text=True)
+
+    assert response.mimetype == 'text/event-stream'
+    assert body.startswith('event: stage\ndata: {"stage": "fetch"}\n\n')